@@ -3,17 +3,30 @@ Database dependency providers for the API.
 
 This module provides dependency injection functions for database connections,
 including Neo4j for the knowledge graph and MongoDB for document storage.
+Connections come from process-wide pools owned by ``pool_registry``, which is
+started and stopped by the application lifespan.
 """
 
 import os
 import json
+from contextlib import contextmanager
 from typing import Generator, Dict, Any
 
 from fastapi import Depends
 from pymongo import MongoClient
+from pymongo.client_session import ClientSession
 from pymongo.database import Database
 
+from src.api.dependencies.pools import ConnectionPoolRegistry, MongoPoolMonitor
+
 # Mock implementation for testing
+class Neo4jSession:
+    def run(self, query, parameters=None):
+        return []
+    
+    def close(self):
+        pass
+
 class Neo4jManager:
     @staticmethod
     def from_config(config_path):
@@ -22,11 +35,21 @@ class Neo4jManager:
     def close(self):
         pass
     
+    def get_session(self, access_mode=None):
+        return Neo4jSession()
+    
     def get_database_info(self):
         return {"name": "test", "version": "1.0"}
     
     def execute_read_query(self, query, params=None):
         return []
+    
+    def execute_write_query(self, query, params=None):
+        return []
+    
+    @contextmanager
+    def transaction(self):
+        yield self
 
 class KnowledgeGraphManager:
     def __init__(self, db_manager):
@@ -44,7 +67,10 @@ class KnowledgeGraphManager:
     def get_all_entities(self, limit=10, offset=0):
         return []
     
-    def count_entities(self):
+    def get_entities_page(self, label=None, limit=100, cursor=None):
+        return {"entities": [], "next_cursor": None}
+    
+    def count_entities(self, label=None):
         return 0
     
     def count_entities_by_label(self, label):
@@ -68,34 +94,83 @@ class KnowledgeGraphManager:
     def get_all_relationships(self, limit=10, offset=0):
         return []
     
-    def count_relationships(self):
+    def get_relationships_page(self, relationship_type=None, entity_id=None, direction="both",
+                               limit=100, cursor=None):
+        return {"relationships": [], "next_cursor": None}
+    
+    def count_relationships(self, relationship_type=None, entity_id=None, direction="both"):
         return 0
     
     def count_relationships_by_type(self, rel_type):
         return 0
     
+    def search_entities(self, search_text, labels=None, min_confidence=0.0, limit=100, mode="exact"):
+        return []
+    
     def compute_graph_statistics(self):
         return {"entities": 0, "relationships": 0, "labels": [], "types": []}
 
 
-def get_neo4j() -> Generator[Neo4jManager, None, None]:
+def _create_neo4j_manager() -> Neo4jManager:
     """
-    Get a Neo4j database manager instance.
+    Create the process-wide Neo4j manager from configuration.
     
     Returns:
-        Generator[Neo4jManager, None, None]: Neo4j database manager
+        Neo4jManager: Neo4j database manager
     """
     config_path = os.environ.get(
         "NEO4J_CONFIG_PATH", 
         "/Users/completetech/open-computer-use/claude_workspace/knowledge_graph_system/config/db_config.json"
     )
+    return Neo4jManager.from_config(config_path)
+
+
+def _create_mongo_client(monitor: MongoPoolMonitor) -> MongoClient:
+    """
+    Create the process-wide MongoDB client.
+    
+    Args:
+        monitor: Listener that records connection pool statistics
+        
+    Returns:
+        MongoClient: MongoDB client
+    """
+    mongo_uri = os.environ.get("MONGODB_URI", "mongodb://localhost:27017/")
+    return MongoClient(
+        mongo_uri,
+        maxPoolSize=int(os.environ.get("MONGODB_MAX_POOL_SIZE", 100)),
+        event_listeners=[monitor]
+    )
+
+
+pool_registry = ConnectionPoolRegistry(
+    neo4j_factory=_create_neo4j_manager,
+    mongo_factory=_create_mongo_client
+)
+
+
+def get_neo4j() -> Generator[Neo4jManager, None, None]:
+    """
+    Get the shared Neo4j database manager.
+    
+    The manager and its driver pool live for the whole application and are
+    not closed at the end of the request.
+    
+    Returns:
+        Generator[Neo4jManager, None, None]: Neo4j database manager
+    """
+    yield pool_registry.get_neo4j()
+
+
+def get_neo4j_session() -> Generator[Any, None, None]:
+    """
+    Borrow a Neo4j session from the shared driver for the current request.
     
-    try:
-        manager = Neo4jManager.from_config(config_path)
-        yield manager
-    finally:
-        if manager:
-            manager.close()
+    Returns:
+        Generator[Any, None, None]: Neo4j session, closed after the request
+    """
+    with pool_registry.neo4j_session() as session:
+        yield session
 
 
 def get_knowledge_graph_manager(neo4j: Neo4jManager = Depends(get_neo4j)) -> KnowledgeGraphManager:
@@ -114,18 +189,31 @@ def get_knowledge_graph_manager(neo4j: Neo4jManager = Depends(get_neo4j)) -> Kno
 
 def get_mongo_client() -> Generator[MongoClient, None, None]:
     """
-    Get a MongoDB client.
+    Get the shared MongoDB client.
+    
+    The client and its connection pool live for the whole application and
+    are not closed at the end of the request.
     
     Returns:
         Generator[MongoClient, None, None]: MongoDB client
     """
-    mongo_uri = os.environ.get("MONGODB_URI", "mongodb://localhost:27017/")
-    client = MongoClient(mongo_uri)
+    yield pool_registry.get_mongo_client()
+
+
+def get_mongo_session(
+    mongo_client: MongoClient = Depends(get_mongo_client)
+) -> Generator[ClientSession, None, None]:
+    """
+    Start a MongoDB client session for the current request.
     
-    try:
-        yield client
-    finally:
-        client.close()
+    Args:
+        mongo_client (MongoClient): MongoDB client
+        
+    Returns:
+        Generator[ClientSession, None, None]: MongoDB session, ended after the request
+    """
+    with mongo_client.start_session() as session:
+        yield session
 
 
 def get_db(mongo_client: MongoClient = Depends(get_mongo_client)) -> Database:
@@ -0,0 +1,274 @@
+"""
+Process-wide connection pools for the API.
+
+This module provides a registry that owns one Neo4j manager (and therefore one
+driver connection pool) and one MongoDB client for the lifetime of the
+application. Request handlers borrow sessions from these pools through the
+dependencies in ``src.api.dependencies.database`` instead of building new
+clients per request.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator
+
+from pymongo import monitoring
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """
+    Usage counters for a connection pool.
+
+    Attributes:
+        in_use: Connections currently checked out
+        idle: Open connections waiting in the pool
+        acquisitions: Total number of successful checkouts
+        total_wait_ms: Cumulative time spent waiting for a checkout
+        max_wait_ms: Longest single wait for a checkout
+    """
+
+    in_use: int = 0
+    idle: int = 0
+    acquisitions: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def record_wait(self, wait_ms: float) -> None:
+        """Record a completed checkout that waited wait_ms milliseconds."""
+        self.acquisitions += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the statistics to a dictionary.
+
+        Returns:
+            Dictionary representation including the average wait time
+        """
+        data = asdict(self)
+        data["avg_wait_ms"] = self.total_wait_ms / self.acquisitions if self.acquisitions else 0.0
+        return data
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    pymongo connection pool listener that maintains PoolStats.
+
+    Register it through ``MongoClient(event_listeners=[monitor])``.
+    """
+
+    def __init__(self):
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
+        self._checkout_started: Dict[int, float] = {}
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.stats.idle = 0
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.stats.idle = 0
+
+    def connection_created(self, event):
+        with self._lock:
+            self.stats.idle += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.stats.idle = max(self.stats.idle - 1, 0)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._checkout_started[threading.get_ident()] = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._checkout_started.pop(threading.get_ident(), None)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            started = self._checkout_started.pop(threading.get_ident(), None)
+            wait_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+            self.stats.record_wait(wait_ms)
+            self.stats.in_use += 1
+            self.stats.idle = max(self.stats.idle - 1, 0)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.stats.in_use = max(self.stats.in_use - 1, 0)
+            self.stats.idle += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the current statistics as a dictionary."""
+        with self._lock:
+            return self.stats.to_dict()
+
+
+class ConnectionPoolRegistry:
+    """
+    Registry of the process-wide database clients.
+
+    ``startup`` is called from the application lifespan and ``shutdown`` when the
+    application stops. Clients are also created lazily on first use so the
+    dependencies keep working when no lifespan runs (e.g. in tests).
+    """
+
+    def __init__(self,
+                 neo4j_factory: Callable[[], Any],
+                 mongo_factory: Callable[[MongoPoolMonitor], Any]):
+        """
+        Initialize the registry.
+
+        Args:
+            neo4j_factory: Callable returning a Neo4j manager
+            mongo_factory: Callable taking a pool monitor and returning a MongoClient
+        """
+        self.neo4j_factory = neo4j_factory
+        self.mongo_factory = mongo_factory
+        self.mongo_monitor = MongoPoolMonitor()
+        self.neo4j_sessions_open = 0
+        self.neo4j_sessions_opened = 0
+        self._neo4j = None
+        self._mongo_client = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """Whether any client has been created."""
+        return self._neo4j is not None or self._mongo_client is not None
+
+    def startup(self) -> None:
+        """
+        Create the shared clients.
+
+        Failures are logged rather than raised so the API can start while a
+        database is unavailable; the client is retried on first use.
+        """
+        try:
+            self.get_neo4j()
+        except Exception as e:
+            logger.error(f"Failed to create Neo4j connection pool: {e}")
+
+        try:
+            self.get_mongo_client()
+        except Exception as e:
+            logger.error(f"Failed to create MongoDB connection pool: {e}")
+
+        logger.info("Connection pools started")
+
+    def shutdown(self) -> None:
+        """Close the shared clients."""
+        with self._lock:
+            neo4j, self._neo4j = self._neo4j, None
+            mongo_client, self._mongo_client = self._mongo_client, None
+
+        if neo4j is not None:
+            try:
+                neo4j.close()
+            except Exception as e:
+                logger.error(f"Failed to close Neo4j connection pool: {e}")
+
+        if mongo_client is not None:
+            try:
+                mongo_client.close()
+            except Exception as e:
+                logger.error(f"Failed to close MongoDB connection pool: {e}")
+
+        logger.info("Connection pools closed")
+
+    def get_neo4j(self) -> Any:
+        """
+        Get the shared Neo4j manager, creating it if necessary.
+
+        Returns:
+            Neo4j manager
+        """
+        if self._neo4j is None:
+            with self._lock:
+                if self._neo4j is None:
+                    self._neo4j = self.neo4j_factory()
+        return self._neo4j
+
+    def get_mongo_client(self) -> Any:
+        """
+        Get the shared MongoDB client, creating it if necessary.
+
+        Returns:
+            MongoDB client
+        """
+        if self._mongo_client is None:
+            with self._lock:
+                if self._mongo_client is None:
+                    self._mongo_client = self.mongo_factory(self.mongo_monitor)
+        return self._mongo_client
+
+    @contextmanager
+    def neo4j_session(self) -> Iterator[Any]:
+        """
+        Borrow a session from the shared Neo4j driver.
+
+        Yields:
+            Neo4j session, closed when the block exits
+        """
+        session = self.get_neo4j().get_session()
+
+        with self._stats_lock:
+            self.neo4j_sessions_open += 1
+            self.neo4j_sessions_opened += 1
+
+        try:
+            yield session
+        finally:
+            try:
+                session.close()
+            finally:
+                with self._stats_lock:
+                    self.neo4j_sessions_open -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get usage statistics for all pools.
+
+        MongoDB statistics come from pymongo pool events and describe real
+        connections. The Neo4j driver has no public API for pool occupancy, and
+        a session only acquires a connection when it runs its first query, so
+        the Neo4j entry counts sessions borrowed through ``neo4j_session``.
+
+        Returns:
+            Dictionary with one entry per pool
+        """
+        with self._stats_lock:
+            neo4j_stats = {
+                "sessions_open": self.neo4j_sessions_open,
+                "sessions_opened": self.neo4j_sessions_opened,
+            }
+
+        neo4j_stats["connected"] = self._neo4j is not None
+        neo4j_stats["max_size"] = getattr(self._neo4j, "max_connection_pool_size", None)
+
+        mongo_stats = self.mongo_monitor.snapshot()
+        mongo_stats["connected"] = self._mongo_client is not None
+
+        return {
+            "neo4j": neo4j_stats,
+            "mongodb": mongo_stats,
+        }
@@ -8,6 +8,7 @@ middleware, and dependencies for the AI Research Integration Project.
 import logging
 import os
 import datetime
+from contextlib import asynccontextmanager
 from typing import Dict, List
 
 from fastapi import Depends, FastAPI, Request
@@ -17,6 +18,8 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 # from fastapi.staticfiles import StaticFiles
 
+from src.api.dependencies.database import pool_registry
+
 # Configure logging
 logging.basicConfig(
     level=os.environ.get("API_LOG_LEVEL", "INFO").upper(),
@@ -24,6 +27,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+# Shared database connection pools
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared database connection pools for the application's lifetime."""
+    pool_registry.startup()
+    try:
+        yield
+    finally:
+        pool_registry.shutdown()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="AI Research Integration API",
@@ -31,6 +46,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -101,12 +101,18 @@ class EntitySearch(BaseModel):
         gt=0,
         le=100
     )
+    mode: Optional[str] = Field(
+        "exact",
+        description="Match whole words (exact), word prefixes (prefix) or similar spellings (fuzzy)",
+        pattern="^(exact|prefix|fuzzy)$"
+    )
 
 
 class EntityList(BaseModel):
     """Model for a list of entities with metadata."""
     items: List[Entity] = Field(..., description="List of entities")
-    total: int = Field(..., description="Total number of matching entities")
+    total: Optional[int] = Field(None, description="Total number of matching entities, if counted")
     page: Optional[int] = Field(1, description="Current page number")
     pages: Optional[int] = Field(1, description="Total number of pages")
-    limit: Optional[int] = Field(10, description="Items per page")
\ No newline at end of file
+    limit: Optional[int] = Field(10, description="Items per page")
+    next_cursor: Optional[str] = Field(None, description="Continuation token for the next page")
\ No newline at end of file
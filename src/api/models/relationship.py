@@ -121,7 +121,8 @@ class RelationshipWithEntities(Relationship):
 class RelationshipList(BaseModel):
     """Model for a list of relationships with metadata."""
     items: List[RelationshipWithEntities] = Field(..., description="List of relationships")
-    total: int = Field(..., description="Total number of matching relationships")
+    total: Optional[int] = Field(None, description="Total number of matching relationships, if counted")
     page: Optional[int] = Field(1, description="Current page number")
     pages: Optional[int] = Field(1, description="Total number of pages")
-    limit: Optional[int] = Field(10, description="Items per page")
\ No newline at end of file
+    limit: Optional[int] = Field(10, description="Items per page")
+    next_cursor: Optional[str] = Field(None, description="Continuation token for the next page")
\ No newline at end of file
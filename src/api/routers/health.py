@@ -10,7 +10,7 @@ from typing import Dict, Any
 
 from fastapi import APIRouter, Depends, Response
 
-from src.api.dependencies.database import get_neo4j, get_mongo_client
+from src.api.dependencies.database import get_neo4j, get_mongo_client, pool_registry
 
 
 logger = logging.getLogger(__name__)
@@ -34,7 +34,8 @@ async def health_check(
         "dependencies": {
             "neo4j": "ok",
             "mongodb": "ok",
-        }
+        },
+        "pools": pool_registry.stats()
     }
     
     # Check Neo4j connection
@@ -58,6 +59,17 @@ async def health_check(
     return health_status
 
 
+@router.get("/pools", summary="Connection pool statistics")
+async def pool_stats() -> Dict[str, Any]:
+    """
+    Get usage statistics for the shared database connection pools.
+    
+    Returns:
+        Dict[str, Any]: MongoDB connection and checkout wait statistics, and Neo4j session counts
+    """
+    return pool_registry.stats()
+
+
 @router.get("/ping", summary="Simple ping endpoint")
 async def ping() -> Dict[str, str]:
     """
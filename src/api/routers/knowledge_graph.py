@@ -64,6 +64,47 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _graph_entity_from_node(node: Dict[str, Any], labels: List[str]) -> GraphEntity:
+    """Build an entity from the properties and labels of a graph node."""
+    properties = dict(node)
+    label = next((l for l in labels or [] if l != "Entity"), "Entity")
+    
+    return GraphEntity(
+        id=properties.pop("id"),
+        name=properties.pop("name", ""),
+        label=label,
+        aliases=properties.pop("aliases", None),
+        source=properties.pop("source", None),
+        confidence=properties.pop("confidence", 1.0),
+        created_at=properties.pop("created_at", None),
+        updated_at=properties.pop("updated_at", None),
+        properties=properties
+    )
+
+
+def _graph_relationship_from_record(record: Dict[str, Any]) -> GraphRelationship:
+    """Build a relationship from a relationship listing record."""
+    properties = dict(record["relationship"])
+    
+    return GraphRelationship(
+        id=properties.pop("id"),
+        type=record["type"],
+        source_id=record["source"].get("id"),
+        target_id=record["target"].get("id"),
+        confidence=properties.pop("confidence", 1.0),
+        source=properties.pop("source", None),
+        bidirectional=properties.pop("bidirectional", False),
+        created_at=properties.pop("created_at", None),
+        updated_at=properties.pop("updated_at", None),
+        properties=properties
+    )
+
+
+def _entity_summary(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarise an endpoint node of a relationship."""
+    return {"id": node.get("id"), "name": node.get("name", ""), "label": node.get("label")}
+
+
 # Entity endpoints
 @router.post(
     "/entities/", 
@@ -178,29 +219,52 @@ async def list_entities(
     label: Optional[str] = Query(None, description="Filter by entity label"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description="Continuation token from the previous page"),
+    include_total: bool = Query(True, description="Whether to count all matching entities"),
     kg_manager: KnowledgeGraphManager = Depends(get_knowledge_graph_manager),
     current_user: User = Depends(get_current_user)
 ) -> EntityList:
     """
     List entities, optionally filtered by label.
     
+    Pages are fetched by keyset on (label, id) and chained with ``next_cursor``;
+    a non-zero offset without a cursor falls back to skipping rows.
+    
     Args:
         label: Optional entity label filter
         limit: Maximum number of results
         offset: Number of results to skip
+        cursor: Continuation token from the previous page
+        include_total: Whether to count all matching entities
         kg_manager: Knowledge graph manager
         current_user: Current authenticated user
         
     Returns:
         EntityList: List of entities with pagination metadata
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     # Get entities
-    if label:
+    next_cursor = None
+    if cursor or offset == 0:
+        try:
+            result = kg_manager.get_entities_page(label, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        entities = [
+            _graph_entity_from_node(record["entity"], record["labels"])
+            for record in result["entities"]
+        ]
+        next_cursor = result["next_cursor"]
+        total = kg_manager.count_entities(label) if include_total else None
+    elif label:
         entities = kg_manager.get_entities_by_label(label, limit, offset)
-        total = kg_manager.count_entities_by_label(label)
+        total = kg_manager.count_entities_by_label(label) if include_total else None
     else:
         entities = kg_manager.get_all_entities(limit, offset)
-        total = kg_manager.count_entities()
+        total = kg_manager.count_entities() if include_total else None
     
     # Convert entities to response format
     items = [
@@ -218,16 +282,17 @@ async def list_entities(
         for entity in entities
     ]
     
-    # Calculate pagination
-    pages = (total + limit - 1) // limit if limit > 0 else 1
-    page = (offset // limit) + 1 if limit > 0 else 1
+    # Calculate pagination; page numbers are unknown once a cursor is followed
+    pages = (total + limit - 1) // limit if total is not None else None
+    page = None if cursor else (offset // limit) + 1
     
     return EntityList(
         items=items,
         total=total,
         pages=pages,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 
@@ -378,7 +443,8 @@ async def search_entities(
         search.query,
         search.labels,
         search.min_confidence,
-        search.limit
+        search.limit,
+        search.mode
     )
     
     # Convert to response model
@@ -497,39 +563,87 @@ async def list_relationships(
     direction: str = Query("both", description="Direction of relationships: 'outgoing', 'incoming', or 'both'"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description="Continuation token from the previous page"),
+    include_total: bool = Query(True, description="Whether to count all matching relationships"),
     kg_manager: KnowledgeGraphManager = Depends(get_knowledge_graph_manager),
     current_user: User = Depends(get_current_user)
 ) -> RelationshipList:
     """
     List relationships, optionally filtered by type or entity.
     
+    Pages are fetched by keyset on (type, id) and chained with ``next_cursor``;
+    a non-zero offset without a cursor falls back to skipping rows.
+    
     Args:
         type: Optional relationship type filter
         entity_id: Optional entity ID filter
         direction: Relationship direction filter
         limit: Maximum number of results
         offset: Number of results to skip
+        cursor: Continuation token from the previous page
+        include_total: Whether to count all matching relationships
         kg_manager: Knowledge graph manager
         current_user: Current authenticated user
         
     Returns:
         RelationshipList: List of relationships with pagination metadata
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
+    if cursor or offset == 0:
+        try:
+            result = kg_manager.get_relationships_page(type, entity_id, direction, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # Endpoints come with each record, so no per-row entity lookups are needed
+        items = []
+        for record in result["relationships"]:
+            rel = _graph_relationship_from_record(record)
+            items.append(
+                RelationshipWithEntities(
+                    id=rel.id,
+                    type=rel.type,
+                    source_id=rel.source_id,
+                    target_id=rel.target_id,
+                    properties=rel.properties,
+                    confidence=rel.confidence,
+                    source=rel.source,
+                    bidirectional=rel.bidirectional,
+                    created_at=datetime.fromisoformat(rel.created_at) if rel.created_at else None,
+                    updated_at=datetime.fromisoformat(rel.updated_at) if rel.updated_at else None,
+                    source_entity=_entity_summary(record["source"]),
+                    target_entity=_entity_summary(record["target"])
+                )
+            )
+        
+        total = kg_manager.count_relationships(type, entity_id, direction) if include_total else None
+        
+        return RelationshipList(
+            items=items,
+            total=total,
+            pages=(total + limit - 1) // limit if total is not None else None,
+            page=None if cursor else 1,
+            limit=limit,
+            next_cursor=result["next_cursor"]
+        )
+    
     # Get relationships
     if type and entity_id:
         relationships = kg_manager.get_relationships_by_type_and_entity(
             entity_id, type, direction, limit, offset
         )
-        total = kg_manager.count_relationships_by_type_and_entity(entity_id, type, direction)
+        total = kg_manager.count_relationships_by_type_and_entity(entity_id, type, direction) if include_total else None
     elif type:
         relationships = kg_manager.get_relationships_by_type(type, limit, offset)
-        total = kg_manager.count_relationships_by_type(type)
+        total = kg_manager.count_relationships_by_type(type) if include_total else None
     elif entity_id:
         relationships = kg_manager.get_relationships_for_entity(entity_id, direction, limit, offset)
-        total = kg_manager.count_relationships_for_entity(entity_id, direction)
+        total = kg_manager.count_relationships_for_entity(entity_id, direction) if include_total else None
     else:
         relationships = kg_manager.get_all_relationships(limit, offset)
-        total = kg_manager.count_relationships()
+        total = kg_manager.count_relationships() if include_total else None
     
     # Convert relationships to response format
     items = []
@@ -564,8 +678,8 @@ async def list_relationships(
             )
     
     # Calculate pagination
-    pages = (total + limit - 1) // limit if limit > 0 else 1
-    page = (offset // limit) + 1 if limit > 0 else 1
+    pages = (total + limit - 1) // limit if total is not None else None
+    page = (offset // limit) + 1
     
     return RelationshipList(
         items=items,
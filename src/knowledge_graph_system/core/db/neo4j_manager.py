@@ -5,17 +5,228 @@ This module provides functionality for connecting to and managing Neo4j database
 for the Knowledge Graph System.
 """
 
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union, Tuple, Iterable, Iterator
+from contextlib import contextmanager
 import logging
 import json
 import os
-from neo4j import GraphDatabase, Session, Transaction, Result, Driver
+import re
+from neo4j import GraphDatabase, Session, Transaction, Result, Driver, WRITE_ACCESS
 from neo4j.exceptions import ServiceUnavailable, AuthError, DriverError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Query parameters, rewritten to fields of the row when statements are unwound
+_PARAMETER_PATTERN = re.compile(r"\$(\w+)")
+_RETURN_PATTERN = re.compile(r"\bRETURN\b", re.IGNORECASE)
+
+
+class BufferedResult:
+    """
+    Fully buffered query result that stays readable after its session is closed.
+    
+    Supports the subset of the neo4j ``Result`` API used in this code base.
+    """
+    
+    def __init__(self, records: List[Any], summary: Any = None):
+        """
+        Initialize the buffered result.
+        
+        Args:
+            records: Records returned by the query
+            summary: Result summary reported by the driver
+        """
+        self.records = records
+        self._summary = summary
+    
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.records)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def data(self) -> List[Dict[str, Any]]:
+        """Return the records as a list of dictionaries."""
+        return [record.data() for record in self.records]
+    
+    def single(self) -> Optional[Any]:
+        """Return the first record, or None if there are no records."""
+        return self.records[0] if self.records else None
+    
+    def consume(self) -> Any:
+        """Return the result summary."""
+        return self._summary
+    
+    summary = consume
+
+
+class Neo4jTransaction:
+    """
+    Unit of work bound to a single session and explicit transaction.
+    
+    Exposes the same query methods as Neo4jManager, so it can be handed to code
+    that normally talks to the manager directly. Instances are created by
+    ``Neo4jManager.transaction()``.
+    """
+    
+    def __init__(self, tx: Transaction):
+        """
+        Initialize the unit of work.
+        
+        Args:
+            tx: Open neo4j transaction
+        """
+        self.tx = tx
+        self.query_count = 0
+    
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Run a query in the transaction.
+        
+        Args:
+            query: Cypher query string
+            parameters: Parameters for the query
+            
+        Returns:
+            List of dictionaries containing query results
+        """
+        self.query_count += 1
+        try:
+            return Neo4jManager._execute_query(self.tx, query, parameters)
+        except Exception as e:
+            logger.error(f"Query failed: {e}\nQuery: {query}\nParameters: {parameters}")
+            raise
+    
+    def run_many(self, statements: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run several parameterised statements in the transaction.
+        
+        Args:
+            statements: Iterable of (query, parameters) tuples
+            
+        Returns:
+            List of result lists, one per statement
+        """
+        return [self.run(query, parameters) for query, parameters in statements]
+    
+    def execute_read_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a read query in the transaction."""
+        return self.run(query, parameters)
+    
+    def execute_write_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a write query in the transaction."""
+        return self.run(query, parameters)
+    
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a query in the transaction."""
+        return self.run(query, parameters)
+
+
+class StatementBatch:
+    """
+    Queue of parameterised statements executed together in one transaction.
+    
+    Statements are buffered by ``add`` and executed in order on a single session
+    and transaction when the batch is flushed. Consecutive statements with the
+    same query are sent as one ``UNWIND $rows`` statement, so a flush costs one
+    round trip per run of same-shaped statements rather than one per statement.
+    Each flush commits its own transaction. Instances are created by
+    ``Neo4jManager.batch()``.
+    """
+    
+    def __init__(self, manager: 'Neo4jManager', max_statements: Optional[int] = None):
+        """
+        Initialize the batch.
+        
+        Args:
+            manager: Neo4j manager used to open the transaction
+            max_statements: Flush automatically once this many statements are queued
+        """
+        self.manager = manager
+        self.max_statements = max_statements
+        self.pending: List[Tuple[str, Dict[str, Any]]] = []
+        self.results: List[List[Dict[str, Any]]] = []
+    
+    def add(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Queue a statement.
+        
+        Args:
+            query: Cypher query string
+            parameters: Parameters for the query
+            
+        Returns:
+            Index of the statement's entry in ``results`` once flushed
+        """
+        index = len(self.results) + len(self.pending)
+        self.pending.append((query, parameters or {}))
+        
+        if self.max_statements and len(self.pending) >= self.max_statements:
+            self.flush()
+        
+        return index
+    
+    def flush(self) -> List[List[Dict[str, Any]]]:
+        """
+        Execute all queued statements in a single transaction.
+        
+        Returns:
+            Results of the statements executed by this flush
+        """
+        if not self.pending:
+            return []
+        
+        statements, self.pending = self.pending, []
+        
+        # Runs of consecutive statements with the same query, in queue order
+        groups: List[Tuple[str, List[Dict[str, Any]]]] = []
+        for query, parameters in statements:
+            if groups and groups[-1][0] == query:
+                groups[-1][1].append(parameters)
+            else:
+                groups.append((query, [parameters]))
+        
+        flushed: List[List[Dict[str, Any]]] = []
+        with self.manager.transaction() as tx:
+            for query, parameter_list in groups:
+                if len(parameter_list) == 1:
+                    flushed.append(tx.run(query, parameter_list[0]))
+                else:
+                    flushed.extend(self._run_unwound(tx, query, parameter_list))
+        
+        self.results.extend(flushed)
+        return flushed
+    
+    @staticmethod
+    def _run_unwound(tx: 'Neo4jTransaction', query: str,
+                     parameter_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run a query once per parameter set with a single UNWIND statement.
+        
+        The query runs as a subquery per row, with its parameters read from the
+        row, so each statement keeps its own semantics. Records are tagged with
+        the index of their row and split back into one result per statement.
+        """
+        body = _PARAMETER_PATTERN.sub(r"_row.\1", query)
+        rows = [dict(parameters, _statement=index) for index, parameters in enumerate(parameter_list)]
+        
+        unwound_query = f"UNWIND $rows AS _row\nCALL {{\n    WITH _row\n{body}\n}}"
+        if _RETURN_PATTERN.search(body):
+            unwound_query += "\nRETURN *"
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in parameter_list]
+        for record in tx.run(unwound_query, {"rows": rows}):
+            row = record.pop("_row", None) or {}
+            if row.get("_statement") is not None:
+                results[row["_statement"]].append(record)
+        return results
+    
+    def discard(self):
+        """Drop all queued statements without executing them."""
+        self.pending = []
+
 
 class Neo4jManager:
     """
@@ -75,10 +286,13 @@ class Neo4jManager:
             self.driver.close()
             logger.info("Neo4j connection closed")
     
-    def get_session(self) -> Session:
+    def get_session(self, access_mode: Optional[str] = None) -> Session:
         """
         Get a new session for interacting with Neo4j.
         
+        Args:
+            access_mode: Default access mode of the session (READ_ACCESS or WRITE_ACCESS)
+        
         Returns:
             Neo4j session
             
@@ -89,8 +303,66 @@ class Neo4jManager:
             logger.error("Neo4j driver not initialized")
             raise DriverError("Neo4j driver not initialized")
         
+        if access_mode:
+            return self.driver.session(database=self.database, default_access_mode=access_mode)
+        
         return self.driver.session(database=self.database)
     
+    @contextmanager
+    def transaction(self, access_mode: str = WRITE_ACCESS) -> Iterator[Neo4jTransaction]:
+        """
+        Open one session and one explicit transaction for several queries.
+        
+        The transaction is committed when the block exits normally and rolled
+        back if it raises.
+        
+        Example:
+            with manager.transaction() as tx:
+                tx.run("MATCH (e {id: $id}) SET e.name = $name", {"id": "a", "name": "A"})
+                tx.run("MATCH (e {id: $id}) DETACH DELETE e", {"id": "b"})
+        
+        Args:
+            access_mode: Access mode of the underlying session
+            
+        Yields:
+            Unit of work bound to the open transaction
+        """
+        with self.get_session(access_mode) as session:
+            tx = session.begin_transaction()
+            try:
+                yield Neo4jTransaction(tx)
+            except BaseException:
+                tx.rollback()
+                raise
+            else:
+                tx.commit()
+    
+    @contextmanager
+    def batch(self, max_statements: Optional[int] = None) -> Iterator[StatementBatch]:
+        """
+        Queue parameterised statements and execute them in one transaction.
+        
+        Queued statements are flushed when the block exits normally and
+        discarded if it raises. With ``max_statements`` set, every automatic
+        flush commits its statements in a separate transaction, so an exception
+        only discards the statements queued since the last flush.
+        
+        Args:
+            max_statements: Flush (and commit) automatically once this many
+                statements are queued
+            
+        Yields:
+            Statement batch; results are available in ``batch.results`` after exit
+        """
+        statement_batch = StatementBatch(self, max_statements)
+        try:
+            yield statement_batch
+        except BaseException:
+            statement_batch.discard()
+            raise
+        else:
+            statement_batch.flush()
+    
     def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Result:
         """
         Run a Cypher query against Neo4j.
@@ -100,7 +372,7 @@ class Neo4jManager:
             parameters: Parameters for the query
             
         Returns:
-            Neo4j result object
+            Buffered result, readable after the session has been closed
             
         Raises:
             Exception: If the query fails
@@ -111,7 +383,9 @@ class Neo4jManager:
         with self.get_session() as session:
             try:
                 result = session.run(query, parameters)
-                return result
+                # Buffer the records before the session closes and discards them
+                records = list(result)
+                return BufferedResult(records, result.consume())
             except Exception as e:
                 logger.error(f"Query failed: {e}\nQuery: {query}\nParameters: {parameters}")
                 raise
@@ -146,6 +420,19 @@ class Neo4jManager:
             result = session.write_transaction(self._execute_query, query, parameters)
             return result
     
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a query that may read and write, and return the results as a list of dictionaries.
+        
+        Args:
+            query: Cypher query string
+            parameters: Parameters for the query
+            
+        Returns:
+            List of dictionaries containing query results
+        """
+        return self.execute_write_query(query, parameters)
+    
     @staticmethod
     def _execute_query(tx: Transaction, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -222,7 +509,107 @@ class Neo4jManager:
                 logger.info(f"Created index {name} for {label} on {properties}")
             except Exception as e:
                 logger.error(f"Failed to create index {name}: {e}")
+
+    def create_relationship_indexes(self, indexes: List[Dict[str, Any]]):
+        """
+        Create relationship property indexes in the Neo4j database.
+
+        Args:
+            indexes: List of index definitions, each with 'name', 'type' (the
+                relationship type), and 'properties' (list)
+        """
+        for index in indexes:
+            name = index.get('name')
+            relationship_type = index.get('type')
+            properties = index.get('properties', [])
+
+            if not all([name, relationship_type, properties]):
+                logger.warning(f"Incomplete index definition: {index}")
+                continue
+
+            # Names and types are quoted, as relationship types are user-defined
+            quoted_name = "`" + name.replace("`", "``") + "`"
+            quoted_type = "`" + relationship_type.replace("`", "``") + "`"
+            properties_str = ', '.join([f"r.{prop}" for prop in properties])
+            query = (
+                f"CREATE INDEX {quoted_name} IF NOT EXISTS "
+                f"FOR ()-[r:{quoted_type}]-() ON ({properties_str})"
+            )
+
+            try:
+                self.run_query(query)
+                logger.info(f"Created index {name} for {relationship_type} on {properties}")
+            except Exception as e:
+                logger.error(f"Failed to create index {name}: {e}")
+
+    def add_label(self, label: str, excluded_labels: Optional[List[str]] = None,
+                  batch_size: int = 10000) -> int:
+        """
+        Add a label to the nodes with an ``id`` property that lack it.
+        
+        Nodes are labelled in batches of ``batch_size`` until none is left, so
+        running this again is a no-op.
+        
+        Args:
+            label: Label to add
+            excluded_labels: Labels of nodes that must not get the label
+            batch_size: Number of nodes labelled per transaction
+            
+        Returns:
+            Number of nodes labelled
+        """
+        quoted = "`" + label.replace("`", "``") + "`"
+        exclusions = "".join(
+            f" AND NOT n:`{excluded.replace('`', '``')}`" for excluded in excluded_labels or []
+        )
+        query = f"""
+        MATCH (n)
+        WHERE n.id IS NOT NULL AND NOT n:{quoted}{exclusions}
+        WITH n LIMIT $batch_size
+        SET n:{quoted}
+        RETURN count(n) AS count
+        """
+        
+        labelled = 0
+        while True:
+            result = self.execute_write_query(query, {"batch_size": batch_size})
+            count = result[0]["count"] if result else 0
+            labelled += count
+            if count < batch_size:
+                break
+        
+        if labelled:
+            logger.info(f"Added label {label} to {labelled} nodes")
+        return labelled
     
+    def create_fulltext_index(self, name: str, labels: List[str], properties: List[str]) -> bool:
+        """
+        Create a full-text index in the Neo4j database.
+
+        Args:
+            name: Name of the index
+            labels: Node labels covered by the index
+            properties: Node properties covered by the index
+
+        Returns:
+            True if the index exists after the call, False if the database does not
+            support full-text indexes
+        """
+        labels_str = '|'.join(labels)
+        properties_str = ', '.join([f"n.{prop}" for prop in properties])
+        query = (
+            f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS "
+            f"FOR (n:{labels_str}) ON EACH [{properties_str}]"
+        )
+
+        try:
+            self.run_query(query)
+            logger.info(f"Created full-text index {name} for {labels} on {properties}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to create full-text index {name}: {e}")
+            return False
+
     def get_database_info(self) -> Dict[str, Any]:
         """
         Get information about the Neo4j database.
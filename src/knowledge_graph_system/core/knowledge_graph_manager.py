@@ -5,19 +5,37 @@ This module provides functionality for managing the knowledge graph,
 including operations for adding, querying, and updating entities and relationships.
 """
 
-from typing import Dict, List, Optional, Any, Union, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Any, Union, Set, Tuple
 import logging
 from datetime import datetime
-import uuid
+import threading
+import time
 import json
+import weakref
 
 from src.knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
 from src.knowledge_graph_system.core.models.base_models import GraphEntity, GraphRelationship
+from src.knowledge_graph_system.core.utils.ndjson_stream import (
+    ChunkWriter, clear_checkpoint, iter_records, load_checkpoint, resolve_compression, save_checkpoint
+)
+from src.knowledge_graph_system.core.utils.pagination import decode_cursor, encode_cursor
+from src.knowledge_graph_system.core.utils.search_index import EntitySearchIndex, SEARCH_MODES, tokenize
+from src.knowledge_graph_system.core.utils.similarity_index import (
+    IGNORED_PROPERTIES, PROPERTY_WEIGHT, EntitySimilarityIndex
+)
+from src.knowledge_graph_system.embeddings.embedding_index import EmbeddingIndex
+from src.knowledge_graph_system.utils.query_cache import QueryResultCache, make_cache_key, tags_for_query
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# State shared by the managers of one database manager. The API builds a
+# manager per request around the application's single database manager, so
+# caches kept here outlive the request.
+_SHARED_STATE: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_SHARED_STATE_LOCK = threading.Lock()
+
 
 class KnowledgeGraphManager:
     """
@@ -27,16 +45,51 @@ class KnowledgeGraphManager:
     relationships in the knowledge graph.
     """
     
-    def __init__(self, db_manager: Neo4jManager):
+    # Default number of rows sent per UNWIND statement in bulk operations
+    DEFAULT_BATCH_SIZE = 500
+    
+    # Full-text index over entity names and aliases used by search_entities
+    FULLTEXT_INDEX_NAME = "entity_fulltext_index"
+    
+    # Seconds for which listing totals are reused before the count store is read again
+    COUNT_CACHE_TTL = 60
+    
+    # Seconds for which a loaded similarity index is used before it is reloaded,
+    # which bounds how long writes made by other processes are missing from it
+    SIMILARITY_INDEX_TTL = 300
+    
+    def __init__(self, db_manager: Neo4jManager, batch_size: int = DEFAULT_BATCH_SIZE,
+                 query_cache: Optional[QueryResultCache] = None,
+                 embedding_index: Optional[EmbeddingIndex] = None):
         """
         Initialize the knowledge graph manager.
         
         Args:
             db_manager: Neo4j database manager
+            batch_size: Number of rows written per transaction by the batch operations
+            query_cache: Optional cache for read results; writes made through this
+                manager evict the cached results that depend on the written labels
+                and relationship types
+            embedding_index: Optional index of entity embeddings; entities written
+                through this manager with an ``embedding`` property are kept in it,
+                and find_similar_entities uses it for entities it contains
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
         self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.query_cache = query_cache
+        self.embedding_index = embedding_index
         self.initialized = False
         
+        # Listing totals are approximate: they are read from the count store and
+        # reused, by every manager of the database, until they expire rather than
+        # invalidated by writes
+        self._count_cache = self._shared_state(
+            "count_cache", lambda: QueryResultCache(max_entries=1024, default_ttl=self.COUNT_CACHE_TTL)
+        )
+        
         # Initialize the knowledge graph schema
         self._initialize_schema()
     
@@ -56,6 +109,17 @@ class KnowledgeGraphManager:
                 {"name": "entity_source_index", "label": "Entity", "properties": ["source"]},
             ])
             
+            # Label the entities written before entity queries matched :Entity;
+            # the temporal change log and checkpoints are not entities
+            self.db_manager.add_label("Entity", excluded_labels=["TemporalChange", "TemporalCheckpoint"])
+            
+            # Create the full-text index used by search_entities; once a manager
+            # of the database has fallen back to the in-process index, all do
+            fulltext_enabled = self.db_manager.create_fulltext_index(
+                self.FULLTEXT_INDEX_NAME, ["Entity"], ["name", "aliases"]
+            )
+            self._shared_state("search_index", dict).setdefault("fulltext_enabled", fulltext_enabled)
+            
             # Mark as initialized
             self.initialized = True
             logger.info("Knowledge graph schema initialized")
@@ -80,6 +144,14 @@ class KnowledgeGraphManager:
             # Execute the query
             result = self.db_manager.execute_write_query(query, params)
             
+            self._invalidate_cache(labels=entity.labels | {"Entity"})
+            
+            if self._search_index is not None:
+                self._search_index.add(entity.to_cypher_params(), entity.labels | {"Entity"})
+            self._index_embedding(entity.id, entity.properties)
+            if self._similarity_index is not None:
+                self._similarity_index.add_entity(entity.id, entity.to_cypher_params(), entity.labels | {"Entity"})
+            
             logger.info(f"Added entity {entity.id} with label {entity.label}")
             
             return {
@@ -106,32 +178,27 @@ class KnowledgeGraphManager:
             Dictionary containing the result of the operation
         """
         try:
-            # Get Cypher query and parameters
-            query, params = relationship.get_cypher_create()
+            if relationship.bidirectional:
+                # Write both directions with one statement, as the bulk path does
+                row = self._relationship_row(relationship)
+                result = self.db_manager.execute_write_query(
+                    self._build_relationship_merge_query(relationship.type, bidirectional=True),
+                    {"rows": [row]}
+                )
+            else:
+                query, params = relationship.get_cypher_create()
+                result = self.db_manager.execute_write_query(query, params)
             
-            # Execute the query
-            result = self.db_manager.execute_write_query(query, params)
+            if self._similarity_index is not None:
+                self._similarity_index.add_edge(relationship.id, relationship.source_id, relationship.target_id)
+                if relationship.bidirectional:
+                    self._similarity_index.add_edge(row["reverse_id"], relationship.target_id,
+                                                    relationship.source_id)
+            
+            self._invalidate_cache(relationship_types=[relationship.type, f"REVERSE_{relationship.type}"]
+                                   if relationship.bidirectional else [relationship.type])
             
-            # If relationship is bidirectional, create the reverse relationship
             if relationship.bidirectional:
-                # Swap source and target
-                reverse_relationship = GraphRelationship(
-                    id=str(uuid.uuid4()),
-                    type=f"REVERSE_{relationship.type}",
-                    source_id=relationship.target_id,
-                    target_id=relationship.source_id,
-                    properties=dict(relationship.properties),
-                    confidence=relationship.confidence,
-                    source=relationship.source,
-                    bidirectional=False  # Prevent infinite loop
-                )
-                
-                # Get Cypher query and parameters for reverse relationship
-                reverse_query, reverse_params = reverse_relationship.get_cypher_create()
-                
-                # Execute the query
-                reverse_result = self.db_manager.execute_write_query(reverse_query, reverse_params)
-                
                 logger.info(f"Added bidirectional relationship {relationship.id} with type {relationship.type}")
             else:
                 logger.info(f"Added relationship {relationship.id} with type {relationship.type}")
@@ -166,7 +233,7 @@ class KnowledgeGraphManager:
         """
         
         try:
-            result = self.db_manager.execute_read_query(query, {"id": entity_id})
+            result = self._execute_read(query, {"id": entity_id})
             
             if not result:
                 logger.warning(f"Entity {entity_id} not found")
@@ -196,7 +263,7 @@ class KnowledgeGraphManager:
         """
         
         try:
-            result = self.db_manager.execute_read_query(query, {"label": label, "limit": limit})
+            result = self._execute_read(query, {"label": label, "limit": limit})
             
             return [record.get('e') for record in result]
         except Exception as e:
@@ -224,7 +291,7 @@ class KnowledgeGraphManager:
         """
         
         try:
-            result = self.db_manager.execute_read_query(query, {
+            result = self._execute_read(query, {
                 "property": property_name, 
                 "value": property_value,
                 "limit": limit
@@ -255,7 +322,7 @@ class KnowledgeGraphManager:
         """
         
         try:
-            result = self.db_manager.execute_read_query(query, {
+            result = self._execute_read(query, {
                 "type": relationship_type,
                 "limit": limit
             })
@@ -309,7 +376,7 @@ class KnowledgeGraphManager:
             """
         
         try:
-            result = self.db_manager.execute_read_query(query, {
+            result = self._execute_read(query, {
                 "id": entity_id,
                 "limit": limit
             })
@@ -326,6 +393,274 @@ class KnowledgeGraphManager:
             logger.error(f"Failed to get relationships for entity {entity_id}: {e}")
             return []
     
+    def get_entities_page(self, label: Optional[str] = None, limit: int = 100,
+                          cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a page of entities using keyset pagination on (label, id).
+        
+        Each page resumes after the ID in the cursor through the ``id`` index, so
+        deep pages cost the same as the first one.
+        
+        Args:
+            label: Optional label of the entities
+            limit: Maximum number of entities to return
+            cursor: Continuation token from the previous page
+            
+        Returns:
+            Dictionary with the page's ``entities`` (each with its ``labels``) and the
+            ``next_cursor`` token, which is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is invalid or was issued for another label
+        """
+        after_id = None
+        if cursor:
+            key = decode_cursor(cursor, "entities")
+            if key.get("label") != label:
+                raise ValueError("Cursor was issued for a different label")
+            after_id = key.get("id")
+        
+        label_clause = f":{self._quote_identifier(label)}" if label else ""
+        query = f"""
+        MATCH (e:Entity{label_clause})
+        WHERE $after_id IS NULL OR e.id > $after_id
+        RETURN e, labels(e) AS labels
+        ORDER BY e.id
+        LIMIT $limit
+        """
+        
+        try:
+            # Fetch one extra row to learn whether another page follows
+            result = self.db_manager.execute_read_query(query, {"after_id": after_id, "limit": limit + 1})
+        except Exception as e:
+            logger.error(f"Failed to get page of entities with label {label}: {e}")
+            return {"entities": [], "next_cursor": None}
+        
+        records = result[:limit]
+        next_cursor = None
+        if len(result) > limit:
+            next_cursor = encode_cursor("entities", {"label": label, "id": records[-1]['e'].get('id')})
+        
+        return {
+            "entities": [
+                {"entity": record.get('e'), "labels": record.get('labels')}
+                for record in records
+            ],
+            "next_cursor": next_cursor
+        }
+    
+    def get_relationships_page(self, relationship_type: Optional[str] = None,
+                               entity_id: Optional[str] = None, direction: str = "both",
+                               limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a page of relationships using keyset pagination on (type, id).
+        
+        Without an entity, relationships are read one type at a time through the
+        type's index on ``id`` (see _read_relationships_by_type). Relationships
+        without an ``id`` are only listed for an entity.
+        
+        Args:
+            relationship_type: Optional type of the relationships
+            entity_id: Optional ID of an entity the relationships must touch
+            direction: Direction of relationships relative to the entity
+                ('outgoing', 'incoming', or 'both')
+            limit: Maximum number of relationships to return
+            cursor: Continuation token from the previous page
+            
+        Returns:
+            Dictionary with the page's ``relationships`` (each with its ``type``,
+            ``source`` and ``target``) and the ``next_cursor`` token, which is None
+            on the last page
+            
+        Raises:
+            ValueError: If the cursor is invalid or was issued for other filters
+        """
+        filters = [relationship_type, entity_id, direction if entity_id else None]
+        after_type = after_id = None
+        if cursor:
+            key = decode_cursor(cursor, "relationships")
+            if key.get("filters") != filters:
+                raise ValueError("Cursor was issued for different filters")
+            after_type, after_id = key.get("type"), key.get("id")
+        
+        try:
+            # Fetch one extra row to learn whether another page follows
+            if entity_id:
+                result = self._read_entity_relationships(
+                    entity_id, direction, relationship_type, after_type, after_id, limit + 1
+                )
+            else:
+                result = self._read_relationships_by_type(relationship_type, after_type, after_id, limit + 1)
+        except Exception as e:
+            logger.error(f"Failed to get page of relationships: {e}")
+            return {"relationships": [], "next_cursor": None}
+        
+        records = result[:limit]
+        next_cursor = None
+        if len(result) > limit:
+            last = records[-1]
+            next_cursor = encode_cursor("relationships", {
+                "filters": filters,
+                "type": last.get('type'),
+                "id": last['r'].get('id')
+            })
+        
+        return {
+            "relationships": [
+                {
+                    "relationship": record.get('r'),
+                    "type": record.get('type'),
+                    "source": record.get('source'),
+                    "target": record.get('target')
+                }
+                for record in records
+            ],
+            "next_cursor": next_cursor
+        }
+    
+    def _read_entity_relationships(self, entity_id: str, direction: str, relationship_type: Optional[str],
+                                   after_type: Optional[str], after_id: Optional[str],
+                                   limit: int) -> List[Dict[str, Any]]:
+        """Read the relationships of an entity in (type, id) order, from its adjacency."""
+        type_clause = f":{self._quote_identifier(relationship_type)}" if relationship_type else ""
+        if direction == "outgoing":
+            pattern = f"(:Entity {{id: $entity_id}})-[r{type_clause}]->()"
+        elif direction == "incoming":
+            pattern = f"(:Entity {{id: $entity_id}})<-[r{type_clause}]-()"
+        else:  # both
+            pattern = f"(:Entity {{id: $entity_id}})-[r{type_clause}]-()"
+        
+        query = f"""
+        MATCH {pattern}
+        WHERE $after_type IS NULL OR type(r) > $after_type
+              OR (type(r) = $after_type AND r.id > $after_id)
+        RETURN r, type(r) AS type, startNode(r) AS source, endNode(r) AS target
+        ORDER BY type, r.id
+        LIMIT $limit
+        """
+        
+        return self.db_manager.execute_read_query(query, {
+            "entity_id": entity_id,
+            "after_type": after_type,
+            "after_id": after_id,
+            "limit": limit
+        })
+    
+    def _read_relationships_by_type(self, relationship_type: Optional[str], after_type: Optional[str],
+                                    after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        Read relationships in (type, id) order, one relationship type at a time.
+        
+        Each type is read with an index seek on its ``id`` index, created the first
+        time the type is listed, so a page costs one seek per type it spans rather
+        than a scan and sort of every relationship.
+        
+        Args:
+            relationship_type: Optional type of the relationships
+            after_type: Type of the last relationship of the previous page
+            after_id: ID of the last relationship of the previous page
+            limit: Maximum number of relationships to return
+            
+        Returns:
+            Records with the relationship, its type, source and target
+        """
+        if relationship_type:
+            types = [relationship_type]
+        else:
+            types = sorted(
+                record['type'] for record in self.db_manager.execute_read_query(
+                    "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType AS type", {}
+                )
+            )
+        
+        records = []
+        for current_type in types:
+            if after_type is not None and current_type < after_type:
+                continue
+            resume_id = after_id if current_type == after_type else None
+            self._ensure_relationship_id_index(current_type)
+            
+            query = f"""
+            MATCH ()-[r:{self._quote_identifier(current_type)}]->()
+            WHERE {"r.id > $after_id" if resume_id is not None else "r.id IS NOT NULL"}
+            RETURN r, type(r) AS type, startNode(r) AS source, endNode(r) AS target
+            ORDER BY r.id
+            LIMIT $limit
+            """
+            
+            records.extend(self.db_manager.execute_read_query(
+                query, {"after_id": resume_id, "limit": limit - len(records)}
+            ))
+            if len(records) >= limit:
+                break
+        
+        return records
+    
+    def _ensure_relationship_id_index(self, relationship_type: str):
+        """Create the ``id`` index of a relationship type once per process."""
+        indexed = self._shared_state("relationship_id_indexes", set)
+        if relationship_type in indexed:
+            return
+        
+        self.db_manager.create_relationship_indexes([
+            {"name": f"relationship_id_{relationship_type}", "type": relationship_type, "properties": ["id"]}
+        ])
+        indexed.add(relationship_type)
+    
+    def count_entities(self, label: Optional[str] = None) -> int:
+        """
+        Count entities, optionally with a label.
+        
+        The count is answered from the database's count store and cached for
+        ``COUNT_CACHE_TTL`` seconds, so it may lag recent writes.
+        
+        Args:
+            label: Optional label of the entities
+            
+        Returns:
+            Approximate number of entities
+        """
+        query = f"""
+        MATCH (e:{self._quote_identifier(label or "Entity")})
+        RETURN count(e) AS count
+        """
+        
+        return self._cached_count(query, {})
+    
+    def count_relationships(self, relationship_type: Optional[str] = None,
+                            entity_id: Optional[str] = None, direction: str = "both") -> int:
+        """
+        Count relationships, optionally with a type or touching an entity.
+        
+        Counts by type come from the count store and counts for an entity from its
+        degree; both are cached for ``COUNT_CACHE_TTL`` seconds.
+        
+        Args:
+            relationship_type: Optional type of the relationships
+            entity_id: Optional ID of an entity the relationships must touch
+            direction: Direction of relationships relative to the entity
+                ('outgoing', 'incoming', or 'both')
+            
+        Returns:
+            Approximate number of relationships
+        """
+        type_clause = f":{self._quote_identifier(relationship_type)}" if relationship_type else ""
+        
+        if entity_id:
+            arrows = {"outgoing": ("-", "->"), "incoming": ("<-", "-")}.get(direction, ("-", "-"))
+            query = f"""
+            MATCH (e:Entity {{id: $entity_id}})
+            RETURN size([(e){arrows[0]}[r{type_clause}]{arrows[1]}() | r]) AS count
+            """
+            return self._cached_count(query, {"entity_id": entity_id})
+        
+        query = f"""
+        MATCH ()-[r{type_clause}]->()
+        RETURN count(r) AS count
+        """
+        
+        return self._cached_count(query, {})
+    
     def update_entity(self, entity_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update an entity's properties.
@@ -341,7 +676,7 @@ class KnowledgeGraphManager:
         MATCH (e)
         WHERE e.id = $id
         SET e += $properties, e.updated_at = $updated_at
-        RETURN e
+        RETURN e, labels(e) AS labels
         """
         
         try:
@@ -359,6 +694,14 @@ class KnowledgeGraphManager:
                     "error": "Entity not found"
                 }
             
+            self._invalidate_cache(labels=result[0].get('labels') or [])
+            
+            if self._search_index is not None:
+                self._search_index.update(entity_id, properties)
+            self._index_embedding(entity_id, properties)
+            if self._similarity_index is not None:
+                self._similarity_index.add_entity(entity_id, result[0].get('e') or {}, result[0].get('labels') or [])
+            
             logger.info(f"Updated entity {entity_id}")
             
             return {
@@ -390,7 +733,7 @@ class KnowledgeGraphManager:
         MATCH ()-[r]->()
         WHERE r.id = $id
         SET r += $properties, r.updated_at = $updated_at
-        RETURN r
+        RETURN r, type(r) AS type
         """
         
         try:
@@ -408,6 +751,8 @@ class KnowledgeGraphManager:
                     "error": "Relationship not found"
                 }
             
+            self._invalidate_cache(relationship_types=[result[0].get('type')])
+            
             logger.info(f"Updated relationship {relationship_id}")
             
             return {
@@ -436,12 +781,26 @@ class KnowledgeGraphManager:
         query = """
         MATCH (e)
         WHERE e.id = $id
+        OPTIONAL MATCH (e)-[r]-()
+        WITH e, labels(e) AS labels, collect(DISTINCT type(r)) AS types
         DETACH DELETE e
+        RETURN labels, types
         """
         
         try:
             result = self.db_manager.execute_write_query(query, {"id": entity_id})
             
+            for record in result or []:
+                self._invalidate_cache(labels=record.get('labels') or [],
+                                       relationship_types=record.get('types') or [])
+            
+            if self._search_index is not None:
+                self._search_index.remove(entity_id)
+            if self.embedding_index is not None:
+                self.embedding_index.remove(entity_id)
+            if self._similarity_index is not None:
+                self._similarity_index.remove_entity(entity_id)
+            
             logger.info(f"Deleted entity {entity_id}")
             
             return {
@@ -470,12 +829,19 @@ class KnowledgeGraphManager:
         query = """
         MATCH ()-[r]->()
         WHERE r.id = $id
+        WITH r, type(r) AS type
         DELETE r
+        RETURN type
         """
         
         try:
             result = self.db_manager.execute_write_query(query, {"id": relationship_id})
             
+            self._invalidate_cache(relationship_types=[record.get('type') for record in result or []])
+            
+            if self._similarity_index is not None:
+                self._similarity_index.remove_edge(relationship_id)
+            
             logger.info(f"Deleted relationship {relationship_id}")
             
             return {
@@ -491,39 +857,198 @@ class KnowledgeGraphManager:
                 "error": str(e)
             }
     
-    def search_entities(self, search_text: str, limit: int = 100) -> List[Dict[str, Any]]:
+    def search_entities(self, search_text: str,
+                        labels: Optional[List[str]] = None,
+                        min_confidence: float = 0.0,
+                        limit: int = 100,
+                        mode: str = "exact") -> List[Dict[str, Any]]:
         """
-        Search for entities matching the given text.
+        Search for entities whose name or aliases match the given text.
+        
+        The search runs against the ``entity_fulltext_index`` full-text index. Every
+        word of the search text must match, and results are ordered by relevance.
+        If the database does not support full-text indexes, an in-process inverted
+        index is built from the stored entities on first use and kept up to date
+        by this manager's writes.
         
         Args:
             search_text: Text to search for
+            labels: Only return entities with at least one of these labels
+            min_confidence: Minimum entity confidence
             limit: Maximum number of entities to return
+            mode: ``exact`` to match whole words, ``prefix`` to match word prefixes,
+                or ``fuzzy`` to tolerate small spelling differences
             
         Returns:
-            List of dictionaries containing entity data
+            List of dictionaries containing entity data and a relevance ``score``
         """
-        # Prepare search pattern with wildcards
-        search_pattern = f"(?i).*{search_text}.*"
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
         
+        if not tokenize(search_text):
+            return []
+        
+        if self.fulltext_enabled:
+            try:
+                return self._search_entities_fulltext(search_text, labels, min_confidence, limit, mode)
+            except Exception as e:
+                logger.warning(f"Full-text search unavailable, using in-process index: {e}")
+                self.fulltext_enabled = False
+        
+        try:
+            return [
+                dict(entity, score=score)
+                for entity, score in self._get_search_index().search(
+                    search_text, mode, labels, min_confidence, limit
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Failed to search entities with text {search_text}: {e}")
+            return []
+    
+    def _search_entities_fulltext(self, search_text: str,
+                                  labels: Optional[List[str]],
+                                  min_confidence: float,
+                                  limit: int,
+                                  mode: str) -> List[Dict[str, Any]]:
+        """Search entities with the database full-text index."""
         query = """
-        MATCH (e)
-        WHERE e.name =~ $pattern OR
-              e.id =~ $pattern OR
-              ANY(alias IN e.aliases WHERE alias =~ $pattern)
-        RETURN e
+        CALL db.index.fulltext.queryNodes($index_name, $search_query) YIELD node, score
+        WHERE ($labels IS NULL OR ANY(label IN labels(node) WHERE label IN $labels))
+          AND coalesce(node.confidence, 1.0) >= $min_confidence
+        RETURN node AS e, score
+        ORDER BY score DESC
         LIMIT $limit
         """
         
+        result = self.db_manager.execute_read_query(query, {
+            "index_name": self.FULLTEXT_INDEX_NAME,
+            "search_query": self._build_fulltext_query(search_text, mode),
+            "labels": labels or None,
+            "min_confidence": min_confidence,
+            "limit": limit
+        })
+        
+        return [dict(record.get('e'), score=record.get('score')) for record in result]
+    
+    @staticmethod
+    def _build_fulltext_query(search_text: str, mode: str) -> str:
+        """Build a Lucene query requiring every word of the search text."""
+        suffix = {"exact": "", "prefix": "*", "fuzzy": "~"}[mode]
+        
+        # Tokens contain only word characters, so no Lucene escaping is needed
+        return " AND ".join(f"{token}{suffix}" for token in tokenize(search_text))
+    
+    @property
+    def fulltext_enabled(self) -> bool:
+        """
+        Whether search_entities uses the database full-text index.
+        
+        Full-text search falls back to an in-process index when the database
+        cannot provide one; the flag is shared by the managers of the database
+        manager, like the index itself.
+        """
+        return self._shared_state("search_index", dict).get("fulltext_enabled", False)
+    
+    @fulltext_enabled.setter
+    def fulltext_enabled(self, enabled: bool):
+        self._shared_state("search_index", dict)["fulltext_enabled"] = enabled
+    
+    @property
+    def _search_index(self) -> Optional[EntitySearchIndex]:
+        """
+        In-process search index behind search_entities, if one is built.
+        
+        The index is built on first use and shared by the managers of the
+        database manager, which keep it up to date with their writes.
+        """
+        return self._shared_state("search_index", dict).get("index")
+    
+    @_search_index.setter
+    def _search_index(self, search_index: Optional[EntitySearchIndex]):
+        self._shared_state("search_index", dict)["index"] = search_index
+    
+    def _get_search_index(self) -> EntitySearchIndex:
+        """Return the in-process search index, loading it from the database if needed."""
+        if self._search_index is None:
+            query = """
+            MATCH (e:Entity)
+            RETURN e, labels(e) AS labels
+            """
+            
+            search_index = EntitySearchIndex()
+            for record in self.db_manager.execute_read_query(query):
+                search_index.add(record.get('e'), record.get('labels'))
+            
+            self._search_index = search_index
+            logger.info(f"Built in-process search index with {len(search_index)} entities")
+        
+        return self._search_index
+    
+    @property
+    def _similarity_index(self) -> Optional[EntitySimilarityIndex]:
+        """
+        Structural similarity index behind find_similar_entities, if one is loaded.
+        
+        The index is shared by the managers of the database manager and kept up to
+        date by their writes, so it is loaded once per process rather than per manager.
+        """
+        return self._shared_state("similarity_index", dict).get("index")
+    
+    @_similarity_index.setter
+    def _similarity_index(self, similarity_index: Optional[EntitySimilarityIndex]):
+        state = self._shared_state("similarity_index", dict)
+        state["index"] = similarity_index
+        state["loaded_at"] = time.monotonic()
+    
+    def _get_similarity_index(self) -> Optional[EntitySimilarityIndex]:
+        """
+        Return the similarity index if it is warm, otherwise start reloading it.
+        
+        An index older than ``SIMILARITY_INDEX_TTL`` seconds is not warm, as it
+        misses the writes of other processes. It is reloaded in a background
+        thread, one at a time, and None is returned until the reload finishes.
+        
+        Returns:
+            The warm similarity index, or None
+        """
+        state = self._shared_state("similarity_index", dict)
+        with _SHARED_STATE_LOCK:
+            if state.get("index") is not None and time.monotonic() - state["loaded_at"] < self.SIMILARITY_INDEX_TTL:
+                return state["index"]
+            if state.get("loading"):
+                return None
+            state["loading"] = True
+        
+        threading.Thread(target=self._load_similarity_index, name="similarity-index-loader", daemon=True).start()
+        return None
+    
+    def _load_similarity_index(self):
+        """Load the similarity index from the database and share it."""
+        state = self._shared_state("similarity_index", dict)
         try:
-            result = self.db_manager.execute_read_query(query, {
-                "pattern": search_pattern,
-                "limit": limit
-            })
+            query = """
+            MATCH (e:Entity)
+            RETURN e, labels(e) AS labels
+            """
             
-            return [record.get('e') for record in result]
+            similarity_index = EntitySimilarityIndex()
+            for record in self.db_manager.execute_read_query(query):
+                entity = record.get('e')
+                similarity_index.add_entity(entity.get('id'), entity, record.get('labels'))
+            for edge in self.get_edge_list():
+                relationship_id = edge.get('id') or self._derived_relationship_id(
+                    edge['source_id'], edge['type'], edge['target_id']
+                )
+                similarity_index.add_edge(relationship_id, edge['source_id'], edge['target_id'])
+            
+            # Writes made while loading may be missing until the next reload
+            self._similarity_index = similarity_index
+            logger.info(f"Built similarity index with {len(similarity_index)} entities")
         except Exception as e:
-            logger.error(f"Failed to search entities with text {search_text}: {e}")
-            return []
+            logger.error(f"Failed to build similarity index: {e}")
+        finally:
+            state["loading"] = False
     
     def find_paths(self, source_id: str, target_id: str, 
                   max_depth: int = 4) -> List[List[Dict[str, Any]]]:
@@ -622,12 +1147,40 @@ class KnowledgeGraphManager:
         except Exception as e:
             logger.error(f"Failed to find related entities for {entity_id}: {e}")
             return []
-    
+
+    def get_edge_list(self) -> List[Dict[str, Any]]:
+        """
+        Fetch every relationship between entities in a single query.
+
+        This is the bulk adjacency snapshot used to build in-memory graph indexes,
+        such as the adjacency matrix of the connection discovery engine.
+
+        Returns:
+            List of dictionaries with id, source_id, target_id and type of each relationship
+        """
+        query = """
+        MATCH (source:Entity)-[r]->(target:Entity)
+        RETURN r.id AS id, source.id AS source_id, target.id AS target_id, type(r) AS type
+        """
+
+        try:
+            return self.db_manager.execute_read_query(query)
+        except Exception as e:
+            logger.error(f"Failed to fetch edge list: {e}")
+            return []
+
     def find_similar_entities(self, entity_id: str, threshold: float = 0.5,
                             limit: int = 10) -> List[Dict[str, Any]]:
         """
         Find entities similar to the given entity based on shared properties and relationships.
         
+        Entities in the embedding index are compared by embedding. Otherwise
+        entities with the same labels are scored by 0.7 times the Jaccard
+        similarity of their property key/value pairs plus 0.3 times that of their
+        neighbour sets. The warm in-process similarity index estimates the scores
+        of the entities sharing a MinHash band with the entity; while it is
+        loading, the scores are computed by the database.
+        
         Args:
             entity_id: ID of the entity
             threshold: Similarity threshold (0.0 to 1.0)
@@ -636,67 +1189,91 @@ class KnowledgeGraphManager:
         Returns:
             List of dictionaries containing similar entity data with similarity scores
         """
-        query = """
-        MATCH (e) WHERE e.id = $id
-        MATCH (other) WHERE other.id <> $id AND labels(e) = labels(other)
-        
-        // Compute similarity based on shared properties
-        WITH e, other, keys(e) as e_keys, keys(other) as other_keys
-        WITH e, other, e_keys, other_keys, 
-             [k in e_keys WHERE k in other_keys and e[k] = other[k]] as shared_props
-        
-        // Only consider entities with some shared properties
-        WHERE size(shared_props) > 0
-        
-        // Compute property similarity
-        WITH e, other, e_keys, other_keys, shared_props,
-             toFloat(size(shared_props)) / toFloat(size(e_keys) + size(other_keys) - size(shared_props)) as prop_similarity
-        
-        // Find shared relationships
-        OPTIONAL MATCH (e)-[r1]-()
-        OPTIONAL MATCH (other)-[r2]-()
-        WITH e, other, prop_similarity,
-             collect(type(r1) + toString(startNode(r1).id) + toString(endNode(r1).id)) as e_rels,
-             collect(type(r2) + toString(startNode(r2).id) + toString(endNode(r2).id)) as other_rels
-        
-        // Compute relationship similarity
-        WITH e, other, prop_similarity, e_rels, other_rels,
-             [rel in e_rels WHERE rel in other_rels] as shared_rels
-        
-        // Compute overall similarity
-        WITH e, other, prop_similarity,
-             CASE WHEN size(e_rels) + size(other_rels) - size(shared_rels) > 0
-               THEN toFloat(size(shared_rels)) / toFloat(size(e_rels) + size(other_rels) - size(shared_rels))
-               ELSE 0
-             END as rel_similarity
-        
-        // Combine property and relationship similarity (weighted)
-        WITH other, 0.7 * prop_similarity + 0.3 * rel_similarity as similarity
-        WHERE similarity >= $threshold
-        
-        RETURN other, similarity
-        ORDER BY similarity DESC
-        LIMIT $limit
-        """
-        
         try:
-            result = self.db_manager.execute_read_query(query, {
-                "id": entity_id,
-                "threshold": threshold,
-                "limit": limit
-            })
+            if self.embedding_index is not None and entity_id in self.embedding_index:
+                matches = self.embedding_index.top_k_similar(entity_id, k=limit, threshold=threshold)
+            else:
+                similarity_index = self._get_similarity_index()
+                if similarity_index is None:
+                    return self._find_similar_entities_in_database(entity_id, threshold, limit)
+                matches = similarity_index.query(entity_id, threshold=threshold, limit=limit)
+            
+            if not matches:
+                return []
+            
+            query = """
+            MATCH (e:Entity) WHERE e.id IN $ids
+            RETURN e
+            """
+            
+            result = self.db_manager.execute_read_query(query, {"ids": [match_id for match_id, _ in matches]})
+            entities = {record['e'].get('id'): record['e'] for record in result}
             
             return [
                 {
-                    "entity": record.get('other'),
-                    "similarity": record.get('similarity')
+                    "entity": entities[match_id],
+                    "similarity": similarity
                 }
-                for record in result
+                for match_id, similarity in matches if match_id in entities
             ]
         except Exception as e:
             logger.error(f"Failed to find similar entities for {entity_id}: {e}")
             return []
     
+    def _find_similar_entities_in_database(self, entity_id: str, threshold: float,
+                                           limit: int) -> List[Dict[str, Any]]:
+        """Score the entities with the labels of an entity against it in the database."""
+        query = """
+        MATCH (e:Entity {id: $id})
+        OPTIONAL MATCH (e)--(neighbor:Entity) WHERE neighbor <> e
+        WITH e, [k IN keys(e) WHERE NOT k IN $ignored] AS e_keys, collect(DISTINCT neighbor.id) AS e_neighbors
+        
+        MATCH (other:Entity)
+        WHERE other.id <> $id AND size(labels(other)) = size(labels(e))
+              AND all(label IN labels(other) WHERE label IN labels(e))
+        OPTIONAL MATCH (other)--(neighbor:Entity) WHERE neighbor <> other
+        WITH e, e_keys, e_neighbors, other,
+             [k IN keys(other) WHERE NOT k IN $ignored] AS other_keys,
+             collect(DISTINCT neighbor.id) AS other_neighbors
+        
+        // Jaccard similarity of the property key/value pairs and of the neighbour sets
+        WITH other, e_neighbors, other_neighbors,
+             size(e_keys) + size(other_keys) AS key_count,
+             size([k IN e_keys WHERE k IN other_keys AND e[k] = other[k]]) AS shared_properties,
+             size([n IN e_neighbors WHERE n IN other_neighbors]) AS shared_neighbors
+        WITH other,
+             CASE WHEN key_count > shared_properties
+               THEN toFloat(shared_properties) / (key_count - shared_properties)
+               ELSE 0.0
+             END AS property_similarity,
+             CASE WHEN size(e_neighbors) > 0 AND size(other_neighbors) > 0
+               THEN toFloat(shared_neighbors) / (size(e_neighbors) + size(other_neighbors) - shared_neighbors)
+               ELSE 0.0
+             END AS neighbor_similarity
+        WITH other, $property_weight * property_similarity + (1 - $property_weight) * neighbor_similarity AS similarity
+        WHERE similarity >= $threshold
+        
+        RETURN other, similarity
+        ORDER BY similarity DESC
+        LIMIT $limit
+        """
+        
+        result = self.db_manager.execute_read_query(query, {
+            "id": entity_id,
+            "ignored": sorted(IGNORED_PROPERTIES),
+            "property_weight": PROPERTY_WEIGHT,
+            "threshold": threshold,
+            "limit": limit
+        })
+        
+        return [
+            {
+                "entity": record['other'],
+                "similarity": record['similarity']
+            }
+            for record in result
+        ]
+    
     def find_contradictions(self) -> List[Dict[str, Any]]:
         """
         Find potential contradictions in the knowledge graph.
@@ -784,48 +1361,406 @@ class KnowledgeGraphManager:
                 "error": str(e)
             }
     
-    def batch_add_entities(self, entities: List[GraphEntity]) -> Dict[str, Any]:
+    def batch_add_entities(self, entities: List[GraphEntity],
+                           batch_size: Optional[int] = None,
+                           bulk: bool = True) -> Dict[str, Any]:
         """
         Add multiple entities to the knowledge graph.
         
+        Entities are grouped by label and written with chunked ``UNWIND ... MERGE``
+        statements, one write transaction per chunk. Nodes are merged on the shared
+        ``Entity`` label so the ``id`` constraint backs the lookup. A failing chunk
+        is reported in ``failures`` without affecting the other chunks.
+        
         Args:
             entities: List of entities to add
+            batch_size: Number of entities per transaction (defaults to ``self.batch_size``)
+            bulk: Whether to use the UNWIND bulk path; if False, entities are added
+                one at a time with ``add_entity``
             
         Returns:
             Dictionary containing the results of the operations
         """
+        if not bulk:
+            return self._batch_add_entities_individually(entities)
+        
+        batch_size = self._resolve_batch_size(batch_size)
         results = {
             "success_count": 0,
             "failure_count": 0,
             "failures": []
         }
         
+        # Group rows by label set so each statement can use a static label pattern
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
         for entity in entities:
-            result = self.add_entity(entity)
+            labels = tuple(sorted(entity.labels | {entity.label}))
+            groups.setdefault(labels, []).append({
+                "id": entity.id,
+                "properties": entity.to_cypher_params()
+            })
+        
+        for labels, rows in groups.items():
+            query = self._build_entity_merge_query(labels)
             
-            if result.get("success", False):
-                results["success_count"] += 1
-            else:
-                results["failure_count"] += 1
-                results["failures"].append({
-                    "entity_id": entity.id,
-                    "error": result.get("error", "Unknown error")
-                })
+            for chunk in self._chunk_rows(rows, batch_size):
+                try:
+                    result = self.db_manager.execute_write_query(query, {"rows": chunk})
+                except Exception as e:
+                    logger.error(f"Failed to add batch of {len(chunk)} entities with labels {labels}: {e}")
+                    results["failure_count"] += len(chunk)
+                    results["failures"].extend(
+                        {"entity_id": row["id"], "error": str(e)} for row in chunk
+                    )
+                    continue
+                
+                # Only rows that produced an output record were written
+                written_ids = {record.get("id") for record in result or []}
+                if written_ids:
+                    self._invalidate_cache(labels=labels)
+                for row in chunk:
+                    if row["id"] in written_ids:
+                        results["success_count"] += 1
+                        if self._search_index is not None:
+                            self._search_index.add(row["properties"], labels + ("Entity",))
+                        self._index_embedding(row["id"], row["properties"])
+                        if self._similarity_index is not None:
+                            self._similarity_index.add_entity(row["id"], row["properties"], labels + ("Entity",))
+                    else:
+                        results["failure_count"] += 1
+                        results["failures"].append(
+                            {"entity_id": row["id"], "error": "Entity was not written"}
+                        )
         
         logger.info(f"Batch added {results['success_count']} entities with {results['failure_count']} failures")
         
         return results
     
-    def batch_add_relationships(self, relationships: List[GraphRelationship]) -> Dict[str, Any]:
+    def batch_add_relationships(self, relationships: List[GraphRelationship],
+                                batch_size: Optional[int] = None,
+                                bulk: bool = True) -> Dict[str, Any]:
         """
         Add multiple relationships to the knowledge graph.
         
+        Relationships are grouped by type and written with chunked ``UNWIND ... MERGE``
+        statements, one write transaction per chunk. The reverse edge of a
+        bidirectional relationship is written by the same statement as the forward
+        edge. Relationships whose source or target entity does not exist are
+        reported as failures.
+        
         Args:
             relationships: List of relationships to add
+            batch_size: Number of relationships per transaction (defaults to ``self.batch_size``)
+            bulk: Whether to use the UNWIND bulk path; if False, relationships are
+                added one at a time with ``add_relationship``
             
         Returns:
             Dictionary containing the results of the operations
         """
+        if not bulk:
+            return self._batch_add_relationships_individually(relationships)
+        
+        batch_size = self._resolve_batch_size(batch_size)
+        results = {
+            "success_count": 0,
+            "failure_count": 0,
+            "failures": []
+        }
+        
+        # Rows grouped by relationship type and direction; a bidirectional row
+        # carries its reverse edge so both are written by the same statement
+        groups: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
+        for relationship in relationships:
+            row = self._relationship_row(relationship)
+            groups.setdefault((relationship.type, relationship.bidirectional), []).append(row)
+        
+        for (relationship_type, bidirectional), rows in groups.items():
+            query = self._build_relationship_merge_query(relationship_type, bidirectional)
+            
+            for chunk in self._chunk_rows(rows, batch_size):
+                try:
+                    result = self.db_manager.execute_write_query(query, {"rows": chunk})
+                except Exception as e:
+                    logger.error(f"Failed to add batch of {len(chunk)} relationships with type {relationship_type}: {e}")
+                    results["failure_count"] += len(chunk)
+                    results["failures"].extend(
+                        {"relationship_id": row["id"], "error": str(e)} for row in chunk
+                    )
+                    continue
+                
+                # Rows whose endpoints could not be matched produce no output record
+                written_ids = {record.get("id") for record in result or []}
+                if written_ids:
+                    self._invalidate_cache(relationship_types=[relationship_type, f"REVERSE_{relationship_type}"]
+                                           if bidirectional else [relationship_type])
+                for row in chunk:
+                    if row["id"] in written_ids:
+                        results["success_count"] += 1
+                        if self._similarity_index is not None:
+                            self._similarity_index.add_edge(row["id"], row["source_id"], row["target_id"])
+                            if bidirectional:
+                                self._similarity_index.add_edge(row["reverse_id"], row["target_id"], row["source_id"])
+                    else:
+                        results["failure_count"] += 1
+                        results["failures"].append(
+                            {"relationship_id": row["id"], "error": "Source or target entity not found"}
+                        )
+        
+        logger.info(f"Batch added {results['success_count']} relationships with {results['failure_count']} failures")
+        
+        return results
+    
+    def export_stream(self, path: str, batch_size: Optional[int] = None,
+                      compression: Optional[str] = None,
+                      checkpoint_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Export the whole knowledge graph to an NDJSON file.
+        
+        Entities are written first, as ``{"type": "node", ...}`` records, followed by
+        their outgoing relationships as ``{"type": "relationship", ...}`` records.
+        Both are read in keyset batches ordered by entity ID, so memory use is
+        bounded by one batch. After each batch the file offset and the last entity
+        ID are saved to the checkpoint; if the checkpoint exists when the export
+        starts, the export resumes from it.
+        
+        Args:
+            path: Path of the output file
+            batch_size: Number of entities per batch (defaults to ``self.batch_size``)
+            compression: 'none', 'gzip' or 'zstd'; inferred from the file suffix if None
+            checkpoint_path: Path of the checkpoint file (defaults to ``path + ".checkpoint"``)
+            
+        Returns:
+            Dictionary with the number of exported nodes and relationships
+        """
+        batch_size = self._resolve_batch_size(batch_size)
+        compression = resolve_compression(path, compression)
+        checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+        
+        state = load_checkpoint(checkpoint_path)
+        if not state or state.get("operation") != "export":
+            state = {"operation": "export", "phase": "nodes", "after_id": None,
+                     "offset": 0, "nodes": 0, "relationships": 0}
+        elif state["offset"]:
+            logger.info(f"Resuming export to {path} after {state['phase']} of entity {state['after_id']}")
+        
+        nodes_query = """
+        MATCH (e:Entity)
+        WHERE $after_id IS NULL OR e.id > $after_id
+        RETURN e, labels(e) AS labels
+        ORDER BY e.id
+        LIMIT $limit
+        """
+        
+        # Relationships are walked by source entity so the id index drives the batches
+        relationships_query = """
+        MATCH (source:Entity)
+        WHERE $after_id IS NULL OR source.id > $after_id
+        WITH source ORDER BY source.id LIMIT $limit
+        OPTIONAL MATCH (source)-[r]->(target:Entity)
+        RETURN source.id AS source_id, r, type(r) AS type, target.id AS target_id
+        ORDER BY source_id
+        """
+        
+        try:
+            with ChunkWriter(path, compression, state["offset"]) as writer:
+                while state["phase"] != "done":
+                    parameters = {"after_id": state["after_id"], "limit": batch_size}
+                    
+                    if state["phase"] == "nodes":
+                        records = self.db_manager.execute_read_query(nodes_query, parameters)
+                        rows = [
+                            {"type": "node", "labels": sorted(record['labels']), "properties": record['e']}
+                            for record in records
+                        ]
+                        last_id = records[-1]['e'].get('id') if records else None
+                    else:
+                        records = self.db_manager.execute_read_query(relationships_query, parameters)
+                        rows = [
+                            {
+                                "type": "relationship",
+                                "relationship_type": record['type'],
+                                "source_id": record['source_id'],
+                                "target_id": record['target_id'],
+                                "properties": record['r']
+                            }
+                            for record in records
+                            if record.get('r') is not None
+                        ]
+                        last_id = records[-1]['source_id'] if records else None
+                    
+                    if not records:
+                        state.update(phase="relationships" if state["phase"] == "nodes" else "done",
+                                     after_id=None)
+                        save_checkpoint(checkpoint_path, state)
+                        continue
+                    
+                    if rows:
+                        state["offset"] = writer.write(rows)
+                    state["nodes" if state["phase"] == "nodes" else "relationships"] += len(rows)
+                    state["after_id"] = last_id
+                    save_checkpoint(checkpoint_path, state)
+        except Exception as e:
+            logger.error(f"Failed to export knowledge graph to {path}: {e}")
+            return {
+                "success": False,
+                "nodes": state["nodes"],
+                "relationships": state["relationships"],
+                "error": str(e)
+            }
+        
+        clear_checkpoint(checkpoint_path)
+        logger.info(f"Exported {state['nodes']} entities and {state['relationships']} relationships to {path}")
+        
+        return {
+            "success": True,
+            "nodes": state["nodes"],
+            "relationships": state["relationships"]
+        }
+    
+    def import_stream(self, path: str, batch_size: Optional[int] = None,
+                      compression: Optional[str] = None,
+                      checkpoint_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Import an NDJSON file written by ``export_stream``.
+        
+        Records are read lazily and written in batches with the same ``UNWIND ...
+        MERGE`` statements as the batch operations, so importing is idempotent. The
+        number of records consumed is saved to the checkpoint after each batch; if
+        the checkpoint exists when the import starts, the records before it are
+        skipped.
+        
+        Args:
+            path: Path of the input file
+            batch_size: Number of records per batch (defaults to ``self.batch_size``)
+            compression: 'none', 'gzip' or 'zstd'; inferred from the file suffix if None
+            checkpoint_path: Path of the checkpoint file (defaults to ``path + ".checkpoint"``)
+            
+        Returns:
+            Dictionary with the number of imported nodes and relationships and of
+            entities without an id and relationships whose endpoints were missing
+        """
+        batch_size = self._resolve_batch_size(batch_size)
+        checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+        
+        state = load_checkpoint(checkpoint_path)
+        if not state or state.get("operation") != "import":
+            state = {"operation": "import", "records": 0, "nodes": 0,
+                     "relationships": 0, "failure_count": 0}
+        elif state["records"]:
+            logger.info(f"Resuming import from {path} after {state['records']} records")
+        
+        try:
+            pending = []
+            for position, record in enumerate(iter_records(path, compression)):
+                if position < state["records"]:
+                    continue
+                
+                pending.append(record)
+                if len(pending) >= batch_size:
+                    self._import_records(pending, state)
+                    state["records"] = position + 1
+                    save_checkpoint(checkpoint_path, state)
+                    pending = []
+            
+            if pending:
+                self._import_records(pending, state)
+                state["records"] += len(pending)
+        except Exception as e:
+            logger.error(f"Failed to import knowledge graph from {path}: {e}")
+            return {
+                "success": False,
+                "nodes": state["nodes"],
+                "relationships": state["relationships"],
+                "failure_count": state["failure_count"],
+                "error": str(e)
+            }
+        finally:
+            # Imported rows bypass the per-write index maintenance
+            self._search_index = None
+            self._similarity_index = None
+            self._count_cache.clear()
+            if self.query_cache is not None:
+                self.query_cache.clear()
+        
+        clear_checkpoint(checkpoint_path)
+        logger.info(f"Imported {state['nodes']} entities and {state['relationships']} relationships from {path}")
+        
+        return {
+            "success": True,
+            "nodes": state["nodes"],
+            "relationships": state["relationships"],
+            "failure_count": state["failure_count"]
+        }
+    
+    def _import_records(self, records: List[Dict[str, Any]], state: Dict[str, Any]):
+        """Write one batch of exported records and add the outcome to the import state."""
+        entity_groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        relationship_groups: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for record in records:
+            properties = record.get("properties") or {}
+            if record.get("type") == "node":
+                # MERGE cannot match a null id, which would fail the whole batch
+                if properties.get("id") is None:
+                    logger.error(f"Skipping imported entity without an id: {properties}")
+                    state["failure_count"] += 1
+                    continue
+                entity_groups.setdefault(tuple(record["labels"]), []).append(
+                    {"id": properties["id"], "properties": properties}
+                )
+            elif record.get("type") == "relationship":
+                # Relationships written without an id get one derived from their
+                # endpoints, so importing them again merges rather than duplicates
+                if properties.get("id") is None:
+                    properties = dict(properties, id=self._derived_relationship_id(
+                        record["source_id"], record["relationship_type"], record["target_id"]
+                    ))
+                relationship_groups.setdefault(record["relationship_type"], []).append({
+                    "id": properties["id"],
+                    "source_id": record["source_id"],
+                    "target_id": record["target_id"],
+                    "properties": properties
+                })
+        
+        # Entities first, so relationships in the same batch find their endpoints
+        for labels, rows in entity_groups.items():
+            result = self.db_manager.execute_write_query(self._build_entity_merge_query(labels), {"rows": rows})
+            state["nodes"] += len(result or [])
+            for row in rows:
+                self._index_embedding(row["id"], row["properties"])
+        
+        for relationship_type, rows in relationship_groups.items():
+            query = self._build_relationship_merge_query(relationship_type)
+            written = len(self.db_manager.execute_write_query(query, {"rows": rows}) or [])
+            state["relationships"] += written
+            state["failure_count"] += len(rows) - written
+    
+    def _batch_add_entities_individually(self, entities: List[GraphEntity]) -> Dict[str, Any]:
+        """Add entities one at a time, using one transaction per entity."""
+        results = {
+            "success_count": 0,
+            "failure_count": 0,
+            "failures": []
+        }
+        
+        for entity in entities:
+            result = self.add_entity(entity)
+            
+            if result.get("success", False):
+                results["success_count"] += 1
+            else:
+                results["failure_count"] += 1
+                results["failures"].append({
+                    "entity_id": entity.id,
+                    "error": result.get("error", "Unknown error")
+                })
+        
+        logger.info(f"Batch added {results['success_count']} entities with {results['failure_count']} failures")
+        
+        return results
+    
+    def _batch_add_relationships_individually(self, relationships: List[GraphRelationship]) -> Dict[str, Any]:
+        """Add relationships one at a time, using one transaction per relationship."""
         results = {
             "success_count": 0,
             "failure_count": 0,
@@ -848,6 +1783,152 @@ class KnowledgeGraphManager:
         
         return results
     
+    def _shared_state(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Get state shared by the managers of this database manager, creating it on first use."""
+        with _SHARED_STATE_LOCK:
+            state = _SHARED_STATE.setdefault(self.db_manager, {})
+            if name not in state:
+                state[name] = factory()
+            return state[name]
+    
+    def _execute_read(self, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run a read query, serving it from the query cache when one is configured."""
+        if self.query_cache is None:
+            return self.db_manager.execute_read_query(query, parameters)
+        
+        cache_key = make_cache_key(query, parameters)
+        records = self.query_cache.get(cache_key)
+        if records is None:
+            records = self.db_manager.execute_read_query(query, parameters)
+            self.query_cache.put(cache_key, records, tags=tags_for_query(query))
+        
+        return records
+    
+    def _cached_count(self, query: str, parameters: Dict[str, Any]) -> int:
+        """Run a count query, reusing its result until it expires."""
+        cache_key = make_cache_key(query, parameters)
+        records = self._count_cache.get(cache_key)
+        
+        if records is None:
+            try:
+                records = self.db_manager.execute_read_query(query, parameters)
+            except Exception as e:
+                logger.error(f"Failed to count: {e}")
+                return 0
+            self._count_cache.put(cache_key, records)
+        
+        return records[0].get('count', 0) if records else 0
+    
+    def _index_embedding(self, entity_id: str, properties: Dict[str, Any]):
+        """
+        Keep the embedding index in step with a written ``embedding`` property.
+        
+        The write has already succeeded when this runs, so an embedding the index
+        rejects is logged and its entity left out of the index rather than raised.
+        """
+        if self.embedding_index is None or "embedding" not in properties:
+            return
+        
+        try:
+            if properties["embedding"] is None:
+                self.embedding_index.remove(entity_id)
+            else:
+                self.embedding_index.add(entity_id, properties["embedding"])
+        except Exception as e:
+            logger.error(f"Failed to index embedding of entity {entity_id}: {e}")
+            # Do not serve the entity's previous embedding
+            self.embedding_index.remove(entity_id)
+    
+    def _invalidate_cache(self, labels: Iterable[str] = (), relationship_types: Iterable[str] = ()):
+        """Evict cached read results that depend on written labels or relationship types."""
+        if self.query_cache is not None:
+            self.query_cache.invalidate(labels, relationship_types)
+    
+    def _resolve_batch_size(self, batch_size: Optional[int]) -> int:
+        """Return the batch size for a call, validating an explicit override."""
+        if batch_size is None:
+            return self.batch_size
+        
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        return batch_size
+    
+    @staticmethod
+    def _chunk_rows(rows: List[Any], batch_size: int) -> List[List[Any]]:
+        """Split rows into consecutive chunks of at most batch_size items."""
+        return [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+    
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        """Quote a label or relationship type for safe interpolation into Cypher."""
+        return "`" + name.replace("`", "``") + "`"
+    
+    @classmethod
+    def _relationship_row(cls, relationship: GraphRelationship) -> Dict[str, Any]:
+        """Build the UNWIND row for a relationship, carrying its reverse edge if it is bidirectional."""
+        properties = relationship.to_cypher_params()
+        
+        # Endpoints and direction are expressed by the pattern, not stored as properties
+        for key in ("source_id", "target_id", "bidirectional"):
+            properties.pop(key, None)
+        
+        row = {
+            "id": relationship.id,
+            "source_id": relationship.source_id,
+            "target_id": relationship.target_id,
+            "properties": properties
+        }
+        
+        if relationship.bidirectional:
+            row["reverse_id"] = cls._reverse_relationship_id(relationship.id)
+            row["reverse_properties"] = dict(properties, id=row["reverse_id"])
+        
+        return row
+    
+    def _build_entity_merge_query(self, labels: Tuple[str, ...]) -> str:
+        """Build the UNWIND MERGE statement for entities with the given labels."""
+        # Merge on the shared Entity label so the id constraint backs the lookup
+        extra_labels = [label for label in labels if label != "Entity"]
+        
+        query = """
+        UNWIND $rows AS row
+        MERGE (e:Entity {id: row.id})
+        SET e += row.properties"""
+        
+        if extra_labels:
+            query += ", e:" + ":".join(self._quote_identifier(label) for label in extra_labels)
+        
+        return query + "\n        RETURN row.id AS id\n        "
+    
+    @staticmethod
+    def _derived_relationship_id(source_id: str, relationship_type: str, target_id: str) -> str:
+        """Derive the ID of a relationship stored without one from its endpoints and type."""
+        return f"{source_id}-{relationship_type}-{target_id}"
+    
+    @staticmethod
+    def _reverse_relationship_id(relationship_id: str) -> str:
+        """Derive the ID of the reverse edge of a bidirectional relationship, so rewrites merge it."""
+        return f"{relationship_id}:reverse"
+    
+    def _build_relationship_merge_query(self, relationship_type: str,
+                                        bidirectional: bool = False) -> str:
+        """Build the UNWIND MERGE statement for relationships of the given type."""
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (source:Entity {{id: row.source_id}})
+        MATCH (target:Entity {{id: row.target_id}})
+        MERGE (source)-[r:{self._quote_identifier(relationship_type)} {{id: row.id}}]->(target)
+        SET r += row.properties"""
+        
+        if bidirectional:
+            reverse_type = self._quote_identifier(f"REVERSE_{relationship_type}")
+            query += f"""
+        MERGE (target)-[reverse:{reverse_type} {{id: row.reverse_id}}]->(source)
+        SET reverse += row.reverse_properties"""
+        
+        return query + "\n        RETURN row.id AS id\n        "
+    
     def close(self):
         """Close the database connection."""
         self.db_manager.close()
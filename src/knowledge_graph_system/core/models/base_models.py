@@ -203,6 +203,10 @@ class GraphEntity:
         params = self.to_cypher_params()
         labels_str = ':'.join(self.labels)
         
+        # Every entity carries the shared Entity label, which holds the id constraint
+        if "Entity" not in self.labels:
+            labels_str += ":Entity"
+        
         # Build the query
         query = f"""
         CREATE (e:{labels_str} {{
@@ -0,0 +1,194 @@
+"""
+NDJSON streaming helpers for Knowledge Graph export and import.
+
+Records are written one JSON object per line in chunks. Every chunk is
+compressed as a self-contained gzip member or zstd frame and appended to the
+file, so a file stays readable as one stream while a checkpoint can record the
+byte offset after any chunk and an interrupted transfer can resume from it.
+"""
+
+import gzip
+import io
+import json
+import os
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Supported compression formats
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+# File suffixes that select a compression format
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+def resolve_compression(path: str, compression: Optional[str] = None) -> str:
+    """
+    Determine the compression format of a file.
+
+    Args:
+        path: Path of the file
+        compression: Explicit format; inferred from the file suffix if None
+
+    Returns:
+        One of ``COMPRESSIONS``
+
+    Raises:
+        ValueError: If the format is unknown or zstd is requested without the
+            ``zstandard`` package installed
+    """
+    if compression is None:
+        compression = _SUFFIXES.get(os.path.splitext(path)[1].lower(), "none")
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}. Expected one of {COMPRESSIONS}")
+
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+    return compression
+
+
+def encode_chunk(records: Iterable[Dict[str, Any]], compression: str) -> bytes:
+    """
+    Serialise records as a self-contained chunk of NDJSON.
+
+    Args:
+        records: Records to serialise
+        compression: Compression format of the chunk
+
+    Returns:
+        Bytes of the chunk
+    """
+    data = "".join(
+        json.dumps(record, separators=(",", ":"), default=str) + "\n" for record in records
+    ).encode("utf-8")
+
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def iter_records(path: str, compression: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read records from an NDJSON file one at a time.
+
+    Args:
+        path: Path of the file
+        compression: Compression format; inferred from the file suffix if None
+
+    Yields:
+        Decoded records
+    """
+    compression = resolve_compression(path, compression)
+
+    with open(path, "rb") as raw:
+        if compression == "gzip":
+            stream: BinaryIO = gzip.GzipFile(fileobj=raw)
+        elif compression == "zstd":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = raw
+
+        for line in io.TextIOWrapper(stream, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
+class ChunkWriter:
+    """
+    Appends encoded chunks to a file and reports the offset after each one.
+
+    Opening a writer at an offset truncates anything written after it, which
+    discards a chunk that was only partly written when a transfer was interrupted.
+    """
+
+    def __init__(self, path: str, compression: str, offset: int = 0):
+        """
+        Open the file for writing.
+
+        Args:
+            path: Path of the file
+            compression: Compression format of the chunks
+            offset: Byte offset to continue from; 0 starts a new file
+        """
+        self.compression = compression
+        self._file = open(path, "r+b" if offset and os.path.exists(path) else "wb")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write records as one chunk and flush it to disk.
+
+        Args:
+            records: Records of the chunk
+
+        Returns:
+            Byte offset after the chunk
+        """
+        self._file.write(encode_chunk(records, self.compression))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+    def __enter__(self) -> 'ChunkWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_checkpoint(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Load a checkpoint.
+
+    Args:
+        path: Path of the checkpoint file
+
+    Returns:
+        Checkpoint state, or None if there is no checkpoint
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: Optional[str], state: Dict[str, Any]):
+    """
+    Save a checkpoint atomically.
+
+    Args:
+        path: Path of the checkpoint file; nothing is saved if None
+        state: Checkpoint state
+    """
+    if not path:
+        return
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(temp_path, path)
+
+
+def clear_checkpoint(path: Optional[str]):
+    """
+    Remove a checkpoint once its transfer has completed.
+
+    Args:
+        path: Path of the checkpoint file
+    """
+    if path and os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,54 @@
+"""
+Keyset pagination helpers for Knowledge Graph listings.
+
+Listings are ordered by a sort key, such as ``(label, id)`` for entities or
+``(type, id)`` for relationships, and each page resumes after the last key of
+the previous one. The key travels between requests as an opaque continuation
+token bound to the listing it came from.
+"""
+
+import base64
+import binascii
+import json
+from typing import Dict, Any
+
+
+def encode_cursor(kind: str, key: Dict[str, Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as a continuation token.
+
+    Args:
+        kind: Listing the token belongs to, e.g. "entities"
+        key: Sort key of the last row
+
+    Returns:
+        URL-safe continuation token
+    """
+    payload = json.dumps({"kind": kind, "key": key}, sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, kind: str) -> Dict[str, Any]:
+    """
+    Decode a continuation token.
+
+    Args:
+        token: Continuation token from a previous page
+        kind: Listing the token is expected to belong to
+
+    Returns:
+        Sort key of the last row of the previous page
+
+    Raises:
+        ValueError: If the token is malformed or belongs to another listing
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+    if not isinstance(payload, dict) or payload.get("kind") != kind or not isinstance(payload.get("key"), dict):
+        raise ValueError(f"Cursor does not belong to the {kind} listing")
+
+    return payload["key"]
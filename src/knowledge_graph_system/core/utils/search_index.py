@@ -0,0 +1,282 @@
+"""
+In-process full-text search index for Knowledge Graph entities.
+
+This module provides an inverted index over entity names and aliases. It is used
+by the KnowledgeGraphManager when the database backend has no full-text index
+support, and mirrors the exact, prefix and fuzzy modes of the Neo4j full-text
+search.
+"""
+
+import bisect
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+
+
+# Supported search modes
+SEARCH_MODES = ("exact", "prefix", "fuzzy")
+
+# Score multiplier for name matches relative to alias matches
+NAME_WEIGHT = 2.0
+ALIAS_WEIGHT = 1.0
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def max_edits(term: str) -> int:
+    """Return the edit distance allowed for a fuzzy term, following Lucene's defaults."""
+    if len(term) < 3:
+        return 0
+    if len(term) < 6:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Compute the Levenshtein distance between two strings, up to a limit.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        Edit distance, or None if it exceeds the limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+
+        if min(current) > limit:
+            return None
+        previous = current
+
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class EntitySearchIndex:
+    """
+    Inverted index over entity names and aliases.
+
+    Each token maps to the IDs of the entities whose name or aliases contain it,
+    together with the field weight of the best match. A sorted vocabulary
+    supports prefix lookups without scanning all tokens. The index is safe to
+    share between threads: its updates and queries are serialized.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._lock = threading.RLock()
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.labels: Dict[str, Set[str]] = {}
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.documents
+
+    def add(self, entity: Dict[str, Any], labels: Optional[Iterable[str]] = None):
+        """
+        Add or replace an entity in the index.
+
+        Args:
+            entity: Entity properties, including ``id``, ``name`` and ``aliases``
+            labels: Labels of the entity node
+        """
+        with self._lock:
+            entity_id = entity.get("id")
+            if entity_id is None:
+                return
+
+            if entity_id in self.documents:
+                self.remove(entity_id)
+
+            weights: Dict[str, float] = {}
+            for token in tokenize(entity.get("name") or ""):
+                weights[token] = NAME_WEIGHT
+
+            for alias in entity.get("aliases") or []:
+                for token in tokenize(alias):
+                    weights.setdefault(token, ALIAS_WEIGHT)
+
+            for token, weight in weights.items():
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = {}
+                    self._vocabulary_dirty = True
+                postings[entity_id] = weight
+
+            self.documents[entity_id] = dict(entity)
+            self.labels[entity_id] = set(labels or [])
+            self._tokens[entity_id] = set(weights)
+
+    def remove(self, entity_id: str):
+        """
+        Remove an entity from the index.
+
+        Args:
+            entity_id: ID of the entity
+        """
+        with self._lock:
+            if entity_id not in self.documents:
+                return
+
+            for token in self._tokens.pop(entity_id, set()):
+                postings = self.postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(entity_id, None)
+                if not postings:
+                    del self.postings[token]
+                    self._vocabulary_dirty = True
+
+            del self.documents[entity_id]
+            self.labels.pop(entity_id, None)
+
+    def update(self, entity_id: str, properties: Dict[str, Any]):
+        """
+        Apply a property update to an indexed entity.
+
+        Args:
+            entity_id: ID of the entity
+            properties: Properties that changed
+        """
+        with self._lock:
+            if entity_id not in self.documents:
+                return
+
+            entity = dict(self.documents[entity_id])
+            entity.update(properties)
+            self.add(entity, self.labels.get(entity_id))
+
+    def search(self, text: str, mode: str = "exact",
+               labels: Optional[List[str]] = None,
+               min_confidence: float = 0.0,
+               limit: int = 100) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Search for entities matching all tokens of the text.
+
+        Args:
+            text: Search text
+            mode: One of ``exact``, ``prefix`` or ``fuzzy``
+            labels: Only return entities with at least one of these labels
+            min_confidence: Minimum entity confidence
+            limit: Maximum number of results
+
+        Returns:
+            List of (entity, score) pairs ordered by descending score
+        """
+        with self._lock:
+            if mode not in SEARCH_MODES:
+                raise ValueError(f"Unknown search mode: {mode}")
+
+            terms = tokenize(text)
+            if not terms:
+                return []
+
+            scores: Optional[Dict[str, float]] = None
+            for term in terms:
+                term_scores = self._score_term(term, mode)
+
+                # Every term must match
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        entity_id: score + term_scores[entity_id]
+                        for entity_id, score in scores.items()
+                        if entity_id in term_scores
+                    }
+
+                if not scores:
+                    return []
+
+            label_filter = set(labels) if labels else None
+            results = []
+            for entity_id, score in scores.items():
+                entity = self.documents[entity_id]
+                if label_filter and not label_filter & self.labels.get(entity_id, set()):
+                    continue
+                if entity.get("confidence", 1.0) < min_confidence:
+                    continue
+                results.append((entity, score))
+
+            results.sort(key=lambda item: (-item[1], item[0]["id"]))
+            return results[:limit]
+
+    def _score_term(self, term: str, mode: str) -> Dict[str, float]:
+        """Score the entities matching one query term."""
+        scores: Dict[str, float] = {}
+
+        for token, similarity in self._expand_term(term, mode):
+            postings = self.postings[token]
+            idf = 1.0 + math.log(len(self.documents) / len(postings))
+
+            for entity_id, weight in postings.items():
+                score = idf * weight * similarity
+                if score > scores.get(entity_id, 0.0):
+                    scores[entity_id] = score
+
+        return scores
+
+    def _expand_term(self, term: str, mode: str) -> List[Tuple[str, float]]:
+        """Return the indexed tokens a query term matches, with their similarity."""
+        if mode == "exact":
+            return [(term, 1.0)] if term in self.postings else []
+
+        if mode == "prefix":
+            vocabulary = self._sorted_vocabulary()
+            start = bisect.bisect_left(vocabulary, term)
+            matches = []
+            for token in vocabulary[start:]:
+                if not token.startswith(term):
+                    break
+                matches.append((token, 1.0 if token == term else len(term) / len(token)))
+            return matches
+
+        limit = max_edits(term)
+        if limit == 0:
+            return [(term, 1.0)] if term in self.postings else []
+
+        matches = []
+        for token in self.postings:
+            distance = bounded_edit_distance(term, token, limit)
+            if distance is not None:
+                matches.append((token, 1.0 - distance / (limit + 1)))
+        return matches
+
+    def _sorted_vocabulary(self) -> List[str]:
+        """Return the indexed tokens in sorted order."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        return self._vocabulary
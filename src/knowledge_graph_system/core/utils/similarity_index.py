@@ -0,0 +1,352 @@
+"""
+In-process structural similarity index for Knowledge Graph entities.
+
+This module keeps MinHash signatures of each entity's property key/value pairs
+and of its neighbour set in a banded locality sensitive hashing index. It backs
+KnowledgeGraphManager.find_similar_entities, which scores an entity against the
+candidates that share an LSH band with it instead of every node in the graph.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Any
+
+import numpy as np
+
+
+# Properties that identify or timestamp an entity rather than describe it
+IGNORED_PROPERTIES = frozenset({"id", "created_at", "updated_at", "embedding"})
+
+# Weight of property similarity; neighbour similarity gets the remainder
+PROPERTY_WEIGHT = 0.7
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def property_tokens(properties: Dict[str, Any]) -> Set[str]:
+    """
+    Turn entity properties into key/value tokens.
+
+    Args:
+        properties: Entity properties
+
+    Returns:
+        Set of ``key=value`` tokens, excluding identifying and timestamp properties
+    """
+    return {
+        f"{key}={json.dumps(value, sort_keys=True, default=str)}"
+        for key, value in properties.items()
+        if key not in IGNORED_PROPERTIES and value is not None
+    }
+
+
+class MinHasher:
+    """
+    MinHash signatures for Jaccard similarity estimation.
+
+    Each of the ``num_perm`` hash functions is a random affine map of a 32-bit
+    token hash modulo a Mersenne prime.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initialize the hash functions.
+
+        Args:
+            num_perm: Number of hash functions, the length of a signature
+            seed: Seed for the hash function parameters
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """
+        Compute the signature of a set of tokens.
+
+        Args:
+            tokens: Tokens of the set
+
+        Returns:
+            Signature array; the empty set has every value at the maximum
+        """
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "little")
+             for token in tokens),
+            dtype=np.uint64
+        )
+        if len(hashes) == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def update(self, signature: np.ndarray, token: str) -> np.ndarray:
+        """Return the signature of a set with one token added."""
+        return np.minimum(signature, self.signature([token]))
+
+
+class EntitySimilarityIndex:
+    """
+    Banded MinHash LSH index over entity properties and neighbour sets.
+
+    Similarity is ``PROPERTY_WEIGHT`` times the estimated Jaccard similarity of
+    the property tokens plus the remainder times that of the neighbour sets;
+    only entities with the same labels are compared. Signatures are kept in
+    row-aligned matrices so candidates are scored in one vectorised comparison;
+    the rows of removed entities are reused. The index is safe to share between
+    threads: its updates and queries are serialized.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 64, seed: int = 1, capacity: int = 1024):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: Length of the MinHash signatures
+            bands: Number of LSH bands; with two rows per band, pairs with a
+                Jaccard similarity of 0.3 share a band with a probability above 99%
+            seed: Seed for the hash functions
+            capacity: Number of entity rows to allocate up front
+        """
+        if bands < 1 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self._lock = threading.RLock()
+
+        # Entity rows and their signatures, label sets and property and neighbour flags
+        self._row_of: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free_rows: List[int] = []
+        self._label_codes: Dict[FrozenSet[str], int] = {}
+        capacity = max(capacity, 1)
+        self._property_signatures = np.zeros((capacity, num_perm), dtype=np.uint64)
+        self._neighbor_signatures = np.zeros((capacity, num_perm), dtype=np.uint64)
+        self._label_ids = np.full(capacity, -1, dtype=np.int64)
+        self._has_properties = np.zeros(capacity, dtype=bool)
+        self._has_neighbors = np.zeros(capacity, dtype=bool)
+
+        # Neighbours of each entity with the relationships that connect them
+        self._neighbors: Dict[str, Dict[str, Set[str]]] = {}
+        self._edges: Dict[str, Tuple[str, str]] = {}
+
+        # Band tables of rows for property ("p") and neighbour ("n") signatures
+        self._buckets: Dict[Tuple[str, int, bytes], Set[int]] = {}
+        self._bucket_keys: Dict[Tuple[str, int], List[Tuple[str, int, bytes]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._row_of
+
+    def add_entity(self, entity_id: str, properties: Dict[str, Any], labels: Iterable[str]):
+        """
+        Add or replace an entity.
+
+        Args:
+            entity_id: ID of the entity
+            properties: All properties of the entity
+            labels: Labels of the entity
+        """
+        with self._lock:
+            row = self._row_of.get(entity_id)
+            is_new = row is None
+            if is_new:
+                row = self._allocate_row(entity_id)
+
+            labels = frozenset(labels)
+            self._label_ids[row] = self._label_codes.setdefault(labels, len(self._label_codes))
+            tokens = property_tokens(properties)
+            self._has_properties[row] = bool(tokens)
+            self._set_signature("p", row, self.hasher.signature(tokens))
+
+            if is_new:
+                self._neighbors.setdefault(entity_id, {})
+                self._update_neighbor_signature(entity_id)
+
+    def remove_entity(self, entity_id: str):
+        """
+        Remove an entity and its relationships.
+
+        Args:
+            entity_id: ID of the entity
+        """
+        with self._lock:
+            for relationship_ids in list(self._neighbors.get(entity_id, {}).values()):
+                for relationship_id in list(relationship_ids):
+                    self.remove_edge(relationship_id)
+
+            self._neighbors.pop(entity_id, None)
+            row = self._row_of.pop(entity_id, None)
+            if row is None:
+                return
+
+            self._unbucket("p", row)
+            self._unbucket("n", row)
+            self._ids[row] = None
+            self._label_ids[row] = -1
+            self._has_properties[row] = False
+            self._has_neighbors[row] = False
+            self._free_rows.append(row)
+
+    def add_edge(self, relationship_id: str, source_id: str, target_id: str):
+        """
+        Add a relationship between two entities.
+
+        Args:
+            relationship_id: ID of the relationship
+            source_id: ID of the source entity
+            target_id: ID of the target entity
+        """
+        with self._lock:
+            if relationship_id in self._edges or source_id == target_id:
+                return
+
+            self._edges[relationship_id] = (source_id, target_id)
+            for entity_id, neighbor_id in ((source_id, target_id), (target_id, source_id)):
+                relationship_ids = self._neighbors.setdefault(entity_id, {}).setdefault(neighbor_id, set())
+                relationship_ids.add(relationship_id)
+
+                row = self._row_of.get(entity_id)
+                if len(relationship_ids) == 1 and row is not None:
+                    self._has_neighbors[row] = True
+                    self._set_signature(
+                        "n", row, self.hasher.update(self._neighbor_signatures[row], neighbor_id)
+                    )
+
+    def remove_edge(self, relationship_id: str):
+        """
+        Remove a relationship.
+
+        Args:
+            relationship_id: ID of the relationship
+        """
+        with self._lock:
+            endpoints = self._edges.pop(relationship_id, None)
+            if endpoints is None:
+                return
+
+            source_id, target_id = endpoints
+            for entity_id, neighbor_id in ((source_id, target_id), (target_id, source_id)):
+                neighbors = self._neighbors.get(entity_id, {})
+                relationship_ids = neighbors.get(neighbor_id, set())
+                relationship_ids.discard(relationship_id)
+
+                # A neighbour is only lost when its last relationship is removed
+                if not relationship_ids:
+                    neighbors.pop(neighbor_id, None)
+                    if entity_id in self._row_of:
+                        self._update_neighbor_signature(entity_id)
+
+    def query(self, entity_id: str, threshold: float = 0.5, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the entities most similar to an indexed entity.
+
+        Args:
+            entity_id: ID of the entity
+            threshold: Minimum similarity (0.0 to 1.0)
+            limit: Maximum number of results
+
+        Returns:
+            List of (entity_id, similarity) tuples, most similar first
+        """
+        with self._lock:
+            row = self._row_of.get(entity_id)
+            if row is None:
+                return []
+
+            candidates = set()
+            for kind in ("p", "n"):
+                for key in self._bucket_keys.get((kind, row), ()):
+                    candidates |= self._buckets[key]
+            candidates.discard(row)
+
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            rows = rows[self._label_ids[rows] == self._label_ids[row]]
+            if len(rows) == 0:
+                return []
+
+            # Entities without properties have no property similarity
+            property_similarity = np.mean(self._property_signatures[rows] == self._property_signatures[row], axis=1)
+            property_similarity[~(self._has_properties[rows] & self._has_properties[row])] = 0.0
+
+            # Entities without neighbours have no neighbour similarity
+            neighbor_similarity = np.mean(self._neighbor_signatures[rows] == self._neighbor_signatures[row], axis=1)
+            neighbor_similarity[~(self._has_neighbors[rows] & self._has_neighbors[row])] = 0.0
+
+            similarity = PROPERTY_WEIGHT * property_similarity + (1 - PROPERTY_WEIGHT) * neighbor_similarity
+            keep = similarity >= threshold
+            rows, similarity = rows[keep], similarity[keep]
+            order = np.argsort(-similarity, kind="stable")[:limit]
+
+            return [(self._ids[rows[position]], float(similarity[position])) for position in order.tolist()]
+
+    def _allocate_row(self, entity_id: str) -> int:
+        """Assign a row to a new entity, growing the matrices if needed."""
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = entity_id
+        else:
+            row = len(self._ids)
+            self._ids.append(entity_id)
+            if row >= len(self._label_ids):
+                capacity = 2 * len(self._label_ids)
+                self._property_signatures = self._grow(self._property_signatures, capacity)
+                self._neighbor_signatures = self._grow(self._neighbor_signatures, capacity)
+                self._label_ids = np.concatenate(
+                    [self._label_ids, np.full(capacity - len(self._label_ids), -1, dtype=np.int64)]
+                )
+                self._has_properties = self._grow(self._has_properties, capacity)
+                self._has_neighbors = self._grow(self._has_neighbors, capacity)
+
+        self._row_of[entity_id] = row
+        return row
+
+    @staticmethod
+    def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+        """Return a zero-padded copy of an array with more rows."""
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _update_neighbor_signature(self, entity_id: str):
+        """Recompute the neighbour signature of an entity from its neighbour set."""
+        row = self._row_of[entity_id]
+        neighbors = self._neighbors.get(entity_id, {})
+        self._has_neighbors[row] = bool(neighbors)
+        self._set_signature("n", row, self.hasher.signature(neighbors))
+
+    def _set_signature(self, kind: str, row: int, signature: np.ndarray):
+        """Store a signature and move the row to the buckets of its bands."""
+        signatures = self._property_signatures if kind == "p" else self._neighbor_signatures
+        signatures[row] = signature
+        self._unbucket(kind, row)
+
+        # Entities without properties or neighbours would all share every band
+        # of that kind, as the empty set has the same signature
+        if not (self._has_properties if kind == "p" else self._has_neighbors)[row]:
+            return
+
+        keys = []
+        for band in range(self.bands):
+            start = band * self.rows_per_band
+            key = (kind, band, signature[start:start + self.rows_per_band].tobytes())
+            self._buckets.setdefault(key, set()).add(row)
+            keys.append(key)
+        self._bucket_keys[(kind, row)] = keys
+
+    def _unbucket(self, kind: str, row: int):
+        """Remove a row from the buckets of one kind of signature."""
+        for key in self._bucket_keys.pop((kind, row), ()):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(row)
+                if not bucket:
+                    del self._buckets[key]
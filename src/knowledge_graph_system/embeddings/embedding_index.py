@@ -0,0 +1,460 @@
+"""
+Embedding Index for the Knowledge Graph System.
+
+This module stores entity embeddings in a contiguous float32 matrix with an
+entity ID to row map and answers cosine similarity queries with batched matrix
+products. It includes:
+
+1. Exact top-k search and thresholded all-pairs search in fixed-size blocks
+2. Saving to disk and memory-mapped loading of the embedding matrix
+3. An optional random-projection LSH mode for approximate search over very
+   large collections (more than a million vectors)
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of matrix rows multiplied per block by the search operations
+DEFAULT_BLOCK_SIZE = 4096
+
+# Bytes of scores and threshold mask computed per tile by all-pairs searches
+PAIR_TILE_BYTES = 64 * 1024 * 1024
+
+
+class RandomProjectionLSH:
+    """
+    Random-projection locality sensitive hashing for cosine similarity.
+
+    Each table hashes a vector to the sign pattern of its projections onto
+    ``n_bits`` random hyperplanes; similar vectors share a bucket in at least
+    one table with high probability.
+    """
+
+    def __init__(self, dimension: int, n_bits: int = 16, n_tables: int = 8, seed: int = 0):
+        """
+        Initialize the hash tables.
+
+        Args:
+            dimension: Dimension of the vectors
+            n_bits: Hyperplanes per table; more bits give smaller buckets
+            n_tables: Number of tables; more tables give higher recall
+            seed: Seed for the random hyperplanes
+        """
+        if not 1 <= n_bits <= 63 or n_tables < 1:
+            raise ValueError("n_bits must be between 1 and 63 and n_tables at least 1")
+
+        rng = np.random.default_rng(seed)
+        self.n_bits = n_bits
+        self.n_tables = n_tables
+        self.planes = rng.standard_normal((n_tables * n_bits, dimension)).astype(np.float32)
+        self._weights = np.left_shift(np.uint64(1), np.arange(n_bits, dtype=np.uint64))
+        self.tables: List[Dict[int, Set[str]]] = [{} for _ in range(n_tables)]
+        self._keys: Dict[str, Tuple[int, ...]] = {}
+
+    def hash(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Hash vectors in every table.
+
+        Args:
+            vectors: Matrix of vectors, one per row
+
+        Returns:
+            Matrix of bucket keys with one column per table
+        """
+        bits = (vectors @ self.planes.T) > 0
+        bits = bits.reshape(len(vectors), self.n_tables, self.n_bits)
+        return (bits * self._weights).sum(axis=2, dtype=np.uint64)
+
+    def add(self, entity_ids: Sequence[str], vectors: np.ndarray):
+        """Add vectors to the tables."""
+        for entity_id, keys in zip(entity_ids, self.hash(vectors).tolist()):
+            self.remove(entity_id)
+            self._keys[entity_id] = tuple(keys)
+            for table, key in zip(self.tables, keys):
+                table.setdefault(key, set()).add(entity_id)
+
+    def remove(self, entity_id: str):
+        """Remove a vector from the tables."""
+        keys = self._keys.pop(entity_id, None)
+        if keys is None:
+            return
+
+        for table, key in zip(self.tables, keys):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(entity_id)
+                if not bucket:
+                    del table[key]
+
+    def candidates(self, vector: np.ndarray) -> Set[str]:
+        """Return the IDs that share a bucket with a vector in any table."""
+        candidates = set()
+        for table, key in zip(self.tables, self.hash(vector.reshape(1, -1))[0].tolist()):
+            candidates.update(table.get(key, ()))
+        return candidates
+
+    def buckets(self) -> Iterator[Set[str]]:
+        """Iterate over the buckets that hold more than one vector."""
+        for table in self.tables:
+            for bucket in table.values():
+                if len(bucket) > 1:
+                    yield bucket
+
+
+class EmbeddingIndex:
+    """
+    Cosine similarity index over entity embeddings.
+
+    Embeddings are normalised to unit length and stored in the rows of a
+    contiguous float32 matrix, so similarity is a matrix product. Removing an
+    entity moves the last row into its place to keep the matrix contiguous.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 1024, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimension: Dimension of the embeddings
+            capacity: Number of rows to allocate up front
+            block_size: Number of rows multiplied per block by searches
+        """
+        if dimension < 1 or block_size < 1:
+            raise ValueError("dimension and block_size must be at least 1")
+
+        self.dimension = dimension
+        self.block_size = block_size
+        self.vectors = np.zeros((max(capacity, 1), dimension), dtype=np.float32)
+        self.id_to_row: Dict[str, int] = {}
+        self.row_ids: List[str] = []
+        self.lsh: Optional[RandomProjectionLSH] = None
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.id_to_row
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The normalised embeddings, one row per entity."""
+        return self.vectors[:len(self.row_ids)]
+
+    def add(self, entity_id: str, embedding: Sequence[float]):
+        """
+        Add or replace the embedding of an entity.
+
+        Args:
+            entity_id: ID of the entity
+            embedding: Embedding vector
+        """
+        self.add_many([entity_id], [embedding])
+
+    def add_many(self, entity_ids: Sequence[str], embeddings: Union[Sequence[Sequence[float]], np.ndarray]):
+        """
+        Add or replace the embeddings of several entities.
+
+        Args:
+            entity_ids: IDs of the entities
+            embeddings: Embedding vectors in the same order as the IDs
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape != (len(entity_ids), self.dimension):
+            raise ValueError(
+                f"Expected {len(entity_ids)} embeddings of dimension {self.dimension}, "
+                f"got shape {vectors.shape}"
+            )
+
+        self._reserve(len(self.row_ids) + len(entity_ids))
+
+        rows = []
+        for entity_id in entity_ids:
+            row = self.id_to_row.get(entity_id)
+            if row is None:
+                row = len(self.row_ids)
+                self.id_to_row[entity_id] = row
+                self.row_ids.append(entity_id)
+            rows.append(row)
+
+        vectors = self._normalize(vectors)
+        self.vectors[rows] = vectors
+
+        if self.lsh is not None:
+            self.lsh.add(entity_ids, vectors)
+
+    def remove(self, entity_id: str) -> bool:
+        """
+        Remove the embedding of an entity.
+
+        Args:
+            entity_id: ID of the entity
+
+        Returns:
+            True if the entity was in the index
+        """
+        row = self.id_to_row.pop(entity_id, None)
+        if row is None:
+            return False
+
+        self._ensure_writable()
+        last_row = len(self.row_ids) - 1
+        last_id = self.row_ids.pop()
+        if row != last_row:
+            self.vectors[row] = self.vectors[last_row]
+            self.row_ids[row] = last_id
+            self.id_to_row[last_id] = row
+
+        if self.lsh is not None:
+            self.lsh.remove(entity_id)
+
+        return True
+
+    def get(self, entity_id: str) -> Optional[np.ndarray]:
+        """Return the normalised embedding of an entity, or None."""
+        row = self.id_to_row.get(entity_id)
+        return None if row is None else self.vectors[row]
+
+    def enable_approximate(self, n_bits: int = 16, n_tables: int = 8, seed: int = 0):
+        """
+        Enable approximate search with random-projection LSH.
+
+        Exact search is a full scan of the matrix; for collections of more than a
+        million vectors the LSH tables restrict each query to the vectors that
+        share a bucket with it, at some cost in recall.
+
+        Args:
+            n_bits: Hyperplanes per table
+            n_tables: Number of tables
+            seed: Seed for the random hyperplanes
+        """
+        self.lsh = RandomProjectionLSH(self.dimension, n_bits=n_bits, n_tables=n_tables, seed=seed)
+        for start in range(0, len(self.row_ids), self.block_size):
+            end = start + self.block_size
+            self.lsh.add(self.row_ids[start:end], self.vectors[start:end])
+
+        logger.info(f"Enabled approximate search over {len(self.row_ids)} embeddings "
+                    f"with {n_tables} tables of {n_bits} bits")
+
+    def search(self, embedding: Sequence[float], k: int = 10, threshold: Optional[float] = None,
+               exclude: Iterable[str] = (), approximate: Optional[bool] = None) -> List[Tuple[str, float]]:
+        """
+        Find the entities most similar to an embedding.
+
+        Args:
+            embedding: Query vector
+            k: Maximum number of results
+            threshold: Optional minimum cosine similarity
+            exclude: IDs to leave out of the results
+            approximate: Whether to search the LSH tables; defaults to whether
+                approximate search is enabled
+
+        Returns:
+            List of (entity_id, similarity) tuples, most similar first
+        """
+        query = self._normalize(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+        excluded_rows = {self.id_to_row[entity_id] for entity_id in exclude if entity_id in self.id_to_row}
+
+        if self._use_approximate(approximate):
+            rows = np.fromiter(
+                (self.id_to_row[entity_id] for entity_id in self.lsh.candidates(query)),
+                dtype=np.int64
+            )
+            rows = rows[~np.isin(rows, list(excluded_rows))]
+            candidates = [(rows, self.vectors[rows] @ query)]
+        else:
+            candidates = self._scan(query, k, excluded_rows)
+
+        rows = np.concatenate([block_rows for block_rows, _ in candidates])
+        scores = np.concatenate([block_scores for _, block_scores in candidates])
+        if threshold is not None:
+            keep = scores >= threshold
+            rows, scores = rows[keep], scores[keep]
+
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(self.row_ids[row], float(score)) for row, score in zip(rows[order].tolist(), scores[order])]
+
+    def top_k_similar(self, entity_id: str, k: int = 10, threshold: Optional[float] = None,
+                      approximate: Optional[bool] = None) -> List[Tuple[str, float]]:
+        """
+        Find the entities most similar to an indexed entity.
+
+        Args:
+            entity_id: ID of the entity
+            k: Maximum number of results
+            threshold: Optional minimum cosine similarity
+            approximate: Whether to search the LSH tables
+
+        Returns:
+            List of (entity_id, similarity) tuples, most similar first, or an
+            empty list if the entity has no embedding
+        """
+        embedding = self.get(entity_id)
+        if embedding is None:
+            return []
+        return self.search(embedding, k=k, threshold=threshold, exclude=[entity_id], approximate=approximate)
+
+    def similar_pairs(self, threshold: float, entity_ids: Optional[Sequence[str]] = None,
+                      approximate: Optional[bool] = None) -> List[Tuple[str, str, float]]:
+        """
+        Find all pairs of entities whose similarity reaches a threshold.
+
+        Args:
+            threshold: Minimum cosine similarity
+            entity_ids: Optional IDs to restrict the pairs to; pairs are ordered as
+                in this sequence
+            approximate: Whether to only compare entities that share an LSH bucket
+
+        Returns:
+            List of (entity_id1, entity_id2, similarity) tuples
+        """
+        if entity_ids is None:
+            rows = np.arange(len(self.row_ids), dtype=np.int64)
+        else:
+            rows = np.fromiter(
+                (self.id_to_row[entity_id] for entity_id in dict.fromkeys(entity_ids) if entity_id in self.id_to_row),
+                dtype=np.int64
+            )
+
+        if not self._use_approximate(approximate):
+            return [
+                (self.row_ids[row1], self.row_ids[row2], score)
+                for row1, row2, score in self._threshold_pairs(rows, threshold)
+            ]
+
+        # Compare only within buckets, keeping the order of the requested rows
+        positions = {row: position for position, row in enumerate(rows.tolist())}
+        pairs = {}
+        for bucket in self.lsh.buckets():
+            bucket_rows = sorted(
+                (self.id_to_row[entity_id] for entity_id in bucket if self.id_to_row[entity_id] in positions),
+                key=positions.get
+            )
+            if len(bucket_rows) > 1:
+                for row1, row2, score in self._threshold_pairs(np.asarray(bucket_rows, dtype=np.int64), threshold):
+                    pairs[(row1, row2)] = score
+
+        return [(self.row_ids[row1], self.row_ids[row2], score) for (row1, row2), score in pairs.items()]
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save the index to a directory.
+
+        Args:
+            path: Directory for the embedding matrix and the ID map
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "vectors.npy", self.matrix)
+        with open(path / "ids.json", "w") as f:
+            json.dump(self.row_ids, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap_mode: Optional[str] = "r",
+             block_size: int = DEFAULT_BLOCK_SIZE) -> 'EmbeddingIndex':
+        """
+        Load an index saved with ``save``.
+
+        Args:
+            path: Directory the index was saved to
+            mmap_mode: Memory-map mode for the embedding matrix, or None to read it
+                into memory; a read-only map is copied into memory on the first write
+            block_size: Number of rows multiplied per block by searches
+
+        Returns:
+            Loaded embedding index
+        """
+        path = Path(path)
+        vectors = np.load(path / "vectors.npy", mmap_mode=mmap_mode)
+        with open(path / "ids.json") as f:
+            row_ids = json.load(f)
+
+        index = cls(vectors.shape[1], capacity=1, block_size=block_size)
+        index.vectors = vectors
+        index.row_ids = row_ids
+        index.id_to_row = {entity_id: row for row, entity_id in enumerate(row_ids)}
+        return index
+
+    def _use_approximate(self, approximate: Optional[bool]) -> bool:
+        """Resolve whether a query uses the LSH tables."""
+        if approximate and self.lsh is None:
+            raise ValueError("Approximate search is not enabled; call enable_approximate first")
+        return self.lsh is not None if approximate is None else approximate
+
+    def _scan(self, query: np.ndarray, k: int, excluded_rows: Set[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Score every row in blocks, keeping the best k rows of each block."""
+        candidates = [(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))]
+        if k < 1:
+            return candidates
+
+        for start in range(0, len(self.row_ids), self.block_size):
+            scores = self.vectors[start:start + self.block_size] @ query
+            rows = np.arange(start, start + len(scores), dtype=np.int64)
+
+            for row in excluded_rows:
+                if start <= row < start + len(scores):
+                    scores[row - start] = -np.inf
+
+            if len(scores) > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[best], scores[best]
+
+            keep = np.isfinite(scores)
+            candidates.append((rows[keep], scores[keep]))
+
+        return candidates
+
+    def _threshold_pairs(self, rows: np.ndarray, threshold: float) -> Iterator[Tuple[int, int, float]]:
+        """
+        Yield the pairs of rows, in the given order, whose similarity reaches a threshold.
+
+        Each block of rows is compared with the rows from its own position on, in
+        tiles of as many columns as fit in ``PAIR_TILE_BYTES``, so memory use does
+        not grow with the number of rows.
+        """
+        for start in range(0, len(rows), self.block_size):
+            block = self.vectors[rows[start:start + self.block_size]]
+            # A float32 score and a boolean mask entry per tile cell
+            width = max(1, PAIR_TILE_BYTES // (5 * len(block)))
+
+            hits = []
+            for column_start in range(start, len(rows), width):
+                scores = block @ self.vectors[rows[column_start:column_start + width]].T
+                i, j = np.nonzero(scores >= threshold)
+                # Keep each unordered pair once: column position after row position
+                keep = column_start + j > start + i
+                hits.append((start + i[keep], column_start + j[keep], scores[i[keep], j[keep]]))
+
+            positions1, positions2, pair_scores = (np.concatenate(values) for values in zip(*hits))
+            for k in np.lexsort((positions2, positions1)).tolist():
+                yield int(rows[positions1[k]]), int(rows[positions2[k]]), float(pair_scores[k])
+
+    def _reserve(self, size: int):
+        """Grow the matrix so it holds at least ``size`` rows."""
+        self._ensure_writable()
+        if size <= len(self.vectors):
+            return
+
+        capacity = max(size, 2 * len(self.vectors))
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:len(self.row_ids)] = self.matrix
+        self.vectors = vectors
+
+    def _ensure_writable(self):
+        """Copy a read-only memory map into memory before it is modified."""
+        if not self.vectors.flags.writeable:
+            self.vectors = np.array(self.vectors)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Scale vectors to unit length, leaving zero vectors unchanged."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
@@ -0,0 +1,68 @@
+"""
+Command line entry point for exporting and importing the knowledge graph.
+
+Usage:
+    python -m src.knowledge_graph_system.graph_transfer export graph.ndjson.gz
+    python -m src.knowledge_graph_system.graph_transfer import graph.ndjson.gz --config db_config.json
+
+The database connection is read from the configuration file if one is given,
+and from the NEO4J_* environment variables otherwise. An interrupted transfer
+resumes from its checkpoint when the same command is run again.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from src.knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
+from src.knowledge_graph_system.core.knowledge_graph_manager import KnowledgeGraphManager
+from src.knowledge_graph_system.core.utils.ndjson_stream import COMPRESSIONS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(description="Export or import the knowledge graph as NDJSON")
+    parser.add_argument("command", choices=["export", "import"], help="Transfer direction")
+    parser.add_argument("path", help="NDJSON file to write or read")
+    parser.add_argument("--config", help="Neo4j configuration file (defaults to NEO4J_* environment variables)")
+    parser.add_argument("--batch-size", type=int, default=KnowledgeGraphManager.DEFAULT_BATCH_SIZE,
+                        help="Entities or records per batch")
+    parser.add_argument("--compression", choices=COMPRESSIONS,
+                        help="Compression format (inferred from the file suffix by default)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (defaults to PATH.checkpoint)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run an export or import.
+
+    Args:
+        argv: Command line arguments (defaults to ``sys.argv[1:]``)
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+
+    db_manager = Neo4jManager.from_config(args.config) if args.config else Neo4jManager.from_env()
+    kg_manager = KnowledgeGraphManager(db_manager, batch_size=args.batch_size)
+
+    try:
+        transfer = kg_manager.export_stream if args.command == "export" else kg_manager.import_stream
+        result = transfer(args.path, compression=args.compression, checkpoint_path=args.checkpoint)
+    finally:
+        kg_manager.close()
+
+    print(json.dumps(result))
+    return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Adjacency Index for graph-structure connection discovery.
+
+This module provides an in-memory, undirected adjacency of the knowledge graph in
+compressed sparse row (CSR) form. It is built from a single bulk fetch of the
+edge list and answers neighbourhood queries with vectorised sparse products, so
+that connection discovery only considers pairs that are reachable from each other.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AdjacencyIndex:
+    """
+    Undirected adjacency matrix of the graph in CSR form.
+
+    Rows are assigned to entity IDs in the order they are first seen. Edges added
+    after the index was built are kept in a per-row overlay until ``compact`` folds
+    them into the CSR arrays.
+    """
+
+    # Fold the overlay into the CSR arrays once it holds this share of the edges
+    COMPACT_RATIO = 0.1
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.id_to_row: Dict[str, int] = {}
+        self.row_ids: List[str] = []
+        self.edge_types: Dict[Tuple[int, int], str] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self._overlay: Dict[int, Set[int]] = {}
+        self._overlay_edges = 0
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str, Optional[str]]]) -> 'AdjacencyIndex':
+        """
+        Build an index from an edge list.
+
+        Args:
+            edges: (source_id, target_id, relationship_type) tuples
+
+        Returns:
+            Adjacency index over all entities that appear in the edges
+        """
+        index = cls()
+        sources = []
+        targets = []
+
+        for source_id, target_id, relationship_type in edges:
+            source = index._ensure_row(source_id)
+            target = index._ensure_row(target_id)
+            if source == target:
+                continue
+
+            sources.append(source)
+            targets.append(target)
+            if relationship_type:
+                index.edge_types.setdefault((source, target), relationship_type)
+
+        index._build(np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64))
+        return index
+
+    @property
+    def size(self) -> int:
+        """Number of entities in the index."""
+        return len(self.row_ids)
+
+    def row(self, entity_id: str) -> Optional[int]:
+        """Return the row of an entity, or None if it has no edges."""
+        return self.id_to_row.get(entity_id)
+
+    def neighbors(self, row: int) -> np.ndarray:
+        """
+        Get the neighbours of a row.
+
+        Args:
+            row: Row of the entity
+
+        Returns:
+            Sorted array of neighbour rows
+        """
+        if row >= len(self.indptr) - 1:
+            base = self.indices[:0]
+        else:
+            base = self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+        extra = self._overlay.get(row)
+        if extra:
+            return np.union1d(base, np.fromiter(extra, dtype=np.int64, count=len(extra)))
+        return base
+
+    def degree(self, row: int) -> int:
+        """Return the number of neighbours of a row."""
+        return len(self.neighbors(row))
+
+    def has_edge(self, row1: Optional[int], row2: Optional[int]) -> bool:
+        """Check whether two rows are directly connected."""
+        if row1 is None or row2 is None:
+            return False
+
+        neighbors = self.neighbors(row1)
+        position = np.searchsorted(neighbors, row2)
+        return bool(position < len(neighbors) and neighbors[position] == row2)
+
+    def edge_type(self, row1: int, row2: int) -> Optional[str]:
+        """Return the relationship type of an edge in either direction."""
+        return self.edge_types.get((row1, row2)) or self.edge_types.get((row2, row1))
+
+    def walk_counts(self, row: int, max_length: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Count walks of each length starting at a row.
+
+        This is the sparse product of the row's indicator vector with successive
+        powers of the adjacency matrix. Between two non-adjacent entities every
+        walk of length two or three is a simple path.
+
+        Args:
+            row: Starting row
+            max_length: Longest walk to count
+
+        Returns:
+            One (rows, counts) pair per length 1..max_length
+        """
+        frontier_rows = np.array([row], dtype=np.int64)
+        frontier_counts = np.ones(1, dtype=np.int64)
+        walks = []
+
+        for _ in range(max_length):
+            frontier_rows, frontier_counts = self._propagate(frontier_rows, frontier_counts)
+            walks.append((frontier_rows, frontier_counts))
+            if len(frontier_rows) == 0:
+                break
+
+        while len(walks) < max_length:
+            walks.append((frontier_rows[:0], frontier_counts[:0]))
+
+        return walks
+
+    def within_hops(self, rows: Iterable[int], hops: int) -> Set[int]:
+        """
+        Get the rows within a number of hops of the given rows.
+
+        Args:
+            rows: Starting rows
+            hops: Maximum number of hops
+
+        Returns:
+            Set of rows, including the starting rows
+        """
+        reached = set(rows)
+        frontier = set(reached)
+
+        for _ in range(hops):
+            next_frontier = set()
+            for row in frontier:
+                next_frontier.update(self.neighbors(row).tolist())
+            frontier = next_frontier - reached
+            reached |= frontier
+            if not frontier:
+                break
+
+        return reached
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Optional[str]]]) -> Set[int]:
+        """
+        Add edges to the index.
+
+        Args:
+            edges: (source_id, target_id, relationship_type) tuples
+
+        Returns:
+            Rows whose neighbourhood changed
+        """
+        touched = set()
+
+        for source_id, target_id, relationship_type in edges:
+            source = self._ensure_row(source_id)
+            target = self._ensure_row(target_id)
+            if source == target or self.has_edge(source, target):
+                continue
+
+            self._overlay.setdefault(source, set()).add(target)
+            self._overlay.setdefault(target, set()).add(source)
+            self._overlay_edges += 1
+            if relationship_type:
+                self.edge_types.setdefault((source, target), relationship_type)
+            touched.update((source, target))
+
+        if self._overlay_edges > self.COMPACT_RATIO * max(len(self.indices) // 2, 1):
+            self.compact()
+
+        return touched
+
+    def compact(self):
+        """Fold edges added since the last build into the CSR arrays."""
+        if not self._overlay:
+            return
+
+        counts = np.diff(self.indptr)
+        sources = [np.repeat(np.arange(len(counts), dtype=np.int64), counts)]
+        targets = [self.indices]
+
+        for row, extra in self._overlay.items():
+            sources.append(np.full(len(extra), row, dtype=np.int64))
+            targets.append(np.fromiter(extra, dtype=np.int64, count=len(extra)))
+
+        self._overlay = {}
+        self._overlay_edges = 0
+
+        # Both directions are already present, so build without mirroring
+        self._build(np.concatenate(sources), np.concatenate(targets), symmetric=True)
+
+    def _ensure_row(self, entity_id: str) -> int:
+        """Return the row of an entity, assigning a new one if needed."""
+        row = self.id_to_row.get(entity_id)
+        if row is None:
+            row = len(self.row_ids)
+            self.id_to_row[entity_id] = row
+            self.row_ids.append(entity_id)
+        return row
+
+    def _build(self, sources: np.ndarray, targets: np.ndarray, symmetric: bool = False):
+        """Build the CSR arrays from edge endpoint arrays."""
+        if not symmetric:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+
+        # Sort by (row, column) and drop duplicate edges
+        order = np.lexsort((targets, sources))
+        sources = sources[order]
+        targets = targets[order]
+        if len(sources):
+            keep = np.ones(len(sources), dtype=bool)
+            keep[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+            sources = sources[keep]
+            targets = targets[keep]
+
+        self.indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self.size), out=self.indptr[1:])
+        self.indices = targets
+
+    def _propagate(self, rows: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Multiply a sparse row vector by the adjacency matrix."""
+        if self._overlay:
+            gathered = [self.neighbors(row) for row in rows.tolist()]
+            lengths = np.fromiter((len(g) for g in gathered), dtype=np.int64, count=len(gathered))
+            columns = np.concatenate(gathered) if gathered else self.indices[:0]
+        else:
+            in_range = rows < len(self.indptr) - 1
+            rows, counts = rows[in_range], counts[in_range]
+            starts = self.indptr[rows]
+            lengths = self.indptr[rows + 1] - starts
+
+            # Gather all neighbour slices in one vectorised operation
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            columns = self.indices[offsets + np.arange(lengths.sum())]
+
+        if len(columns) == 0:
+            return columns, counts[:0]
+
+        weights = np.repeat(counts, lengths)
+        unique_columns, inverse = np.unique(columns, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights).astype(np.int64)
+        return unique_columns, totals
@@ -7,6 +7,11 @@ from pathlib import Path
 import json
 import itertools
 
+import numpy as np
+
+from src.knowledge_graph_system.embeddings.embedding_index import EmbeddingIndex
+from src.knowledge_graph_system.knowledge_graph.adjacency_index import AdjacencyIndex
+
 class ConnectionDiscoveryEngine:
     """
     Discovers and analyzes connections between entities in the knowledge graph.
@@ -16,15 +21,20 @@ class ConnectionDiscoveryEngine:
     various discovery strategies.
     """
     
-    def __init__(self, graph_manager, config_path: Optional[Path] = None):
+    def __init__(self, graph_manager, config_path: Optional[Path] = None,
+                 embedding_index: Optional[EmbeddingIndex] = None):
         """
         Initialize the ConnectionDiscoveryEngine with a graph manager and optional configuration.
         
         Args:
             graph_manager: The knowledge graph manager instance
             config_path: Optional path to a configuration file
+            embedding_index: Optional index of entity embeddings; defaults to the
+                graph manager's index, and otherwise to an index built from the
+                embeddings of the analyzed entities
         """
         self.graph_manager = graph_manager
+        self.embedding_index = embedding_index or getattr(graph_manager, 'embedding_index', None)
         self.logger = logging.getLogger(__name__)
         
         # Default configuration
@@ -52,6 +62,18 @@ class ConnectionDiscoveryEngine:
             'citation_patterns': self._find_citation_patterns,
             'attribute_similarity': self._find_attribute_similarities
         }
+        
+        # Strategies scored from the adjacency index, which can be re-scored per entity
+        self.graph_strategies = {
+            'common_neighbors': self._score_common_neighbors,
+            'path_based': self._score_path_based
+        }
+        
+        # Adjacency snapshot, and the entities and results of the last full discovery run
+        self.adjacency: Optional[AdjacencyIndex] = None
+        self._analysis_entities: Optional[List[Dict[str, Any]]] = None
+        self._connection_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._cache_filters: Optional[Tuple[Optional[Tuple[str, ...]], Optional[Tuple[str, ...]]]] = None
     
     def _load_config(self, config_path: Path) -> None:
         """
@@ -77,16 +99,23 @@ class ConnectionDiscoveryEngine:
         entity_ids: Optional[List[str]] = None, 
         entity_types: Optional[List[str]] = None,
         strategies: Optional[List[str]] = None,
-        limit: int = 100
+        limit: int = 100,
+        incremental: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Discover potential connections between entities.
         
+        A full run takes a fresh snapshot of the adjacency with one bulk query and
+        keeps its results. An incremental run returns those results as updated by
+        ``add_edges`` since, and falls back to a full run if there are none or if
+        they were discovered for other entity IDs or types.
+        
         Args:
             entity_ids: Optional list of entity IDs to focus on
             entity_types: Optional list of entity types to focus on
             strategies: Optional list of discovery strategies to use
             limit: Maximum number of connections to return
+            incremental: Whether to reuse the results of the last full run
             
         Returns:
             List of potential connections with metadata
@@ -98,23 +127,137 @@ class ConnectionDiscoveryEngine:
         # Validate strategies
         valid_strategies = [s for s in strategies if s in self.discovery_strategies]
         
-        # Get entities to analyze
-        entities = self._get_entities_for_analysis(entity_ids, entity_types)
+        filters = (
+            tuple(sorted(set(entity_ids))) if entity_ids is not None else None,
+            tuple(sorted(set(entity_types))) if entity_types is not None else None
+        )
         
-        # Apply each selected strategy and collect results
-        connections = []
-        for strategy in valid_strategies:
-            strategy_func = self.discovery_strategies[strategy]
-            strategy_connections = strategy_func(entities)
+        if not incremental or filters != self._cache_filters or \
+                not all(s in self._connection_cache for s in valid_strategies):
+            self.build_adjacency_index()
+            
+            # Get entities to analyze
+            entities = self._get_entities_for_analysis(entity_ids, entity_types)
+            self._analysis_entities = entities
+            self._connection_cache = {}
+            self._cache_filters = filters
             
-            for conn in strategy_connections:
-                conn['discovery_method'] = strategy
-                connections.append(conn)
+            # Apply each selected strategy and keep its results
+            for strategy in valid_strategies:
+                strategy_func = self.discovery_strategies[strategy]
+                strategy_connections = strategy_func(entities)
+                
+                for conn in strategy_connections:
+                    conn['discovery_method'] = strategy
+                self._connection_cache[strategy] = strategy_connections
+        
+        connections = [
+            conn for strategy in valid_strategies for conn in self._connection_cache[strategy]
+        ]
         
         # Sort by confidence and limit results
         connections.sort(key=lambda x: x.get('confidence', 0), reverse=True)
         return connections[:limit]
     
+    def build_adjacency_index(self) -> AdjacencyIndex:
+        """
+        Build the adjacency index from a single bulk fetch of the edge list.
+        
+        Returns:
+            The new adjacency index
+        """
+        edges = self.graph_manager.get_edge_list()
+        self.adjacency = AdjacencyIndex.from_edges(
+            (edge['source_id'], edge['target_id'], edge.get('type')) for edge in edges
+        )
+        self.logger.info(f"Built adjacency index of {self.adjacency.size} entities from {len(edges)} edges")
+        return self.adjacency
+    
+    def add_edges(self, edges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add new edges and re-score only the connections they affect.
+        
+        Common neighbour scores change only for the endpoints of a new edge, and path
+        scores only for entities within ``path_max_length - 1`` hops of an endpoint.
+        Cached connections of every strategy between entities that are now directly
+        connected are dropped.
+        
+        Args:
+            edges: New edges as dictionaries with source_id, target_id and type
+            
+        Returns:
+            List of re-scored connections
+        """
+        adjacency = self._get_adjacency()
+        touched = adjacency.add_edges(
+            (edge['source_id'], edge['target_id'], edge.get('type')) for edge in edges
+        )
+        
+        if not touched or self._analysis_entities is None:
+            return []
+        
+        entities = self._analysis_entities
+        positions = self._get_entity_positions(entities)
+        hops = {
+            'common_neighbors': 0,
+            'path_based': max(self.config['path_max_length'] - 1, 0)
+        }
+        
+        rescored = []
+        for strategy, scorer in self.graph_strategies.items():
+            if strategy not in self._connection_cache:
+                continue
+            
+            affected_rows = adjacency.within_hops(touched, hops[strategy])
+            affected_ids = {adjacency.row_ids[row] for row in affected_rows}
+            kept = [
+                conn for conn in self._connection_cache[strategy]
+                if conn['source_id'] not in affected_ids and conn['target_id'] not in affected_ids
+            ]
+            
+            # Re-score every pair of an affected entity, once per pair
+            updated = {}
+            for row in affected_rows:
+                if row not in positions:
+                    continue
+                for conn in scorer(row, entities, positions):
+                    conn['discovery_method'] = strategy
+                    updated[(conn['source_id'], conn['target_id'])] = conn
+            
+            self._connection_cache[strategy] = kept + list(updated.values())
+            rescored.extend(updated.values())
+        
+        for strategy, connections in self._connection_cache.items():
+            if strategy not in self.graph_strategies:
+                self._connection_cache[strategy] = [
+                    conn for conn in connections
+                    if not self._directly_connected(conn['source_id'], conn['target_id'])
+                ]
+        
+        rescored.sort(key=lambda x: x.get('confidence', 0), reverse=True)
+        return rescored
+    
+    def _get_adjacency(self) -> AdjacencyIndex:
+        """Get the adjacency index, building it on first use."""
+        if self.adjacency is None:
+            self.build_adjacency_index()
+        return self.adjacency
+    
+    def _directly_connected(self, entity_id1: str, entity_id2: str) -> bool:
+        """Check whether two entities are directly connected in the adjacency index."""
+        adjacency = self._get_adjacency()
+        return adjacency.has_edge(adjacency.row(entity_id1), adjacency.row(entity_id2))
+    
+    def _get_entity_positions(self, entities: List[Dict[str, Any]]) -> Dict[int, int]:
+        """Map the adjacency rows of entities to their positions in the list."""
+        adjacency = self._get_adjacency()
+        positions = {}
+        for position, entity in enumerate(entities):
+            row = adjacency.row(entity['id'])
+            if row is not None:
+                positions.setdefault(row, position)
+        return positions
+    
     def _get_entities_for_analysis(
         self, 
         entity_ids: Optional[List[str]], 
@@ -153,49 +296,81 @@ class ConnectionDiscoveryEngine:
         """
         Find potential connections based on common neighbors.
         
+        Candidate pairs come only from the 2-hop neighbourhood of each entity in the
+        adjacency index, rather than from all pairs of entities.
+        
         Args:
             entities: List of entities to analyze
             
         Returns:
             List of potential connections with confidence scores
         """
+        positions = self._get_entity_positions(entities)
+        
         connections = []
+        for row, position in positions.items():
+            connections.extend(self._score_common_neighbors(row, entities, positions, after=position))
+        
+        return connections
+    
+    def _score_common_neighbors(
+        self,
+        row: int,
+        entities: List[Dict[str, Any]],
+        positions: Dict[int, int],
+        after: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score the common neighbor connections of one entity.
         
-        # Create pairs of entities to analyze
-        entity_pairs = list(itertools.combinations(entities, 2))
+        Common neighbour counts are the entity's row of the sparse product A·A.
         
-        for entity1, entity2 in entity_pairs:
+        Args:
+            row: Adjacency row of the entity
+            entities: List of entities to analyze
+            positions: Adjacency rows of the entities mapped to their positions
+            after: If given, only score pairs with entities after this position
+            
+        Returns:
+            List of potential connections with confidence scores
+        """
+        adjacency = self.adjacency
+        columns, counts = adjacency.walk_counts(row, 2)[1]
+        candidates = (counts >= self.config['min_common_connections']) & (columns != row)
+        degree = adjacency.degree(row)
+        
+        connections = []
+        for column, common_count in zip(columns[candidates].tolist(), counts[candidates].tolist()):
+            position = positions.get(column)
+            if position is None or (after is not None and position <= after):
+                continue
+            
             # Skip if already directly connected
-            if self.graph_manager.check_direct_connection(entity1['id'], entity2['id']):
+            if adjacency.has_edge(row, column):
                 continue
-                
-            # Get neighbors for both entities
-            neighbors1 = self.graph_manager.get_neighbors(entity1['id'])
-            neighbors2 = self.graph_manager.get_neighbors(entity2['id'])
-            
-            # Find common neighbors
-            neighbor_ids1 = {n['id'] for n in neighbors1}
-            neighbor_ids2 = {n['id'] for n in neighbors2}
-            common_neighbors = neighbor_ids1.intersection(neighbor_ids2)
-            
-            # If enough common connections, suggest a relationship
-            if len(common_neighbors) >= self.config['min_common_connections']:
-                # Calculate confidence score based on proportion of common neighbors
-                total_neighbors = len(neighbor_ids1.union(neighbor_ids2))
-                confidence = len(common_neighbors) / total_neighbors if total_neighbors > 0 else 0
-                
-                connections.append({
-                    'source_id': entity1['id'],
-                    'source_type': entity1.get('type', 'Unknown'),
-                    'source_name': entity1.get('name', entity1['id']),
-                    'target_id': entity2['id'],
-                    'target_type': entity2.get('type', 'Unknown'),
-                    'target_name': entity2.get('name', entity2['id']),
-                    'relationship_type': 'RELATED_TO',
-                    'confidence': confidence,
-                    'common_neighbors': list(common_neighbors),
-                    'evidence': f"Entities share {len(common_neighbors)} common connections"
-                })
+            
+            # Calculate confidence score based on proportion of common neighbors
+            confidence = common_count / (degree + adjacency.degree(column) - common_count)
+            common_neighbors = [
+                adjacency.row_ids[neighbor]
+                for neighbor in np.intersect1d(adjacency.neighbors(row), adjacency.neighbors(column)).tolist()
+            ]
+            
+            entity1, entity2 = entities[positions[row]], entities[position]
+            if position < positions[row]:
+                entity1, entity2 = entity2, entity1
+            connections.append({
+                'source_id': entity1['id'],
+                'source_type': entity1.get('type', 'Unknown'),
+                'source_name': entity1.get('name', entity1['id']),
+                'target_id': entity2['id'],
+                'target_type': entity2.get('type', 'Unknown'),
+                'target_name': entity2.get('name', entity2['id']),
+                'relationship_type': 'RELATED_TO',
+                'confidence': confidence,
+                'common_neighbors': common_neighbors,
+                'evidence': f"Entities share {common_count} common connections"
+            })
         
         return connections
     
@@ -209,52 +384,101 @@ class ConnectionDiscoveryEngine:
         Returns:
             List of potential connections with confidence scores
         """
+        positions = self._get_entity_positions(entities)
+        
         connections = []
+        for row, position in positions.items():
+            connections.extend(self._score_path_based(row, entities, positions, after=position))
+        
+        return connections
+    
+    def _score_path_based(
+        self,
+        row: int,
+        entities: List[Dict[str, Any]],
+        positions: Dict[int, int],
+        after: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score the path based connections of one entity.
+        
+        Path counts are the entity's rows of the sparse powers of the adjacency
+        matrix. Between entities that are not directly connected, walks of length two
+        and three are exactly the simple paths; longer walks may revisit entities.
+        
+        Args:
+            row: Adjacency row of the entity
+            entities: List of entities to analyze
+            positions: Adjacency rows of the entities mapped to their positions
+            after: If given, only score pairs with entities after this position
+            
+        Returns:
+            List of potential connections with confidence scores
+        """
+        adjacency = self.adjacency
         max_length = self.config['path_max_length']
+        if max_length < 2:
+            return []
+        
+        # Paths of length one are direct connections, which are skipped
+        walks = adjacency.walk_counts(row, max_length)[1:]
+        columns = np.concatenate([walk_columns for walk_columns, _ in walks])
+        counts = np.concatenate([walk_counts for _, walk_counts in walks])
+        lengths = np.concatenate([
+            np.full(len(walk_columns), length, dtype=np.int64)
+            for length, (walk_columns, _) in enumerate(walks, start=2)
+        ])
         
-        # Create pairs of entities to analyze
-        entity_pairs = list(itertools.combinations(entities, 2))
+        targets, inverse = np.unique(columns, return_inverse=True)
+        path_counts = np.bincount(inverse, weights=counts, minlength=len(targets)).astype(np.int64)
+        shortest_lengths = np.full(len(targets), max_length, dtype=np.int64)
+        np.minimum.at(shortest_lengths, inverse, lengths)
         
-        for entity1, entity2 in entity_pairs:
+        connections = []
+        for column, path_count, shortest_path_length in zip(
+            targets.tolist(), path_counts.tolist(), shortest_lengths.tolist()
+        ):
+            position = positions.get(column)
+            if column == row or position is None or (after is not None and position <= after):
+                continue
+            
             # Skip if already directly connected
-            if self.graph_manager.check_direct_connection(entity1['id'], entity2['id']):
+            if adjacency.has_edge(row, column):
                 continue
-                
-            # Find paths between the entities
-            paths = self.graph_manager.find_paths(
-                entity1['id'], 
-                entity2['id'], 
-                max_length=max_length
+            
+            # Higher confidence for shorter paths and more paths
+            path_length_factor = 1 / shortest_path_length
+            path_count_factor = min(1.0, path_count / 5)  # Cap at 1.0 at 5 paths
+            
+            confidence = 0.5 * path_length_factor + 0.5 * path_count_factor
+            
+            entity1, entity2 = entities[positions[row]], entities[position]
+            if position < positions[row]:
+                entity1, entity2 = entity2, entity1
+            
+            # Determine most appropriate relationship type based on the two-step paths
+            paths = [
+                [{'relationship_type': adjacency.edge_type(row, neighbor)},
+                 {'relationship_type': adjacency.edge_type(neighbor, column)}]
+                for neighbor in np.intersect1d(adjacency.neighbors(row), adjacency.neighbors(column)).tolist()
+            ]
+            relationship_type = self._infer_relationship_type(
+                paths, entity1.get('type', 'Unknown'), entity2.get('type', 'Unknown')
             )
             
-            if paths:
-                # Calculate confidence based on path length and count
-                # Shorter paths and more paths increase confidence
-                shortest_path_length = min(len(path) for path in paths)
-                path_count = len(paths)
-                
-                # Higher confidence for shorter paths and more paths
-                path_length_factor = 1 / shortest_path_length if shortest_path_length > 0 else 0
-                path_count_factor = min(1.0, path_count / 5)  # Cap at 1.0 at 5 paths
-                
-                confidence = 0.5 * path_length_factor + 0.5 * path_count_factor
-                
-                # Determine most appropriate relationship type based on paths
-                relationship_type = self._infer_relationship_type(paths, entity1['type'], entity2['type'])
-                
-                connections.append({
-                    'source_id': entity1['id'],
-                    'source_type': entity1.get('type', 'Unknown'),
-                    'source_name': entity1.get('name', entity1['id']),
-                    'target_id': entity2['id'],
-                    'target_type': entity2.get('type', 'Unknown'),
-                    'target_name': entity2.get('name', entity2['id']),
-                    'relationship_type': relationship_type,
-                    'confidence': confidence,
-                    'path_count': path_count,
-                    'shortest_path_length': shortest_path_length,
-                    'evidence': f"Found {path_count} paths with shortest length {shortest_path_length}"
-                })
+            connections.append({
+                'source_id': entity1['id'],
+                'source_type': entity1.get('type', 'Unknown'),
+                'source_name': entity1.get('name', entity1['id']),
+                'target_id': entity2['id'],
+                'target_type': entity2.get('type', 'Unknown'),
+                'target_name': entity2.get('name', entity2['id']),
+                'relationship_type': relationship_type,
+                'confidence': confidence,
+                'path_count': path_count,
+                'shortest_path_length': shortest_path_length,
+                'evidence': f"Found {path_count} paths with shortest length {shortest_path_length}"
+            })
         
         return connections
     
@@ -324,6 +548,7 @@ class ConnectionDiscoveryEngine:
             
         connections = []
         threshold = self.config['similarity_threshold']
+        entities_by_id = {entity['id']: entity for entity in entities}
         
         # Filter entities that have embeddings
         entities_with_embeddings = [
@@ -331,34 +556,41 @@ class ConnectionDiscoveryEngine:
             if 'embedding' in entity and entity['embedding'] is not None
         ]
         
-        # Create pairs of entities to analyze
-        entity_pairs = list(itertools.combinations(entities_with_embeddings, 2))
+        # Use the shared index if it holds the entities, or index their embeddings
+        embedding_index = self.embedding_index
+        if embedding_index is None or any(entity['id'] not in embedding_index for entity in entities_with_embeddings):
+            if not entities_with_embeddings:
+                return []
+            embedding_index = EmbeddingIndex(
+                len(entities_with_embeddings[0]['embedding']),
+                capacity=len(entities_with_embeddings)
+            )
+            embedding_index.add_many(
+                [entity['id'] for entity in entities_with_embeddings],
+                [entity['embedding'] for entity in entities_with_embeddings]
+            )
         
-        for entity1, entity2 in entity_pairs:
+        # Thresholded all-pairs cosine similarity in batched matrix products
+        for source_id, target_id, similarity in embedding_index.similar_pairs(
+            threshold, entity_ids=[entity['id'] for entity in entities]
+        ):
             # Skip if already directly connected
-            if self.graph_manager.check_direct_connection(entity1['id'], entity2['id']):
+            if self._directly_connected(source_id, target_id):
                 continue
-                
-            # Calculate embedding similarity
-            similarity = self.graph_manager.calculate_embedding_similarity(
-                entity1['embedding'], 
-                entity2['embedding']
-            )
             
-            # If similarity above threshold, suggest a relationship
-            if similarity >= threshold:
-                connections.append({
-                    'source_id': entity1['id'],
-                    'source_type': entity1.get('type', 'Unknown'),
-                    'source_name': entity1.get('name', entity1['id']),
-                    'target_id': entity2['id'],
-                    'target_type': entity2.get('type', 'Unknown'),
-                    'target_name': entity2.get('name', entity2['id']),
-                    'relationship_type': 'RELATED_TO',
-                    'confidence': similarity,
-                    'similarity_score': similarity,
-                    'evidence': f"Embedding similarity: {similarity:.2f}"
-                })
+            entity1, entity2 = entities_by_id[source_id], entities_by_id[target_id]
+            connections.append({
+                'source_id': entity1['id'],
+                'source_type': entity1.get('type', 'Unknown'),
+                'source_name': entity1.get('name', entity1['id']),
+                'target_id': entity2['id'],
+                'target_type': entity2.get('type', 'Unknown'),
+                'target_name': entity2.get('name', entity2['id']),
+                'relationship_type': 'RELATED_TO',
+                'confidence': similarity,
+                'similarity_score': similarity,
+                'evidence': f"Embedding similarity: {similarity:.2f}"
+            })
         
         return connections
     
@@ -396,7 +628,7 @@ class ConnectionDiscoveryEngine:
                 entity2 = entities_with_time[j]
                 
                 # Skip if already directly connected
-                if self.graph_manager.check_direct_connection(entity1['id'], entity2['id']):
+                if self._directly_connected(entity1['id'], entity2['id']):
                     continue
                 
                 # If same type, look for progression or iteration patterns
@@ -503,7 +735,7 @@ class ConnectionDiscoveryEngine:
         
         for paper1, paper2 in paper_pairs:
             # Skip if already directly connected
-            if self.graph_manager.check_direct_connection(paper1['id'], paper2['id']):
+            if self._directly_connected(paper1['id'], paper2['id']):
                 continue
                 
             # Get citations for both papers
@@ -593,7 +825,7 @@ class ConnectionDiscoveryEngine:
             
             for entity1, entity2 in entity_pairs:
                 # Skip if already directly connected
-                if self.graph_manager.check_direct_connection(entity1['id'], entity2['id']):
+                if self._directly_connected(entity1['id'], entity2['id']):
                     continue
                 
                 # Calculate attribute similarity
@@ -760,7 +992,7 @@ class ConnectionDiscoveryEngine:
                 target_id = conn['target_id']
                 
                 # Check if relationship already exists
-                if not self.graph_manager.check_direct_connection(source_id, target_id):
+                if not self._directly_connected(source_id, target_id):
                     filtered_connections.append(conn)
             
             high_confidence = filtered_connections
@@ -5,8 +5,10 @@ This module provides the core functionality for managing temporal entity version
 including creation, updating, and querying entities across time.
 """
 
-from typing import Dict, List, Optional, Any, Union, Set, Tuple
+from typing import Dict, List, Optional, Any, Union, Set, Tuple, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import copy
 import logging
 import uuid
 
@@ -18,6 +20,9 @@ from src.knowledge_graph_system.temporal_evolution.models.temporal_ai_models imp
     TemporalAIModel, TemporalDataset, TemporalAlgorithm,
     EvolvedInto, ReplacedBy, Inspired, MergedWith
 )
+from src.knowledge_graph_system.temporal_evolution.query_engine.snapshot_engine import (
+    TemporalSnapshotEngine
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -31,14 +36,19 @@ class TemporalEntityManager:
     temporal entities across time, handling versioning and evolution tracking.
     """
     
-    def __init__(self, graph_manager: Optional[Neo4jManager] = None):
+    def __init__(self,
+                 graph_manager: Optional[Neo4jManager] = None,
+                 snapshot_engine: Optional[TemporalSnapshotEngine] = None):
         """
         Initialize the Temporal Entity Manager.
         
         Args:
             graph_manager: Neo4j graph manager instance
+            snapshot_engine: Snapshot engine whose change log records the
+                entity and relationship changes made through this manager
         """
         self.graph_manager = graph_manager
+        self.snapshot_engine = snapshot_engine
         
         # Ensure necessary indices and constraints for temporal entities
         if self.graph_manager:
@@ -69,6 +79,12 @@ class TemporalEntityManager:
             FOR (e:TemporalEntity) ON (e.valid_to)
         """)
         
+        # Text index for name lookups with CONTAINS
+        self.graph_manager.execute_query("""
+            CREATE TEXT INDEX temporal_entity_name IF NOT EXISTS
+            FOR (e:TemporalEntity) ON (e.name)
+        """)
+        
         # Index for current versions
         self.graph_manager.execute_query("""
             CREATE INDEX temporal_entity_current IF NOT EXISTS
@@ -95,6 +111,12 @@ class TemporalEntityManager:
             logger.warning("No graph manager available, returning entity without persistence")
             return entity
         
+        # Write the entity and its change log entries in one transaction
+        with self._unit_of_work() as manager:
+            return manager._create_entity(entity)
+    
+    def _create_entity(self, entity: TemporalEntityBase) -> TemporalEntityBase:
+        """Create a temporal entity using this manager's graph manager."""
         # Generate Cypher query for entity creation
         query, params = entity.get_cypher_create()
         
@@ -102,6 +124,15 @@ class TemporalEntityManager:
         result = self.graph_manager.execute_query(query, params)
         
         if result and result[0] and 'e' in result[0]:
+            changes = [self.snapshot_engine.entity_change(
+                entity.entity_id, entity.valid_from, None, params, entity.labels
+            )] if self.snapshot_engine else []
+            if self.snapshot_engine and entity.valid_to:
+                changes.append(self.snapshot_engine.entity_change(
+                    entity.entity_id, entity.valid_to, params, None, entity.labels
+                ))
+            self._record_changes(changes)
+            
             # Return the created entity
             return entity
         else:
@@ -266,6 +297,18 @@ class TemporalEntityManager:
             logger.warning("No graph manager available, returning None")
             return None
         
+        # Run the lookup and the version write in one session and transaction
+        with self._unit_of_work() as manager:
+            return manager._create_new_version(
+                previous_version_id, updated_properties, version_number, valid_from
+            )
+    
+    def _create_new_version(self,
+                            previous_version_id: str,
+                            updated_properties: Dict[str, Any],
+                            version_number: Optional[float],
+                            valid_from: Optional[datetime]) -> Optional[TemporalEntityBase]:
+        """Create a new entity version using this manager's graph manager."""
         # Get the previous version
         previous_version = self.get_entity(previous_version_id)
         if not previous_version:
@@ -314,23 +357,115 @@ class TemporalEntityManager:
             logger.error("Failed to create new version from dictionary")
             return None
         
-        # Mark the previous version as deprecated
-        updated_previous = self.deprecate_entity_version(
-            previous_version.version_id, 
-            end_time=valid_from,
-            successor_id=new_version.version_id
+        # Deprecate the previous version, create the new one and link them
+        # with EVOLVED_INTO in a single statement
+        return self._write_version_transition(previous_version, new_version, valid_from)
+    
+    def _write_version_transition(self,
+                                  previous_version: TemporalEntityBase,
+                                  new_version: TemporalEntityBase,
+                                  valid_from: datetime) -> Optional[TemporalEntityBase]:
+        """
+        Persist a version change with one round trip.
+        
+        Args:
+            previous_version: Version being superseded
+            new_version: Version to create
+            valid_from: Timestamp when the new version becomes valid
+            
+        Returns:
+            Created version or None if the previous version no longer exists
+        """
+        relationship = EvolvedInto(
+            source_id=previous_version.id,
+            target_id=new_version.id,
+            evolution_type="gradual",
+            has_breaking_changes=False,
+            valid_from=new_version.valid_from
         )
         
-        if not updated_previous:
-            logger.warning(f"Failed to mark previous version as deprecated: {previous_version.version_id}")
+        relationship_properties = relationship.to_cypher_params()
+        for key in ("source_id", "target_id"):
+            relationship_properties.pop(key, None)
+        
+        labels_str = ':'.join(f"`{label}`" for label in sorted(new_version.labels))
+        query = f"""
+        MATCH (previous:TemporalEntity {{version_id: $previous_version_id}})
+        SET previous.valid_to = $valid_to,
+            previous.is_current = false,
+            previous.updated_at = $now,
+            previous.successor_version_ids = coalesce(previous.successor_version_ids, []) + $new_version_id
+        CREATE (e:{labels_str})
+        SET e = $entity_properties
+        CREATE (previous)-[r:EVOLVED_INTO]->(e)
+        SET r = $relationship_properties
+        RETURN e
+        """
+        
+        params = {
+            "previous_version_id": previous_version.version_id,
+            "new_version_id": new_version.version_id,
+            "valid_to": valid_from.isoformat(),
+            "now": datetime.now().isoformat(),
+            "entity_properties": new_version.to_cypher_params(),
+            "relationship_properties": relationship_properties
+        }
         
-        # Create the new version in the database
-        created_version = self.create_entity(new_version)
+        result = self.graph_manager.execute_query(query, params)
         
-        # Create EVOLVED_INTO relationship between versions
-        self._create_evolution_relationship(previous_version, new_version)
+        if result and result[0] and 'e' in result[0]:
+            if self.snapshot_engine:
+                self._record_changes([
+                    self.snapshot_engine.entity_change(
+                        new_version.entity_id, valid_from,
+                        previous_version.to_cypher_params(), params["entity_properties"],
+                        new_version.labels
+                    ),
+                    self.snapshot_engine.relationship_change(
+                        previous_version.id, "EVOLVED_INTO", new_version.id,
+                        valid_from, None, relationship_properties
+                    )
+                ])
+            return new_version
+        
+        logger.error(f"Failed to create new version of {previous_version.version_id}")
+        return None
+    
+    def _record_changes(self, changes: List[Dict[str, Any]]) -> None:
+        """
+        Append changes to the snapshot engine's change log.
         
-        return created_version
+        The changes are written through this manager's graph manager, so
+        inside a unit of work they commit or roll back with the write they
+        describe.
+        """
+        if not self.snapshot_engine or not changes:
+            return
+        
+        self.snapshot_engine.record_changes(changes, self.graph_manager)
+    
+    @contextmanager
+    def _unit_of_work(self) -> Iterator['TemporalEntityManager']:
+        """
+        Yield a manager whose queries share one session and transaction.
+        
+        Falls back to this manager when the graph manager does not support
+        explicit transactions, such as a manager already scoped to a
+        transaction. A checkpoint that became due while logging changes in
+        the transaction is taken once it is committed.
+        """
+        transaction = getattr(self.graph_manager, "transaction", None)
+        if transaction is None:
+            yield self
+            return
+        
+        with transaction() as tx:
+            scoped = copy.copy(self)
+            scoped.graph_manager = tx
+            yield scoped
+        
+        if self.snapshot_engine:
+            self.snapshot_engine.checkpoint_if_due()
     
     def deprecate_entity_version(self, 
                                 version_id: str, 
@@ -351,6 +486,15 @@ class TemporalEntityManager:
             logger.warning("No graph manager available, returning None")
             return None
         
+        # Write the update and its change log entry in one transaction
+        with self._unit_of_work() as manager:
+            return manager._deprecate_entity_version(version_id, end_time, successor_id)
+    
+    def _deprecate_entity_version(self,
+                                  version_id: str,
+                                  end_time: Optional[datetime],
+                                  successor_id: Optional[str]) -> Optional[TemporalEntityBase]:
+        """Deprecate an entity version using this manager's graph manager."""
         # Set default end time if not provided
         if end_time is None:
             end_time = datetime.now()
@@ -381,7 +525,15 @@ class TemporalEntityManager:
         if result and result[0] and 'e' in result[0]:
             # Return the updated entity
             entity_data = result[0]['e']
-            return self._create_entity_from_data(entity_data)
+            entity = self._create_entity_from_data(entity_data)
+            
+            # A successor version logs its own change; otherwise the entity ends here
+            if self.snapshot_engine and entity and not successor_id:
+                self._record_changes([self.snapshot_engine.entity_change(
+                    entity.entity_id, end_time, dict(entity_data), None, entity.labels
+                )])
+            
+            return entity
         
         return None
     
@@ -627,6 +779,18 @@ class TemporalEntityManager:
             logger.warning("No graph manager available, returning None")
             return None
         
+        # Run the lookups, the write and its change log entry in one transaction
+        with self._unit_of_work() as manager:
+            return manager._create_evolutionary_relationship(
+                source_version_id, target_version_id, relationship_type, properties
+            )
+    
+    def _create_evolutionary_relationship(self,
+                                          source_version_id: str,
+                                          target_version_id: str,
+                                          relationship_type: str,
+                                          properties: Optional[Dict[str, Any]]) -> Optional[TemporalRelationshipBase]:
+        """Create an evolutionary relationship using this manager's graph manager."""
         # Get the source and target entities
         source = self.get_entity(source_version_id)
         target = self.get_entity(target_version_id)
@@ -678,6 +842,12 @@ class TemporalEntityManager:
         result = self.graph_manager.execute_query(query, params)
         
         if result and result[0] and 'r' in result[0]:
+            if self.snapshot_engine:
+                self._record_changes([self.snapshot_engine.relationship_change(
+                    relationship.source_id, relationship.type, relationship.target_id,
+                    relationship.valid_from, None,
+                    {key: value for key, value in params.items() if key not in ("source_id", "target_id")}
+                )])
             return relationship
         
         return None
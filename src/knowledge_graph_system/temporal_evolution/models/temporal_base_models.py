@@ -320,8 +320,10 @@ class TemporalRelationshipBase(GraphRelationship):
     
     def __post_init__(self):
         """Perform post-initialization validation and setup."""
-        # Call parent post-init
-        super().__post_init__()
+        # Call parent post-init if GraphRelationship defines one
+        parent_post_init = getattr(super(), "__post_init__", None)
+        if parent_post_init:
+            parent_post_init()
         
         # Update properties with temporal attributes
         self.properties.update({
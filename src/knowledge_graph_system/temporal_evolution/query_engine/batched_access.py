@@ -0,0 +1,161 @@
+"""
+Batched access to temporal entity versions.
+
+This module fetches the versions of many entities with one UNWIND query per
+batch of entity IDs instead of one query per entity, and matches entity names
+through the text index on TemporalEntity.name. Versions are streamed grouped
+by entity, so the number of round trips depends on the batch size rather than
+on the number of entities.
+"""
+
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+from datetime import datetime
+import logging
+
+from src.knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class BatchedTemporalAccess:
+    """
+    Batched reads of temporal entities and their versions.
+    """
+
+    def __init__(self, graph_manager: Optional[Neo4jManager] = None, batch_size: int = 500):
+        """
+        Initialize the batched access layer.
+
+        Args:
+            graph_manager: Neo4j graph manager instance
+            batch_size: Maximum number of entity IDs per query
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.graph_manager = graph_manager
+        self.batch_size = batch_size
+
+    def find_entity_ids_by_name(self, name: str) -> List[str]:
+        """
+        Find the entities whose name contains a string.
+
+        The CONTAINS predicate is served by the temporal_entity_name text index.
+
+        Args:
+            name: String to look for in entity names
+
+        Returns:
+            Stable IDs of the matching entities, without duplicates
+        """
+        if not self.graph_manager:
+            return []
+
+        query = """
+        MATCH (e:TemporalEntity)
+        WHERE e.name CONTAINS $name
+        RETURN DISTINCT e.entity_id AS entity_id
+        """
+
+        result = self.graph_manager.execute_query(query, {"name": name})
+
+        return [record["entity_id"] for record in result if record.get("entity_id") is not None]
+
+    def find_related_entity_ids(self, entity_ids: List[str]) -> List[str]:
+        """
+        Find the entities directly connected to a set of entities.
+
+        Args:
+            entity_ids: Stable IDs of the entities
+
+        Returns:
+            Stable IDs of the connected entities outside the set
+        """
+        if not self.graph_manager or not entity_ids:
+            return []
+
+        related = set()
+        for batch in self.batch_ids(entity_ids):
+            query = """
+            UNWIND $entity_ids AS entity_id
+            MATCH (e1:TemporalEntity {entity_id: entity_id})-[]-(e2:TemporalEntity)
+            RETURN DISTINCT e2.entity_id AS related_id
+            """
+
+            result = self.graph_manager.execute_query(query, {"entity_ids": batch})
+            related.update(record["related_id"] for record in result if record.get("related_id") is not None)
+
+        return sorted(related - set(entity_ids))
+
+    def iter_versions(self,
+                      entity_ids: Iterable[str],
+                      from_date: Optional[datetime] = None,
+                      to_date: Optional[datetime] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Stream the versions of many entities, grouped by entity.
+
+        Args:
+            entity_ids: Stable IDs of the entities
+            from_date: Only include versions valid from this date onwards
+            to_date: Only include versions valid from this date at the latest
+
+        Yields:
+            Tuples of (entity ID, versions ordered by valid_from) for the
+            entities that have versions in the range
+        """
+        if not self.graph_manager:
+            return
+
+        query = """
+        UNWIND $entity_ids AS entity_id
+        MATCH (e:TemporalEntity {entity_id: entity_id})
+        """
+
+        conditions = []
+        if from_date:
+            conditions.append("e.valid_from >= $from_date")
+        if to_date:
+            conditions.append("e.valid_from <= $to_date")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += """
+        WITH entity_id, e
+        ORDER BY entity_id, e.valid_from
+        RETURN entity_id, collect(e) AS versions
+        """
+
+        params = {}
+        if from_date:
+            params["from_date"] = from_date.isoformat()
+        if to_date:
+            params["to_date"] = to_date.isoformat()
+
+        for batch in self.batch_ids(entity_ids):
+            params["entity_ids"] = batch
+            for record in self.graph_manager.execute_query(query, params):
+                yield record["entity_id"], [dict(version) for version in record["versions"]]
+
+    def get_versions(self,
+                     entity_ids: Iterable[str],
+                     from_date: Optional[datetime] = None,
+                     to_date: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the versions of many entities, grouped by entity.
+
+        Args:
+            entity_ids: Stable IDs of the entities
+            from_date: Only include versions valid from this date onwards
+            to_date: Only include versions valid from this date at the latest
+
+        Returns:
+            Dictionary mapping entity IDs to their versions ordered by valid_from
+        """
+        return dict(self.iter_versions(entity_ids, from_date, to_date))
+
+    def batch_ids(self, entity_ids: Iterable[str]) -> Iterator[List[str]]:
+        """Split entity IDs into batches of at most batch_size, without duplicates."""
+        unique_ids = list(dict.fromkeys(entity_ids))
+        for start in range(0, len(unique_ids), self.batch_size):
+            yield unique_ids[start:start + self.batch_size]
@@ -0,0 +1,708 @@
+"""
+Snapshot Engine for point-in-time views of the temporal knowledge graph.
+
+This module keeps an append-only change log of temporal entities and
+relationships, plus periodic materialised checkpoints of the whole graph,
+stored in chunks of entity and relationship states. A
+snapshot at time T is the latest checkpoint at or before T with the changes
+logged since replayed on top of it, and the differences between two points in
+time are computed from the changes logged between them only.
+
+Times are stored as epoch milliseconds, so both the change log and the
+checkpoints are searched through range indexes. Changes at the same time are
+ordered by a sequence number taken from the clock of the recording process, so
+writers do not share a counter.
+"""
+
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from contextlib import nullcontext
+from datetime import datetime
+import logging
+import json
+import threading
+import time
+import uuid
+
+from src.knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Kinds of logged changes
+ENTITY = "entity"
+RELATIONSHIP = "relationship"
+
+# Last sequence number handed out by this process
+_last_seq = 0
+_seq_lock = threading.Lock()
+
+
+def to_epoch_millis(value: Any) -> int:
+    """
+    Convert a point in time to epoch milliseconds.
+
+    Args:
+        value: A datetime or an ISO 8601 string (naive values are local time)
+
+    Returns:
+        Milliseconds since the epoch
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp() * 1000)
+
+
+def next_sequence(count: int) -> int:
+    """
+    Reserve sequence numbers for changes recorded together.
+
+    Sequence numbers are nanoseconds since the epoch, strictly increasing
+    within the process, so changes of different processes at the same time
+    are ordered by when they were recorded.
+
+    Args:
+        count: Number of sequence numbers to reserve
+
+    Returns:
+        First of count consecutive sequence numbers
+    """
+    global _last_seq
+    with _seq_lock:
+        first = max(time.time_ns(), _last_seq + 1)
+        _last_seq = first + count - 1
+    return first
+
+
+def compare_properties(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare properties between two dictionaries.
+
+    Args:
+        first: First dictionary
+        second: Second dictionary
+
+    Returns:
+        Dictionary with added, removed, and changed properties
+    """
+    return {
+        "added": {key: value for key, value in second.items() if key not in first},
+        "removed": {key: value for key, value in first.items() if key not in second},
+        "changed": {
+            key: {"old": first[key], "new": value}
+            for key, value in second.items()
+            if key in first and first[key] != value
+        }
+    }
+
+
+def relationship_key(source_id: Any, relationship_type: str, target_id: Any) -> str:
+    """
+    Generate a unique key for a relationship.
+
+    Args:
+        source_id: ID of the source entity version
+        relationship_type: Type of the relationship
+        target_id: ID of the target entity version
+
+    Returns:
+        Unique key for the relationship
+    """
+    return f"{source_id}|{relationship_type}|{target_id}"
+
+
+class TemporalSnapshotEngine:
+    """
+    Checkpoint and change log store for knowledge graph snapshots.
+
+    Entities are keyed by their stable entity ID, so a new version of an
+    entity is a change of that entity. Relationships are keyed by source,
+    type and target.
+
+    Each logged change holds the state of its entity or relationship before
+    and after it (None when absent), so the changes in a time range are
+    enough to tell what was added, removed or changed over it.
+    """
+
+    def __init__(self,
+                 graph_manager: Optional[Neo4jManager] = None,
+                 checkpoint_interval: int = 1000,
+                 checkpoint_chunk_size: int = 1000):
+        """
+        Initialize the Snapshot Engine.
+
+        Args:
+            graph_manager: Neo4j graph manager instance
+            checkpoint_interval: Number of logged changes after which a new
+                checkpoint is materialised
+            checkpoint_chunk_size: Number of entity or relationship states
+                stored per checkpoint chunk
+        """
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+        if checkpoint_chunk_size < 1:
+            raise ValueError("checkpoint_chunk_size must be at least 1")
+
+        self.graph_manager = graph_manager
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_chunk_size = checkpoint_chunk_size
+        self._checkpoint_due = False
+
+        if self.graph_manager:
+            self._ensure_indices()
+
+    def _ensure_indices(self) -> None:
+        """Create the range indexes of the change log and checkpoints."""
+        self.graph_manager.execute_query("""
+            CREATE INDEX temporal_change_at IF NOT EXISTS
+            FOR (c:TemporalChange) ON (c.at)
+        """)
+
+        self.graph_manager.execute_query("""
+            CREATE INDEX temporal_checkpoint_at IF NOT EXISTS
+            FOR (c:TemporalCheckpoint) ON (c.at)
+        """)
+
+        self.graph_manager.execute_query("""
+            CREATE INDEX temporal_checkpoint_id IF NOT EXISTS
+            FOR (c:TemporalCheckpoint) ON (c.id)
+        """)
+
+    def record_entity_change(self,
+                             entity_id: str,
+                             at: datetime,
+                             before: Optional[Dict[str, Any]],
+                             after: Optional[Dict[str, Any]],
+                             labels: Optional[List[str]] = None) -> int:
+        """
+        Log a change of an entity.
+
+        Args:
+            entity_id: Stable ID of the entity
+            at: Time the change took effect
+            before: Properties of the entity before the change (None if it did not exist)
+            after: Properties of the entity after the change (None if it was removed)
+            labels: Labels of the entity
+
+        Returns:
+            Sequence number of the change, or 0 if it was not logged
+        """
+        return self.record_changes([
+            self.entity_change(entity_id, at, before, after, labels)
+        ])
+
+    def record_relationship_change(self,
+                                   source_id: str,
+                                   relationship_type: str,
+                                   target_id: str,
+                                   at: datetime,
+                                   before: Optional[Dict[str, Any]],
+                                   after: Optional[Dict[str, Any]]) -> int:
+        """
+        Log a change of a relationship.
+
+        Args:
+            source_id: ID of the source entity version
+            relationship_type: Type of the relationship
+            target_id: ID of the target entity version
+            at: Time the change took effect
+            before: Properties of the relationship before the change (None if it did not exist)
+            after: Properties of the relationship after the change (None if it was removed)
+
+        Returns:
+            Sequence number of the change, or 0 if it was not logged
+        """
+        return self.record_changes([
+            self.relationship_change(source_id, relationship_type, target_id, at, before, after)
+        ])
+
+    @staticmethod
+    def entity_change(entity_id: str,
+                      at: datetime,
+                      before: Optional[Dict[str, Any]],
+                      after: Optional[Dict[str, Any]],
+                      labels: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Build an entity change for record_changes."""
+        return {
+            "kind": ENTITY,
+            "key": entity_id,
+            "at": to_epoch_millis(at),
+            "labels": sorted(labels or []),
+            "before": json.dumps(before, default=str) if before is not None else None,
+            "after": json.dumps(after, default=str) if after is not None else None
+        }
+
+    @staticmethod
+    def relationship_change(source_id: str,
+                            relationship_type: str,
+                            target_id: str,
+                            at: datetime,
+                            before: Optional[Dict[str, Any]],
+                            after: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a relationship change for record_changes."""
+        return {
+            "kind": RELATIONSHIP,
+            "key": relationship_key(source_id, relationship_type, target_id),
+            "at": to_epoch_millis(at),
+            "type": relationship_type,
+            "source_id": source_id,
+            "target_id": target_id,
+            "before": json.dumps(before, default=str) if before is not None else None,
+            "after": json.dumps(after, default=str) if after is not None else None
+        }
+
+    def record_changes(self,
+                       changes: List[Dict[str, Any]],
+                       graph_manager: Optional[Neo4jManager] = None) -> int:
+        """
+        Append changes to the log with a single statement.
+
+        Checkpoints taken at or after the earliest change no longer reflect
+        the graph and are dropped. A new checkpoint is materialised once a
+        snapshot would replay at least checkpoint_interval changes logged
+        after the latest checkpoint. When the changes are written through
+        another graph manager, such as the transaction of the write they
+        describe, the checkpoint is left to checkpoint_if_due, to be called
+        once that transaction is committed.
+
+        Args:
+            changes: Changes built with entity_change or relationship_change
+            graph_manager: Graph manager or transaction to write through
+                (defaults to the engine's graph manager)
+
+        Returns:
+            Sequence number of the last change, or 0 if nothing was logged
+        """
+        writer = graph_manager or self.graph_manager
+        if not writer or not changes:
+            return 0
+
+        first_seq = next_sequence(len(changes))
+
+        query = """
+        UNWIND $changes AS change
+        CREATE (c:TemporalChange)
+        SET c = change
+        WITH count(c) AS logged
+        OPTIONAL MATCH (stale:TemporalCheckpoint)
+        WHERE stale.at >= $earliest
+        OPTIONAL MATCH (stale)-[:HAS_CHUNK]->(chunk:TemporalCheckpointChunk)
+        WITH collect(DISTINCT stale) AS stale, collect(chunk) AS chunks
+        FOREACH (chunk IN chunks | DETACH DELETE chunk)
+        FOREACH (checkpoint IN stale | DETACH DELETE checkpoint)
+        WITH size(stale) AS invalidated
+        OPTIONAL MATCH (checkpoint:TemporalCheckpoint)
+        WHERE checkpoint.at < $earliest
+        WITH invalidated, max(checkpoint.at) AS checkpoint_at
+        OPTIONAL MATCH (pending:TemporalChange)
+        WHERE checkpoint_at IS NULL OR pending.at > checkpoint_at
+        RETURN invalidated, count(pending) AS pending
+        """
+
+        params = {
+            "changes": [dict(change, seq=first_seq + index) for index, change in enumerate(changes)],
+            "earliest": min(change["at"] for change in changes)
+        }
+
+        result = writer.execute_query(query, params)
+        if not result:
+            logger.error("Failed to record temporal changes")
+            return 0
+
+        if result[0].get("invalidated"):
+            logger.info(f"Dropped {result[0]['invalidated']} checkpoints superseded by backdated changes")
+
+        if result[0]["pending"] >= self.checkpoint_interval:
+            self._checkpoint_due = True
+            if writer is self.graph_manager:
+                self.checkpoint_if_due()
+
+        return first_seq + len(changes) - 1
+
+    def checkpoint_if_due(self) -> Optional[Dict[str, Any]]:
+        """
+        Materialise a checkpoint if logged changes made one due.
+
+        Checkpoints only speed up snapshots, so a failure is logged and the
+        checkpoint stays due rather than failing the committed write.
+
+        Returns:
+            The checkpoint as returned by create_checkpoint, or None if none
+            was taken
+        """
+        if not self._checkpoint_due or not self.graph_manager:
+            return None
+
+        self._checkpoint_due = False
+        try:
+            return self.create_checkpoint()
+        except Exception as e:
+            self._checkpoint_due = True
+            logger.error(f"Failed to create temporal checkpoint: {e}")
+            return None
+
+    def create_checkpoint(self, point_in_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        Materialise the state of the graph at a point in time.
+
+        The states of the entities and relationships are stored in chunks of
+        checkpoint_chunk_size, written in one transaction with the checkpoint.
+
+        Args:
+            point_in_time: Time of the checkpoint (defaults to the latest change)
+
+        Returns:
+            Dictionary with the time, sequence number and size of the
+            checkpoint, or None if there is nothing to checkpoint
+        """
+        if not self.graph_manager:
+            return None
+
+        if point_in_time is None:
+            result = self.graph_manager.execute_query(
+                "MATCH (c:TemporalChange) RETURN max(c.at) AS at"
+            )
+            if not result or result[0].get("at") is None:
+                return None
+            at = result[0]["at"]
+        else:
+            at = to_epoch_millis(point_in_time)
+
+        entities, relationships, seq = self._materialize(at)
+        checkpoint_id = str(uuid.uuid4())
+
+        query = """
+        CREATE (c:TemporalCheckpoint {
+            id: $id,
+            at: $at,
+            seq: $seq,
+            entity_count: $entity_count,
+            relationship_count: $relationship_count
+        })
+        RETURN c.at AS at
+        """
+
+        chunk_query = """
+        MATCH (c:TemporalCheckpoint {id: $id})
+        CREATE (c)-[:HAS_CHUNK]->(chunk:TemporalCheckpointChunk)
+        SET chunk = $chunk
+        """
+
+        transaction = getattr(self.graph_manager, "transaction", None)
+        with (transaction() if transaction else nullcontext(self.graph_manager)) as writer:
+            writer.execute_query(query, {
+                "id": checkpoint_id,
+                "at": at,
+                "seq": seq,
+                "entity_count": len(entities),
+                "relationship_count": len(relationships)
+            })
+            for chunk in self._chunks(entities, relationships):
+                writer.execute_query(chunk_query, {"id": checkpoint_id, "chunk": chunk})
+
+        return {
+            "at": at,
+            "seq": seq,
+            "entity_count": len(entities),
+            "relationship_count": len(relationships)
+        }
+
+    def get_snapshot(self,
+                     point_in_time: datetime,
+                     entity_types: Optional[List[str]] = None,
+                     relationship_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get a snapshot of the knowledge graph at a point in time.
+
+        Args:
+            point_in_time: Point in time for the snapshot
+            entity_types: Types of entities to include (or None for all)
+            relationship_types: Types of relationships to include (or None for all)
+
+        Returns:
+            Dictionary with entities and relationships in the snapshot
+        """
+        if not self.graph_manager:
+            logger.warning("No graph manager available, returning empty snapshot")
+            return {"entities": [], "relationships": []}
+
+        entities, relationships, _ = self._materialize(to_epoch_millis(point_in_time))
+
+        return {
+            "timestamp": point_in_time.isoformat(),
+            "entities": [
+                entity["properties"] for entity in entities.values()
+                if not entity_types or set(entity["labels"]) & set(entity_types)
+            ],
+            "relationships": [
+                relationship for relationship in relationships.values()
+                if not relationship_types or relationship["type"] in relationship_types
+            ]
+        }
+
+    def compare(self,
+                first_time: datetime,
+                second_time: datetime,
+                entity_types: Optional[List[str]] = None,
+                relationship_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Compare the knowledge graph at two points in time.
+
+        Only the changes logged between the two points in time are read.
+
+        Args:
+            first_time: First point in time
+            second_time: Second point in time
+            entity_types: Types of entities to include (or None for all)
+            relationship_types: Types of relationships to include (or None for all)
+
+        Returns:
+            Dictionary with differences between the two points in time
+        """
+        if not self.graph_manager:
+            logger.warning("No graph manager available, returning empty comparison")
+            return {"differences": {}}
+
+        first_at = to_epoch_millis(first_time)
+        second_at = to_epoch_millis(second_time)
+
+        query = """
+        MATCH (c:TemporalChange)
+        WHERE c.at > $from_at AND c.at <= $to_at
+        AND (c.kind <> 'entity' OR $entity_types IS NULL
+             OR any(label IN c.labels WHERE label IN $entity_types))
+        AND (c.kind <> 'relationship' OR $relationship_types IS NULL
+             OR c.type IN $relationship_types)
+        RETURN c.kind AS kind, c.key AS key, c.type AS type,
+               c.source_id AS source_id, c.target_id AS target_id,
+               c.before AS before, c.after AS after
+        ORDER BY c.at, c.seq
+        """
+
+        params = {
+            "from_at": min(first_at, second_at),
+            "to_at": max(first_at, second_at),
+            "entity_types": entity_types or None,
+            "relationship_types": relationship_types or None
+        }
+
+        # State of each changed entity and relationship at both ends of the range
+        states: Dict[Tuple[str, str], List[Any]] = {}
+        records = self.graph_manager.execute_query(query, params)
+        for record in records:
+            key = (record["kind"], record["key"])
+            if key not in states:
+                states[key] = [record, _load(record["before"]), None]
+            states[key][2] = _load(record["after"])
+
+        if first_at > second_at:
+            for state in states.values():
+                state[1], state[2] = state[2], state[1]
+
+        differences = {
+            "added_entities": [],
+            "removed_entities": [],
+            "changed_entities": [],
+            "added_relationships": [],
+            "removed_relationships": [],
+            "changed_relationships": []
+        }
+
+        for (kind, key), (record, first, second) in states.items():
+            if kind == ENTITY:
+                if first is None and second is not None:
+                    differences["added_entities"].append(second)
+                elif first is not None and second is None:
+                    differences["removed_entities"].append(first)
+                elif first is not None:
+                    changes = compare_properties(first, second)
+                    if changes["added"] or changes["removed"] or changes["changed"]:
+                        differences["changed_entities"].append({"entity_id": key, "changes": changes})
+            else:
+                if first is None and second is not None:
+                    differences["added_relationships"].append(_relationship(record, second))
+                elif first is not None and second is None:
+                    differences["removed_relationships"].append(_relationship(record, first))
+                elif first is not None:
+                    changes = compare_properties(first, second)
+                    if changes["added"] or changes["removed"] or changes["changed"]:
+                        differences["changed_relationships"].append({
+                            "source_id": record["source_id"],
+                            "target_id": record["target_id"],
+                            "type": record["type"],
+                            "changes": changes
+                        })
+
+        stats = {
+            "entity_count_change": len(differences["added_entities"]) - len(differences["removed_entities"]),
+            "relationship_count_change": (
+                len(differences["added_relationships"]) - len(differences["removed_relationships"])
+            ),
+            "changes_read": len(records)
+        }
+        for name, items in differences.items():
+            stats[f"{name}_count"] = len(items)
+
+        return {
+            "first_time": first_time.isoformat(),
+            "second_time": second_time.isoformat(),
+            "statistics": stats,
+            "differences": differences
+        }
+
+    def backfill(self, batch_size: int = 1000) -> int:
+        """
+        Seed the change log from the versions already in the graph.
+
+        Intended for graphs created before the change log existed; run it
+        once on an empty log.
+
+        Args:
+            batch_size: Number of changes appended per statement
+
+        Returns:
+            Number of changes logged
+        """
+        if not self.graph_manager:
+            return 0
+
+        versions = self.graph_manager.execute_query("""
+        MATCH (e:TemporalEntity)
+        RETURN e AS properties, labels(e) AS labels
+        ORDER BY e.entity_id, e.valid_from
+        """)
+
+        relationships = self.graph_manager.execute_query("""
+        MATCH (src:TemporalEntity)-[r]->(tgt:TemporalEntity)
+        WHERE r.valid_from IS NOT NULL
+        RETURN src.id AS source_id, tgt.id AS target_id, type(r) AS type, r AS properties
+        """)
+
+        changes = list(self._version_changes(versions))
+        for record in relationships:
+            properties = dict(record["properties"])
+            changes.append(self.relationship_change(
+                record["source_id"], record["type"], record["target_id"],
+                properties["valid_from"], None, properties
+            ))
+            if properties.get("valid_to"):
+                changes.append(self.relationship_change(
+                    record["source_id"], record["type"], record["target_id"],
+                    properties["valid_to"], properties, None
+                ))
+
+        changes.sort(key=lambda change: change["at"])
+        for start in range(0, len(changes), batch_size):
+            self.record_changes(changes[start:start + batch_size])
+
+        return len(changes)
+
+    def _version_changes(self, versions: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Turn the versions of each entity, ordered by validity, into changes."""
+        previous = None
+        for record in versions:
+            version = dict(record["properties"])
+            labels = record["labels"]
+            entity_id = version.get("entity_id") or version.get("id")
+            if not version.get("valid_from"):
+                continue
+
+            # A version either succeeds the previous one or starts a new lifetime
+            before = None
+            if (previous is not None and previous.get("entity_id") == version.get("entity_id")
+                    and previous.get("valid_to") == version["valid_from"]):
+                before = previous
+            yield self.entity_change(entity_id, version["valid_from"], before, version, labels)
+
+            previous = version
+            if version.get("valid_to") and not version.get("successor_version_ids"):
+                yield self.entity_change(entity_id, version["valid_to"], version, None, labels)
+
+    def _chunks(self,
+                entities: Dict[str, Any],
+                relationships: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Split the states of a checkpoint into chunks of serialized items."""
+        index = 0
+        for kind, states in ((ENTITY, entities), (RELATIONSHIP, relationships)):
+            items = [json.dumps(dict(state, key=key), default=str) for key, state in states.items()]
+            for start in range(0, len(items), self.checkpoint_chunk_size):
+                yield {"index": index, "kind": kind, "items": items[start:start + self.checkpoint_chunk_size]}
+                index += 1
+
+    def _materialize(self, at: int) -> Tuple[Dict[str, Any], Dict[str, Any], int]:
+        """
+        Rebuild the state of the graph at a time.
+
+        Args:
+            at: Time in epoch milliseconds
+
+        Returns:
+            Tuple of (entities by key, relationships by key, last sequence
+            number replayed)
+        """
+        checkpoint = self.graph_manager.execute_query("""
+        MATCH (c:TemporalCheckpoint)
+        WHERE c.at <= $at
+        WITH c
+        ORDER BY c.at DESC, c.seq DESC
+        LIMIT 1
+        OPTIONAL MATCH (c)-[:HAS_CHUNK]->(chunk:TemporalCheckpointChunk)
+        RETURN c.at AS at, c.seq AS seq, chunk.kind AS kind, chunk.items AS items
+        ORDER BY chunk.index
+        """, {"at": at})
+
+        if checkpoint:
+            entities, relationships = {}, {}
+            for record in checkpoint:
+                state = entities if record["kind"] == ENTITY else relationships
+                for item in record["items"] or []:
+                    item = json.loads(item)
+                    state[item.pop("key")] = item
+            seq = checkpoint[0]["seq"]
+            changes_query = """
+            MATCH (c:TemporalChange)
+            WHERE c.at > $from_at AND c.at <= $to_at
+            """
+            params = {"from_at": checkpoint[0]["at"], "to_at": at}
+        else:
+            entities, relationships, seq = {}, {}, 0
+            changes_query = """
+            MATCH (c:TemporalChange)
+            WHERE c.at <= $to_at
+            """
+            params = {"to_at": at}
+
+        changes_query += """
+        RETURN c.seq AS seq, c.kind AS kind, c.key AS key, c.labels AS labels,
+               c.type AS type, c.source_id AS source_id, c.target_id AS target_id,
+               c.after AS after
+        ORDER BY c.at, c.seq
+        """
+
+        for record in self.graph_manager.execute_query(changes_query, params):
+            seq = max(seq, record["seq"])
+            after = _load(record["after"])
+            state = entities if record["kind"] == ENTITY else relationships
+
+            if after is None:
+                state.pop(record["key"], None)
+            elif record["kind"] == ENTITY:
+                state[record["key"]] = {"labels": record["labels"] or [], "properties": after}
+            else:
+                state[record["key"]] = _relationship(record, after)
+
+        return entities, relationships, seq
+
+
+def _load(value: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Deserialize the state stored in a change."""
+    return json.loads(value) if value is not None else None
+
+
+def _relationship(record: Dict[str, Any], properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a relationship dict from a change and its properties."""
+    return {
+        "source_id": record["source_id"],
+        "target_id": record["target_id"],
+        "type": record["type"],
+        "properties": properties
+    }
@@ -15,6 +15,12 @@ from src.knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
 from src.knowledge_graph_system.temporal_evolution.models.temporal_base_models import (
     TemporalEntityBase, TemporalRelationshipBase
 )
+from src.knowledge_graph_system.temporal_evolution.query_engine.batched_access import (
+    BatchedTemporalAccess
+)
+from src.knowledge_graph_system.temporal_evolution.query_engine.snapshot_engine import (
+    TemporalSnapshotEngine, compare_properties, relationship_key
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -28,14 +34,20 @@ class TemporalQueryEngine:
     snapshots, time window queries, and temporal path finding.
     """
     
-    def __init__(self, graph_manager: Optional[Neo4jManager] = None):
+    def __init__(self,
+                 graph_manager: Optional[Neo4jManager] = None,
+                 snapshot_engine: Optional[TemporalSnapshotEngine] = None):
         """
         Initialize the Temporal Query Engine.
         
         Args:
             graph_manager: Neo4j graph manager instance
+            snapshot_engine: Snapshot engine serving snapshots and comparisons
+                from checkpoints and the change log, instead of graph scans
         """
         self.graph_manager = graph_manager
+        self.snapshot_engine = snapshot_engine
+        self.batched_access = BatchedTemporalAccess(graph_manager)
     
     def query_entities_at_time(self, 
                               entity_type: str, 
@@ -158,6 +170,9 @@ class TemporalQueryEngine:
             logger.warning("No graph manager available, returning empty snapshot")
             return {"entities": [], "relationships": []}
         
+        if self.snapshot_engine and not include_inactive:
+            return self.snapshot_engine.get_snapshot(point_in_time, entity_types, relationship_types)
+        
         # Build entity query
         entity_query = """
         MATCH (e)
@@ -174,7 +189,7 @@ class TemporalQueryEngine:
         if entity_types:
             type_conditions = []
             for entity_type in entity_types:
-                type_conditions.append(f"e:{entity_type}")
+                type_conditions.append(f"e:`{entity_type}`")
             
             if type_conditions:
                 entity_query += " AND (" + " OR ".join(type_conditions) + ")"
@@ -183,9 +198,13 @@ class TemporalQueryEngine:
         RETURN e
         """
         
-        # Build relationship query
-        rel_query = """
-        MATCH (src)-[r]->(tgt)
+        # Build relationship query, typed if relationship types are provided
+        rel_pattern = "r"
+        if relationship_types:
+            rel_pattern += ":" + "|".join(f"`{rel_type}`" for rel_type in relationship_types)
+        
+        rel_query = f"""
+        MATCH (src)-[{rel_pattern}]->(tgt)
         WHERE src:TemporalEntity AND tgt:TemporalEntity
         """
         
@@ -199,15 +218,6 @@ class TemporalQueryEngine:
             AND (tgt.valid_to IS NULL OR tgt.valid_to > $point_in_time)
             """
         
-        # Add relationship type filter if provided
-        if relationship_types:
-            type_conditions = []
-            for rel_type in relationship_types:
-                type_conditions.append(f"type(r) = '{rel_type}'")
-            
-            if type_conditions:
-                rel_query += " AND (" + " OR ".join(type_conditions) + ")"
-        
         rel_query += """
         RETURN src.id as source_id, tgt.id as target_id, type(r) as type, r as properties
         """
@@ -265,6 +275,10 @@ class TemporalQueryEngine:
             logger.warning("No graph manager available, returning empty comparison")
             return {"differences": {}}
         
+        # Read only the changes logged between the two points in time
+        if self.snapshot_engine:
+            return self.snapshot_engine.compare(first_time, second_time, entity_types, relationship_types)
+        
         # Get snapshots at both points in time
         first_snapshot = self.get_knowledge_graph_snapshot(
             point_in_time=first_time,
@@ -373,7 +387,7 @@ class TemporalQueryEngine:
         Returns:
             Unique key for the relationship
         """
-        return f"{rel.get('source_id')}|{rel.get('type')}|{rel.get('target_id')}"
+        return relationship_key(rel.get('source_id'), rel.get('type'), rel.get('target_id'))
     
     def _compare_properties(self, first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -386,33 +400,7 @@ class TemporalQueryEngine:
         Returns:
             Dictionary with added, removed, and changed properties
         """
-        added = {}
-        removed = {}
-        changed = {}
-        
-        # Find added properties
-        for key, value in second.items():
-            if key not in first:
-                added[key] = value
-        
-        # Find removed properties
-        for key, value in first.items():
-            if key not in second:
-                removed[key] = value
-        
-        # Find changed properties
-        for key, value in second.items():
-            if key in first and first[key] != value:
-                changed[key] = {
-                    "old": first[key],
-                    "new": value
-                }
-        
-        return {
-            "added": added,
-            "removed": removed,
-            "changed": changed
-        }
+        return compare_properties(first, second)
     
     def find_temporal_path(self,
                           start_entity_id: str,
@@ -733,58 +721,17 @@ class TemporalQueryEngine:
         if to_date is None:
             to_date = datetime.now()
         
-        # Find entities matching the concept name
-        query = """
-        MATCH (e:TemporalEntity)
-        WHERE e.name = $concept_name OR e.name CONTAINS $concept_name
-        RETURN e.entity_id AS entity_id, e.label AS entity_type, e.name AS name
-        """
-        
-        result = self.graph_manager.execute_query(query, {"concept_name": concept_name})
-        
-        entity_ids = []
-        for record in result:
-            if 'entity_id' in record:
-                entity_ids.append(record['entity_id'])
+        # Find entities matching the concept name through the text index
+        entity_ids = self.batched_access.find_entity_ids_by_name(concept_name)
         
         if not entity_ids:
             logger.warning(f"No entities found for concept: {concept_name}")
             return {"concept": concept_name, "evolution": []}
         
-        # Get versions for each entity
+        # Get the versions of all entities with one query per batch
         all_versions = []
-        for entity_id in entity_ids:
-            version_query = """
-            MATCH (e:TemporalEntity)
-            WHERE e.entity_id = $entity_id
-            """
-            
-            if from_date:
-                version_query += " AND e.valid_from >= $from_date"
-            
-            if to_date:
-                version_query += " AND e.valid_from <= $to_date"
-            
-            version_query += """
-            RETURN e
-            ORDER BY e.valid_from
-            """
-            
-            params = {
-                "entity_id": entity_id
-            }
-            
-            if from_date:
-                params["from_date"] = from_date.isoformat()
-            
-            if to_date:
-                params["to_date"] = to_date.isoformat()
-            
-            version_result = self.graph_manager.execute_query(version_query, params)
-            
-            for record in version_result:
-                if 'e' in record:
-                    all_versions.append(dict(record['e']))
+        for entity_id, versions in self.batched_access.iter_versions(entity_ids, from_date, to_date):
+            all_versions.extend(versions)
         
         # Sort all versions by valid_from date
         all_versions.sort(key=lambda x: x.get("valid_from", ""))
@@ -846,7 +793,9 @@ class TemporalQueryEngine:
                          entity_type: Optional[str] = None,
                          from_date: Optional[datetime] = None,
                          to_date: Optional[datetime] = None,
-                         granularity: str = "month") -> Dict[str, Any]:
+                         granularity: str = "month",
+                         concept_name: Optional[str] = None,
+                         include_related_concepts: bool = False) -> Dict[str, Any]:
         """
         Get timeline data showing entity counts over time.
         
@@ -855,6 +804,9 @@ class TemporalQueryEngine:
             from_date: Start date for the timeline (defaults to earliest)
             to_date: End date for the timeline (defaults to now)
             granularity: Time granularity (day, week, month, year)
+            concept_name: Only count the entities of this concept (or None for all)
+            include_related_concepts: Whether to also count the entities
+                related to the concept
             
         Returns:
             Dictionary with timeline data
@@ -880,10 +832,24 @@ class TemporalQueryEngine:
         else:
             date_format = "%Y-%m"  # Default to month
         
+        # Restrict the timeline to the entities of the concept, if any
+        entity_id_batches = [None]
+        if concept_name:
+            entity_ids = self.batched_access.find_entity_ids_by_name(concept_name)
+            if include_related_concepts:
+                entity_ids += self.batched_access.find_related_entity_ids(entity_ids)
+            entity_id_batches = list(self.batched_access.batch_ids(entity_ids))
+        
         # Build the query
-        query = """
-        MATCH (e:TemporalEntity)
-        """
+        if concept_name:
+            query = """
+            UNWIND $entity_ids AS entity_id
+            MATCH (e:TemporalEntity {entity_id: entity_id})
+            """
+        else:
+            query = """
+            MATCH (e:TemporalEntity)
+            """
         
         if entity_type:
             query += f" WHERE e:{entity_type}"
@@ -905,7 +871,7 @@ class TemporalQueryEngine:
         query += f"""
         WITH datetime(e.valid_from) AS date, e.label AS type
         RETURN datetime.format(date, '{date_format}') AS period,
-               type, count(e) AS count
+               type, count(*) AS count
         ORDER BY period
         """
         
@@ -915,22 +881,24 @@ class TemporalQueryEngine:
         if to_date:
             params["to_date"] = to_date.isoformat()
         
-        result = self.graph_manager.execute_query(query, params)
-        
-        # Process the results
+        # Process the results, adding up the counts of each batch
         timeline_data = {}
         entity_types = set()
         
-        for record in result:
-            period = record.get("period")
-            entity_type = record.get("type")
-            count = record.get("count")
+        for entity_ids in entity_id_batches:
+            if entity_ids is not None:
+                params["entity_ids"] = entity_ids
             
-            if period not in timeline_data:
-                timeline_data[period] = {}
-            
-            timeline_data[period][entity_type] = count
-            entity_types.add(entity_type)
+            for record in self.graph_manager.execute_query(query, params):
+                period = record.get("period")
+                entity_type = record.get("type")
+                count = record.get("count")
+                
+                if period not in timeline_data:
+                    timeline_data[period] = {}
+                
+                timeline_data[period][entity_type] = timeline_data[period].get(entity_type, 0) + count
+                entity_types.add(entity_type)
         
         # Convert to list format
         timeline = []
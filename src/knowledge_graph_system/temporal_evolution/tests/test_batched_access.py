@@ -0,0 +1,135 @@
+"""
+Unit tests for the Batched Temporal Access module.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime
+
+from src.knowledge_graph_system.temporal_evolution.query_engine.batched_access import (
+    BatchedTemporalAccess
+)
+from src.knowledge_graph_system.temporal_evolution.query_engine.temporal_query_engine import (
+    TemporalQueryEngine
+)
+
+
+class FakeVersionStore:
+    """In-memory stand-in for the temporal entity queries."""
+
+    def __init__(self, entity_count, versions_per_entity=2):
+        self.versions = [
+            {
+                "entity_id": f"e{i}",
+                "version_id": f"e{i}_v{v}",
+                "name": f"Transformer {i}",
+                "label": "AIModel",
+                "valid_from": f"2023-{v + 1:02d}-01T00:00:00"
+            }
+            for i in range(entity_count)
+            for v in range(versions_per_entity)
+        ]
+        self.queries = []
+
+    def execute_query(self, query, params=None):
+        params = params or {}
+        self.queries.append(query)
+
+        if "e.name CONTAINS $name" in query:
+            ids = [v["entity_id"] for v in self.versions if params["name"] in v["name"]]
+            return [{"entity_id": entity_id} for entity_id in dict.fromkeys(ids)]
+
+        if "collect(e) AS versions" in query:
+            return [
+                {
+                    "entity_id": entity_id,
+                    "versions": sorted(
+                        (v for v in self.versions if v["entity_id"] == entity_id),
+                        key=lambda v: v["valid_from"]
+                    )
+                }
+                for entity_id in params["entity_ids"]
+                if any(v["entity_id"] == entity_id for v in self.versions)
+            ]
+
+        if "AS period" in query:
+            counts = {}
+            for v in self.versions:
+                if v["entity_id"] in params["entity_ids"]:
+                    key = (v["valid_from"][:7], v["label"])
+                    counts[key] = counts.get(key, 0) + 1
+            return [
+                {"period": period, "type": label, "count": count}
+                for (period, label), count in sorted(counts.items())
+            ]
+
+        return []
+
+
+class TestBatchedTemporalAccess(unittest.TestCase):
+    """Tests for the BatchedTemporalAccess class."""
+
+    def test_versions_are_grouped_by_entity(self):
+        """Test that versions are returned per entity, in order of validity."""
+        store = FakeVersionStore(entity_count=3)
+        access = BatchedTemporalAccess(store)
+
+        versions = access.get_versions(["e0", "e2", "e0"])
+
+        self.assertEqual(list(versions), ["e0", "e2"])
+        self.assertEqual([v["version_id"] for v in versions["e0"]], ["e0_v0", "e0_v1"])
+
+    def test_versions_are_fetched_in_batches(self):
+        """Test that one query is issued per batch of entity IDs."""
+        graph_manager = MagicMock()
+        graph_manager.execute_query.return_value = []
+        access = BatchedTemporalAccess(graph_manager, batch_size=2)
+
+        list(access.iter_versions(["a", "b", "c"], from_date=datetime(2023, 1, 1)))
+
+        self.assertEqual(graph_manager.execute_query.call_count, 2)
+        query, params = graph_manager.execute_query.call_args[0]
+        self.assertIn("UNWIND $entity_ids AS entity_id", query)
+        self.assertIn("e.valid_from >= $from_date", query)
+        self.assertEqual(params["entity_ids"], ["c"])
+
+    def test_invalid_batch_size(self):
+        """Test that a batch size below one is rejected."""
+        with self.assertRaises(ValueError):
+            BatchedTemporalAccess(None, batch_size=0)
+
+
+class TestTemporalQueryEngineBatchedVersions(unittest.TestCase):
+    """Tests for the batched version lookups of the TemporalQueryEngine class."""
+
+    def test_trace_concept_evolution_round_trips(self):
+        """Test that tracing a concept does not query each entity separately."""
+        store = FakeVersionStore(entity_count=300)
+        query_engine = TemporalQueryEngine(store)
+
+        evolution = query_engine.trace_concept_evolution("Transformer")
+
+        self.assertEqual(len(evolution["entity_ids"]), 300)
+        self.assertEqual(len(evolution["versions"]), 600)
+        self.assertFalse(any("e.entity_id = $entity_id" in query for query in store.queries))
+        # Name lookup, one version batch and the evolution relationships
+        self.assertEqual(len(store.queries), 3)
+
+    def test_concept_timeline_adds_up_batches(self):
+        """Test that a concept timeline sums the counts of every batch."""
+        store = FakeVersionStore(entity_count=300)
+        query_engine = TemporalQueryEngine(store)
+        query_engine.batched_access.batch_size = 200
+
+        timeline = query_engine.get_timeline_data(concept_name="Transformer", to_date=datetime(2024, 1, 1))
+
+        self.assertEqual(timeline["timeline"], [
+            {"period": "2023-01", "AIModel": 300},
+            {"period": "2023-02", "AIModel": 300}
+        ])
+        # Name lookup and two timeline batches
+        self.assertEqual(len(store.queries), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,273 @@
+"""
+Unit tests for the Snapshot Engine module.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+
+from src.knowledge_graph_system.temporal_evolution.query_engine.snapshot_engine import (
+    TemporalSnapshotEngine, to_epoch_millis
+)
+from src.knowledge_graph_system.temporal_evolution.query_engine.temporal_query_engine import (
+    TemporalQueryEngine
+)
+
+
+class FakeChangeStore:
+    """In-memory stand-in for the change log and checkpoint queries."""
+
+    def __init__(self):
+        self.changes = []
+        self.checkpoints = []
+        self.queries = []
+
+    def execute_query(self, query, params=None):
+        params = params or {}
+        self.queries.append(query)
+
+        if "CREATE INDEX" in query:
+            return []
+
+        if "CREATE (c:TemporalChange)" in query:
+            self.changes.extend(dict(change) for change in params["changes"])
+            stale = [c for c in self.checkpoints if c["at"] >= params["earliest"]]
+            self.checkpoints = [c for c in self.checkpoints if c["at"] < params["earliest"]]
+            checkpoint_at = max((c["at"] for c in self.checkpoints), default=None)
+            pending = [c for c in self.changes if checkpoint_at is None or c["at"] > checkpoint_at]
+            return [{"invalidated": len(stale), "pending": len(pending)}]
+
+        if "CREATE (c:TemporalCheckpoint" in query:
+            self.checkpoints.append(dict(params, chunks=[]))
+            return [{"at": params["at"]}]
+
+        if "CREATE (c)-[:HAS_CHUNK]->" in query:
+            checkpoint = next(c for c in self.checkpoints if c["id"] == params["id"])
+            checkpoint["chunks"].append(dict(params["chunk"]))
+            return []
+
+        if "MATCH (c:TemporalCheckpoint)" in query:
+            candidates = [c for c in self.checkpoints if c["at"] <= params["at"]]
+            candidates.sort(key=lambda c: (c["at"], c["seq"]))
+            if not candidates:
+                return []
+            checkpoint = candidates[-1]
+            chunks = sorted(checkpoint["chunks"], key=lambda chunk: chunk["index"]) or [{}]
+            return [
+                {"at": checkpoint["at"], "seq": checkpoint["seq"],
+                 "kind": chunk.get("kind"), "items": chunk.get("items")}
+                for chunk in chunks
+            ]
+
+        if "max(c.at)" in query:
+            return [{"at": max((c["at"] for c in self.changes), default=None)}]
+
+        if "MATCH (c:TemporalChange)" in query:
+            changes = [
+                c for c in self.changes
+                if c["at"] > params.get("from_at", float("-inf")) and c["at"] <= params["to_at"]
+            ]
+            if params.get("entity_types"):
+                changes = [
+                    c for c in changes
+                    if c["kind"] != "entity" or set(c["labels"]) & set(params["entity_types"])
+                ]
+            if params.get("relationship_types"):
+                changes = [
+                    c for c in changes
+                    if c["kind"] != "relationship" or c["type"] in params["relationship_types"]
+                ]
+            changes.sort(key=lambda c: (c["at"], c["seq"]))
+            return [
+                {key: c.get(key) for key in (
+                    "seq", "kind", "key", "labels", "type", "source_id", "target_id", "before", "after"
+                )}
+                for c in changes
+            ]
+
+        raise AssertionError(f"Unexpected query: {query}")
+
+
+class TestTemporalSnapshotEngine(unittest.TestCase):
+    """Tests for the TemporalSnapshotEngine class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store = FakeChangeStore()
+        self.engine = TemporalSnapshotEngine(self.store, checkpoint_interval=3)
+
+        self.start = datetime(2023, 1, 1)
+        self.gpt3 = {"id": "v1", "entity_id": "gpt", "name": "GPT-3"}
+        self.gpt4 = {"id": "v2", "entity_id": "gpt", "name": "GPT-4"}
+        self.bert = {"id": "b1", "entity_id": "bert", "name": "BERT"}
+
+        # GPT-3 and BERT appear, GPT-3 evolves into GPT-4, BERT is retired
+        self.engine.record_entity_change("gpt", self.day(1), None, self.gpt3, ["AIModel", "TemporalEntity"])
+        self.engine.record_entity_change("bert", self.day(2), None, self.bert, ["AIModel", "TemporalEntity"])
+        self.engine.record_changes([
+            self.engine.entity_change("gpt", self.day(10), self.gpt3, self.gpt4, ["AIModel", "TemporalEntity"]),
+            self.engine.relationship_change("v1", "EVOLVED_INTO", "v2", self.day(10), None, {"evolution_type": "gradual"})
+        ])
+        self.engine.record_entity_change("bert", self.day(20), self.bert, None, ["AIModel", "TemporalEntity"])
+
+    def day(self, days):
+        """Get a point in time relative to the start of the fixtures."""
+        return self.start + timedelta(days=days)
+
+    def test_to_epoch_millis_accepts_iso_strings(self):
+        """Test that datetimes and their ISO strings map to the same epoch value."""
+        self.assertEqual(to_epoch_millis(self.day(1)), to_epoch_millis(self.day(1).isoformat()))
+
+    def test_snapshot_replays_changes(self):
+        """Test that snapshots reflect the changes up to their point in time."""
+        snapshot = self.engine.get_snapshot(self.day(5))
+        self.assertEqual(
+            sorted(e["name"] for e in snapshot["entities"]), ["BERT", "GPT-3"]
+        )
+        self.assertEqual(snapshot["relationships"], [])
+
+        snapshot = self.engine.get_snapshot(self.day(30))
+        self.assertEqual([e["name"] for e in snapshot["entities"]], ["GPT-4"])
+        self.assertEqual(len(snapshot["relationships"]), 1)
+        self.assertEqual(snapshot["relationships"][0]["type"], "EVOLVED_INTO")
+
+    def test_snapshot_filters_types(self):
+        """Test that snapshots only include the requested types."""
+        snapshot = self.engine.get_snapshot(self.day(30), entity_types=["Dataset"], relationship_types=["INSPIRED"])
+
+        self.assertEqual(snapshot["entities"], [])
+        self.assertEqual(snapshot["relationships"], [])
+
+    def test_sequence_numbers_without_shared_counter(self):
+        """Test that changes are numbered in recording order without a shared log node."""
+        seqs = [change["seq"] for change in self.store.changes]
+
+        self.assertEqual(seqs, sorted(set(seqs)))
+        self.assertFalse(any("MERGE" in query for query in self.store.queries))
+
+    def test_checkpoint_every_interval(self):
+        """Test that a checkpoint is materialised when the log crosses the interval."""
+        # The third change was logged in the second batch
+        self.assertEqual(len(self.store.checkpoints), 1)
+        self.assertEqual(self.store.checkpoints[0]["at"], to_epoch_millis(self.day(10)))
+        self.assertEqual(self.store.checkpoints[0]["entity_count"], 2)
+
+    def test_checkpoint_waits_for_transaction(self):
+        """Test that changes written through a transaction defer the checkpoint to checkpoint_if_due."""
+        store = FakeChangeStore()
+        tx = FakeChangeStore()
+        engine = TemporalSnapshotEngine(store, checkpoint_interval=1)
+
+        engine.record_changes([engine.entity_change("gpt", self.day(1), None, self.gpt3, ["AIModel"])], tx)
+
+        self.assertEqual(len(tx.changes), 1)
+        self.assertEqual(store.changes, [])
+        self.assertEqual(store.checkpoints + tx.checkpoints, [])
+
+        # Once committed, the changes are visible to the engine's graph manager
+        store.changes = tx.changes
+        self.assertIsNotNone(engine.checkpoint_if_due())
+        self.assertEqual(len(store.checkpoints), 1)
+        self.assertIsNone(engine.checkpoint_if_due())
+
+    def test_checkpoint_is_stored_in_chunks(self):
+        """Test that checkpoints store their states in chunks of the configured size."""
+        engine = TemporalSnapshotEngine(self.store, checkpoint_chunk_size=1)
+        engine.create_checkpoint(self.day(15))
+
+        checkpoint = self.store.checkpoints[-1]
+        self.assertNotIn("entities", checkpoint)
+        self.assertEqual(
+            [(chunk["kind"], len(chunk["items"])) for chunk in checkpoint["chunks"]],
+            [("entity", 1), ("entity", 1), ("relationship", 1)]
+        )
+
+        snapshot = engine.get_snapshot(self.day(15))
+        self.assertEqual(sorted(e["name"] for e in snapshot["entities"]), ["BERT", "GPT-4"])
+        self.assertEqual(len(snapshot["relationships"]), 1)
+
+    def test_snapshot_starts_from_checkpoint(self):
+        """Test that a snapshot only replays the changes after its checkpoint."""
+        self.store.queries.clear()
+
+        snapshot = self.engine.get_snapshot(self.day(30))
+
+        self.assertEqual([e["name"] for e in snapshot["entities"]], ["GPT-4"])
+        self.assertTrue(any("c.at > $from_at" in query for query in self.store.queries))
+
+    def test_backdated_change_invalidates_checkpoints(self):
+        """Test that checkpoints after a backdated change are dropped."""
+        dataset = {"id": "d1", "entity_id": "imagenet", "name": "ImageNet"}
+        self.engine.record_entity_change("imagenet", self.day(3), None, dataset, ["Dataset", "TemporalEntity"])
+
+        # The stale checkpoint was replaced by one taken after the new change
+        self.assertEqual(len(self.store.checkpoints), 1)
+        self.assertEqual(self.store.checkpoints[0]["at"], to_epoch_millis(self.day(20)))
+        self.assertIn("ImageNet", "".join(self.store.checkpoints[0]["chunks"][0]["items"]))
+        snapshot = self.engine.get_snapshot(self.day(30))
+        self.assertEqual(sorted(e["name"] for e in snapshot["entities"]), ["GPT-4", "ImageNet"])
+
+    def test_compare_reads_changes_in_range(self):
+        """Test that comparisons classify the changes between two points in time."""
+        comparison = self.engine.compare(self.day(5), self.day(30))
+        differences = comparison["differences"]
+
+        self.assertEqual(differences["added_entities"], [])
+        self.assertEqual([e["name"] for e in differences["removed_entities"]], ["BERT"])
+        self.assertEqual(len(differences["changed_entities"]), 1)
+        self.assertEqual(differences["changed_entities"][0]["entity_id"], "gpt")
+        self.assertEqual(
+            differences["changed_entities"][0]["changes"]["changed"]["name"],
+            {"old": "GPT-3", "new": "GPT-4"}
+        )
+        self.assertEqual(len(differences["added_relationships"]), 1)
+        self.assertEqual(comparison["statistics"]["entity_count_change"], -1)
+        self.assertEqual(comparison["statistics"]["changes_read"], 3)
+
+    def test_compare_in_reverse(self):
+        """Test that comparing backwards in time inverts the differences."""
+        differences = self.engine.compare(self.day(30), self.day(5))["differences"]
+
+        self.assertEqual([e["name"] for e in differences["added_entities"]], ["BERT"])
+        self.assertEqual(len(differences["removed_relationships"]), 1)
+
+    def test_invalid_checkpoint_interval(self):
+        """Test that a checkpoint interval below one is rejected."""
+        with self.assertRaises(ValueError):
+            TemporalSnapshotEngine(None, checkpoint_interval=0)
+        with self.assertRaises(ValueError):
+            TemporalSnapshotEngine(None, checkpoint_chunk_size=0)
+
+
+class TestTemporalQueryEngineSnapshots(unittest.TestCase):
+    """Tests for snapshot queries of the TemporalQueryEngine class."""
+
+    def test_snapshot_engine_serves_snapshots_and_comparisons(self):
+        """Test that snapshots and comparisons are delegated to the snapshot engine."""
+        graph_manager = MagicMock()
+        snapshot_engine = MagicMock()
+        query_engine = TemporalQueryEngine(graph_manager, snapshot_engine)
+        now = datetime.now()
+
+        query_engine.get_knowledge_graph_snapshot(now, entity_types=["AIModel"])
+        query_engine.compare_snapshots(now - timedelta(days=1), now)
+
+        snapshot_engine.get_snapshot.assert_called_once_with(now, ["AIModel"], None)
+        snapshot_engine.compare.assert_called_once()
+        graph_manager.execute_query.assert_not_called()
+
+    def test_relationship_types_use_typed_pattern(self):
+        """Test that relationship type filters are part of the pattern."""
+        graph_manager = MagicMock()
+        graph_manager.execute_query.return_value = []
+        query_engine = TemporalQueryEngine(graph_manager)
+
+        query_engine.get_knowledge_graph_snapshot(datetime.now(), relationship_types=["EVOLVED_INTO", "INSPIRED"])
+
+        rel_query = graph_manager.execute_query.call_args_list[1][0][0]
+        self.assertIn("[r:`EVOLVED_INTO`|`INSPIRED`]", rel_query)
+        self.assertNotIn("type(r) =", rel_query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,283 @@
+"""
+Query Result Cache
+
+This module provides a bounded cache for materialised Cypher query results used
+by the Knowledge Graph System. It includes:
+
+1. O(1) least-recently-used eviction with a per-entry time-to-live
+2. A memory bound based on the serialised size of the cached records
+3. Tag-based invalidation by node label and relationship type
+4. Hit, miss, eviction, expiration and invalidation counters
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tags of queries whose patterns do not name a label or relationship type; these
+# are invalidated by writes to any label or type
+ANY_LABEL_TAG = "label:*"
+ANY_TYPE_TAG = "type:*"
+
+# Node patterns are parentheses not preceded by a function name; relationship
+# patterns are brackets preceded by a dash
+_NODE_PATTERN = re.compile(r"(?<![\w`])\(\s*\w*\s*((?::\s*`?\w+`?\s*)*)[{)]")
+_RELATIONSHIP_PATTERN = re.compile(r"-\s*\[\s*\w*\s*(?::\s*([`\w|:]+))?[^\]]*\]")
+
+
+def label_tag(label: str) -> str:
+    """Return the cache tag for a node label."""
+    return f"label:{label}"
+
+
+def type_tag(relationship_type: str) -> str:
+    """Return the cache tag for a relationship type."""
+    return f"type:{relationship_type}"
+
+
+def make_cache_key(query: str, parameters: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key for a query and its parameters.
+
+    Args:
+        query: Cypher query string
+        parameters: Parameters for the query
+
+    Returns:
+        Hex digest identifying the query text (with whitespace collapsed) and parameters
+    """
+    combined = f"{' '.join(query.split())}|{json.dumps(parameters or {}, sort_keys=True, default=str)}"
+    return hashlib.md5(combined.encode()).hexdigest()
+
+
+def tags_for_query(query: str) -> Set[str]:
+    """
+    Derive invalidation tags from the patterns of a Cypher query.
+
+    Args:
+        query: Cypher query string
+
+    Returns:
+        Set of label and relationship type tags the query depends on
+    """
+    tags = set()
+
+    for labels in _NODE_PATTERN.findall(query):
+        names = [name.strip("` ") for name in labels.split(":") if name.strip("` ")]
+        if names:
+            tags.update(label_tag(name) for name in names)
+        else:
+            tags.add(ANY_LABEL_TAG)
+
+    for types in _RELATIONSHIP_PATTERN.findall(query):
+        names = [name.strip("` ") for name in re.split(r"[|:]", types) if name.strip("` ")]
+        if names:
+            tags.update(type_tag(name) for name in names)
+        else:
+            tags.add(ANY_TYPE_TAG)
+
+    return tags
+
+
+@dataclass
+class CacheEntry:
+    """A cached query result."""
+    records: List[Dict[str, Any]]
+    expires_at: float
+    size: int
+    tags: Set[str] = field(default_factory=set)
+
+
+class QueryResultCache:
+    """
+    Thread-safe LRU cache of materialised query results.
+
+    Entries expire after their time-to-live and the least recently used entries
+    are evicted when either the entry count or the total size bound is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl: float = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total serialised size of the cached results
+            default_ttl: Default time-to-live of an entry in seconds
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached records, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.records
+
+    def put(self, key: str, records: List[Dict[str, Any]],
+            ttl: Optional[float] = None, tags: Iterable[str] = ()) -> bool:
+        """
+        Cache a query result.
+
+        Args:
+            key: Cache key
+            records: Materialised query records
+            ttl: Time-to-live in seconds (defaults to ``default_ttl``)
+            tags: Labels and relationship types the result depends on
+
+        Returns:
+            True if the result was cached, False if it exceeds the size bound
+        """
+        size = self._estimate_size(records)
+        if size > self.max_bytes:
+            return False
+
+        entry = CacheEntry(
+            records=records,
+            expires_at=time.monotonic() + (self.default_ttl if ttl is None else ttl),
+            size=size,
+            tags=set(tags)
+        )
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            # Evict least recently used entries until both bounds hold
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+        return True
+
+    def invalidate(self, labels: Iterable[str] = (), relationship_types: Iterable[str] = ()) -> int:
+        """
+        Evict the results that depend on the given labels or relationship types.
+
+        Args:
+            labels: Node labels that were written
+            relationship_types: Relationship types that were written
+
+        Returns:
+            Number of entries evicted
+        """
+        tags = {label_tag(label) for label in labels}
+        if tags:
+            tags.add(ANY_LABEL_TAG)
+
+        type_tags = {type_tag(relationship_type) for relationship_type in relationship_types}
+        if type_tags:
+            tags.update(type_tags)
+            tags.add(ANY_TYPE_TAG)
+
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tag_index.get(tag, ()))
+
+            for key in keys:
+                self._remove(key)
+
+            self.invalidations += len(keys)
+
+        if keys:
+            logger.debug(f"Invalidated {len(keys)} cached query results")
+
+        return len(keys)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary of counters and current usage
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, key: str):
+        """Remove an entry and its tag references; the caller holds the lock."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    @staticmethod
+    def _estimate_size(records: List[Dict[str, Any]]) -> int:
+        """Estimate the memory used by records from their serialised size."""
+        return len(json.dumps(records, default=str))
@@ -16,7 +16,8 @@ import logging
 from typing import Dict, List, Any, Tuple, Optional, Union
 from dataclasses import dataclass
 
-from ..core.neo4j_manager import Neo4jManager
+from src.knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
+from src.knowledge_graph_system.utils.query_cache import QueryResultCache, make_cache_key, tags_for_query
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,10 +39,18 @@ class QueryProfile:
 class QueryOptimizer:
     """Utility for optimizing Neo4j queries and database configuration."""
     
-    def __init__(self, neo4j_manager: Neo4jManager):
-        """Initialize with a Neo4j connection."""
+    def __init__(self, neo4j_manager: Neo4jManager, query_cache: Optional[QueryResultCache] = None):
+        """
+        Initialize with a Neo4j connection.
+        
+        Args:
+            neo4j_manager: Neo4j database manager
+            query_cache: Result cache to use; share it with the KnowledgeGraphManager
+                so that its writes invalidate cached results
+        """
         self.neo4j = neo4j_manager
-        self.query_cache = {}
+        self.query_cache = query_cache or QueryResultCache()
+        self.caching_enabled = query_cache is not None
         self.query_stats = {}
     
     def profile_query(self, query: str, parameters: Dict[str, Any] = None) -> QueryProfile:
@@ -65,7 +74,7 @@ class QueryOptimizer:
             profile_query = query
         
         start_time = time.time()
-        result = self.neo4j.run_query(profile_query, **parameters)
+        result = self.neo4j.run_query(profile_query, parameters)
         end_time = time.time()
         
         execution_time_ms = (end_time - start_time) * 1000
@@ -315,7 +324,7 @@ class QueryOptimizer:
         AND labelsOrTypes = [$label] 
         AND properties = [$property]
         """
-        result = self.neo4j.run_query(query, label=label, property=property)
+        result = self.neo4j.run_query(query, {"label": label, "property": property})
         return len(result.data()) > 0
     
     def create_index(self, label: str, property: str) -> None:
@@ -504,7 +513,7 @@ class QueryOptimizer:
         Args:
             max_size: Maximum number of query results to cache
         """
-        self.max_cache_size = max_size
+        self.query_cache.max_entries = max_size
         self.caching_enabled = True
     
     def disable_query_caching(self) -> None:
@@ -513,82 +522,48 @@ class QueryOptimizer:
     
     def clear_query_cache(self) -> None:
         """Clear the query cache."""
-        self.query_cache = {}
+        self.query_cache.clear()
     
-    def execute_with_cache(self, query: str, parameters: Dict[str, Any] = None, ttl: int = 300) -> Any:
+    def execute_with_cache(self, query: str, parameters: Dict[str, Any] = None, ttl: int = 300) -> List[Dict[str, Any]]:
         """
         Execute a query with caching if enabled.
         
+        Results are cached as materialised records and tagged with the labels and
+        relationship types in the query, so writes to those labels or types evict them.
+        
         Args:
             query: The Cypher query to execute
             parameters: Query parameters
             ttl: Time-to-live for cache entry in seconds (default 5 minutes)
             
         Returns:
-            Query results
+            Query results as a list of records
         """
         if not self.caching_enabled:
-            return self.neo4j.run_query(query, **(parameters or {}))
+            return self.neo4j.run_query(query, parameters).data()
         
         # Normalize the query for cache lookup
         cache_key = self._get_cache_key(query, parameters)
         
         # Check if we have a cached result
-        now = time.time()
-        if cache_key in self.query_cache:
-            cache_entry = self.query_cache[cache_key]
-            if now - cache_entry['timestamp'] < ttl:
-                logger.debug(f"Cache hit for query: {query[:50]}...")
-                return cache_entry['result']
-        
-        # Execute the query
-        result = self.neo4j.run_query(query, **(parameters or {}))
-        
-        # Cache the result if it's not too large
-        try:
-            result_data = result.data()
-            if len(result_data) < 1000:  # Don't cache very large results
-                self.query_cache[cache_key] = {
-                    'timestamp': now,
-                    'result': result,
-                    'size': len(result_data)
-                }
-                
-                # Prune cache if it exceeds max size
-                if len(self.query_cache) > self.max_cache_size:
-                    self._prune_cache()
-        except Exception as e:
-            logger.warning(f"Failed to cache query result: {str(e)}")
+        records = self.query_cache.get(cache_key)
+        if records is not None:
+            logger.debug(f"Cache hit for query: {query[:50]}...")
+            return records
         
-        return result
+        # Execute the query and cache the materialised records
+        records = self.neo4j.run_query(query, parameters).data()
+        self.query_cache.put(cache_key, records, ttl=ttl, tags=tags_for_query(query))
+        
+        return records
     
     def _get_cache_key(self, query: str, parameters: Dict[str, Any] = None) -> str:
         """Generate a cache key for a query and its parameters."""
-        import hashlib
-        import json
-        
-        # Normalize the query
-        norm_query = self._normalize_query(query)
-        
-        # Serialize and hash the parameters
-        params_str = json.dumps(parameters or {}, sort_keys=True)
-        combined = f"{norm_query}|{params_str}"
-        
-        # Create a hash
-        return hashlib.md5(combined.encode()).hexdigest()
+        return make_cache_key(query, parameters)
     
-    def _prune_cache(self) -> None:
-        """Remove oldest entries from the cache."""
-        # Sort by timestamp
-        sorted_entries = sorted(
-            [(k, v['timestamp']) for k, v in self.query_cache.items()],
-            key=lambda x: x[1]
-        )
-        
-        # Remove the oldest third
-        to_remove = sorted_entries[:len(sorted_entries) // 3]
-        for key, _ in to_remove:
-            del self.query_cache[key]
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters for the query cache."""
+        return self.query_cache.stats()
     
     def get_query_statistics(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all executed queries."""
@@ -5,6 +5,7 @@ This module defines the FastAPI application for the Paper Processing Pipeline,
 integrating the routes and configuration.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any
 
@@ -13,6 +14,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from ..config.settings import settings, configure_logging
+from ..db.statistics import get_statistics_recorder
+from ..websocket.connection import connection_manager
+from ..websocket.batching import EventBatcher
+from ..websocket.event_bus import EventSubscriber
 from . import routes
 
 # Configure logging
@@ -91,6 +96,47 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
+# Batch the events for this process's WebSocket clients
+event_batcher = EventBatcher(
+    connection_manager,
+    settings.event_bus.batch_window_ms / 1000,
+    settings.event_bus.batch_max_events
+)
+
+# Forward events published by the workers to this process's WebSocket clients
+event_subscriber = EventSubscriber(
+    event_batcher,
+    settings.event_bus.redis_url,
+    settings.event_bus.channel
+) if settings.event_bus.enabled else None
+
+
+@app.on_event("startup")
+async def start_event_subscriber() -> None:
+    """Start receiving events from the event bus."""
+    if event_subscriber:
+        event_subscriber.start()
+
+
+@app.on_event("startup")
+async def rebuild_statistics() -> None:
+    """Rebuild the processing statistics, to count papers written before and repair drift."""
+    if not settings.database.rebuild_statistics_on_startup:
+        return
+    
+    try:
+        await asyncio.to_thread(get_statistics_recorder().rebuild)
+    except Exception as e:
+        logger.error(f"Could not rebuild the processing statistics: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_event_subscriber() -> None:
+    """Stop receiving events from the event bus."""
+    if event_subscriber:
+        await event_subscriber.stop()
+    await event_batcher.close()
+
 # Include paper processing routes
 app.include_router(routes.router)
 
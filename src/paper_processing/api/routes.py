@@ -15,9 +15,14 @@ from fastapi.responses import JSONResponse
 
 from ..models.paper import Paper, PaperStatus, add_processing_event
 from ..models.state_machine import PaperStateMachine, StateTransitionException
-from ..db.models import PaperModel
+from ..models.state_factory import get_state
+from ..db.connection import db_connection
+from ..db.models import PaperModel, BatchModel
+from ..db.search import PaperSearchEngine
+from ..db.statistics import AsyncStatisticsRecorder, StatisticsModel
 from ..tasks.processing_tasks import process_paper, cancel_processing_task
-from ..websocket.connection import manager
+from ..tasks.extraction_cache import get_extraction_cache
+from ..websocket.connection import JSON, connection_manager as manager
 from ..websocket.events import create_system_event
 
 # Create router
@@ -29,6 +34,16 @@ ws_router = APIRouter(tags=["WebSocket"])
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of papers submitted to the workers per Celery message in bulk batches
+BATCH_CHUNK_SIZE = 100
+
+# Statuses in which a paper of a batch has finished processing
+BATCH_FINISHED_STATUSES = {
+    PaperStatus.ANALYZED.value,
+    PaperStatus.IMPLEMENTATION_READY.value,
+    PaperStatus.FAILED.value
+}
+
 
 async def get_paper_model(paper_id: str) -> PaperModel:
     """
@@ -49,105 +64,79 @@ async def get_paper_model(paper_id: str) -> PaperModel:
     return paper_model
 
 
-@router.post("/{paper_id}/process")
-async def start_paper_processing(
-    background_tasks: BackgroundTasks,
-    paper_id: str = Path(..., description="The ID of the paper to process")
-) -> Dict[str, Any]:
+async def _papers_model() -> PaperModel:
     """
-    Process a paper.
+    Get the model of the papers, recording the status changes it writes in
+    the processing statistics.
     
-    Initiates the processing of a paper that has been uploaded.
+    Returns:
+        The paper model
+    """
+    statistics = AsyncStatisticsRecorder(
+        await db_connection.get_collection('papers'),
+        await db_connection.get_collection('statistics'),
+        await db_connection.get_collection('paper_statistics')
+    )
+    return PaperModel(statistics.papers, statistics=statistics)
+
+
+async def _record_statistics(paper_ids: List[str]) -> None:
+    """
+    Record the status of papers saved through the task models in the
+    processing statistics.
     
     Args:
-        background_tasks: FastAPI background tasks
-        paper_id: The ID of the paper to process
-        
-    Returns:
-        Dict containing the process request result
+        paper_ids: The IDs of the papers saved
     """
-    logger.info(f"Process request for paper {paper_id}")
+    if not paper_ids:
+        return
     
     try:
-        # Get the paper
-        paper_model = await get_paper_model(paper_id)
-        paper = paper_model.to_domain()
-        
-        # Check if paper is in a state that can be processed
-        if paper.status not in [PaperStatus.UPLOADED, PaperStatus.FAILED]:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "paper_id": paper_id,
-                    "status": "error",
-                    "message": f"Paper is already in {paper.status.value} state"
-                }
-            )
-        
-        # Queue the processing task
-        background_tasks.add_task(process_paper.delay, paper_id)
-        
-        # Update paper status to QUEUED
-        state_machine = PaperStateMachine(paper)
-        try:
-            paper = state_machine.transition_to(
-                PaperStatus.QUEUED, 
-                "Paper queued for processing via API"
-            )
-            
-            # Save the updated paper
-            paper_model.update_from_domain(paper)
-            paper_model.save()
-            
-            return {
-                "paper_id": paper_id,
-                "status": "success",
-                "message": "Paper queued for processing",
-                "current_status": paper.status.value,
-                "queue_time": datetime.utcnow().isoformat()
-            }
-        except StateTransitionException as e:
-            logger.error(f"State transition error for paper {paper_id}: {e}")
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "paper_id": paper_id,
-                    "status": "error",
-                    "message": str(e)
-                }
-            )
-            
+        paper_model = await _papers_model()
     except Exception as e:
-        logger.error(f"Error processing paper {paper_id}: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "paper_id": paper_id,
-                "status": "error",
-                "message": f"Error processing paper: {str(e)}"
-            }
-        )
+        logger.warning(f"Could not record statistics of {len(paper_ids)} papers: {e}")
+        return
+    await paper_model.record_statistics(paper_ids)
 
 
+# Batch routes come first, so that "batch" is not taken for a paper ID
 @router.post("/batch/process")
 async def process_papers_batch(
     background_tasks: BackgroundTasks,
-    paper_ids: List[str]
+    paper_ids: List[str],
+    bulk: bool = Query(False, description="Submit the papers with bulk database operations and return a batch ID")
 ) -> Dict[str, Any]:
     """
     Process multiple papers in batch.
     
-    Initiates the processing of multiple papers in batch.
+    Initiates the processing of multiple papers in batch. In bulk mode the
+    papers are read, queued and submitted to the workers with a constant
+    number of database round trips, and the progress of the batch can be
+    polled from ``/papers/batch/{batch_id}``.
     
     Args:
         background_tasks: FastAPI background tasks
         paper_ids: List of paper IDs to process
+        bulk: Whether to use bulk submission
         
     Returns:
         Dict containing the batch process request result
     """
     logger.info(f"Batch process request for {len(paper_ids)} papers")
     
+    if bulk:
+        try:
+            return await _submit_batch(background_tasks, paper_ids)
+        except Exception as e:
+            logger.error(f"Error submitting batch of {len(paper_ids)} papers: {e}")
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "status": "error",
+                    "message": f"Error submitting batch: {str(e)}"
+                }
+            )
+    
     results = {
         "total": len(paper_ids),
         "queued": 0,
@@ -155,6 +144,7 @@ async def process_papers_batch(
         "errors": 0,
         "details": []
     }
+    queued_ids = []
     
     for paper_id in paper_ids:
         try:
@@ -195,6 +185,7 @@ async def process_papers_batch(
                 # Save the updated paper
                 paper_model.update_from_domain(paper)
                 paper_model.save()
+                queued_ids.append(paper_id)
                 
                 results["queued"] += 1
                 results["details"].append({
@@ -218,9 +209,276 @@ async def process_papers_batch(
                 "message": f"Error: {str(e)}"
             })
     
+    await _record_statistics(queued_ids)
     return results
 
 
+async def _submit_batch(
+    background_tasks: BackgroundTasks,
+    paper_ids: List[str]
+) -> Dict[str, Any]:
+    """
+    Submit papers for processing with bulk database operations.
+    
+    The statuses of all papers are read with one query and the transitions
+    validated in memory against the state machine. The papers are then moved
+    to QUEUED and tagged with the batch ID in one bulk write, and submitted
+    to the workers in chunks once the response has been sent.
+    
+    Args:
+        background_tasks: FastAPI background tasks
+        paper_ids: List of paper IDs to process
+        
+    Returns:
+        Dict containing the batch ID and the submission result
+    """
+    paper_ids = list(dict.fromkeys(paper_ids))
+    batch_id = str(uuid.uuid4())
+    paper_model = await _papers_model()
+    batch_model = BatchModel(await db_connection.get_collection('batches'))
+    
+    statuses = await paper_model.find_statuses(paper_ids)
+    
+    # Validate the transitions in memory
+    queued_state = get_state(PaperStatus.QUEUED)
+    transitions = {}
+    details = []
+    for paper_id in paper_ids:
+        status = statuses.get(paper_id)
+        if status is None:
+            details.append({
+                "paper_id": paper_id,
+                "status": "error",
+                "message": "Paper not found"
+            })
+        elif status not in [PaperStatus.UPLOADED, PaperStatus.FAILED]:
+            details.append({
+                "paper_id": paper_id,
+                "status": "skipped",
+                "message": f"Paper is already in {status.value} state"
+            })
+        elif not get_state(status).can_transition_to(queued_state):
+            details.append({
+                "paper_id": paper_id,
+                "status": "error",
+                "message": f"State transition error: Invalid transition from {status.value} to queued"
+            })
+        else:
+            transitions[paper_id] = status
+    
+    updated = await paper_model.bulk_update_status(
+        transitions,
+        PaperStatus.QUEUED,
+        "Paper queued for batch processing via API",
+        {"batch_id": batch_id}
+    )
+    
+    queued_ids = list(transitions)
+    if updated < len(transitions):
+        # Some papers changed status between the read and the write
+        tagged = await paper_model.find_statuses(queued_ids, {"batch_id": batch_id})
+        for paper_id in queued_ids:
+            if paper_id not in tagged:
+                details.append({
+                    "paper_id": paper_id,
+                    "status": "skipped",
+                    "message": "Paper status changed during submission"
+                })
+        queued_ids = [paper_id for paper_id in queued_ids if paper_id in tagged]
+    
+    now = datetime.utcnow()
+    batch = {
+        "id": batch_id,
+        "status": "queued" if queued_ids else "completed",
+        "created_at": now,
+        "updated_at": now,
+        "total": len(paper_ids),
+        "queued": len(queued_ids),
+        "skipped": sum(1 for detail in details if detail["status"] == "skipped"),
+        "errors": sum(1 for detail in details if detail["status"] == "error"),
+        "paper_ids": queued_ids,
+        "progress": {PaperStatus.QUEUED.value: len(queued_ids)} if queued_ids else {},
+        "details": details
+    }
+    await batch_model.create(batch)
+    
+    if queued_ids:
+        background_tasks.add_task(_enqueue_batch, queued_ids)
+    
+    logger.info(f"Batch {batch_id}: queued {len(queued_ids)} of {len(paper_ids)} papers")
+    
+    return {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "total": batch["total"],
+        "queued": batch["queued"],
+        "skipped": batch["skipped"],
+        "errors": batch["errors"],
+        "details": details
+    }
+
+
+def _enqueue_batch(paper_ids: List[str]) -> None:
+    """
+    Submit queued papers to the workers in chunks.
+    
+    Args:
+        paper_ids: IDs of the queued papers
+    """
+    process_paper.chunks([(paper_id,) for paper_id in paper_ids], BATCH_CHUNK_SIZE).apply_async()
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(
+    batch_id: str = Path(..., description="The ID of the batch to check")
+) -> Dict[str, Any]:
+    """
+    Get the processing progress of a batch.
+    
+    Aggregates the statuses of the batch's papers and stores the result in
+    the batch document, so that finished batches are served without
+    aggregating again.
+    
+    Args:
+        batch_id: The ID of the batch to check
+        
+    Returns:
+        Dict containing the batch progress information
+    """
+    logger.info(f"Status request for batch {batch_id}")
+    
+    try:
+        batch_model = BatchModel(await db_connection.get_collection('batches'))
+        batch = await batch_model.find_by_id(batch_id)
+        if not batch:
+            raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+        
+        if batch["status"] != "completed":
+            paper_model = PaperModel(await db_connection.get_collection('papers'))
+            progress = await paper_model.count_by_status({"batch_id": batch_id})
+            
+            finished = sum(count for status, count in progress.items() if status in BATCH_FINISHED_STATUSES)
+            if finished >= batch["queued"]:
+                status = "completed"
+            elif progress.get(PaperStatus.QUEUED.value, 0) < batch["queued"]:
+                status = "processing"
+            else:
+                status = "queued"
+            
+            await batch_model.update_progress(batch_id, status, progress)
+            batch.update(status=status, progress=progress)
+        
+        progress = batch.get("progress", {})
+        finished = sum(count for status, count in progress.items() if status in BATCH_FINISHED_STATUSES)
+        
+        return {
+            "batch_id": batch_id,
+            "status": batch["status"],
+            "created_at": batch["created_at"].isoformat(),
+            "total": batch["total"],
+            "queued": batch["queued"],
+            "skipped": batch["skipped"],
+            "errors": batch["errors"],
+            "finished": finished,
+            "failed": progress.get(PaperStatus.FAILED.value, 0),
+            "progress": round(100 * finished / batch["queued"]) if batch["queued"] else 100,
+            "papers_by_status": progress
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving status for batch {batch_id}: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "batch_id": batch_id,
+                "status": "error",
+                "message": f"Error retrieving batch status: {str(e)}"
+            }
+        )
+
+
+@router.post("/{paper_id}/process")
+async def start_paper_processing(
+    background_tasks: BackgroundTasks,
+    paper_id: str = Path(..., description="The ID of the paper to process")
+) -> Dict[str, Any]:
+    """
+    Process a paper.
+    
+    Initiates the processing of a paper that has been uploaded.
+    
+    Args:
+        background_tasks: FastAPI background tasks
+        paper_id: The ID of the paper to process
+        
+    Returns:
+        Dict containing the process request result
+    """
+    logger.info(f"Process request for paper {paper_id}")
+    
+    try:
+        # Get the paper
+        paper_model = await get_paper_model(paper_id)
+        paper = paper_model.to_domain()
+        
+        # Check if paper is in a state that can be processed
+        if paper.status not in [PaperStatus.UPLOADED, PaperStatus.FAILED]:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "paper_id": paper_id,
+                    "status": "error",
+                    "message": f"Paper is already in {paper.status.value} state"
+                }
+            )
+        
+        # Queue the processing task
+        background_tasks.add_task(process_paper.delay, paper_id)
+        
+        # Update paper status to QUEUED
+        state_machine = PaperStateMachine(paper)
+        try:
+            paper = state_machine.transition_to(
+                PaperStatus.QUEUED, 
+                "Paper queued for processing via API"
+            )
+            
+            # Save the updated paper
+            paper_model.update_from_domain(paper)
+            paper_model.save()
+            await _record_statistics([paper_id])
+            
+            return {
+                "paper_id": paper_id,
+                "status": "success",
+                "message": "Paper queued for processing",
+                "current_status": paper.status.value,
+                "queue_time": datetime.utcnow().isoformat()
+            }
+        except StateTransitionException as e:
+            logger.error(f"State transition error for paper {paper_id}: {e}")
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "paper_id": paper_id,
+                    "status": "error",
+                    "message": str(e)
+                }
+            )
+            
+    except Exception as e:
+        logger.error(f"Error processing paper {paper_id}: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "paper_id": paper_id,
+                "status": "error",
+                "message": f"Error processing paper: {str(e)}"
+            }
+        )
+
+
 @router.get("/{paper_id}/status")
 async def get_paper_status(
     paper_id: str = Path(..., description="The ID of the paper to check")
@@ -533,35 +791,16 @@ async def get_processing_stats() -> Dict[str, Any]:
     logger.info("Processing statistics request")
     
     try:
-        # Get statistics from the model
-        # In a real implementation, this would query aggregate statistics
-        # For now, we'll create some sample statistics
-        
-        # Count papers by status
-        status_counts = {status.value: 0 for status in PaperStatus}
-        
-        # Generate sample data
-        status_counts.update({
-            PaperStatus.UPLOADED.value: 10,
-            PaperStatus.QUEUED.value: 3,
-            PaperStatus.PROCESSING.value: 2,
-            PaperStatus.EXTRACTING_ENTITIES.value: 1,
-            PaperStatus.EXTRACTING_RELATIONSHIPS.value: 1,
-            PaperStatus.BUILDING_KNOWLEDGE_GRAPH.value: 1,
-            PaperStatus.ANALYZED.value: 5,
-            PaperStatus.IMPLEMENTATION_READY.value: 3,
-            PaperStatus.FAILED.value: 2
-        })
-        
-        total_papers = sum(status_counts.values())
+        # Read the statistics materialized by the processing tasks
+        statistics_model = StatisticsModel(await db_connection.get_collection('statistics'))
+        statistics = await statistics_model.get()
+        
+        # Hit rates of the extraction cache, if it is enabled
+        extraction_cache = get_extraction_cache()
         
         return {
-            "total_papers": total_papers,
-            "papers_by_status": status_counts,
-            "avg_processing_time": 120.5,  # seconds
-            "avg_entity_count": 25.3,
-            "avg_relationship_count": 18.7,
-            "success_rate": 0.92,  # 92% success rate
+            **statistics,
+            "extraction_cache": extraction_cache.stats() if extraction_cache else None,
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
@@ -580,18 +819,21 @@ async def search_papers(
     query: Optional[str] = Query(None, description="Search query"),
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip")
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to return, from a previous result")
 ) -> Dict[str, Any]:
     """
     Search for papers.
     
-    Searches for papers matching the given criteria.
+    Searches for papers matching the given criteria. Papers matching a query
+    are ranked by relevance, others sorted by upload time, newest first.
     
     Args:
         query: Optional search query
         status: Optional status filter
         limit: Maximum number of results
-        offset: Number of results to skip
+        offset: Number of results to skip, if no cursor is given
+        cursor: Cursor of the page to return
         
     Returns:
         Dict containing search results
@@ -613,17 +855,46 @@ async def search_papers(
                     }
                 )
         
-        # In a real implementation, this would query the database
-        # For now, we'll return an empty result
+        search_engine = PaperSearchEngine(await db_connection.get_collection('papers'))
+        try:
+            result = await search_engine.search(
+                query=query,
+                status=status_enum,
+                limit=limit,
+                cursor=cursor,
+                offset=offset
+            )
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "message": str(e)
+                }
+            )
+        
+        papers = [
+            {
+                "id": doc["id"],
+                "title": doc.get("title"),
+                "authors": [author.get("name") for author in doc.get("authors") or []],
+                "abstract": doc.get("abstract"),
+                "status": doc.get("status"),
+                "uploaded_at": doc["uploaded_at"].isoformat() if doc.get("uploaded_at") else None,
+                "score": doc.get("score")
+            }
+            for doc in result["papers"]
+        ]
         
         return {
-            "count": 0,
-            "total": 0,
-            "papers": [],
+            "count": result["count"],
+            "total": result["total"],
+            "papers": papers,
             "query": query,
             "status": status,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": result["next_cursor"]
         }
     except Exception as e:
         logger.error(f"Error searching papers: {e}")
@@ -642,7 +913,8 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket endpoint for real-time paper processing updates.
     
     Establishes a WebSocket connection for receiving real-time updates
-    about all paper processing events.
+    about all paper processing events. Clients pass ?encoding=msgpack
+    to receive msgpack binary frames instead of JSON text frames.
     
     Args:
         websocket: The WebSocket connection
@@ -650,7 +922,7 @@ async def websocket_endpoint(websocket: WebSocket):
     client_id = str(uuid.uuid4())
     
     try:
-        await manager.connect(websocket, client_id)
+        await manager.connect(websocket, client_id, encoding=websocket.query_params.get("encoding", JSON))
         logger.info(f"WebSocket client {client_id} connected")
         
         # Send welcome message
@@ -794,7 +1066,9 @@ async def paper_websocket_endpoint(websocket: WebSocket, paper_id: str):
     WebSocket endpoint for real-time updates about a specific paper.
     
     Establishes a WebSocket connection for receiving real-time updates
-    about a specific paper's processing events.
+    about a specific paper's processing events. Clients pass
+    ?encoding=msgpack to receive msgpack binary frames instead of JSON
+    text frames.
     
     Args:
         websocket: The WebSocket connection
@@ -804,7 +1078,7 @@ async def paper_websocket_endpoint(websocket: WebSocket, paper_id: str):
     
     try:
         # Connect the client
-        await manager.connect(websocket, client_id)
+        await manager.connect(websocket, client_id, encoding=websocket.query_params.get("encoding", JSON))
         logger.info(f"WebSocket client {client_id} connected for paper {paper_id}")
         
         # Subscribe to the specified paper
@@ -70,6 +70,10 @@ class DatabaseSettings(BaseModel):
         description="Wait queue timeout in milliseconds",
         ge=1000
     )
+    rebuild_statistics_on_startup: bool = Field(
+        default=True,
+        description="Whether API processes rebuild the processing statistics from the papers when they start"
+    )
 
 
 class CelerySettings(BaseModel):
@@ -251,6 +255,102 @@ class ExtractionSettings(BaseModel):
     )
     
 
+class CacheSettings(BaseModel):
+    """Extraction cache settings."""
+    
+    enabled: bool = Field(
+        default=True,
+        description="Whether processing stages reuse results for unchanged documents"
+    )
+    backend: str = Field(
+        default="sqlite",
+        description="Cache backend (sqlite or redis)"
+    )
+    sqlite_path: str = Field(
+        default="/tmp/paper_processing/extraction_cache.sqlite3",
+        description="Path of the SQLite cache file"
+    )
+    redis_url: str = Field(
+        default="redis://localhost:6379/1",
+        description="Redis URL for the redis backend"
+    )
+    max_entries: int = Field(
+        default=10000,
+        description="Maximum number of cached stage results",
+        ge=1
+    )
+    max_size_mb: int = Field(
+        default=1024,
+        description="Maximum total size of the SQLite cache in megabytes",
+        ge=1
+    )
+    ttl_seconds: Optional[int] = Field(
+        default=None,
+        description="Expiry time of Redis cache entries (None for no expiry)"
+    )
+    
+    @validator('backend')
+    def validate_backend(cls, v):
+        """Validate cache backend."""
+        valid_backends = ['sqlite', 'redis']
+        if v not in valid_backends:
+            raise ValueError(f"Invalid cache backend. Must be one of {valid_backends}")
+        return v
+
+
+class PipelineSettings(BaseModel):
+    """Settings of the fused processing pipeline's paper store."""
+    
+    blob_store: str = Field(
+        default="gridfs",
+        description="Store for large paper content and segments (gridfs, local or none)"
+    )
+    blob_dir: str = Field(
+        default="/tmp/paper_processing/blobs",
+        description="Directory of the local blob store"
+    )
+    blob_threshold_kb: int = Field(
+        default=64,
+        description="Minimum size in kilobytes of content stored out of line",
+        ge=1
+    )
+    
+    @validator('blob_store')
+    def validate_blob_store(cls, v):
+        """Validate blob store."""
+        valid_stores = ['gridfs', 'local', 'none']
+        if v not in valid_stores:
+            raise ValueError(f"Invalid blob store. Must be one of {valid_stores}")
+        return v
+
+
+class EventBusSettings(BaseModel):
+    """Settings of the event bus carrying WebSocket events from workers to API processes."""
+    
+    enabled: bool = Field(
+        default=True,
+        description="Whether workers publish events and API processes subscribe to them"
+    )
+    redis_url: str = Field(
+        default="redis://localhost:6379/2",
+        description="Redis URL of the event bus"
+    )
+    channel: str = Field(
+        default="paper_processing:events",
+        description="Redis pub/sub channel of the events"
+    )
+    batch_window_ms: int = Field(
+        default=100,
+        ge=0,
+        description="Milliseconds the events of a paper are collected for before being sent together, or 0 to send them immediately"
+    )
+    batch_max_events: int = Field(
+        default=100,
+        ge=1,
+        description="Number of pending events of a paper at which they are sent without waiting for the window"
+    )
+
+
 class KnowledgeGraphSettings(BaseModel):
     """Knowledge Graph connection settings."""
     
@@ -415,6 +515,18 @@ class Settings(BaseSettings):
         default_factory=ExtractionSettings,
         description="Extraction settings"
     )
+    cache: CacheSettings = Field(
+        default_factory=CacheSettings,
+        description="Extraction cache settings"
+    )
+    pipeline: PipelineSettings = Field(
+        default_factory=PipelineSettings,
+        description="Fused processing pipeline settings"
+    )
+    event_bus: EventBusSettings = Field(
+        default_factory=EventBusSettings,
+        description="Event bus settings"
+    )
     knowledge_graph: KnowledgeGraphSettings = Field(
         default_factory=KnowledgeGraphSettings,
         description="Knowledge Graph settings"
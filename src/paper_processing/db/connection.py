@@ -91,7 +91,8 @@ class DatabaseConnection:
                 'papers': self.db.papers,
                 'batches': self.db.batches,
                 'tasks': self.db.tasks,
-                'statistics': self.db.statistics
+                'statistics': self.db.statistics,
+                'paper_statistics': self.db.paper_statistics
             }
             
             # Test connection
@@ -155,7 +156,9 @@ class DatabaseConnection:
         await self.collections['papers'].create_index([('id', 1)], unique=True)
         await self.collections['papers'].create_index([('status', 1)])
         await self.collections['papers'].create_index([('uploaded_at', -1)])
-        await self.collections['papers'].create_index([('title', 'text'), ('abstract', 'text')])
+        await self.collections['papers'].create_index([('uploaded_at', -1), ('id', -1)])
+        await self.collections['papers'].create_index([('batch_id', 1), ('status', 1)])
+        await self._create_text_index()
         
         # Batches collection indexes
         await self.collections['batches'].create_index([('id', 1)], unique=True)
@@ -169,8 +172,66 @@ class DatabaseConnection:
         await self.collections['tasks'].create_index([('created_at', -1)])
         
         logger.info("Created MongoDB indexes")
+    
+    async def _create_text_index(self) -> None:
+        """
+        Create the weighted text index used by paper search.
+        
+        A collection can only have one text index, so a text index with
+        other fields or weights, such as the former title/abstract index,
+        is dropped first.
+        """
+        from .search import TEXT_INDEX_NAME, TEXT_INDEX_WEIGHTS
+        
+        papers = self.collections['papers']
+        async for index in papers.list_indexes():
+            if 'textIndexVersion' in index and index['name'] != TEXT_INDEX_NAME:
+                logger.info(f"Dropping text index {index['name']} of papers")
+                await papers.drop_index(index['name'])
+        
+        await papers.create_index(
+            [(field, 'text') for field in TEXT_INDEX_WEIGHTS],
+            name=TEXT_INDEX_NAME,
+            weights=TEXT_INDEX_WEIGHTS
+        )
 
 
 # Global database connection instance
 # This will be initialized by the application at startup
-db_connection = DatabaseConnection()
\ No newline at end of file
+db_connection = DatabaseConnection()
+
+
+# Synchronous database shared by the Celery tasks of this process
+_sync_database = None
+_sync_database_pid: Optional[int] = None
+
+
+def get_sync_database():
+    """
+    Get a synchronous pymongo database configured from the settings.
+    
+    The Celery tasks use this instead of the Motor connection, which needs
+    the application's event loop.
+    
+    Returns:
+        The pymongo database of this process
+    """
+    global _sync_database, _sync_database_pid
+    
+    # Celery's prefork workers must not share a client created before the fork
+    if _sync_database is None or _sync_database_pid != os.getpid():
+        from pymongo import MongoClient
+        from ..config.settings import settings
+        
+        database_settings = settings.database
+        client = MongoClient(
+            database_settings.mongodb_uri,
+            maxPoolSize=database_settings.max_pool_size,
+            minPoolSize=database_settings.min_pool_size,
+            connectTimeoutMS=database_settings.connect_timeout_ms,
+            serverSelectionTimeoutMS=database_settings.server_selection_timeout_ms
+        )
+        _sync_database = client[database_settings.database_name]
+        _sync_database_pid = os.getpid()
+    
+    return _sync_database
\ No newline at end of file
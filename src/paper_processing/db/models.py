@@ -9,12 +9,12 @@ Current Implementation Status:
 - Core paper model defined ✓
 - Document schema defined ✓
 - State persistence functionality ✓
+- Batch operations ✓
 
 Upcoming Development:
 - Index creation for query optimization
 - Schema migration utilities
 - Advanced query methods
-- Batch operations
 """
 
 import logging
@@ -44,14 +44,20 @@ class PaperModel:
     It converts between the Pydantic Paper model and MongoDB documents.
     """
     
-    def __init__(self, collection: Collection):
+    def __init__(self, collection: Collection, blob_store=None, statistics=None):
         """
         Initialize the paper model.
         
         Args:
             collection: MongoDB collection for papers
+            blob_store: Store of the payloads saved out of line by the fused
+                pipeline (defaults to the store configured in the settings)
+            statistics: AsyncStatisticsRecorder the status changes are
+                recorded with, if any
         """
         self.collection = collection
+        self.blob_store = blob_store
+        self.statistics = statistics
     
     def to_document(self, paper: Paper) -> Dict[str, Any]:
         """
@@ -87,6 +93,11 @@ class PaperModel:
         Returns:
             Paper model
         """
+        # Read back the payloads the fused pipeline stored out of line
+        from .paper_store import get_blob_store, has_blob_references, resolve_blob_references
+        if has_blob_references(doc):
+            resolve_blob_references(doc, self.blob_store or get_blob_store())
+        
         # Convert status string to enum
         if 'status' in doc and isinstance(doc['status'], str):
             doc['status'] = PaperStatus(doc['status'])
@@ -143,11 +154,29 @@ class PaperModel:
                 upsert=True
             )
             logger.debug(f"Saved paper {paper.id}, upserted: {result.upserted_id is not None}")
+            await self.record_statistics([paper.id])
             return paper
         except PyMongoError as e:
             logger.error(f"Database error saving paper {paper.id}: {e}")
             raise DatabaseError(f"Error saving paper: {e}")
     
+    async def record_statistics(self, paper_ids: List[str]) -> None:
+        """
+        Record the status of papers in the processing statistics.
+        
+        Statistics are best effort: failing to record them does not fail the write.
+        
+        Args:
+            paper_ids: The IDs of the papers written
+        """
+        if self.statistics is None:
+            return
+        
+        try:
+            await self.statistics.record_many(paper_ids)
+        except Exception as e:
+            logger.warning(f"Could not record statistics of {len(paper_ids)} papers: {e}")
+    
     async def update_status(
         self,
         paper_id: str,
@@ -192,6 +221,7 @@ class PaperModel:
             if result.matched_count == 0:
                 logger.warning(f"Paper {paper_id} not found for status update")
                 return None
+            await self.record_statistics([paper_id])
             
             # Fetch the updated paper
             return await self.find_by_id(paper_id)
@@ -199,6 +229,122 @@ class PaperModel:
             logger.error(f"Database error updating paper {paper_id} status: {e}")
             raise DatabaseError(f"Error updating paper status: {e}")
     
+    async def find_statuses(
+        self,
+        paper_ids: List[str],
+        extra_filter: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, PaperStatus]:
+        """
+        Find the statuses of many papers with a single query.
+        
+        Args:
+            paper_ids: The IDs of the papers to find
+            extra_filter: Optional additional filter the papers must match
+            
+        Returns:
+            Dict mapping the ID of each paper found to its status
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            filter_query = {'id': {'$in': paper_ids}}
+            if extra_filter:
+                filter_query.update(extra_filter)
+            
+            cursor = self.collection.find(filter_query, {'_id': 0, 'id': 1, 'status': 1})
+            
+            statuses = {}
+            async for doc in cursor:
+                statuses[doc['id']] = PaperStatus(doc['status'])
+            
+            return statuses
+        except PyMongoError as e:
+            logger.error(f"Database error finding statuses of {len(paper_ids)} papers: {e}")
+            raise DatabaseError(f"Error finding paper statuses: {e}")
+    
+    async def bulk_update_status(
+        self,
+        current_statuses: Dict[str, PaperStatus],
+        status: PaperStatus,
+        message: str,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Update the status of many papers with a single bulk write.
+        
+        Each paper is only updated if it is still in the status it was read
+        in, so that a concurrent transition is not overwritten.
+        
+        Args:
+            current_statuses: Dict mapping paper IDs to their expected current status
+            status: The new status
+            message: Status change message
+            fields: Optional additional fields to set on each paper
+            
+        Returns:
+            Number of papers updated
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        if not current_statuses:
+            return 0
+        
+        try:
+            now = datetime.utcnow()
+            update = {
+                '$set': {'status': status.value, 'last_updated': now, **(fields or {})},
+                '$push': {'processing_history': {
+                    'timestamp': now,
+                    'status': status.value,
+                    'message': message
+                }}
+            }
+            
+            operations = [
+                UpdateOne({'id': paper_id, 'status': current_status.value}, update)
+                for paper_id, current_status in current_statuses.items()
+            ]
+            result = await self.collection.bulk_write(operations, ordered=False)
+            
+            logger.debug(f"Updated {result.matched_count} of {len(operations)} papers to {status.value}")
+            if result.matched_count:
+                await self.record_statistics(list(current_statuses))
+            return result.matched_count
+        except PyMongoError as e:
+            logger.error(f"Database error updating status of {len(current_statuses)} papers: {e}")
+            raise DatabaseError(f"Error updating paper statuses: {e}")
+    
+    async def count_by_status(self, filter_query: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Count papers by status.
+        
+        Args:
+            filter_query: Optional filter the counted papers must match
+            
+        Returns:
+            Dict mapping status values to paper counts
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            pipeline = [
+                {'$match': filter_query or {}},
+                {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+            ]
+            
+            counts = {}
+            cursor = self.collection.aggregate(pipeline)
+            async for doc in cursor:
+                counts[doc['_id']] = doc['count']
+            
+            return counts
+        except PyMongoError as e:
+            logger.error(f"Database error counting papers by status: {e}")
+            raise DatabaseError(f"Error counting papers by status: {e}")
+    
     async def find_by_status(
         self,
         status: PaperStatus,
@@ -242,79 +388,62 @@ class PaperModel:
         to_date: Optional[datetime] = None,
         limit: int = 10,
         offset: int = 0,
-        sort_by: str = 'uploaded_at',
+        cursor: Optional[str] = None,
         sort_order: int = -1
     ) -> Dict[str, Any]:
         """
         Search for papers matching criteria.
         
+        Papers matching a query are ranked by relevance; otherwise they are
+        sorted by upload time. Pass the ``next_cursor`` of a result to get the
+        following page.
+        
         Args:
-            query: Optional search query
+            query: Optional full-text search query
             status: Optional status filter
             from_date: Optional from date filter
             to_date: Optional to date filter
             limit: Maximum number of papers to return
-            offset: Number of papers to skip
-            sort_by: Field to sort by
-            sort_order: Sort order (1 for ascending, -1 for descending)
+            offset: Number of papers to skip, if no cursor is given
+            cursor: Cursor of the page to return
+            sort_order: Order of upload times (1 for ascending, -1 for descending)
             
         Returns:
             Dict with search results and metadata
             
         Raises:
+            ValueError: If the cursor is invalid
             DatabaseError: If a database error occurs
         """
-        try:
-            # Build filter
-            filter_query = {}
-            
-            if query:
-                filter_query['$or'] = [
-                    {'title': {'$regex': query, '$options': 'i'}},
-                    {'abstract': {'$regex': query, '$options': 'i'}},
-                    {'authors.name': {'$regex': query, '$options': 'i'}}
-                ]
-            
-            if status:
-                filter_query['status'] = status.value
-            
-            date_filter = {}
-            if from_date:
-                date_filter['$gte'] = from_date
-            if to_date:
-                date_filter['$lte'] = to_date
-            
-            if date_filter:
-                filter_query['uploaded_at'] = date_filter
-            
-            # Count total matches
-            total = await self.collection.count_documents(filter_query)
-            
-            # Execute search
-            cursor = self.collection.find(filter_query) \
-                .skip(offset) \
-                .limit(limit) \
-                .sort(sort_by, sort_order)
-            
-            # Collect results
-            papers = []
-            async for doc in cursor:
-                papers.append(self.from_document(doc))
-            
-            return {
-                'count': len(papers),
-                'total': total,
-                'limit': limit,
-                'offset': offset,
-                'papers': papers
-            }
-        except PyMongoError as e:
-            logger.error(f"Database error searching papers: {e}")
-            raise DatabaseError(f"Error searching papers: {e}")
+        from .search import PaperSearchEngine
+        
+        result = await PaperSearchEngine(self.collection).search(
+            query=query,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+            sort_order=sort_order,
+            fields=None
+        )
+        
+        return {
+            'count': result['count'],
+            'total': result['total'],
+            'limit': limit,
+            'offset': offset,
+            'papers': [self.from_document(doc) for doc in result['papers']],
+            'next_cursor': result['next_cursor']
+        }
     
     async def get_statistics(self) -> Dict[str, Any]:
         """
-        Get paper processing statistics.
+        Compute paper processing statistics from all papers.
+        
+        This scans the collection; the API serves the statistics materialized
+        by the processing tasks instead.
         
         Returns:
             Dict with statistics
@@ -322,39 +451,103 @@ class PaperModel:
         Raises:
             DatabaseError: If a database error occurs
         """
+        from .statistics import rebuild_pipeline, summarize
+        
         try:
-            # Count papers by status
-            pipeline = [
-                {
-                    '$group': {
-                        '_id': '$status',
-                        'count': {'$sum': 1}
-                    }
-                }
-            ]
+            doc = None
+            cursor = self.collection.aggregate(rebuild_pipeline())
+            async for result in cursor:
+                doc = result
             
-            status_counts = {}
-            cursor = self.collection.aggregate(pipeline)
-            async for doc in cursor:
-                status_counts[doc['_id']] = doc['count']
+            return summarize(doc)
+        except PyMongoError as e:
+            logger.error(f"Database error getting statistics: {e}")
+            raise DatabaseError(f"Error getting statistics: {e}")
+
+
+class BatchModel:
+    """
+    Database model for batches of papers submitted for processing.
+    
+    A batch records the papers submitted together and the outcome of the
+    submission. Its progress is aggregated from the papers tagged with the
+    batch ID and materialized in the batch document when polled.
+    """
+    
+    def __init__(self, collection: Collection):
+        """
+        Initialize the batch model.
+        
+        Args:
+            collection: MongoDB collection for batches
+        """
+        self.collection = collection
+    
+    async def create(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a new batch.
+        
+        Args:
+            batch: The batch document, including its ID
             
-            # Calculate total papers
-            total_papers = sum(status_counts.values())
+        Returns:
+            The stored batch
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            await self.collection.insert_one(dict(batch))
+            logger.debug(f"Created batch {batch['id']}")
+            return batch
+        except PyMongoError as e:
+            logger.error(f"Database error creating batch {batch.get('id')}: {e}")
+            raise DatabaseError(f"Error creating batch: {e}")
+    
+    async def find_by_id(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a batch by ID.
+        
+        Args:
+            batch_id: The ID of the batch to find
             
-            # This is a placeholder for the rest of the statistics
-            # The full implementation would calculate average processing times,
-            # entity counts, etc.
+        Returns:
+            The batch document if found, None otherwise
             
-            return {
-                'total_papers': total_papers,
-                'papers_by_status': status_counts,
-                'avg_processing_time': 0.0,  # Placeholder
-                'avg_entity_count': 0.0,     # Placeholder
-                'avg_relationship_count': 0.0  # Placeholder
-            }
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            return await self.collection.find_one({'id': batch_id}, {'_id': 0})
         except PyMongoError as e:
-            logger.error(f"Database error getting statistics: {e}")
-            raise DatabaseError(f"Error getting statistics: {e}")
+            logger.error(f"Database error finding batch {batch_id}: {e}")
+            raise DatabaseError(f"Error finding batch: {e}")
+    
+    async def update_progress(
+        self,
+        batch_id: str,
+        status: str,
+        progress: Dict[str, int]
+    ) -> None:
+        """
+        Materialize the progress of a batch in its document.
+        
+        Args:
+            batch_id: The ID of the batch to update
+            status: The status of the batch
+            progress: Dict mapping paper status values to paper counts
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            await self.collection.update_one(
+                {'id': batch_id},
+                {'$set': {'status': status, 'progress': progress, 'updated_at': datetime.utcnow()}}
+            )
+        except PyMongoError as e:
+            logger.error(f"Database error updating batch {batch_id}: {e}")
+            raise DatabaseError(f"Error updating batch: {e}")
 
 
 # This will be initialized by the application at startup
@@ -0,0 +1,448 @@
+"""
+Delta-persisting paper store for the Paper Processing Pipeline.
+
+This module provides the PaperStore class, which saves papers held in memory by
+writing only the fields that changed since they were loaded or last saved, as
+``$set`` updates with processing events appended by ``$push``. Large payloads
+such as the document content and segments are stored out of line in a blob
+store (GridFS or a local directory) and referenced from the paper document, so
+status updates do not rewrite them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from ..models.paper import Paper, PaperStatus
+from .models import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Fields stored out of line once their JSON form reaches the blob threshold
+BLOB_FIELDS = ("content", "metadata.document.segments")
+
+# Key of the reference that replaces an out-of-line field in the paper document
+BLOB_REFERENCE_KEY = "_blob_id"
+
+
+class BlobStore(ABC):
+    """
+    Storage for large, immutable payloads.
+
+    Blobs are addressed by the SHA-256 of their content, so storing the same
+    payload twice writes it once.
+    """
+
+    @abstractmethod
+    def put(self, blob_id: str, data: bytes) -> None:
+        """Store a blob under its content hash, unless it is already stored."""
+        pass
+
+    @abstractmethod
+    def get(self, blob_id: str) -> bytes:
+        """Return a blob's content, raising KeyError if it does not exist."""
+        pass
+
+    @abstractmethod
+    def delete(self, blob_id: str) -> None:
+        """Remove a blob if it exists."""
+        pass
+
+
+class GridFSBlobStore(BlobStore):
+    """Blob store keeping blobs in a MongoDB GridFS bucket."""
+
+    def __init__(self, database, bucket_name: str = "paper_blobs"):
+        """
+        Initialize the blob store.
+
+        Args:
+            database: pymongo Database holding the bucket
+            bucket_name: Name of the GridFS bucket
+        """
+        import gridfs
+
+        self._errors = gridfs.errors
+        self.bucket = gridfs.GridFSBucket(database, bucket_name=bucket_name)
+        self.files = database[f"{bucket_name}.files"]
+
+    def put(self, blob_id: str, data: bytes) -> None:
+        if self.files.count_documents({"_id": blob_id}, limit=1):
+            return
+        try:
+            self.bucket.upload_from_stream_with_id(blob_id, blob_id, data)
+        except self._errors.FileExists:
+            # Stored concurrently by another worker
+            pass
+
+    def get(self, blob_id: str) -> bytes:
+        try:
+            return self.bucket.open_download_stream(blob_id).read()
+        except self._errors.NoFile:
+            raise KeyError(blob_id)
+
+    def delete(self, blob_id: str) -> None:
+        try:
+            self.bucket.delete(blob_id)
+        except self._errors.NoFile:
+            pass
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store keeping each blob in a file of a local directory."""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the blob store.
+
+        Args:
+            directory: Directory of the blob files, created if needed
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, blob_id: str) -> str:
+        return os.path.join(self.directory, blob_id)
+
+    def put(self, blob_id: str, data: bytes) -> None:
+        path = self._path(blob_id)
+        if os.path.exists(path):
+            return
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def get(self, blob_id: str) -> bytes:
+        try:
+            with open(self._path(blob_id), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(blob_id)
+
+    def delete(self, blob_id: str) -> None:
+        try:
+            os.unlink(self._path(blob_id))
+        except FileNotFoundError:
+            pass
+
+
+def compute_delta(before: Dict[str, Any], after: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Compute the MongoDB update turning one document into another.
+
+    Nested dictionaries are compared key by key, so only the changed leaves
+    are set. A list that only grew at the end is extended with ``$push``;
+    any other changed value is replaced with ``$set``.
+
+    Args:
+        before: Document as last persisted
+        after: Document as it should be persisted
+        prefix: Dotted path of the documents within a larger document
+
+    Returns:
+        Update document with ``$set``, ``$unset`` and ``$push`` operators as
+        needed; empty if nothing changed
+    """
+    set_fields: Dict[str, Any] = {}
+    unset_fields: Dict[str, Any] = {}
+    push_fields: Dict[str, Any] = {}
+
+    for key, value in after.items():
+        path = f"{prefix}{key}"
+        if key not in before:
+            set_fields[path] = value
+            continue
+
+        old_value = before[key]
+        if old_value == value:
+            continue
+
+        if isinstance(old_value, dict) and isinstance(value, dict) and value and _is_path_safe(value):
+            nested = compute_delta(old_value, value, f"{path}.")
+            set_fields.update(nested.get("$set", {}))
+            unset_fields.update(nested.get("$unset", {}))
+            push_fields.update(nested.get("$push", {}))
+        elif isinstance(old_value, list) and isinstance(value, list) and \
+                len(value) > len(old_value) and value[:len(old_value)] == old_value:
+            push_fields[path] = {"$each": value[len(old_value):]}
+        else:
+            set_fields[path] = value
+
+    for key in before:
+        if key not in after:
+            unset_fields[f"{prefix}{key}"] = ""
+
+    update = {}
+    if set_fields:
+        update["$set"] = set_fields
+    if unset_fields:
+        update["$unset"] = unset_fields
+    if push_fields:
+        update["$push"] = push_fields
+    return update
+
+
+def _is_path_safe(value: Dict[str, Any]) -> bool:
+    """Whether every key of a dictionary can be used in a dotted field path."""
+    return all(isinstance(key, str) and key and "." not in key and not key.startswith("$") for key in value)
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Return the dictionary holding a dotted path's last key, and that key."""
+    *parents, key = path.split(".")
+    for parent in parents:
+        doc = doc.get(parent) if isinstance(doc, dict) else None
+        if not isinstance(doc, dict):
+            return None, None
+    return doc, key
+
+
+def has_blob_references(doc: Dict[str, Any]) -> bool:
+    """Whether any of a paper document's BLOB_FIELDS is stored out of line."""
+    for path in BLOB_FIELDS:
+        parent, key = _get_path(doc, path)
+        reference = parent.get(key) if parent is not None else None
+        if isinstance(reference, dict) and BLOB_REFERENCE_KEY in reference:
+            return True
+    return False
+
+
+def resolve_blob_references(doc: Dict[str, Any], blob_store: Optional["BlobStore"]) -> Dict[str, Any]:
+    """
+    Replace the blob references of a paper document by their payloads, in place.
+
+    Every reader building a Paper from a stored document goes through this,
+    so papers saved in fused mode read back like any other.
+
+    Args:
+        doc: Paper document as stored in MongoDB
+        blob_store: Store holding the referenced blobs
+
+    Returns:
+        The document
+
+    Raises:
+        DatabaseError: If the document references blobs that cannot be read
+    """
+    for path in BLOB_FIELDS:
+        parent, key = _get_path(doc, path)
+        reference = parent.get(key) if parent is not None else None
+        if not (isinstance(reference, dict) and BLOB_REFERENCE_KEY in reference):
+            continue
+
+        if blob_store is None:
+            raise DatabaseError(f"No blob store configured to read {path} of paper {doc.get('id')}")
+        try:
+            parent[key] = json.loads(blob_store.get(reference[BLOB_REFERENCE_KEY]))
+        except KeyError:
+            raise DatabaseError(f"Blob {reference[BLOB_REFERENCE_KEY]} of paper {doc.get('id')} is missing")
+
+    return doc
+
+
+class PaperStore:
+    """
+    Synchronous paper store that persists field-level deltas.
+
+    A paper loaded or saved through the store is remembered as persisted;
+    saving it again writes only what changed since. Payloads of BLOB_FIELDS
+    at least ``blob_threshold`` bytes long are written to the blob store once
+    and referenced by their content hash.
+    """
+
+    def __init__(self, collection: Collection, blob_store: Optional[BlobStore] = None,
+                 blob_threshold: int = 64 * 1024):
+        """
+        Initialize the paper store.
+
+        Args:
+            collection: pymongo collection of papers
+            blob_store: Store for large payloads; if None they stay inline
+            blob_threshold: Minimum size in bytes of a payload stored out of line
+        """
+        self.collection = collection
+        self.blob_store = blob_store
+        self.blob_threshold = blob_threshold
+        self._persisted: Dict[str, Dict[str, Any]] = {}
+
+    def to_document(self, paper: Paper) -> Dict[str, Any]:
+        """
+        Convert a paper to its MongoDB document, without blob references.
+
+        Args:
+            paper: The paper to convert
+
+        Returns:
+            Dict representing the MongoDB document
+        """
+        doc = paper.model_dump(mode="python")
+        doc["status"] = paper.status.value
+        for event in doc.get("processing_history") or []:
+            if isinstance(event.get("status"), PaperStatus):
+                event["status"] = event["status"].value
+        return doc
+
+    def load(self, paper_id: str) -> Optional[Paper]:
+        """
+        Load a paper, resolving its out-of-line payloads.
+
+        Args:
+            paper_id: The ID of the paper to load
+
+        Returns:
+            The paper, or None if it does not exist
+
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            stored = self.collection.find_one({"id": paper_id}, {"_id": 0})
+        except PyMongoError as e:
+            logger.error(f"Database error loading paper {paper_id}: {e}")
+            raise DatabaseError(f"Error loading paper: {e}")
+
+        if stored is None:
+            return None
+
+        doc = resolve_blob_references(deepcopy(stored), self.blob_store)
+
+        self._persisted[paper_id] = stored
+        return Paper(**doc)
+
+    def save(self, paper: Paper) -> Dict[str, Any]:
+        """
+        Persist the changes to a paper since it was loaded or last saved.
+
+        A paper the store has not seen is inserted, or replaces the stored
+        document, as a whole.
+
+        Args:
+            paper: The paper to save
+
+        Returns:
+            The update applied, empty if nothing changed
+
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        before = self._persisted.get(paper.id)
+        after = self._externalize(self.to_document(paper), before)
+
+        try:
+            if before is None:
+                self.collection.replace_one({"id": paper.id}, after, upsert=True)
+                update = {"$set": after}
+            else:
+                update = compute_delta(before, after)
+                if update:
+                    self.collection.update_one({"id": paper.id}, update)
+        except PyMongoError as e:
+            logger.error(f"Database error saving paper {paper.id}: {e}")
+            raise DatabaseError(f"Error saving paper: {e}")
+
+        if update:
+            logger.debug(f"Saved paper {paper.id}: {sorted(k for op in update.values() for k in op)}")
+        self._persisted[paper.id] = after
+        return update
+
+    def forget(self, paper_id: str) -> None:
+        """Stop tracking a paper, so that its next save writes it as a whole."""
+        self._persisted.pop(paper_id, None)
+
+    def _externalize(self, doc: Dict[str, Any], before: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Replace large payloads of a document by references to blobs."""
+        if self.blob_store is None:
+            return doc
+
+        for path in BLOB_FIELDS:
+            parent, key = _get_path(doc, path)
+            if parent is None or parent.get(key) is None:
+                continue
+
+            data = json.dumps(parent[key], default=str).encode("utf-8")
+            if len(data) < self.blob_threshold:
+                continue
+
+            blob_id = hashlib.sha256(data).hexdigest()
+            reference = {BLOB_REFERENCE_KEY: blob_id, "size": len(data)}
+
+            previous_parent, _ = _get_path(before, path) if before else (None, None)
+            previous = previous_parent.get(key) if previous_parent is not None else None
+            if previous != reference:
+                self.blob_store.put(blob_id, data)
+
+            parent[key] = reference
+
+        return doc
+
+
+# Store shared by the tasks of this process, created from the settings on first use
+_paper_store: Optional[PaperStore] = None
+_paper_store_pid: Optional[int] = None
+
+# Blob store shared by the readers of this process, created from the settings on first use
+_blob_store: Optional[BlobStore] = None
+_blob_store_pid: Optional[int] = None
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """
+    Get the blob store configured in the settings.
+
+    Returns:
+        The blob store of this process, or None if payloads are kept inline
+    """
+    global _blob_store, _blob_store_pid
+
+    if _blob_store_pid != os.getpid():
+        from paper_processing.config.settings import settings
+
+        pipeline_settings = settings.pipeline
+        if pipeline_settings.blob_store == "gridfs":
+            from .connection import get_sync_database
+            _blob_store = GridFSBlobStore(get_sync_database())
+        elif pipeline_settings.blob_store == "local":
+            _blob_store = LocalBlobStore(pipeline_settings.blob_dir)
+        else:
+            _blob_store = None
+        _blob_store_pid = os.getpid()
+
+    return _blob_store
+
+
+def get_paper_store() -> PaperStore:
+    """
+    Get the paper store configured in the settings.
+
+    Returns:
+        The paper store of this process
+    """
+    global _paper_store, _paper_store_pid
+
+    if _paper_store is None or _paper_store_pid != os.getpid():
+        from paper_processing.config.settings import settings
+        from .connection import get_sync_database
+
+        _paper_store = PaperStore(
+            get_sync_database().papers,
+            blob_store=get_blob_store(),
+            blob_threshold=settings.pipeline.blob_threshold_kb * 1024
+        )
+        _paper_store_pid = os.getpid()
+
+    return _paper_store
@@ -0,0 +1,221 @@
+"""
+Paper search for the Paper Processing Pipeline.
+
+This module provides the PaperSearchEngine class, which searches the papers
+collection through its text index. Matches are ranked by relevance, and pages
+are addressed by keyset cursors on ``(uploaded_at, id)`` rather than offsets,
+so that deep pages cost the same as the first. Results and the total match
+count are computed by a single ``$facet`` aggregation.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from ..models.paper import PaperStatus
+from .models import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Name and weights of the papers collection's text index
+TEXT_INDEX_NAME = "paper_text"
+TEXT_INDEX_WEIGHTS = {"title": 10, "abstract": 5, "authors.name": 3}
+
+# Fields of the paper summaries returned by default, with the relevance score
+SUMMARY_FIELDS = ("id", "title", "authors.name", "abstract", "status", "uploaded_at")
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last result of a page as a cursor.
+
+    Args:
+        values: Sort key values, with datetimes
+
+    Returns:
+        Opaque URL-safe cursor
+    """
+    data = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, fields: List[str]) -> List[Any]:
+    """
+    Decode a cursor into the sort key it was created from.
+
+    Args:
+        cursor: Cursor returned with a previous page
+        fields: Names of the sort key fields
+
+    Returns:
+        Sort key values
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError("Invalid cursor: sort key does not match the search")
+
+    try:
+        return [
+            datetime.fromisoformat(value) if field == "uploaded_at" else value
+            for field, value in zip(fields, values)
+        ]
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+    """
+    Build the filter selecting the documents after a sort key.
+
+    Args:
+        sort: Sort fields and directions (1 ascending, -1 descending)
+        values: Sort key of the last document of the previous page
+
+    Returns:
+        MongoDB filter
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prefix_field: value for (prefix_field, _), value in zip(sort[:i], values[:i])}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+class PaperSearchEngine:
+    """
+    Search engine for papers.
+
+    A query is matched against the text index over titles, abstracts and
+    author names and ranked by relevance; without a query, papers are
+    listed by upload time. Either way, ties are broken by paper ID so that
+    every paper has a unique position for keyset pagination.
+    """
+
+    def __init__(self, collection: Collection):
+        """
+        Initialize the search engine.
+
+        Args:
+            collection: MongoDB collection for papers
+        """
+        self.collection = collection
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        status: Optional[PaperStatus] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        sort_order: int = -1,
+        fields: Optional[Sequence[str]] = SUMMARY_FIELDS
+    ) -> Dict[str, Any]:
+        """
+        Search for papers matching criteria.
+
+        Args:
+            query: Optional full-text search query
+            status: Optional status filter
+            from_date: Optional from date filter
+            to_date: Optional to date filter
+            limit: Maximum number of papers to return
+            cursor: Cursor of the page to return, from a previous result
+            offset: Number of papers to skip, for clients without cursors
+            sort_order: Order of upload times (1 for ascending, -1 for descending)
+            fields: Fields of the paper documents to return, or None for the
+                whole documents
+
+        Returns:
+            Dict with the matching paper documents, each with its relevance
+            score if a query was given, the total number of matches and the
+            cursor of the next page, or None on the last page
+
+        Raises:
+            ValueError: If the cursor is invalid
+            DatabaseError: If a database error occurs
+        """
+        filter_query: Dict[str, Any] = {}
+        if query:
+            filter_query["$text"] = {"$search": query}
+        if status:
+            filter_query["status"] = status.value
+
+        date_filter = {}
+        if from_date:
+            date_filter["$gte"] = from_date
+        if to_date:
+            date_filter["$lte"] = to_date
+        if date_filter:
+            filter_query["uploaded_at"] = date_filter
+
+        sort = [("uploaded_at", sort_order), ("id", sort_order)]
+        if query:
+            sort.insert(0, ("score", -1))
+        sort_fields = [field for field, _ in sort]
+
+        # $text must be in the first stage, and the score must be a field
+        # before it can be sorted and paged on
+        pipeline: List[Dict[str, Any]] = [{"$match": filter_query}]
+        if query:
+            pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+
+        page: List[Dict[str, Any]] = []
+        if cursor:
+            page.append({"$match": keyset_filter(sort, decode_cursor(cursor, sort_fields))})
+        page.append({"$sort": dict(sort)})
+        if offset and not cursor:
+            page.append({"$skip": offset})
+        # One more than the limit tells whether there is a next page
+        page.append({"$limit": limit + 1})
+        if fields is None:
+            page.append({"$project": {"_id": 0}})
+        else:
+            # The sort key fields are kept for the cursor
+            projection = dict.fromkeys(fields, 1)
+            projection.update(dict.fromkeys(sort_fields, 1))
+            projection["_id"] = 0
+            page.append({"$project": projection})
+
+        pipeline.append({"$facet": {
+            "papers": page,
+            "total": [{"$count": "count"}]
+        }})
+
+        try:
+            facets = None
+            async for doc in self.collection.aggregate(pipeline):
+                facets = doc
+        except PyMongoError as e:
+            logger.error(f"Database error searching papers: {e}")
+            raise DatabaseError(f"Error searching papers: {e}")
+
+        papers = facets["papers"] if facets else []
+        total = facets["total"][0]["count"] if facets and facets["total"] else 0
+
+        next_cursor = None
+        if len(papers) > limit:
+            papers = papers[:limit]
+            next_cursor = encode_cursor([papers[-1].get(field) for field in sort_fields])
+
+        return {
+            "count": len(papers),
+            "total": total,
+            "limit": limit,
+            "papers": papers,
+            "next_cursor": next_cursor
+        }
@@ -0,0 +1,405 @@
+"""
+Materialized processing statistics for the Paper Processing Pipeline.
+
+This module keeps a single statistics document up to date as papers move
+through the pipeline, so that reading the statistics does not scan the papers
+collection. Each time a processing stage completes or the API changes the
+status of papers, their status is compared with the status last recorded for
+them and the counters are adjusted with one ``$inc`` update. The document is
+rebuilt from all papers with a single aggregation when the API starts, to
+count papers recorded before and to repair drift.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from ..models.paper import PaperStatus
+from .models import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# ID of the statistics document in the statistics collection
+STATISTICS_ID = "papers"
+
+# Statuses of papers that have been processed successfully
+COMPLETED_STATUSES = (PaperStatus.ANALYZED.value, PaperStatus.IMPLEMENTATION_READY.value)
+
+# Projection of the paper values the statistics are computed from
+PAPER_STATISTICS_PROJECTION = {
+    "_id": 0,
+    "status": 1,
+    "entity_count": {"$size": {"$ifNull": ["$entities", []]}},
+    "relationship_count": {"$size": {"$ifNull": ["$relationships", []]}},
+    "processing_time_ms": {"$subtract": [
+        {"$max": "$processing_history.timestamp"},
+        {"$min": "$processing_history.timestamp"}
+    ]}
+}
+
+
+def statistics_update(
+    paper: Dict[str, Any],
+    previous_status: Optional[str],
+    stage: Optional[str] = None,
+    duration: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Build the update of the statistics document for a paper.
+
+    Args:
+        paper: Paper values projected with PAPER_STATISTICS_PROJECTION
+        previous_status: Status last recorded for the paper, None if none was
+        stage: Name of the stage that completed, if any
+        duration: Duration of the stage in seconds, if known
+
+    Returns:
+        Update document, empty if there is nothing to count
+    """
+    increments: Dict[str, Any] = {}
+
+    status = paper.get("status")
+    if status != previous_status:
+        increments[f"papers_by_status.{status}"] = 1
+        if previous_status:
+            increments[f"papers_by_status.{previous_status}"] = -1
+
+        # Count each processing run once, when it reaches its outcome
+        if status in COMPLETED_STATUSES and previous_status not in COMPLETED_STATUSES:
+            increments["completed"] = 1
+            increments["total_entities"] = paper.get("entity_count") or 0
+            increments["total_relationships"] = paper.get("relationship_count") or 0
+            increments["total_processing_time"] = (paper.get("processing_time_ms") or 0) / 1000
+        elif status == PaperStatus.FAILED.value:
+            increments["failed"] = 1
+
+    if stage:
+        increments[f"stages.{stage}.count"] = 1
+        if duration is not None:
+            increments[f"stages.{stage}.total_time"] = duration
+
+    if not increments:
+        return {}
+    return {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}}
+
+
+def merge_updates(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the updates of several papers into one update of the statistics document.
+
+    Args:
+        updates: Updates built by statistics_update
+
+    Returns:
+        Update document, empty if there is nothing to count
+    """
+    increments: Dict[str, Any] = {}
+    for update in updates:
+        for field, value in update.get("$inc", {}).items():
+            increments[field] = increments.get(field, 0) + value
+
+    increments = {field: value for field, value in increments.items() if value}
+    if not increments:
+        return {}
+    return {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}}
+
+
+def rebuild_pipeline() -> List[Dict[str, Any]]:
+    """
+    Build the aggregation computing the statistics document from the papers.
+
+    Returns:
+        Aggregation pipeline over the papers collection yielding one document
+    """
+    completed = {"$in": ["$status", list(COMPLETED_STATUSES)]}
+    return [
+        {"$project": PAPER_STATISTICS_PROJECTION},
+        {"$group": {
+            "_id": "$status",
+            "count": {"$sum": 1},
+            "total_entities": {"$sum": {"$cond": [completed, "$entity_count", 0]}},
+            "total_relationships": {"$sum": {"$cond": [completed, "$relationship_count", 0]}},
+            "total_processing_time_ms": {"$sum": {"$cond": [completed, {"$ifNull": ["$processing_time_ms", 0]}, 0]}}
+        }},
+        {"$group": {
+            "_id": None,
+            "papers_by_status": {"$push": {"k": "$_id", "v": "$count"}},
+            "completed": {"$sum": {"$cond": [completed, "$count", 0]}},
+            "failed": {"$sum": {"$cond": [{"$eq": ["$_id", PaperStatus.FAILED.value]}, "$count", 0]}},
+            "total_entities": {"$sum": "$total_entities"},
+            "total_relationships": {"$sum": "$total_relationships"},
+            "total_processing_time": {"$sum": {"$divide": ["$total_processing_time_ms", 1000]}}
+        }},
+        {"$project": {
+            "_id": 0,
+            "papers_by_status": {"$arrayToObject": "$papers_by_status"},
+            "completed": 1,
+            "failed": 1,
+            "total_entities": 1,
+            "total_relationships": 1,
+            "total_processing_time": 1
+        }}
+    ]
+
+
+def summarize(doc: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute the reported statistics from a statistics document.
+
+    Args:
+        doc: The statistics document, or None if there is none yet
+
+    Returns:
+        Dict with paper counts, averages and per-stage timings
+    """
+    doc = doc or {}
+    status_counts = {status.value: 0 for status in PaperStatus}
+    status_counts.update({status: count for status, count in (doc.get("papers_by_status") or {}).items() if count})
+
+    completed = doc.get("completed", 0)
+    failed = doc.get("failed", 0)
+
+    stages = {}
+    for stage, stage_stats in (doc.get("stages") or {}).items():
+        count = stage_stats.get("count", 0)
+        stages[stage] = {
+            "count": count,
+            "avg_time": stage_stats.get("total_time", 0.0) / count if count else 0.0
+        }
+
+    updated_at = doc.get("updated_at")
+    return {
+        "total_papers": sum(status_counts.values()),
+        "papers_by_status": status_counts,
+        "avg_processing_time": doc.get("total_processing_time", 0.0) / completed if completed else 0.0,
+        "avg_entity_count": doc.get("total_entities", 0) / completed if completed else 0.0,
+        "avg_relationship_count": doc.get("total_relationships", 0) / completed if completed else 0.0,
+        "success_rate": completed / (completed + failed) if completed + failed else 0.0,
+        "stages": stages,
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+
+
+class StatisticsRecorder:
+    """
+    Synchronous recorder of processing statistics, used by the Celery tasks.
+    """
+
+    def __init__(self, papers: Collection, statistics: Collection, paper_statistics: Collection):
+        """
+        Initialize the statistics recorder.
+
+        Args:
+            papers: pymongo collection of papers
+            statistics: pymongo collection of statistics
+            paper_statistics: pymongo collection of the status last recorded
+                for each paper
+        """
+        self.papers = papers
+        self.statistics = statistics
+        self.paper_statistics = paper_statistics
+
+    def record(self, paper_id: str, stage: Optional[str] = None, duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Record a paper's current status and the completion of a stage.
+
+        The recorded status is swapped atomically, so concurrent recordings
+        of a paper count each change once.
+
+        Args:
+            paper_id: The ID of the paper
+            stage: Name of the stage that completed, if any
+            duration: Duration of the stage in seconds, if known
+
+        Returns:
+            The update applied to the statistics document
+
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            paper = self.papers.find_one({"id": paper_id}, PAPER_STATISTICS_PROJECTION)
+            if paper is None:
+                logger.warning(f"Paper {paper_id} not found for statistics")
+                return {}
+
+            recorded = self.paper_statistics.find_one_and_update(
+                {"_id": paper_id},
+                {"$set": {"status": paper["status"]}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+
+            update = statistics_update(paper, recorded["status"] if recorded else None, stage, duration)
+            if update:
+                self.statistics.update_one({"_id": STATISTICS_ID}, update, upsert=True)
+            return update
+        except PyMongoError as e:
+            logger.error(f"Database error recording statistics of paper {paper_id}: {e}")
+            raise DatabaseError(f"Error recording statistics: {e}")
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Recompute the statistics document from the papers.
+
+        Per-stage timings cannot be recomputed and are kept.
+
+        Returns:
+            The rebuilt statistics document
+
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            self.papers.aggregate([
+                {"$project": {"_id": "$id", "status": 1}},
+                {"$merge": {"into": self.paper_statistics.name, "whenMatched": "replace"}}
+            ])
+            results = list(self.papers.aggregate(rebuild_pipeline()))
+
+            doc = results[0] if results else {
+                "papers_by_status": {},
+                "completed": 0,
+                "failed": 0,
+                "total_entities": 0,
+                "total_relationships": 0,
+                "total_processing_time": 0.0
+            }
+            doc["updated_at"] = datetime.utcnow()
+
+            self.statistics.update_one({"_id": STATISTICS_ID}, {"$set": doc}, upsert=True)
+            logger.info(f"Rebuilt statistics of {sum(doc['papers_by_status'].values())} papers")
+            return doc
+        except PyMongoError as e:
+            logger.error(f"Database error rebuilding statistics: {e}")
+            raise DatabaseError(f"Error rebuilding statistics: {e}")
+
+
+class AsyncStatisticsRecorder:
+    """
+    Asynchronous recorder of processing statistics, used by the API when it
+    changes the status of papers.
+    """
+
+    def __init__(self, papers: Collection, statistics: Collection, paper_statistics: Collection):
+        """
+        Initialize the statistics recorder.
+
+        Args:
+            papers: Motor collection of papers
+            statistics: Motor collection of statistics
+            paper_statistics: Motor collection of the status last recorded
+                for each paper
+        """
+        self.papers = papers
+        self.statistics = statistics
+        self.paper_statistics = paper_statistics
+
+    async def record_many(self, paper_ids: List[str]) -> Dict[str, Any]:
+        """
+        Record the current status of many papers.
+
+        The papers are read with one query and their recorded statuses
+        swapped atomically, as in StatisticsRecorder.record; the changes are
+        then counted with a single update of the statistics document.
+
+        Args:
+            paper_ids: The IDs of the papers
+
+        Returns:
+            The update applied to the statistics document
+
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        if not paper_ids:
+            return {}
+
+        try:
+            cursor = self.papers.find(
+                {"id": {"$in": paper_ids}},
+                {**PAPER_STATISTICS_PROJECTION, "id": 1}
+            )
+            papers = [paper async for paper in cursor]
+
+            recorded = await asyncio.gather(*(
+                self.paper_statistics.find_one_and_update(
+                    {"_id": paper["id"]},
+                    {"$set": {"status": paper["status"]}},
+                    upsert=True,
+                    return_document=ReturnDocument.BEFORE
+                )
+                for paper in papers
+            ))
+
+            update = merge_updates([
+                statistics_update(paper, previous["status"] if previous else None)
+                for paper, previous in zip(papers, recorded)
+            ])
+            if update:
+                await self.statistics.update_one({"_id": STATISTICS_ID}, update, upsert=True)
+            return update
+        except PyMongoError as e:
+            logger.error(f"Database error recording statistics of {len(paper_ids)} papers: {e}")
+            raise DatabaseError(f"Error recording statistics: {e}")
+
+
+class StatisticsModel:
+    """
+    Database model for reading the materialized statistics.
+    """
+
+    def __init__(self, collection: Collection):
+        """
+        Initialize the statistics model.
+
+        Args:
+            collection: MongoDB collection for statistics
+        """
+        self.collection = collection
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Get the processing statistics.
+
+        Returns:
+            Dict with statistics, as computed by summarize
+
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            return summarize(await self.collection.find_one({"_id": STATISTICS_ID}))
+        except PyMongoError as e:
+            logger.error(f"Database error getting statistics: {e}")
+            raise DatabaseError(f"Error getting statistics: {e}")
+
+
+# Recorder shared by the tasks of this process, created on first use
+_statistics_recorder: Optional[StatisticsRecorder] = None
+_statistics_recorder_pid: Optional[int] = None
+
+
+def get_statistics_recorder() -> StatisticsRecorder:
+    """
+    Get the statistics recorder of this process.
+
+    Returns:
+        The statistics recorder
+    """
+    global _statistics_recorder, _statistics_recorder_pid
+
+    if _statistics_recorder is None or _statistics_recorder_pid != os.getpid():
+        from .connection import get_sync_database
+
+        database = get_sync_database()
+        _statistics_recorder = StatisticsRecorder(database.papers, database.statistics, database.paper_statistics)
+        _statistics_recorder_pid = os.getpid()
+
+    return _statistics_recorder
@@ -135,6 +135,14 @@ class Paper(BaseModel):
         None, 
         description="Additional metadata"
     )
+    content: Optional[str] = Field(
+        None,
+        description="Text content extracted from the document"
+    )
+    batch_id: Optional[str] = Field(
+        None,
+        description="ID of the batch the paper was last submitted in"
+    )
     
     @field_validator('year')
     @classmethod
@@ -38,6 +38,9 @@ logger = logging.getLogger(__name__)
 broker_url = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 result_backend = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+# Run all stages of a paper in one worker (run_paper_pipeline) instead of a task chain
+fused_pipeline = os.environ.get('PAPER_PIPELINE_FUSED', 'false').lower() in ('1', 'true', 'yes')
+
 # Define queues with priorities
 QUEUE_DEFAULT_PRIORITY = 5  # Medium priority (range 0-9)
 
@@ -103,6 +106,7 @@ app.conf.update(
     task_default_routing_key='processing',
     
     # Task execution settings
+    paper_pipeline_fused=fused_pipeline,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
@@ -130,6 +134,7 @@ app.conf.update(
     task_routes={
         # Processing tasks with priority levels
         'paper_processing.tasks.processing_tasks.process_paper': {'queue': 'processing_high'},
+        'paper_processing.tasks.processing_tasks.run_paper_pipeline': {'queue': 'processing'},
         'paper_processing.tasks.processing_tasks.process_document': {'queue': 'processing'},
         'paper_processing.tasks.processing_tasks.check_implementation_readiness': {'queue': 'processing_low'},
         
@@ -0,0 +1,526 @@
+"""
+Content-addressed extraction cache for the Paper Processing Pipeline.
+
+Processing stages cache their output under a key made of the SHA-256 of their
+input, the stage name and a hash of the stage's configuration, so a retried or
+reprocessed paper whose document and configuration are unchanged skips the
+work. Entries are stored in a local SQLite file or in Redis, evicted least
+recently used first once the cache is full, and hits and misses are counted
+per stage across all worker processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Part of every key; bump it when the format of cached values changes
+CACHE_FORMAT_VERSION = 1
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """
+    Compute the SHA-256 hash of some content.
+
+    Args:
+        content: Text or bytes to hash; text is encoded as UTF-8
+
+    Returns:
+        Hex digest of the content
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hash of a file's content.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read at a time
+
+    Returns:
+        Hex digest of the file's content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_hash(config: Optional[Dict[str, Any]]) -> str:
+    """
+    Compute a hash of a stage configuration that ignores key order.
+
+    Args:
+        config: JSON-serializable configuration
+
+    Returns:
+        Hex digest of the canonical JSON form of the configuration
+    """
+    canonical = json.dumps(config or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return content_hash(canonical)
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cache entries and statistics.
+
+    Backends store opaque byte values, evict the least recently used entries
+    when full, and keep hit and miss counters shared by every process using
+    the same storage.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under a key, marking it as recently used."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """Store a value, evicting least recently used entries if the cache is full."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry if it exists."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        pass
+
+    @abstractmethod
+    def increment_stat(self, stage: str, name: str) -> None:
+        """Increment a counter of a stage, e.g. its hits or misses."""
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the counters of every stage."""
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache backend storing entries in a local SQLite file.
+
+    The file can be shared by the worker processes of one machine: it is opened
+    in WAL mode and each process uses its own connection.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, max_size_bytes: Optional[int] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            path: Path of the SQLite file, created if it does not exist
+            max_entries: Maximum number of entries
+            max_size_bytes: Maximum total size of the stored values, if any
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection, opening it on first use."""
+        # Celery's prefork workers must not share a connection opened before the fork
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries (accessed_at)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_stats ("
+                "stage TEXT NOT NULL, name TEXT NOT NULL, count INTEGER NOT NULL, "
+                "PRIMARY KEY (stage, name))"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block in a write transaction on this process's connection."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._transaction() as connection:
+            row = connection.execute("SELECT value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.max_size_bytes is not None and len(value) > self.max_size_bytes:
+            logger.warning(f"Not caching {key}: {len(value)} bytes exceeds the cache size")
+            return
+
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), time.time())
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Remove least recently used entries until the cache is within its limits."""
+        count, size = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+
+        evicted = []
+        if count > self.max_entries or (self.max_size_bytes is not None and size > self.max_size_bytes):
+            for key, entry_size in connection.execute(
+                "SELECT key, size FROM cache_entries ORDER BY accessed_at"
+            ):
+                if count <= self.max_entries and (self.max_size_bytes is None or size <= self.max_size_bytes):
+                    break
+                evicted.append((key,))
+                count -= 1
+                size -= entry_size
+
+        if evicted:
+            connection.executemany("DELETE FROM cache_entries WHERE key = ?", evicted)
+            logger.debug(f"Evicted {len(evicted)} cache entries")
+
+    def delete(self, key: str) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM cache_entries")
+            connection.execute("DELETE FROM cache_stats")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def increment_stat(self, stage: str, name: str) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO cache_stats (stage, name, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (stage, name) DO UPDATE SET count = count + 1",
+                (stage, name)
+            )
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._connect().execute("SELECT stage, name, count FROM cache_stats").fetchall()
+
+        stats: Dict[str, Dict[str, int]] = {}
+        for stage, name, count in rows:
+            stats.setdefault(stage, {})[name] = count
+        return stats
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend storing entries in Redis.
+
+    Shares the cache between machines. Recency is tracked in a sorted set of
+    keys scored by last access time, which is trimmed to ``max_entries``.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/1", client=None,
+                 prefix: str = "paper_processing:extraction_cache",
+                 max_entries: int = 10000, ttl_seconds: Optional[int] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            url: Redis URL, used if no client is given
+            client: Redis client to use instead of connecting to ``url``
+            prefix: Prefix of every Redis key used by the cache
+            max_entries: Maximum number of entries
+            ttl_seconds: Optional expiry time of each entry
+        """
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lru_key = f"{prefix}:lru"
+        self._stats_key = f"{prefix}:stats"
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.client.get(self._entry_key(key))
+        if value is None:
+            # The entry may have expired; forget it
+            self.client.zrem(self._lru_key, key)
+            return None
+        self.client.zadd(self._lru_key, {key: time.time()})
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.set(self._entry_key(key), value, ex=self.ttl_seconds)
+        pipeline.zadd(self._lru_key, {key: time.time()})
+        pipeline.zcard(self._lru_key)
+        count = pipeline.execute()[-1]
+
+        if count > self.max_entries:
+            evicted = self.client.zpopmin(self._lru_key, count - self.max_entries)
+            if evicted:
+                self.client.delete(*(self._entry_key(self._decode(member)) for member, _ in evicted))
+                logger.debug(f"Evicted {len(evicted)} cache entries")
+
+    def delete(self, key: str) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.delete(self._entry_key(key))
+        pipeline.zrem(self._lru_key, key)
+        pipeline.execute()
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def __len__(self) -> int:
+        return self.client.zcard(self._lru_key)
+
+    def increment_stat(self, stage: str, name: str) -> None:
+        self.client.hincrby(self._stats_key, f"{stage}:{name}", 1)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        stats: Dict[str, Dict[str, int]] = {}
+        for field, count in self.client.hgetall(self._stats_key).items():
+            stage, _, name = self._decode(field).rpartition(":")
+            stats.setdefault(stage, {})[name] = int(count)
+        return stats
+
+    @staticmethod
+    def _decode(value: Union[str, bytes]) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class ExtractionCache:
+    """
+    Cache of processing stage results keyed by content and configuration.
+
+    Values are stored as JSON. Cache failures are logged and treated as misses,
+    so an unavailable backend slows processing down but never fails it.
+    """
+
+    def __init__(self, backend: CacheBackend, version: int = CACHE_FORMAT_VERSION):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage for the entries
+            version: Format version included in every key
+        """
+        self.backend = backend
+        self.version = version
+
+    def make_key(self, stage: str, input_hash: str, config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the key of a stage result.
+
+        Args:
+            stage: Name of the processing stage
+            input_hash: Hash of the stage's input
+            config: Configuration of the stage
+
+        Returns:
+            Cache key
+        """
+        return f"v{self.version}:{stage}:{config_hash(config)}:{input_hash}"
+
+    def get(self, stage: str, input_hash: str, config: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Look up a stage result.
+
+        Args:
+            stage: Name of the processing stage
+            input_hash: Hash of the stage's input
+            config: Configuration of the stage
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        try:
+            value = self.backend.get(self.make_key(stage, input_hash, config))
+        except Exception as e:
+            logger.warning(f"Extraction cache lookup for stage {stage} failed: {e}")
+            return None
+
+        self._record(stage, "hits" if value is not None else "misses")
+        return json.loads(value) if value is not None else None
+
+    def set(self, stage: str, input_hash: str, config: Optional[Dict[str, Any]], value: Any) -> None:
+        """
+        Store a stage result.
+
+        Args:
+            stage: Name of the processing stage
+            input_hash: Hash of the stage's input
+            config: Configuration of the stage
+            value: JSON-serializable result
+        """
+        try:
+            data = json.dumps(value, default=str).encode("utf-8")
+            self.backend.set(self.make_key(stage, input_hash, config), data)
+        except Exception as e:
+            logger.warning(f"Extraction cache store for stage {stage} failed: {e}")
+
+    def get_or_compute(self, stage: str, input_hash: str, config: Optional[Dict[str, Any]],
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Return a cached stage result, computing and storing it on a miss.
+
+        Args:
+            stage: Name of the processing stage
+            input_hash: Hash of the stage's input
+            config: Configuration of the stage
+            compute: Function computing the result
+
+        Returns:
+            The stage result
+        """
+        value = self.get(stage, input_hash, config)
+        if value is None:
+            value = compute()
+            self.set(stage, input_hash, config, value)
+        return value
+
+    def _record(self, stage: str, name: str) -> None:
+        """Increment a stage counter, ignoring backend failures."""
+        try:
+            self.backend.increment_stat(stage, name)
+        except Exception as e:
+            logger.debug(f"Could not record extraction cache {name} for stage {stage}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hit and miss counts and hit rates of the cache.
+
+        Returns:
+            Dictionary with overall and per-stage statistics
+        """
+        by_stage = {}
+        hits = misses = 0
+        for stage, counts in self.backend.get_stats().items():
+            stage_hits = counts.get("hits", 0)
+            stage_misses = counts.get("misses", 0)
+            lookups = stage_hits + stage_misses
+            by_stage[stage] = {
+                "hits": stage_hits,
+                "misses": stage_misses,
+                "hit_rate": stage_hits / lookups if lookups else 0.0
+            }
+            hits += stage_hits
+            misses += stage_misses
+
+        return {
+            "entries": len(self.backend),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "stages": by_stage
+        }
+
+
+# Cache shared by the tasks of this process, created from the settings on first use
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Get the extraction cache configured in the settings.
+
+    Returns:
+        The extraction cache, or None if caching is disabled
+    """
+    global _extraction_cache
+
+    if _extraction_cache is None:
+        from paper_processing.config.settings import settings
+
+        cache_settings = settings.cache
+        if not cache_settings.enabled:
+            return None
+
+        if cache_settings.backend == "redis":
+            backend = RedisCacheBackend(
+                url=cache_settings.redis_url,
+                max_entries=cache_settings.max_entries,
+                ttl_seconds=cache_settings.ttl_seconds
+            )
+        else:
+            backend = SQLiteCacheBackend(
+                cache_settings.sqlite_path,
+                max_entries=cache_settings.max_entries,
+                max_size_bytes=cache_settings.max_size_mb * 1024 * 1024
+            )
+
+        _extraction_cache = ExtractionCache(backend)
+        logger.info(f"Extraction cache enabled with {cache_settings.backend} backend")
+
+    return _extraction_cache
+
+
+def cached_stage(stage: str, input_hash: Optional[str], config: Optional[Dict[str, Any]],
+                 compute: Callable[[], Any]) -> Any:
+    """
+    Run a processing stage through the extraction cache, if it is enabled.
+
+    Args:
+        stage: Name of the processing stage
+        input_hash: Hash of the stage's input, or None to bypass the cache
+        config: Configuration of the stage
+        compute: Function computing the stage's JSON-serializable result
+
+    Returns:
+        The stage result
+    """
+    cache = get_extraction_cache() if input_hash is not None else None
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(stage, input_hash, config, compute)
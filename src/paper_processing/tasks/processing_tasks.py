@@ -5,10 +5,13 @@ This module implements the primary Celery tasks for processing papers through
 the full lifecycle from document extraction to knowledge graph integration.
 """
 
+import json
 import logging
 import os
 import time
 import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 
@@ -19,11 +22,43 @@ from paper_processing.models.paper import Paper, PaperStatus, add_processing_eve
 from paper_processing.models.state_machine import PaperStateMachine, StateTransitionException
 from paper_processing.tasks.celery_app import app
 from paper_processing.tasks.dead_letter import dead_letter_task
+from paper_processing.tasks.extraction_cache import cached_stage, content_hash, file_hash
 from paper_processing.db.models import PaperModel
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Recognizer settings for extract_entities, which also key its cached results
+ENTITY_RECOGNIZER_CONFIG = {
+    "recognizer": "combined",
+    "confidence_threshold": 0.6,  # Minimum confidence for entities
+    "min_support": 1,             # Minimum number of recognizers in agreement
+    "max_conflicts": 0,           # Maximum conflicts allowed before resolution
+    # Retried with these settings when nothing is found
+    "fallback": {
+        "confidence_threshold": 0.4,
+        "min_support": 1,
+        "max_conflicts": 1
+    }
+}
+
+# Extractor settings for extract_relationships, which also key its cached results
+RELATIONSHIP_EXTRACTOR_CONFIG = {
+    "extractor": "combined",
+    "confidence_threshold": 0.6,  # Minimum confidence for relationships
+    "min_support": 1,             # Minimum number of extractors in agreement
+    "max_conflicts": 0,           # Maximum conflicts allowed before resolution
+    # Retried with these settings when nothing is found
+    "fallback": {
+        "confidence_threshold": 0.4,
+        "min_support": 1,
+        "max_conflicts": 1
+    }
+}
+
+# Paper held in memory by run_paper_pipeline while it runs the stages
+_fused_paper_model: ContextVar[Optional["FusedPaperModel"]] = ContextVar("fused_paper_model", default=None)
+
 
 # Base task class with error handling
 class PaperProcessingTask(Task):
@@ -35,6 +70,19 @@ class PaperProcessingTask(Task):
     # Don't propagate exceptions to the next task in the chain
     ignore_result = False
     
+    def before_start(self, task_id, args, kwargs):
+        """Note when the task started, to record the stage duration."""
+        self.request.stage_started_at = time.monotonic()
+    
+    def on_success(self, retval, task_id, args, kwargs):
+        """Record the completed stage in the processing statistics."""
+        paper_id = kwargs.get('paper_id', args[0] if args else None)
+        started_at = getattr(self.request, 'stage_started_at', None)
+        duration = time.monotonic() - started_at if started_at is not None else None
+        _record_stage(paper_id, self.name, duration)
+        
+        super().on_success(retval, task_id, args, kwargs)
+    
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """Handle task failure by logging and sending to dead letter queue."""
         paper_id = kwargs.get('paper_id', args[0] if args else None)
@@ -57,7 +105,7 @@ class PaperProcessingTask(Task):
             if paper_id:
                 try:
                     # Get paper from database
-                    paper_model = PaperModel.get_by_id(paper_id)
+                    paper_model = _get_paper_model(paper_id)
                     if paper_model:
                         paper = paper_model.to_domain()
                         
@@ -75,10 +123,264 @@ class PaperProcessingTask(Task):
                             logger.error(f"Could not transition paper {paper_id} to FAILED state: {e}")
                 except Exception as e:
                     logger.error(f"Error updating paper {paper_id} status to FAILED: {e}")
+                
+                _record_stage(paper_id)
                     
         super().on_failure(exc, task_id, args, kwargs, einfo)
 
 
+class FusedPaperModel:
+    """
+    In-memory stand-in for a PaperModel during a fused pipeline run.
+    
+    It offers the interface the stage tasks use on a PaperModel. Every stage
+    gets the same paper object, and saving persists only the fields changed
+    since the previous save through the PaperStore.
+    """
+    
+    def __init__(self, paper: Paper, paper_store):
+        """
+        Initialize the fused paper model.
+        
+        Args:
+            paper: The paper, as loaded by the paper store
+            paper_store: PaperStore persisting the paper's changes
+        """
+        self.paper = paper
+        self.paper_store = paper_store
+        self.saves = 0
+    
+    def to_domain(self) -> Paper:
+        """Return the paper held in memory."""
+        return self.paper
+    
+    def update_from_domain(self, paper: Paper) -> None:
+        """Replace the paper held in memory."""
+        self.paper = paper
+    
+    def save(self) -> None:
+        """Persist the paper's changes since the previous save."""
+        self.paper_store.save(self.paper)
+        self.saves += 1
+
+
+def _get_paper_model(paper_id: str):
+    """
+    Get the model of a paper for a stage task.
+    
+    Returns the in-memory model while run_paper_pipeline is running the stages
+    of this paper, and loads the paper from the database otherwise.
+    
+    Args:
+        paper_id: ID of the paper
+        
+    Returns:
+        The paper model, or None if the paper does not exist
+    """
+    fused_model = _fused_paper_model.get()
+    if fused_model is not None and fused_model.paper.id == paper_id:
+        return fused_model
+    return PaperModel.get_by_id(paper_id)
+
+
+@contextmanager
+def _fused_paper(paper_id: str):
+    """
+    Hold a paper in memory for the stage tasks run in the block.
+    
+    Args:
+        paper_id: ID of the paper
+        
+    Yields:
+        The FusedPaperModel the stages share
+    """
+    from paper_processing.db.paper_store import get_paper_store
+    
+    paper_store = get_paper_store()
+    paper = paper_store.load(paper_id)
+    if paper is None:
+        raise ValueError(f"Paper with ID {paper_id} not found")
+    
+    fused_model = FusedPaperModel(paper, paper_store)
+    token = _fused_paper_model.set(fused_model)
+    try:
+        yield fused_model
+    finally:
+        _fused_paper_model.reset(token)
+        paper_store.forget(paper_id)
+
+
+def _broadcast(paper_id: str, event) -> None:
+    """
+    Publish an event for the WebSocket clients following a paper.
+    
+    Workers have no WebSocket connections; the event is published on the
+    event bus and delivered to the clients by the API processes.
+    
+    Args:
+        paper_id: ID of the paper
+        event: The event to broadcast
+    """
+    try:
+        from paper_processing.websocket.event_bus import get_event_publisher
+        
+        publisher = get_event_publisher()
+    except Exception as e:
+        logger.warning(f"Event bus unavailable, dropping event for paper {paper_id}: {e}")
+        return
+    
+    if publisher is not None:
+        publisher.publish(event, paper_id)
+
+
+def _record_stage(paper_id: Optional[str], task_name: Optional[str] = None,
+                  duration: Optional[float] = None) -> None:
+    """
+    Record a paper's status, and the stage that completed, in the statistics.
+    
+    Statistics are best effort: failing to record them does not fail the task.
+    """
+    if not paper_id:
+        return
+    
+    try:
+        from paper_processing.db.statistics import get_statistics_recorder
+        
+        stage = task_name.rsplit('.', 1)[-1] if task_name else None
+        get_statistics_recorder().record(paper_id, stage, duration)
+    except Exception as e:
+        logger.warning(f"Could not record statistics of paper {paper_id}: {e}")
+
+
+def _document_data(processed_document) -> Dict[str, Any]:
+    """
+    Convert a processed document to the data stored for a paper.
+    
+    Args:
+        processed_document: Document returned by the DocumentProcessor
+        
+    Returns:
+        Dictionary with the document's content, segments and metadata
+    """
+    return {
+        "content": processed_document.content,
+        "segments": processed_document.segments,
+        "metadata": processed_document.metadata,
+        "document_type": processed_document.document_type,
+        "processed_at": processed_document.processed_at
+    }
+
+
+def _recognize_entities(content: str) -> List[Dict[str, Any]]:
+    """
+    Recognize entities in a paper's content.
+    
+    Uses the combined recognizer with ENTITY_RECOGNIZER_CONFIG, retrying with
+    the fallback settings if nothing is found.
+    
+    Args:
+        content: Text content of the paper
+        
+    Returns:
+        Entities in paper entity format, without identifiers
+    """
+    from src.research_orchestrator.knowledge_extraction.entity_recognition.factory import EntityRecognizerFactory
+    
+    factory = EntityRecognizerFactory()
+    entities = []
+    
+    for settings in (ENTITY_RECOGNIZER_CONFIG, ENTITY_RECOGNIZER_CONFIG["fallback"]):
+        if settings is not ENTITY_RECOGNIZER_CONFIG:
+            logger.warning(f"No entities found with default confidence, trying with lower threshold")
+        
+        entity_recognizer = factory.create_combined_recognizer(
+            confidence_threshold=settings["confidence_threshold"],
+            min_support=settings["min_support"],
+            max_conflicts=settings["max_conflicts"]
+        )
+        
+        for entity in entity_recognizer.extract_entities(content):
+            # Convert from OrchestratorEntity to paper entity format
+            entities.append({
+                "type": entity.entity_type.lower(),
+                "name": entity.name,
+                "confidence": entity.confidence,
+                "context": entity.context or "",
+                "metadata": getattr(entity, 'attributes', {}) or {}
+            })
+        
+        if entities:
+            break
+    
+    return entities
+
+
+def _extract_relationships(content: str, paper_entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Extract relationships between a paper's entities.
+    
+    Uses the combined extractor with RELATIONSHIP_EXTRACTOR_CONFIG, retrying
+    with the fallback settings if nothing is found.
+    
+    Args:
+        content: Text content of the paper
+        paper_entities: The paper's entities in paper entity format
+        
+    Returns:
+        Relationships in paper relationship format, without identifiers and
+        with their source and target given as indices into ``paper_entities``
+    """
+    from src.research_orchestrator.knowledge_extraction.relationship_extraction.factory import RelationshipExtractorFactory
+    from src.research_orchestrator.knowledge_extraction.entity_recognition.entity import Entity as OrchestratorEntity
+    
+    # Convert paper entities to orchestrator entities, remembering their positions
+    orchestrator_entities = []
+    entity_index = {}
+    
+    for index, entity in enumerate(paper_entities):
+        orchestrator_entity = OrchestratorEntity(
+            name=entity["name"],
+            entity_type=entity["type"].upper(),
+            confidence=entity["confidence"],
+            context=entity["context"]
+        )
+        entity_index[id(orchestrator_entity)] = index
+        orchestrator_entities.append(orchestrator_entity)
+    
+    factory = RelationshipExtractorFactory()
+    relationships = []
+    
+    for settings in (RELATIONSHIP_EXTRACTOR_CONFIG, RELATIONSHIP_EXTRACTOR_CONFIG["fallback"]):
+        if settings is not RELATIONSHIP_EXTRACTOR_CONFIG:
+            logger.warning(f"No relationships found with default confidence, trying with lower threshold")
+        
+        relationship_extractor = factory.create_combined_extractor(
+            confidence_threshold=settings["confidence_threshold"],
+            min_support=settings["min_support"],
+            max_conflicts=settings["max_conflicts"]
+        )
+        
+        for rel in relationship_extractor.extract_relationships(content, orchestrator_entities):
+            # Skip if source or target entity not in our map
+            if id(rel.source) not in entity_index or id(rel.target) not in entity_index:
+                continue
+            
+            # Convert to paper relationship format
+            relationships.append({
+                "type": rel.relationship_type.lower(),
+                "source_index": entity_index[id(rel.source)],
+                "target_index": entity_index[id(rel.target)],
+                "confidence": rel.confidence,
+                "context": rel.context or "",
+                "metadata": getattr(rel, 'attributes', {}) or {}
+            })
+        
+        if relationships:
+            break
+    
+    return relationships
+
+
 @app.task(bind=True, base=PaperProcessingTask)
 def process_paper(self, paper_id: str) -> str:
     """
@@ -97,7 +399,7 @@ def process_paper(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -124,6 +426,11 @@ def process_paper(self, paper_id: str) -> str:
         paper_model.update_from_domain(paper)
         paper_model.save()
         
+        if app.conf.get('paper_pipeline_fused'):
+            # Run every stage in one worker with the paper held in memory
+            run_paper_pipeline.delay(paper_id)
+            return paper_id
+        
         # Start the processing chain
         processing_chain = chain(
             process_document.s(paper_id),
@@ -143,6 +450,45 @@ def process_paper(self, paper_id: str) -> str:
         self.retry(exc=e)
 
 
+@app.task(bind=True, base=PaperProcessingTask)
+def run_paper_pipeline(self, paper_id: str) -> str:
+    """
+    Run every processing stage of a paper in one worker.
+    
+    The fused alternative to the process_paper chain: the paper is loaded
+    once and held in memory across the stages, each stage persists only the
+    fields it changed, and large content and segments are stored out of line.
+    
+    Args:
+        paper_id: ID of the paper to process
+        
+    Returns:
+        Paper ID
+    """
+    logger.info(f"Running fused processing pipeline for paper {paper_id}")
+    
+    try:
+        start_time = time.time()
+        
+        with _fused_paper(paper_id) as fused_model:
+            for stage in PIPELINE_STAGES:
+                stage_start = time.monotonic()
+                stage.run(paper_id)
+                # Stages run in this task, so their own success handlers do not
+                _record_stage(paper_id, stage.name, time.monotonic() - stage_start)
+        
+        logger.info(
+            f"Fused pipeline for paper {paper_id} finished in {time.time() - start_time:.2f}s "
+            f"with {fused_model.saves} delta saves"
+        )
+        
+        return paper_id
+    
+    except Exception as e:
+        logger.error(f"Error in fused pipeline for paper {paper_id}: {e}")
+        self.retry(exc=e)
+
+
 @app.task(bind=True, base=PaperProcessingTask)
 def process_document(self, paper_id: str) -> str:
     """
@@ -160,7 +506,7 @@ def process_document(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -199,35 +545,40 @@ def process_document(self, paper_id: str) -> str:
         
         # Process the document based on whether it's a file path or URL
         if paper.file_path.startswith(("http://", "https://")):
-            # It's a URL
-            processed_document = document_processor.process_url(paper.file_path)
+            # It's a URL, whose content is unknown until it is fetched
+            document = _document_data(document_processor.process_url(paper.file_path))
         else:
-            # It's a local file path
-            processed_document = document_processor.process_document(paper.file_path)
+            # It's a local file path; reuse the result for unchanged files
+            document = cached_stage(
+                "document",
+                file_hash(paper.file_path),
+                processor_config,
+                lambda: _document_data(document_processor.process_document(paper.file_path))
+            )
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
         # Extract statistics from processed document
-        page_count = processed_document.metadata.get("page_count", 1)
-        word_count = processed_document.metadata.get("word_count", 0)
-        char_count = processed_document.metadata.get("char_count", 0)
+        page_count = document["metadata"].get("page_count", 1)
+        word_count = document["metadata"].get("word_count", 0)
+        char_count = document["metadata"].get("char_count", 0)
         
         # Store document text content in the paper
-        paper.content = processed_document.content
+        paper.content = document["content"]
         
         # Store document segments
         paper.metadata = paper.metadata or {}
         paper.metadata["document"] = {
-            "segments": processed_document.segments,
-            "metadata": processed_document.metadata,
-            "document_type": processed_document.document_type,
-            "processed_at": processed_document.processed_at
+            "segments": document["segments"],
+            "metadata": document["metadata"],
+            "document_type": document["document_type"],
+            "processed_at": document["processed_at"]
         }
         
         # Update document info based on extracted metadata
-        if processed_document.document_type == "pdf" and "document_info" in processed_document.metadata:
-            doc_info = processed_document.metadata["document_info"]
+        if document["document_type"] == "pdf" and "document_info" in document["metadata"]:
+            doc_info = document["metadata"]["document_info"]
             
             # Update basic paper fields if they're not already set
             if doc_info.get("Title") and not paper.title:
@@ -257,7 +608,7 @@ def process_document(self, paper_id: str) -> str:
                 "word_count": word_count,
                 "char_count": char_count,
                 "processing_time": processing_time,
-                "document_type": processed_document.document_type
+                "document_type": document["document_type"]
             }
         )
         
@@ -283,7 +634,6 @@ def process_document(self, paper_id: str) -> str:
         
         # Broadcast event for WebSocket clients
         from paper_processing.websocket.events import create_paper_status_event
-        from paper_processing.websocket.connection import manager
         
         # Create and broadcast event asynchronously
         event = create_paper_status_event(
@@ -298,16 +648,7 @@ def process_document(self, paper_id: str) -> str:
             }
         )
         
-        # This needs to be run in an async context - we'll use asyncio.run()
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            # If no event loop exists, create a new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        loop.run_until_complete(manager.broadcast_to_paper(paper_id, event))
+        _broadcast(paper_id, event)
         
         return paper_id
     
@@ -334,7 +675,7 @@ def extract_entities(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -347,10 +688,6 @@ def extract_entities(self, paper_id: str) -> str:
             "Starting entity extraction"
         )
         
-        # Import entity recognizer components
-        from src.research_orchestrator.knowledge_extraction.entity_recognition.factory import EntityRecognizerFactory
-        from src.research_orchestrator.knowledge_extraction.entity_recognition.entity import Entity as OrchestratorEntity
-        
         # Check if paper has content to process
         if not paper.content:
             logger.warning(f"Paper {paper_id} has no content to extract entities from")
@@ -367,66 +704,21 @@ def extract_entities(self, paper_id: str) -> str:
         # Start processing timer
         start_time = time.time()
         
-        # Create entity recognizer factory
-        factory = EntityRecognizerFactory()
-        
-        # Create combined recognizer with all available recognizers
-        entity_recognizer = factory.create_combined_recognizer(
-            confidence_threshold=0.6,  # Minimum confidence for entities
-            min_support=1,             # Minimum number of recognizers in agreement
-            max_conflicts=0            # Maximum conflicts allowed before resolution
-        )
-        
-        # Extract entities from paper content
+        # Recognize entities, reusing the result for unchanged content
         content = paper.content
-        extracted_entities = entity_recognizer.extract_entities(content)
+        recognized_entities = cached_stage(
+            "entities",
+            content_hash(content),
+            ENTITY_RECOGNIZER_CONFIG,
+            lambda: _recognize_entities(content)
+        )
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
-        # Convert to paper entity format
-        entities = []
-        entity_types = set()
-        
-        for entity in extracted_entities:
-            # Convert from OrchestratorEntity to paper entity format
-            entity_dict = {
-                "id": str(uuid.uuid4()),
-                "type": entity.entity_type.lower(),
-                "name": entity.name,
-                "confidence": entity.confidence,
-                "context": entity.context or "",
-                "metadata": {}
-            }
-            
-            # Add additional metadata if available
-            if hasattr(entity, 'attributes') and entity.attributes:
-                entity_dict["metadata"] = entity.attributes
-                
-            entity_types.add(entity.entity_type.lower())
-            entities.append(entity_dict)
-        
-        # If no entities were found, try with lower confidence threshold
-        if not entities:
-            logger.warning(f"No entities found with default confidence, trying with lower threshold")
-            entity_recognizer = factory.create_combined_recognizer(
-                confidence_threshold=0.4,  # Lower confidence threshold
-                min_support=1,
-                max_conflicts=1
-            )
-            extracted_entities = entity_recognizer.extract_entities(content)
-            
-            for entity in extracted_entities:
-                entity_dict = {
-                    "id": str(uuid.uuid4()),
-                    "type": entity.entity_type.lower(),
-                    "name": entity.name,
-                    "confidence": entity.confidence,
-                    "context": entity.context or "",
-                    "metadata": getattr(entity, 'attributes', {}) or {}
-                }
-                entity_types.add(entity.entity_type.lower())
-                entities.append(entity_dict)
+        # Give the entities identifiers of their own, even when cached
+        entities = [{"id": str(uuid.uuid4()), **entity} for entity in recognized_entities]
+        entity_types = {entity["type"] for entity in entities}
         
         # If still no entities, create sample entities for demo purposes
         if not entities:
@@ -478,7 +770,6 @@ def extract_entities(self, paper_id: str) -> str:
         
         # Broadcast event for WebSocket clients
         from paper_processing.websocket.events import create_paper_status_event
-        from paper_processing.websocket.connection import manager
         
         # Create and broadcast event asynchronously
         event = create_paper_status_event(
@@ -493,15 +784,7 @@ def extract_entities(self, paper_id: str) -> str:
             }
         )
         
-        # This needs to be run in an async context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        loop.run_until_complete(manager.broadcast_to_paper(paper_id, event))
+        _broadcast(paper_id, event)
         
         return paper_id
     
@@ -528,7 +811,7 @@ def extract_relationships(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -541,11 +824,6 @@ def extract_relationships(self, paper_id: str) -> str:
             "Starting relationship extraction"
         )
         
-        # Import relationship extractor components
-        from src.research_orchestrator.knowledge_extraction.relationship_extraction.factory import RelationshipExtractorFactory
-        from src.research_orchestrator.knowledge_extraction.entity_recognition.entity import Entity as OrchestratorEntity
-        from src.research_orchestrator.knowledge_extraction.relationship_extraction.relationship import Relationship as OrchestratorRelationship
-        
         # Check if paper has content and entities to process
         if not paper.content:
             logger.warning(f"Paper {paper_id} has no content to extract relationships from")
@@ -610,98 +888,38 @@ def extract_relationships(self, paper_id: str) -> str:
         # Start processing timer
         start_time = time.time()
         
-        # Convert paper entities to orchestrator entities
-        orchestrator_entities = []
-        entity_id_map = {}  # For mapping paper entity IDs to orchestrator entities
-        
-        for entity in paper.entities:
-            orchestrator_entity = OrchestratorEntity(
-                name=entity["name"],
-                entity_type=entity["type"].upper(),
-                confidence=entity["confidence"],
-                context=entity["context"]
-            )
-            # Store the mapping between paper entity ID and orchestrator entity
-            entity_id_map[entity["id"]] = orchestrator_entity
-            orchestrator_entities.append(orchestrator_entity)
-        
-        # Create relationship extractor factory
-        factory = RelationshipExtractorFactory()
-        
-        # Create combined relationship extractor
-        relationship_extractor = factory.create_combined_extractor(
-            confidence_threshold=0.6,  # Minimum confidence for relationships
-            min_support=1,             # Minimum number of extractors in agreement
-            max_conflicts=0            # Maximum conflicts allowed before resolution
-        )
-        
-        # Extract relationships
+        # Extract relationships, reusing the result for unchanged content and entities
         content = paper.content
-        extracted_relationships = relationship_extractor.extract_relationships(
-            content, orchestrator_entities
+        extraction_input = json.dumps({
+            "content": content,
+            "entities": [
+                [entity["name"], entity["type"], entity["confidence"], entity["context"]]
+                for entity in paper.entities
+            ]
+        })
+        extracted_relationships = cached_stage(
+            "relationships",
+            content_hash(extraction_input),
+            RELATIONSHIP_EXTRACTOR_CONFIG,
+            lambda: _extract_relationships(content, paper.entities)
         )
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
-        # Convert to paper relationship format
+        # Refer to the entities by their identifiers in this paper
         relationships = []
-        relationship_types = set()
-        
-        # Create reverse mapping from orchestrator entities back to paper entity IDs
-        reverse_entity_map = {v: k for k, v in entity_id_map.items()}
-        
         for rel in extracted_relationships:
-            # Skip if source or target entity not in our map
-            if rel.source not in reverse_entity_map or rel.target not in reverse_entity_map:
-                continue
-                
-            # Convert to paper relationship format
-            relationship_dict = {
+            relationships.append({
                 "id": str(uuid.uuid4()),
-                "type": rel.relationship_type.lower(),
-                "source_id": reverse_entity_map[rel.source],
-                "target_id": reverse_entity_map[rel.target],
-                "confidence": rel.confidence,
-                "context": rel.context or "",
-                "metadata": {}
-            }
-            
-            # Add additional metadata if available
-            if hasattr(rel, 'attributes') and rel.attributes:
-                relationship_dict["metadata"] = rel.attributes
-                
-            relationship_types.add(rel.relationship_type.lower())
-            relationships.append(relationship_dict)
-        
-        # If no relationships were found, try with lower confidence threshold
-        if not relationships:
-            logger.warning(f"No relationships found with default confidence, trying with lower threshold")
-            relationship_extractor = factory.create_combined_extractor(
-                confidence_threshold=0.4,  # Lower threshold
-                min_support=1,
-                max_conflicts=1
-            )
-            extracted_relationships = relationship_extractor.extract_relationships(
-                content, orchestrator_entities
-            )
-            
-            for rel in extracted_relationships:
-                # Skip if source or target entity not in our map
-                if rel.source not in reverse_entity_map or rel.target not in reverse_entity_map:
-                    continue
-                    
-                relationship_dict = {
-                    "id": str(uuid.uuid4()),
-                    "type": rel.relationship_type.lower(),
-                    "source_id": reverse_entity_map[rel.source],
-                    "target_id": reverse_entity_map[rel.target],
-                    "confidence": rel.confidence,
-                    "context": rel.context or "",
-                    "metadata": getattr(rel, 'attributes', {}) or {}
-                }
-                relationship_types.add(rel.relationship_type.lower())
-                relationships.append(relationship_dict)
+                "type": rel["type"],
+                "source_id": paper.entities[rel["source_index"]]["id"],
+                "target_id": paper.entities[rel["target_index"]]["id"],
+                "confidence": rel["confidence"],
+                "context": rel["context"],
+                "metadata": rel["metadata"]
+            })
+        relationship_types = {rel["type"] for rel in relationships}
         
         # If still no relationships, create sample relationships between existing entities
         if not relationships and len(paper.entities) >= 2:
@@ -778,7 +996,6 @@ def extract_relationships(self, paper_id: str) -> str:
         
         # Broadcast event for WebSocket clients
         from paper_processing.websocket.events import create_paper_status_event
-        from paper_processing.websocket.connection import manager
         
         # Create and broadcast event asynchronously
         event = create_paper_status_event(
@@ -793,15 +1010,7 @@ def extract_relationships(self, paper_id: str) -> str:
             }
         )
         
-        # This needs to be run in an async context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        loop.run_until_complete(manager.broadcast_to_paper(paper_id, event))
+        _broadcast(paper_id, event)
         
         return paper_id
     
@@ -828,7 +1037,7 @@ def build_knowledge_graph(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -903,10 +1112,14 @@ def build_knowledge_graph(self, paper_id: str) -> str:
                 from src.knowledge_graph_system.temporal_evolution.query_engine.temporal_query_engine import (
                     TemporalQueryEngine
                 )
+                from src.knowledge_graph_system.temporal_evolution.query_engine.snapshot_engine import (
+                    TemporalSnapshotEngine
+                )
                 
-                # Create temporal managers
-                temporal_entity_manager = TemporalEntityManager(neo4j_manager)
-                temporal_query_engine = TemporalQueryEngine(neo4j_manager)
+                # Create temporal managers sharing the snapshot change log
+                snapshot_engine = TemporalSnapshotEngine(neo4j_manager)
+                temporal_entity_manager = TemporalEntityManager(neo4j_manager, snapshot_engine)
+                temporal_query_engine = TemporalQueryEngine(neo4j_manager, snapshot_engine)
                 
                 # Create integrator and attach to adapter
                 temporal_integrator = TemporalKnowledgeGraphIntegrator(
@@ -984,7 +1197,6 @@ def build_knowledge_graph(self, paper_id: str) -> str:
         
         # Broadcast event for WebSocket clients
         from paper_processing.websocket.events import create_paper_status_event
-        from paper_processing.websocket.connection import manager
         
         # Create and broadcast event asynchronously
         event = create_paper_status_event(
@@ -995,15 +1207,7 @@ def build_knowledge_graph(self, paper_id: str) -> str:
             metadata=event_metadata
         )
         
-        # This needs to be run in an async context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        loop.run_until_complete(manager.broadcast_to_paper(paper_id, event))
+        _broadcast(paper_id, event)
         
         return paper_id
     
@@ -1030,7 +1234,7 @@ def check_implementation_readiness(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -1076,6 +1280,16 @@ def check_implementation_readiness(self, paper_id: str) -> str:
         self.retry(exc=e)
 
 
+# Stages run in order by the process_paper chain and by run_paper_pipeline
+PIPELINE_STAGES = (
+    process_document,
+    extract_entities,
+    extract_relationships,
+    build_knowledge_graph,
+    check_implementation_readiness
+)
+
+
 @app.task(bind=True, base=PaperProcessingTask)
 def request_implementation(self, paper_id: str) -> str:
     """
@@ -1093,7 +1307,7 @@ def request_implementation(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -1145,7 +1359,7 @@ def cancel_processing_task(self, paper_id: str) -> str:
     
     try:
         # Get paper from database
-        paper_model = PaperModel.get_by_id(paper_id)
+        paper_model = _get_paper_model(paper_id)
         if not paper_model:
             raise ValueError(f"Paper with ID {paper_id} not found")
             
@@ -1190,6 +1404,7 @@ def cancel_processing_task(self, paper_id: str) -> str:
         # Save updated paper
         paper_model.update_from_domain(paper)
         paper_model.save()
+        _record_stage(paper_id)
         
         return paper_id
     
@@ -0,0 +1,110 @@
+"""
+Benchmark tests for WebSocket broadcasts.
+
+These tests fan events out to 5,000 simulated sockets, some of which are slow
+to read, comparing sending to each client in turn with the queued broadcasts
+of ConnectionManager.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+# Mark all tests in this module as benchmark tests
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow
+]
+
+from paper_processing.websocket.connection import ConnectionManager
+
+SOCKET_COUNT = 5000
+
+# One client in twenty takes this long to accept each message
+SLOW_EVERY = 20
+SLOW_SEND_SECONDS = 0.002
+
+EVENT_COUNT = 20
+
+
+class SimulatedWebSocket:
+    """WebSocket stand-in counting received messages, optionally slow to read."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = 0
+        self.last_progress = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        self.last_progress = json.loads(text).get("progress")
+
+
+def _create_sockets():
+    """Create the simulated sockets, every SLOW_EVERY-th one slow."""
+    return [
+        SimulatedWebSocket(SLOW_SEND_SECONDS if i % SLOW_EVERY == 0 else 0.0)
+        for i in range(SOCKET_COUNT)
+    ]
+
+
+def _progress_event(progress):
+    return {"event_type": "paper_progress", "paper_id": "paper", "progress": progress}
+
+
+async def _sequential_broadcast(sockets, message):
+    """Send a message to each socket in turn, as the manager used to."""
+    message_json = json.dumps(message)
+    for websocket in sockets:
+        await websocket.send_text(message_json)
+
+
+async def _wait_until(condition, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "Timed out waiting for delivery"
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_with_slow_clients():
+    """Compare sequential and queued fan-out of progress events to 5k sockets."""
+    sockets = _create_sockets()
+    start = time.perf_counter()
+    for progress in range(EVENT_COUNT):
+        await _sequential_broadcast(sockets, _progress_event(progress))
+    sequential_duration = time.perf_counter() - start
+
+    sockets = _create_sockets()
+    fast_sockets = [websocket for websocket in sockets if not websocket.delay]
+    manager = ConnectionManager()
+    for websocket in sockets:
+        await manager.connect(websocket, "paper")
+
+    start = time.perf_counter()
+    for progress in range(EVENT_COUNT):
+        await manager.broadcast_to_paper("paper", _progress_event(progress))
+    enqueue_duration = time.perf_counter() - start
+
+    await _wait_until(lambda: all(websocket.received == EVENT_COUNT for websocket in fast_sockets))
+    fast_delivery_duration = time.perf_counter() - start
+
+    # Slow clients end on the latest progress, having skipped superseded events
+    await _wait_until(lambda: all(websocket.last_progress == EVENT_COUNT - 1 for websocket in sockets))
+    metrics = manager.metrics()
+    await manager.close()
+
+    print(f"{SOCKET_COUNT} sockets, {EVENT_COUNT} events: sequential={sequential_duration:.2f}s, "
+          f"queued broadcast={enqueue_duration:.2f}s, fast clients served={fast_delivery_duration:.2f}s, "
+          f"coalesced={metrics['coalesced_messages']}, max queue depth={metrics['max_queue_depth']}")
+
+    assert fast_delivery_duration < sequential_duration
+    assert metrics["coalesced_messages"] > 0
+    assert metrics["dropped_messages"] == 0
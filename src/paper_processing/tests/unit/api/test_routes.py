@@ -0,0 +1,125 @@
+"""
+Unit tests for the API application and routes.
+
+This module tests that the application imports with its routes and serves
+requests through a test client, and the bulk batch submission and progress
+routes.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi.testclient import TestClient
+
+from paper_processing.api import main, routes
+from paper_processing.models.paper import PaperStatus
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create a test client without an event bus subscription or statistics rebuild."""
+    monkeypatch.setattr(main, "event_subscriber", None)
+    monkeypatch.setattr(main.settings.database, "rebuild_statistics_on_startup", False)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_app_serves_routes(client):
+    """Test that the application starts and includes the paper routes."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "up"
+    paths = client.get("/openapi.json").json()["paths"]
+    assert {"/papers/batch/process", "/papers/batch/{batch_id}", "/papers/search", "/papers/stats"} <= set(paths)
+
+
+def test_startup_rebuilds_statistics(monkeypatch):
+    """Test that the statistics are rebuilt when the application starts."""
+    recorder = MagicMock()
+    monkeypatch.setattr(main, "event_subscriber", None)
+    monkeypatch.setattr(main, "get_statistics_recorder", MagicMock(return_value=recorder))
+
+    with TestClient(main.app):
+        recorder.rebuild.assert_called_once_with()
+
+    # A failed rebuild does not stop the application
+    recorder.rebuild.side_effect = Exception("Test error")
+    with TestClient(main.app) as client:
+        assert client.get("/").status_code == 200
+
+
+@pytest.fixture
+def models(monkeypatch):
+    """Replace the database models of the routes with mocks."""
+    paper_model = MagicMock()
+    batch_model = MagicMock()
+    for model in (paper_model, batch_model):
+        for name in ("find_statuses", "bulk_update_status", "count_by_status",
+                     "create", "find_by_id", "update_progress"):
+            setattr(model, name, AsyncMock())
+    monkeypatch.setattr(routes, "db_connection", MagicMock(get_collection=AsyncMock()))
+    monkeypatch.setattr(routes, "PaperModel", MagicMock(return_value=paper_model))
+    monkeypatch.setattr(routes, "BatchModel", MagicMock(return_value=batch_model))
+    return paper_model, batch_model
+
+
+def test_bulk_batch_submission(client, models, monkeypatch):
+    """Test that a bulk batch is queued with one write and one Celery dispatch."""
+    paper_model, batch_model = models
+    process_paper = MagicMock()
+    monkeypatch.setattr(routes, "process_paper", process_paper)
+    paper_model.find_statuses.return_value = {
+        "p1": PaperStatus.UPLOADED,
+        "p2": PaperStatus.FAILED,
+        "p3": PaperStatus.PROCESSING
+    }
+    paper_model.bulk_update_status.return_value = 2
+
+    response = client.post("/papers/batch/process?bulk=true", json=["p1", "p2", "p3", "p4", "p1"])
+
+    result = response.json()
+    assert response.status_code == 200
+    assert (result["total"], result["queued"], result["skipped"], result["errors"]) == (4, 2, 1, 1)
+    paper_model.bulk_update_status.assert_awaited_once()
+    transitions, status = paper_model.bulk_update_status.call_args.args[:2]
+    assert transitions == {"p1": PaperStatus.UPLOADED, "p2": PaperStatus.FAILED}
+    assert status == PaperStatus.QUEUED
+    batch = batch_model.create.call_args.args[0]
+    assert batch["id"] == result["batch_id"]
+    assert batch["paper_ids"] == ["p1", "p2"]
+    process_paper.chunks.assert_called_once_with([("p1",), ("p2",)], routes.BATCH_CHUNK_SIZE)
+    process_paper.chunks.return_value.apply_async.assert_called_once_with()
+
+
+def test_batch_status_polling(client, models):
+    """Test that batch progress is aggregated until every paper has finished."""
+    paper_model, batch_model = models
+    batch = {
+        "id": "batch", "status": "queued", "created_at": datetime(2025, 1, 1),
+        "total": 3, "queued": 2, "skipped": 1, "errors": 0, "progress": {"queued": 2}
+    }
+    batch_model.find_by_id.return_value = batch
+    paper_model.count_by_status.return_value = {"analyzed": 1, "processing": 1}
+
+    result = client.get("/papers/batch/batch").json()
+
+    assert (result["status"], result["finished"], result["progress"]) == ("processing", 1, 50)
+    batch_model.update_progress.assert_awaited_once_with("batch", "processing", {"analyzed": 1, "processing": 1})
+
+    paper_model.count_by_status.return_value = {"analyzed": 1, "failed": 1}
+    assert client.get("/papers/batch/batch").json()["status"] == "completed"
+
+    # Finished batches are served without aggregating again
+    paper_model.count_by_status.reset_mock()
+    result = client.get("/papers/batch/batch").json()
+    assert (result["status"], result["failed"], result["progress"]) == ("completed", 1, 100)
+    paper_model.count_by_status.assert_not_awaited()
+
+
+def test_unknown_batch(client, models):
+    """Test that an unknown batch is not found."""
+    models[1].find_by_id.return_value = None
+
+    assert client.get("/papers/batch/missing").status_code == 404
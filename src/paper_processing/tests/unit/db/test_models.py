@@ -11,7 +11,7 @@ from datetime import datetime
 from pymongo.errors import PyMongoError
 
 from paper_processing.models.paper import Paper, PaperStatus, add_processing_event
-from paper_processing.db.models import PaperModel, DatabaseError
+from paper_processing.db.models import BatchModel, PaperModel, DatabaseError
 
 
 @pytest.mark.asyncio
@@ -419,4 +419,142 @@ async def test_find_by_status_error():
         await paper_model.find_by_status(PaperStatus.UPLOADED)
     
     # Check that find was called
-    mock_collection.find.assert_called_once_with({"status": "uploaded"})
\ No newline at end of file
+    mock_collection.find.assert_called_once_with({"status": "uploaded"})
+
+class AsyncCursor:
+    """Async iterator over a list of documents, standing in for a Motor cursor."""
+    
+    def __init__(self, docs):
+        self.docs = iter(docs)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+async def test_find_statuses():
+    """Test finding the statuses of many papers with one query."""
+    mock_collection = AsyncMock()
+    mock_collection.find = MagicMock(return_value=AsyncCursor([
+        {"id": "test-id-1", "status": "uploaded"},
+        {"id": "test-id-2", "status": "failed"}
+    ]))
+    paper_model = PaperModel(mock_collection)
+    
+    statuses = await paper_model.find_statuses(["test-id-1", "test-id-2", "test-id-3"], {"batch_id": "batch"})
+    
+    mock_collection.find.assert_called_once_with(
+        {"id": {"$in": ["test-id-1", "test-id-2", "test-id-3"]}, "batch_id": "batch"},
+        {"_id": 0, "id": 1, "status": 1}
+    )
+    assert statuses == {"test-id-1": PaperStatus.UPLOADED, "test-id-2": PaperStatus.FAILED}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_status():
+    """Test updating the status of many papers with one bulk write."""
+    mock_collection = AsyncMock()
+    mock_collection.bulk_write.return_value = MagicMock(matched_count=2)
+    paper_model = PaperModel(mock_collection)
+    
+    updated = await paper_model.bulk_update_status(
+        {"test-id-1": PaperStatus.UPLOADED, "test-id-2": PaperStatus.FAILED},
+        PaperStatus.QUEUED,
+        "Paper queued for batch processing",
+        {"batch_id": "batch"}
+    )
+    
+    assert updated == 2
+    mock_collection.bulk_write.assert_called_once()
+    operations = mock_collection.bulk_write.call_args[0][0]
+    assert len(operations) == 2
+    # Each update is conditional on the status the paper was read in
+    assert operations[1]._filter == {"id": "test-id-2", "status": "failed"}
+    assert operations[1]._doc["$set"]["status"] == "queued"
+    assert operations[1]._doc["$set"]["batch_id"] == "batch"
+    assert operations[1]._doc["$push"]["processing_history"]["status"] == "queued"
+    
+    # Nothing to update does not touch the database
+    assert await paper_model.bulk_update_status({}, PaperStatus.QUEUED, "Queued") == 0
+    mock_collection.bulk_write.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_status_changes_are_recorded():
+    """Test that status writes record the papers in the statistics."""
+    mock_collection = AsyncMock()
+    mock_collection.bulk_write.return_value = MagicMock(matched_count=1)
+    statistics = AsyncMock()
+    paper_model = PaperModel(mock_collection, statistics=statistics)
+    
+    await paper_model.bulk_update_status(
+        {"test-id-1": PaperStatus.UPLOADED, "test-id-2": PaperStatus.FAILED},
+        PaperStatus.QUEUED,
+        "Paper queued for batch processing"
+    )
+    statistics.record_many.assert_awaited_once_with(["test-id-1", "test-id-2"])
+    
+    # Papers that were not updated are not recorded
+    mock_collection.bulk_write.return_value = MagicMock(matched_count=0)
+    await paper_model.bulk_update_status({"test-id-3": PaperStatus.UPLOADED}, PaperStatus.QUEUED, "Queued")
+    statistics.record_many.assert_awaited_once()
+    
+    # Statistics are best effort
+    statistics.record_many.side_effect = DatabaseError("Test error")
+    mock_collection.update_one.return_value = MagicMock(matched_count=1)
+    mock_collection.find_one.return_value = None
+    await paper_model.update_status("test-id-1", PaperStatus.FAILED, "Failed")
+    statistics.record_many.assert_awaited_with(["test-id-1"])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_status_error():
+    """Test updating the status of many papers with an error."""
+    mock_collection = AsyncMock()
+    mock_collection.bulk_write.side_effect = PyMongoError("Test error")
+    paper_model = PaperModel(mock_collection)
+    
+    with pytest.raises(DatabaseError):
+        await paper_model.bulk_update_status({"test-id": PaperStatus.UPLOADED}, PaperStatus.QUEUED, "Queued")
+
+
+@pytest.mark.asyncio
+async def test_count_by_status():
+    """Test counting papers by status."""
+    mock_collection = AsyncMock()
+    mock_collection.aggregate = MagicMock(return_value=AsyncCursor([
+        {"_id": "queued", "count": 3},
+        {"_id": "analyzed", "count": 2}
+    ]))
+    paper_model = PaperModel(mock_collection)
+    
+    counts = await paper_model.count_by_status({"batch_id": "batch"})
+    
+    assert counts == {"queued": 3, "analyzed": 2}
+    pipeline = mock_collection.aggregate.call_args[0][0]
+    assert pipeline[0] == {"$match": {"batch_id": "batch"}}
+
+
+@pytest.mark.asyncio
+async def test_batch_model():
+    """Test creating a batch and materializing its progress."""
+    mock_collection = AsyncMock()
+    mock_collection.find_one.return_value = {"id": "batch", "status": "queued"}
+    batch_model = BatchModel(mock_collection)
+    
+    await batch_model.create({"id": "batch", "status": "queued"})
+    batch = await batch_model.find_by_id("batch")
+    await batch_model.update_progress("batch", "processing", {"queued": 1, "processing": 1})
+    
+    mock_collection.insert_one.assert_called_once()
+    mock_collection.find_one.assert_called_once_with({"id": "batch"}, {"_id": 0})
+    assert batch["status"] == "queued"
+    update = mock_collection.update_one.call_args[0][1]
+    assert update["$set"]["status"] == "processing"
+    assert update["$set"]["progress"] == {"queued": 1, "processing": 1}
@@ -0,0 +1,165 @@
+"""
+Unit tests for the delta-persisting paper store.
+
+This module tests computing field-level updates, saving papers as deltas and
+storing large payloads out of line.
+"""
+
+import pytest
+import uuid
+from copy import deepcopy
+from datetime import datetime
+
+from paper_processing.models.paper import Paper, PaperStatus, add_processing_event
+from paper_processing.db.models import DatabaseError, PaperModel
+from paper_processing.db.paper_store import LocalBlobStore, PaperStore, compute_delta
+
+
+class FakeCollection:
+    """Minimal in-memory collection applying $set, $unset and $push updates."""
+
+    def __init__(self):
+        self.docs = {}
+        self.updates = []
+
+    def find_one(self, query, projection=None):
+        doc = self.docs.get(query["id"])
+        return deepcopy(doc) if doc is not None else None
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["id"]] = deepcopy(doc)
+
+    def update_one(self, query, update):
+        self.updates.append(update)
+        doc = self.docs[query["id"]]
+        for path, value in update.get("$set", {}).items():
+            parent, key = self._parent(doc, path)
+            parent[key] = deepcopy(value)
+        for path in update.get("$unset", {}):
+            parent, key = self._parent(doc, path)
+            parent.pop(key, None)
+        for path, value in update.get("$push", {}).items():
+            parent, key = self._parent(doc, path)
+            parent[key].extend(deepcopy(value["$each"]))
+
+    @staticmethod
+    def _parent(doc, path):
+        *parents, key = path.split(".")
+        for parent in parents:
+            doc = doc.setdefault(parent, {})
+        return doc, key
+
+
+@pytest.fixture
+def sample_paper():
+    """Create a sample paper for testing."""
+    return Paper(
+        id=str(uuid.uuid4()),
+        title="Test Paper",
+        filename="test.pdf",
+        file_path="/tmp/test.pdf",
+        content_type="application/pdf",
+        original_filename="original_test.pdf",
+        uploaded_by="test_user",
+        uploaded_at=datetime.utcnow(),
+        status=PaperStatus.PROCESSING
+    )
+
+
+def test_compute_delta():
+    """Test that only changed leaves are set and appended list items pushed."""
+    before = {
+        "status": "processing",
+        "metadata": {"document": {"page_count": 3}, "source": "upload"},
+        "processing_history": [{"message": "queued"}],
+        "entities": [{"name": "BERT"}],
+        "abstract": "old"
+    }
+    after = {
+        "status": "analyzed",
+        "metadata": {"document": {"page_count": 3, "word_count": 10}, "source": "upload"},
+        "processing_history": [{"message": "queued"}, {"message": "analyzed"}],
+        "entities": [{"name": "GPT-4"}]
+    }
+
+    assert compute_delta(before, after) == {
+        "$set": {
+            "status": "analyzed",
+            "metadata.document.word_count": 10,
+            "entities": [{"name": "GPT-4"}]
+        },
+        "$unset": {"abstract": ""},
+        "$push": {"processing_history": {"$each": [{"message": "analyzed"}]}}
+    }
+    assert compute_delta(after, deepcopy(after)) == {}
+
+
+def test_save_writes_deltas(sample_paper):
+    """Test that saving a loaded paper writes only the changed fields."""
+    collection = FakeCollection()
+    store = PaperStore(collection)
+    store.save(sample_paper)
+    store.forget(sample_paper.id)
+
+    paper = store.load(sample_paper.id)
+    paper.content = "BERT was trained on SQuAD."
+    paper = add_processing_event(paper, PaperStatus.EXTRACTING_ENTITIES, "Extracting entities")
+    update = store.save(paper)
+
+    assert set(update["$set"]) == {"content", "status"}
+    assert len(update["$push"]["processing_history"]["$each"]) == 1
+    assert store.save(paper) == {}
+
+    # The stored document matches the paper
+    store.forget(paper.id)
+    assert store.load(paper.id) == paper
+
+
+def test_large_payloads_are_stored_out_of_line(sample_paper, tmp_path):
+    """Test that large content is written to the blob store once."""
+    collection = FakeCollection()
+    blob_store = LocalBlobStore(str(tmp_path / "blobs"))
+    store = PaperStore(collection, blob_store=blob_store, blob_threshold=1024)
+
+    sample_paper.content = "Transformer " * 1000
+    sample_paper.metadata = {"document": {"segments": [{"content": "x" * 2000}], "document_type": "pdf"}}
+    store.save(sample_paper)
+
+    stored = collection.docs[sample_paper.id]
+    assert set(stored["content"]) == {"_blob_id", "size"}
+    assert set(stored["metadata"]["document"]["segments"]) == {"_blob_id", "size"}
+    assert len(list((tmp_path / "blobs").iterdir())) == 2
+
+    # A status update does not rewrite the content
+    sample_paper.status = PaperStatus.ANALYZED
+    update = store.save(sample_paper)
+    assert update == {"$set": {"status": "analyzed"}}
+
+    store.forget(sample_paper.id)
+    loaded = store.load(sample_paper.id)
+    assert loaded.content == sample_paper.content
+    assert loaded.metadata == sample_paper.metadata
+
+
+def test_paper_model_reads_out_of_line_payloads(sample_paper, tmp_path):
+    """Test that a paper saved in fused mode reads back through PaperModel."""
+    collection = FakeCollection()
+    blob_store = LocalBlobStore(str(tmp_path / "blobs"))
+    store = PaperStore(collection, blob_store=blob_store, blob_threshold=1024)
+
+    sample_paper.content = "Transformer " * 1000
+    sample_paper.metadata = {"document": {"segments": [{"content": "x" * 2000}], "document_type": "pdf"}}
+    store.save(sample_paper)
+
+    paper = PaperModel(collection, blob_store=blob_store).from_document(
+        collection.find_one({"id": sample_paper.id})
+    )
+
+    assert paper.content == sample_paper.content
+    assert paper.metadata == sample_paper.metadata
+
+    # A missing blob is a database error rather than a validation error
+    with pytest.raises(DatabaseError):
+        PaperModel(collection, blob_store=LocalBlobStore(str(tmp_path / "empty"))).from_document(
+            collection.find_one({"id": sample_paper.id})
+        )
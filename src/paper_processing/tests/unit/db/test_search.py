@@ -0,0 +1,109 @@
+"""
+Unit tests for paper search.
+
+This module tests keyset cursors and the aggregation built by the search engine.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+
+from paper_processing.models.paper import PaperStatus
+from paper_processing.db.search import PaperSearchEngine, decode_cursor, encode_cursor, keyset_filter
+
+
+class AsyncCursor:
+    """Async iterator over a list of documents, standing in for a Motor cursor."""
+
+    def __init__(self, docs):
+        self.docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the sort key it was encoded from."""
+    uploaded_at = datetime(2025, 1, 1, 12, 30)
+    cursor = encode_cursor([1.5, uploaded_at, "paper-1"])
+
+    assert decode_cursor(cursor, ["score", "uploaded_at", "id"]) == [1.5, uploaded_at, "paper-1"]
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, ["uploaded_at", "id"])
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor", ["uploaded_at", "id"])
+
+
+def test_keyset_filter():
+    """Test that the keyset filter selects the documents after the sort key."""
+    uploaded_at = datetime(2025, 1, 1)
+
+    assert keyset_filter([("uploaded_at", -1), ("id", -1)], [uploaded_at, "paper-1"]) == {
+        "$or": [
+            {"uploaded_at": {"$lt": uploaded_at}},
+            {"uploaded_at": uploaded_at, "id": {"$lt": "paper-1"}}
+        ]
+    }
+    assert keyset_filter([("id", 1)], ["paper-1"]) == {"id": {"$gt": "paper-1"}}
+
+
+@pytest.mark.asyncio
+async def test_search_with_query():
+    """Test that a query is matched with the text index and paged by relevance."""
+    uploaded_at = datetime(2025, 1, 1)
+    papers = [
+        {"id": f"paper-{i}", "title": "Transformers", "uploaded_at": uploaded_at, "score": 2.0 - i / 10}
+        for i in range(3)
+    ]
+    mock_collection = MagicMock()
+    mock_collection.aggregate.return_value = AsyncCursor([{"papers": papers, "total": [{"count": 7}]}])
+    engine = PaperSearchEngine(mock_collection)
+
+    result = await engine.search(query="transformer", status=PaperStatus.ANALYZED, limit=2)
+
+    pipeline = mock_collection.aggregate.call_args[0][0]
+    assert pipeline[0] == {"$match": {"$text": {"$search": "transformer"}, "status": "analyzed"}}
+    assert pipeline[1] == {"$addFields": {"score": {"$meta": "textScore"}}}
+    facet = pipeline[2]["$facet"]
+    assert facet["papers"][0] == {"$sort": {"score": -1, "uploaded_at": -1, "id": -1}}
+    assert facet["papers"][1] == {"$limit": 3}
+    # Pages hold paper summaries rather than whole documents
+    assert facet["papers"][2] == {"$project": {
+        "id": 1, "title": 1, "authors.name": 1, "abstract": 1, "status": 1, "uploaded_at": 1, "score": 1, "_id": 0
+    }}
+    assert facet["total"] == [{"$count": "count"}]
+
+    assert result["count"] == 2
+    assert result["total"] == 7
+    assert [paper["id"] for paper in result["papers"]] == ["paper-0", "paper-1"]
+    assert decode_cursor(result["next_cursor"], ["score", "uploaded_at", "id"]) == [1.9, uploaded_at, "paper-1"]
+
+    # The next page starts after the cursor
+    mock_collection.aggregate.return_value = AsyncCursor([{"papers": papers[2:], "total": [{"count": 7}]}])
+    result = await engine.search(query="transformer", limit=2, cursor=result["next_cursor"])
+
+    page = mock_collection.aggregate.call_args[0][0][2]["$facet"]["papers"]
+    assert "$or" in page[0]["$match"]
+    assert result["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_without_matches():
+    """Test that an empty result has no total and no cursor."""
+    mock_collection = MagicMock()
+    mock_collection.aggregate.return_value = AsyncCursor([{"papers": [], "total": []}])
+    engine = PaperSearchEngine(mock_collection)
+
+    result = await engine.search(offset=20)
+
+    pipeline = mock_collection.aggregate.call_args[0][0]
+    assert pipeline[0] == {"$match": {}}
+    assert {"$skip": 20} in pipeline[1]["$facet"]["papers"]
+    assert result == {"count": 0, "total": 0, "limit": 10, "papers": [], "next_cursor": None}
@@ -0,0 +1,153 @@
+"""
+Unit tests for the materialized processing statistics.
+
+This module tests the incremental statistics updates, their summary and the
+statistics recorders.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from paper_processing.models.paper import PaperStatus
+from paper_processing.db.statistics import (
+    STATISTICS_ID,
+    AsyncStatisticsRecorder,
+    StatisticsRecorder,
+    merge_updates,
+    statistics_update,
+    summarize
+)
+
+
+def test_statistics_update():
+    """Test that a status change moves the paper between counters."""
+    paper = {"status": "extracting_entities"}
+
+    update = statistics_update(paper, "processing", "process_document", 2.5)
+
+    assert update["$inc"] == {
+        "papers_by_status.extracting_entities": 1,
+        "papers_by_status.processing": -1,
+        "stages.process_document.count": 1,
+        "stages.process_document.total_time": 2.5
+    }
+
+    # An unchanged status only counts the stage
+    update = statistics_update(paper, "extracting_entities", "extract_entities")
+    assert update["$inc"] == {"stages.extract_entities.count": 1}
+
+    assert statistics_update(paper, "extracting_entities") == {}
+
+
+def test_statistics_update_outcomes():
+    """Test that completed and failed processing runs are counted once."""
+    paper = {"status": "analyzed", "entity_count": 12, "relationship_count": 5, "processing_time_ms": 90000}
+
+    update = statistics_update(paper, "building_knowledge_graph")
+    assert update["$inc"]["completed"] == 1
+    assert update["$inc"]["total_entities"] == 12
+    assert update["$inc"]["total_relationships"] == 5
+    assert update["$inc"]["total_processing_time"] == 90.0
+
+    # Becoming implementation ready does not complete the paper again
+    paper["status"] = "implementation_ready"
+    assert "completed" not in statistics_update(paper, "analyzed")["$inc"]
+
+    update = statistics_update({"status": "failed"}, "extracting_entities")
+    assert update["$inc"]["failed"] == 1
+    assert "completed" not in update["$inc"]
+
+
+def test_summarize():
+    """Test computing averages from the statistics document."""
+    summary = summarize({
+        "papers_by_status": {"analyzed": 3, "failed": 1, "processing": 0},
+        "completed": 4,
+        "failed": 1,
+        "total_entities": 40,
+        "total_relationships": 20,
+        "total_processing_time": 360.0,
+        "stages": {"extract_entities": {"count": 4, "total_time": 10.0}}
+    })
+
+    assert summary["total_papers"] == 4
+    assert summary["papers_by_status"]["analyzed"] == 3
+    assert summary["papers_by_status"][PaperStatus.UPLOADED.value] == 0
+    assert summary["avg_processing_time"] == 90.0
+    assert summary["avg_entity_count"] == 10.0
+    assert summary["avg_relationship_count"] == 5.0
+    assert summary["success_rate"] == 0.8
+    assert summary["stages"]["extract_entities"]["avg_time"] == 2.5
+
+    empty = summarize(None)
+    assert empty["total_papers"] == 0
+    assert empty["success_rate"] == 0.0
+
+
+def test_recorder_record():
+    """Test that recording swaps the paper's recorded status and updates the statistics."""
+    papers = MagicMock()
+    papers.find_one.return_value = {"status": "analyzed", "entity_count": 2, "relationship_count": 1,
+                                     "processing_time_ms": 1000}
+    statistics = MagicMock()
+    paper_statistics = MagicMock()
+    paper_statistics.find_one_and_update.return_value = {"_id": "paper", "status": "building_knowledge_graph"}
+    recorder = StatisticsRecorder(papers, statistics, paper_statistics)
+
+    update = recorder.record("paper", "build_knowledge_graph", 3.0)
+
+    assert paper_statistics.find_one_and_update.call_args[0][:2] == (
+        {"_id": "paper"},
+        {"$set": {"status": "analyzed"}}
+    )
+    statistics.update_one.assert_called_once_with({"_id": STATISTICS_ID}, update, upsert=True)
+    assert update["$inc"]["completed"] == 1
+    assert update["$inc"]["papers_by_status.building_knowledge_graph"] == -1
+
+    # A missing paper is not recorded
+    papers.find_one.return_value = None
+    assert recorder.record("missing") == {}
+    statistics.update_one.assert_called_once()
+
+
+def test_merge_updates():
+    """Test that the updates of several papers are counted in one update."""
+    update = merge_updates([
+        statistics_update({"status": "queued"}, "uploaded"),
+        statistics_update({"status": "queued"}, "failed"),
+        statistics_update({"status": "queued"}, None)
+    ])
+
+    assert update["$inc"] == {
+        "papers_by_status.queued": 3,
+        "papers_by_status.uploaded": -1,
+        "papers_by_status.failed": -1
+    }
+    assert merge_updates([{}, statistics_update({"status": "queued"}, "queued")]) == {}
+
+
+@pytest.mark.asyncio
+async def test_async_recorder_record_many():
+    """Test that the API records the status of many papers with one statistics update."""
+    cursor = MagicMock()
+    cursor.__aiter__.return_value = [{"id": "p1", "status": "queued"}, {"id": "p2", "status": "queued"}]
+    papers = MagicMock()
+    papers.find.return_value = cursor
+    statistics = AsyncMock()
+    paper_statistics = AsyncMock()
+    paper_statistics.find_one_and_update.side_effect = [{"_id": "p1", "status": "uploaded"}, None]
+    recorder = AsyncStatisticsRecorder(papers, statistics, paper_statistics)
+
+    update = await recorder.record_many(["p1", "p2", "missing"])
+
+    assert papers.find.call_args[0][0] == {"id": {"$in": ["p1", "p2", "missing"]}}
+    assert [call[0][:2] for call in paper_statistics.find_one_and_update.call_args_list] == [
+        ({"_id": "p1"}, {"$set": {"status": "queued"}}),
+        ({"_id": "p2"}, {"$set": {"status": "queued"}})
+    ]
+    assert update["$inc"] == {"papers_by_status.queued": 2, "papers_by_status.uploaded": -1}
+    statistics.update_one.assert_awaited_once_with({"_id": STATISTICS_ID}, update, upsert=True)
+
+    # Nothing to record does not touch the database
+    assert await recorder.record_many([]) == {}
+    papers.find.assert_called_once()
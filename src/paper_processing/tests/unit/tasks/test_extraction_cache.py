@@ -0,0 +1,124 @@
+"""
+Unit tests for the extraction cache.
+
+This module tests the content-addressed cache of processing stage results and
+its SQLite and Redis backends.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from paper_processing.tasks import extraction_cache
+from paper_processing.tasks.extraction_cache import (
+    ExtractionCache,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    cached_stage,
+    config_hash,
+    content_hash,
+    file_hash
+)
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    """Create a cache backed by a temporary SQLite file."""
+    return ExtractionCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), max_entries=3))
+
+
+@pytest.fixture
+def redis_cache():
+    """Create a cache backed by a fake Redis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return ExtractionCache(RedisCacheBackend(client=fakeredis.FakeRedis(), max_entries=3))
+
+
+def test_hashes(tmp_path):
+    """Test that hashes depend on content only."""
+    path = tmp_path / "paper.txt"
+    path.write_text("Attention is all you need")
+
+    assert file_hash(str(path)) == content_hash("Attention is all you need")
+    assert config_hash({"a": 1, "b": 2}) == config_hash({"b": 2, "a": 1})
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+
+@pytest.mark.parametrize("cache_fixture", ["sqlite_cache", "redis_cache"])
+def test_get_or_compute(cache_fixture, request):
+    """Test that a result is computed once and then served from the cache."""
+    cache = request.getfixturevalue(cache_fixture)
+    compute = MagicMock(return_value=[{"name": "BERT", "type": "model"}])
+
+    first = cache.get_or_compute("entities", "hash", {"threshold": 0.6}, compute)
+    second = cache.get_or_compute("entities", "hash", {"threshold": 0.6}, compute)
+
+    assert first == second == [{"name": "BERT", "type": "model"}]
+    assert compute.call_count == 1
+
+    # A different configuration is a different entry
+    cache.get_or_compute("entities", "hash", {"threshold": 0.4}, compute)
+    assert compute.call_count == 2
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["stages"]["entities"]["hit_rate"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.parametrize("cache_fixture", ["sqlite_cache", "redis_cache"])
+def test_lru_eviction(cache_fixture, request):
+    """Test that the least recently used entry is evicted once the cache is full."""
+    cache = request.getfixturevalue(cache_fixture)
+
+    for key in ("a", "b", "c"):
+        cache.set("document", key, None, key)
+    # Use "a" so that "b" becomes the least recently used entry
+    assert cache.get("document", "a") == "a"
+    cache.set("document", "d", None, "d")
+
+    assert cache.get("document", "b") is None
+    assert [cache.get("document", key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats()["entries"] == 3
+
+
+def test_sqlite_size_eviction(tmp_path):
+    """Test that entries are evicted to keep the cache within its size."""
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), max_size_bytes=25)
+
+    backend.set("a", b"x" * 10)
+    backend.set("b", b"x" * 10)
+    backend.set("c", b"x" * 10)
+    backend.set("huge", b"x" * 100)
+
+    assert len(backend) == 2
+    assert backend.get("a") is None
+    assert backend.get("huge") is None
+
+
+def test_backend_failure_is_a_miss():
+    """Test that a failing backend does not fail the stage."""
+    backend = MagicMock()
+    backend.get.side_effect = ConnectionError("unavailable")
+    backend.set.side_effect = ConnectionError("unavailable")
+    cache = ExtractionCache(backend)
+
+    assert cache.get_or_compute("entities", "hash", None, lambda: ["BERT"]) == ["BERT"]
+
+
+def test_cached_stage(sqlite_cache):
+    """Test that cached_stage uses the cache unless it is disabled or bypassed."""
+    compute = MagicMock(return_value={"content": "text"})
+
+    with patch.object(extraction_cache, "get_extraction_cache", return_value=sqlite_cache):
+        cached_stage("document", "hash", None, compute)
+        cached_stage("document", "hash", None, compute)
+        assert compute.call_count == 1
+
+        # No input hash bypasses the cache
+        cached_stage("document", None, None, compute)
+        assert compute.call_count == 2
+
+    with patch.object(extraction_cache, "get_extraction_cache", return_value=None):
+        cached_stage("document", "hash", None, compute)
+        assert compute.call_count == 3
@@ -10,12 +10,15 @@ from unittest.mock import patch, MagicMock, ANY
 from datetime import datetime
 
 from paper_processing.models.paper import Paper, PaperStatus
+from paper_processing.tasks import processing_tasks
 from paper_processing.tasks.processing_tasks import (
     process_paper,
     process_document,
     extract_entities,
     extract_relationships,
-    build_knowledge_graph
+    build_knowledge_graph,
+    run_paper_pipeline,
+    PIPELINE_STAGES
 )
 
 
@@ -136,4 +139,43 @@ def test_build_knowledge_graph(mock_paper_model, sample_paper):
         mock_build_knowledge_graph.assert_called_once_with(sample_paper.id)
         
         # Check that the paper ID was returned
-        assert result == sample_paper.id
\ No newline at end of file
+        assert result == sample_paper.id
+
+
+def test_run_paper_pipeline(mock_paper_model, sample_paper):
+    """Test that the fused pipeline loads the paper once and shares it across stages."""
+    paper_store = MagicMock()
+    paper_store.load.return_value = sample_paper
+    seen_papers = []
+    
+    def run_stage(paper_id):
+        model = processing_tasks._get_paper_model(paper_id)
+        paper = model.to_domain()
+        seen_papers.append(paper)
+        model.update_from_domain(paper)
+        model.save()
+        return paper_id
+    
+    with patch('paper_processing.db.paper_store.get_paper_store', return_value=paper_store), \
+            patch.object(processing_tasks, '_record_stage') as mock_record_stage:
+        stage_patches = [patch.object(stage, 'run', side_effect=run_stage) for stage in PIPELINE_STAGES]
+        for stage_patch in stage_patches:
+            stage_patch.start()
+        try:
+            result = run_paper_pipeline(sample_paper.id)
+        finally:
+            for stage_patch in stage_patches:
+                stage_patch.stop()
+    
+    assert result == sample_paper.id
+    paper_store.load.assert_called_once_with(sample_paper.id)
+    assert len(seen_papers) == len(PIPELINE_STAGES)
+    assert all(paper is sample_paper for paper in seen_papers)
+    assert paper_store.save.call_count == len(PIPELINE_STAGES)
+    # Each stage is recorded in the statistics
+    assert [c.args[1] for c in mock_record_stage.call_args_list] == [stage.name for stage in PIPELINE_STAGES]
+    
+    # The database model is used again once the pipeline is done
+    assert processing_tasks._get_paper_model(sample_paper.id) is not None
+    assert not isinstance(processing_tasks._get_paper_model(sample_paper.id), processing_tasks.FusedPaperModel)
+
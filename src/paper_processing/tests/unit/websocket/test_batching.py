@@ -0,0 +1,190 @@
+"""
+Unit tests for event batching.
+
+This module tests collecting the events of each paper into batches, merging
+superseded progress events, and the msgpack encoding of client messages.
+"""
+
+import pytest
+import json
+from unittest.mock import AsyncMock
+import asyncio
+
+from paper_processing.websocket import connection
+from paper_processing.websocket.batching import EventBatcher
+from paper_processing.websocket.connection import ConnectionManager, encode_message
+from paper_processing.websocket.events import (
+    EventType,
+    PaperEvent,
+    create_event_batch,
+    create_paper_status_event
+)
+
+
+def mock_manager():
+    """Create a mock connection manager for testing."""
+    manager = AsyncMock()
+    manager.broadcast = AsyncMock()
+    manager.broadcast_to_paper = AsyncMock()
+    return manager
+
+
+def progress_event(paper_id, progress):
+    """Create a progress event for testing."""
+    return {"event_type": "paper_progress", "paper_id": paper_id, "progress": progress}
+
+
+def test_create_event_batch():
+    """Test that batched events leave out the paper ID of the batch."""
+    events = [progress_event("paper", 10), {"event_type": "paper_status", "paper_id": "paper"}]
+
+    batch = create_event_batch("paper", events)
+
+    assert batch["event_type"] == EventType.EVENT_BATCH.value
+    assert batch["paper_id"] == "paper"
+    assert batch["events"] == [
+        {"event_type": "paper_progress", "progress": 10},
+        {"event_type": "paper_status"}
+    ]
+    assert "timestamp" in batch
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_per_paper():
+    """Test that the events of a window are sent as one batch per paper."""
+    manager = mock_manager()
+    batcher = EventBatcher(manager, window=0.05)
+
+    await batcher.add(create_paper_status_event("paper", "processing", "Started", 0))
+    await batcher.add(PaperEvent(event_type=EventType.PAPER_ANALYZED, paper_id="paper", message="Analyzed"))
+    await batcher.add(progress_event("other", 50))
+    manager.broadcast_to_paper.assert_not_called()
+
+    await asyncio.sleep(0.1)
+
+    sent = {call.args[0]: call.args[1] for call in manager.broadcast_to_paper.call_args_list}
+    assert sent["paper"]["event_type"] == "event_batch"
+    assert [event["event_type"] for event in sent["paper"]["events"]] == ["paper_status", "paper_analyzed"]
+    # A single pending event is sent as is
+    assert sent["other"] == progress_event("other", 50)
+
+
+@pytest.mark.asyncio
+async def test_progress_events_are_merged():
+    """Test that a progress event replaces the pending progress event of its paper."""
+    manager = mock_manager()
+    batcher = EventBatcher(manager, window=10)
+
+    await batcher.add(progress_event("paper", 0))
+    await batcher.add({"event_type": "paper_status", "paper_id": "paper", "status": "processing"})
+    for progress in range(1, 10):
+        await batcher.add(progress_event("paper", progress))
+    await batcher.flush()
+
+    manager.broadcast_to_paper.assert_called_once()
+    batch = manager.broadcast_to_paper.call_args.args[1]
+    # The latest progress event moves after the events it follows
+    assert [(event["event_type"], event.get("progress")) for event in batch["events"]] == [
+        ("paper_status", None), ("paper_progress", 9)
+    ]
+    assert batcher.metrics() == {
+        "received_events": 11,
+        "merged_events": 9,
+        "pending_events": 0,
+        "sent_messages": 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_before_window_ends():
+    """Test that a batch reaching the maximum size is sent immediately."""
+    manager = mock_manager()
+    batcher = EventBatcher(manager, window=10, max_batch_size=3)
+
+    for index in range(3):
+        await batcher.add({"event_type": "paper_status", "paper_id": "paper", "index": index})
+
+    manager.broadcast_to_paper.assert_called_once()
+    assert len(manager.broadcast_to_paper.call_args.args[1]["events"]) == 3
+    assert batcher.metrics()["pending_events"] == 0
+
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_events_without_paper_go_to_all_clients():
+    """Test that events without a paper are broadcast to every client."""
+    manager = mock_manager()
+    batcher = EventBatcher(manager, window=0)
+
+    await batcher.broadcast({"event_type": "system_status", "message": "Up"})
+
+    manager.broadcast.assert_called_once_with({"event_type": "system_status", "message": "Up"})
+    manager.broadcast_to_paper.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_close_sends_pending_events():
+    """Test that closing the batcher sends the pending events."""
+    manager = mock_manager()
+    batcher = EventBatcher(manager, window=10)
+
+    await batcher.broadcast_to_paper("paper", {"event_type": "paper_status", "status": "processing"})
+    await batcher.close()
+
+    manager.broadcast_to_paper.assert_called_once_with(
+        "paper", {"event_type": "paper_status", "status": "processing"}
+    )
+
+
+def test_encode_message_json_is_compact():
+    """Test that JSON messages are serialized without whitespace."""
+    assert encode_message({"event_type": "paper_status", "progress": 5}) == \
+        '{"event_type":"paper_status","progress":5}'
+
+
+@pytest.mark.asyncio
+async def test_msgpack_clients_receive_binary_frames():
+    """Test that clients negotiating msgpack receive binary frames."""
+    msgpack = pytest.importorskip("msgpack")
+    connection_manager = ConnectionManager()
+    json_websocket = AsyncMock()
+    msgpack_websocket = AsyncMock()
+    await connection_manager.connect(json_websocket, "paper")
+    await connection_manager.connect(msgpack_websocket, "paper", encoding="msgpack")
+
+    await connection_manager.broadcast_to_paper("paper", progress_event("paper", 50))
+    await asyncio.sleep(0.01)
+
+    # The manager stamps broadcasts with the time they were sent
+    json_message = json.loads(json_websocket.send_text.call_args.args[0])
+    msgpack_message = msgpack.unpackb(msgpack_websocket.send_bytes.call_args.args[0])
+    assert json_message.pop("timestamp") == msgpack_message.pop("timestamp")
+    assert json_message == msgpack_message == progress_event("paper", 50)
+    msgpack_websocket.send_text.assert_not_called()
+
+    await connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_msgpack_falls_back_to_json(monkeypatch):
+    """Test that msgpack clients receive JSON when msgpack is not installed."""
+    monkeypatch.setattr(connection, "MSGPACK_AVAILABLE", False)
+    connection_manager = ConnectionManager()
+    websocket = AsyncMock()
+    await connection_manager.connect(websocket, encoding="msgpack")
+
+    await connection_manager.broadcast({"event_type": "system_status"})
+    await asyncio.sleep(0.01)
+
+    websocket.send_text.assert_called_once()
+    websocket.send_bytes.assert_not_called()
+
+    await connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_encoding():
+    """Test that an unknown encoding is rejected."""
+    with pytest.raises(ValueError):
+        await ConnectionManager().connect(AsyncMock(), encoding="xml")
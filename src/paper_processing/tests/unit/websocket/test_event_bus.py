@@ -0,0 +1,116 @@
+"""
+Unit tests for the event bus.
+
+This module tests publishing events from workers and fanning them out to the
+WebSocket clients of API processes, using fakeredis.
+"""
+
+import pytest
+import json
+from unittest.mock import MagicMock, AsyncMock
+import asyncio
+
+from paper_processing.websocket.connection import ConnectionManager
+from paper_processing.websocket.event_bus import EventPublisher, EventSubscriber, serialize_event
+from paper_processing.websocket.events import EventType, PaperEvent, create_paper_status_event
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_server():
+    """Create a fake Redis server shared by publishers and subscribers."""
+    return fakeredis.FakeServer()
+
+
+def mock_websocket():
+    """Create a mock WebSocket for testing."""
+    websocket = AsyncMock()
+    websocket.send_text = AsyncMock()
+    return websocket
+
+
+async def wait_for(condition, timeout=2.0):
+    """Wait until a condition holds."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "Timed out waiting for event"
+        await asyncio.sleep(0.01)
+
+
+def test_serialize_event():
+    """Test that events are serialized with the paper they relate to."""
+    event = PaperEvent(event_type=EventType.PAPER_ANALYZED, paper_id="paper", message="Analyzed")
+
+    message = json.loads(serialize_event(event))
+
+    assert message["paper_id"] == "paper"
+    assert message["event"]["event_type"] == "paper_analyzed"
+    assert isinstance(message["event"]["timestamp"], str)
+
+
+@pytest.mark.asyncio
+async def test_events_reach_clients_of_every_api_process(redis_server):
+    """Test that a published event reaches the clients of each subscribed process."""
+    # Two API processes, each with its own connection manager and client
+    managers = [ConnectionManager(), ConnectionManager()]
+    websockets = [mock_websocket(), mock_websocket()]
+    other_websocket = mock_websocket()
+    await managers[0].connect(websockets[0], "paper")
+    await managers[1].connect(websockets[1], "paper")
+    await managers[1].connect(other_websocket, "other-paper")
+
+    subscribers = [
+        EventSubscriber(manager, client=fakeredis.aioredis.FakeRedis(server=redis_server))
+        for manager in managers
+    ]
+    for subscriber in subscribers:
+        subscriber.start()
+    try:
+        await asyncio.wait_for(asyncio.gather(*(s.subscribed.wait() for s in subscribers)), 2.0)
+
+        # A worker publishes without an event loop
+        publisher = EventPublisher(client=fakeredis.FakeRedis(server=redis_server))
+        event = create_paper_status_event("paper", "analyzed", "Paper analyzed", 90)
+        assert publisher.publish(event, "paper") == 2
+
+        await wait_for(lambda: all(w.send_text.called for w in websockets))
+    finally:
+        for subscriber in subscribers:
+            await subscriber.stop()
+
+    for websocket in websockets:
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert sent["paper_id"] == "paper"
+        assert sent["data"]["status"] == "analyzed"
+    assert not other_websocket.send_text.called
+
+
+@pytest.mark.asyncio
+async def test_system_events_reach_all_clients(redis_server):
+    """Test that an event without a paper is broadcast to all clients."""
+    manager = ConnectionManager()
+    websocket = mock_websocket()
+    await manager.connect(websocket)
+
+    subscriber = EventSubscriber(manager, client=fakeredis.aioredis.FakeRedis(server=redis_server))
+    subscriber.start()
+    try:
+        await asyncio.wait_for(subscriber.subscribed.wait(), 2.0)
+        publisher = EventPublisher(client=fakeredis.FakeRedis(server=redis_server))
+        publisher.publish(PaperEvent(event_type=EventType.SYSTEM_STATUS, message="Workers restarted"))
+
+        await wait_for(lambda: websocket.send_text.called)
+    finally:
+        await subscriber.stop()
+
+    assert json.loads(websocket.send_text.call_args[0][0])["message"] == "Workers restarted"
+
+
+def test_publish_failure_is_not_raised():
+    """Test that an unavailable Redis server does not fail the publisher."""
+    client = MagicMock()
+    client.publish.side_effect = ConnectionError("unavailable")
+    publisher = EventPublisher(client=client)
+
+    assert publisher.publish({"event_type": "paper_status"}, "paper") == 0
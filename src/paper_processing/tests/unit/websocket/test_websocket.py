@@ -153,6 +153,143 @@ async def test_connection_manager_send_personal_message(connection_manager, mock
     mock_websocket.send_text.assert_called_once()
 
 
+class SlowWebSocket:
+    """WebSocket stand-in whose sends block until released."""
+    
+    def __init__(self):
+        self.sent = []
+        self.release = asyncio.Event()
+        self.close_code = None
+    
+    async def accept(self):
+        pass
+    
+    async def close(self, code=1000):
+        self.close_code = code
+    
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(json.loads(text))
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_stall_broadcast(mock_websocket):
+    """Test that a client that does not read does not delay the others."""
+    connection_manager = ConnectionManager()
+    slow_websocket = SlowWebSocket()
+    await connection_manager.connect(slow_websocket, "paper")
+    await connection_manager.connect(mock_websocket, "paper")
+    
+    for i in range(3):
+        await asyncio.wait_for(
+            connection_manager.broadcast_to_paper("paper", {"event_type": "paper_status", "index": i}),
+            timeout=1.0
+        )
+    
+    assert mock_websocket.send_text.call_count == 3
+    assert connection_manager.metrics()["queued_messages"] == 2
+    
+    slow_websocket.release.set()
+    await asyncio.sleep(0.01)
+    assert [message["index"] for message in slow_websocket.sent] == [0, 1, 2]
+    
+    await connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_progress_events_are_coalesced():
+    """Test that a slow client only receives the latest queued progress per paper."""
+    connection_manager = ConnectionManager()
+    slow_websocket = SlowWebSocket()
+    await connection_manager.connect(slow_websocket)
+    
+    await connection_manager.broadcast({"event_type": "paper_status", "paper_id": "paper", "status": "processing"})
+    for progress in range(10):
+        await connection_manager.broadcast({"event_type": "paper_progress", "paper_id": "paper", "progress": progress})
+    await connection_manager.broadcast({"event_type": "paper_progress", "paper_id": "other", "progress": 50})
+    
+    slow_websocket.release.set()
+    await asyncio.sleep(0.01)
+    
+    # The status event was already being sent; the progress events queued
+    # behind it were reduced to the latest one of each paper
+    assert [(m["paper_id"], m.get("progress")) for m in slow_websocket.sent] == [
+        ("paper", None), ("paper", 9), ("other", 50)
+    ]
+    assert connection_manager.metrics()["coalesced_messages"] == 9
+    
+    await connection_manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow_policy, expected", [
+    ("drop_oldest", [0, 3, 4]),
+    ("drop_newest", [0, 1, 2]),
+])
+async def test_overflow_policies(overflow_policy, expected):
+    """Test that messages are dropped as configured when a client's queue is full."""
+    connection_manager = ConnectionManager(max_queue_size=2, overflow_policy=overflow_policy)
+    slow_websocket = SlowWebSocket()
+    await connection_manager.connect(slow_websocket)
+    
+    for i in range(5):
+        await connection_manager.broadcast({"event_type": "paper_status", "index": i})
+    
+    metrics = connection_manager.metrics()
+    assert metrics["max_queue_depth"] == 2
+    assert metrics["dropped_messages"] == 2
+    
+    slow_websocket.release.set()
+    await asyncio.sleep(0.01)
+    assert [message["index"] for message in slow_websocket.sent] == expected
+    
+    await connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_disconnects_slow_client(mock_websocket):
+    """Test that the disconnect policy drops clients that cannot keep up."""
+    connection_manager = ConnectionManager(max_queue_size=2, overflow_policy="disconnect")
+    slow_websocket = SlowWebSocket()
+    await connection_manager.connect(slow_websocket)
+    await connection_manager.connect(mock_websocket)
+    
+    for i in range(4):
+        await connection_manager.broadcast({"event_type": "paper_status", "index": i})
+    
+    assert slow_websocket not in connection_manager.active_connections
+    assert slow_websocket.close_code == 1013
+    assert mock_websocket in connection_manager.active_connections
+    assert mock_websocket.send_text.call_count == 4
+    assert connection_manager.metrics()["slow_disconnects"] == 1
+    
+    # A disconnected client gets no new queue
+    await connection_manager.send_personal_message(slow_websocket, {"event_type": "system_status"})
+    assert connection_manager.metrics()["connections"] == 1
+    
+    await connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_send_closes_client(mock_websocket):
+    """Test that a client whose send fails is closed and disconnected."""
+    connection_manager = ConnectionManager()
+    await connection_manager.connect(mock_websocket)
+    mock_websocket.send_text.side_effect = RuntimeError("connection reset")
+    
+    await connection_manager.broadcast({"event_type": "system_status"})
+    await asyncio.sleep(0.01)
+    
+    mock_websocket.close.assert_awaited_once_with(code=1011)
+    assert connection_manager.metrics()["connections"] == 0
+
+
+def test_invalid_overflow_policy():
+    """Test that an unknown overflow policy is rejected."""
+    with pytest.raises(ValueError):
+        ConnectionManager(overflow_policy="block")
+
+
 def test_create_system_event():
     """Test creating a system event."""
     message = "Test message"
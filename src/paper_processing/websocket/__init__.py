@@ -8,10 +8,11 @@ implementation (Phase 3.5) as outlined in CODING_PROMPT.md.
 Current Implementation Status:
 - Package structure created ✓
 - Integration points defined ✓
+- Event bus from workers to API processes ✓
+- Event batching and msgpack encoding ✓
 
 Upcoming Development:
 - WebSocket server implementation
-- Status event broadcasting
 - Connection management
 - Client libraries and examples
 """
@@ -0,0 +1,167 @@
+"""
+Event batching for the Paper Processing Pipeline.
+
+This module sits between the creation of events and their broadcast. Rather
+than sending every event as its own message, the events of each paper are
+collected over a short time window and sent as one batch, in which a progress
+or extraction event replaces the earlier pending events of its type. During
+entity extraction on large papers, clients then receive a few compact frames
+per second instead of a flood of messages, and the server serializes each
+batch once.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Union
+
+from .connection import DEFAULT_COALESCED_EVENT_TYPES
+from .events import PaperEvent, create_event_batch
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class EventBatcher:
+    """
+    Batches the events broadcast through a connection manager.
+
+    The batcher offers the broadcast methods of the connection manager, so it
+    can be used wherever the manager is. A paper with a single pending event
+    gets that event as is; several pending events are sent as an event batch.
+    """
+
+    def __init__(
+        self,
+        manager,
+        window: float = 0.1,
+        max_batch_size: int = 100,
+        merged_event_types: Set[str] = DEFAULT_COALESCED_EVENT_TYPES
+    ):
+        """
+        Initialize the event batcher.
+
+        Args:
+            manager: Connection manager broadcasting the batches
+            window: Seconds events are collected for before being sent, or 0
+                to send every event immediately
+            max_batch_size: Number of pending events of a paper at which its
+                batch is sent without waiting for the end of the window
+            merged_event_types: Event types of which only the latest pending
+                event per paper is sent
+        """
+        self.manager = manager
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.merged_event_types = frozenset(merged_event_types)
+
+        self.received_events = 0
+        self.merged_events = 0
+        self.sent_messages = 0
+
+        # Pending events by paper ID, keyed by event type for merged events
+        self._pending: Dict[Optional[str], Dict[Any, Dict[str, Any]]] = {}
+        self._sequence = 0
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def broadcast(self, message: Union[PaperEvent, Dict[str, Any]]):
+        """
+        Batch a message for all connected clients.
+
+        Args:
+            message: The message to broadcast
+        """
+        await self.add(message)
+
+    async def broadcast_to_paper(self, paper_id: str, message: Union[PaperEvent, Dict[str, Any]]):
+        """
+        Batch a message for the clients subscribed to a specific paper.
+
+        Args:
+            paper_id: The paper ID
+            message: The message to broadcast
+        """
+        await self.add(message, paper_id)
+
+    async def add(self, event: Union[PaperEvent, Dict[str, Any]], paper_id: Optional[str] = None):
+        """
+        Add an event to the pending batch of its paper.
+
+        Args:
+            event: The event, as a PaperEvent or an event dict
+            paper_id: ID of the paper the event relates to, if not in the
+                event, or None for an event for all clients
+        """
+        if isinstance(event, PaperEvent):
+            event = event.model_dump(mode="json")
+        paper_id = paper_id or event.get("paper_id")
+        self.received_events += 1
+
+        if self.window <= 0:
+            await self._send(paper_id, [event])
+            return
+
+        events = self._pending.setdefault(paper_id, {})
+        event_type = event.get("event_type")
+        if event_type in self.merged_event_types:
+            # The latest event replaces the pending one and moves to the end
+            if events.pop(event_type, None) is not None:
+                self.merged_events += 1
+            events[event_type] = event
+        else:
+            self._sequence += 1
+            events[self._sequence] = event
+
+        if len(events) >= self.max_batch_size:
+            del self._pending[paper_id]
+            await self._send(paper_id, list(events.values()))
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Send the pending events of every paper now."""
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+        pending, self._pending = self._pending, {}
+        for paper_id, events in pending.items():
+            await self._send(paper_id, list(events.values()))
+
+    async def close(self):
+        """Send the pending events and stop batching."""
+        await self.flush()
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Get the metrics of the batcher.
+
+        Returns:
+            Dict with the events received, merged into later events and
+            waiting to be sent, and the messages sent
+        """
+        return {
+            "received_events": self.received_events,
+            "merged_events": self.merged_events,
+            "pending_events": sum(len(events) for events in self._pending.values()),
+            "sent_messages": self.sent_messages
+        }
+
+    async def _flush_later(self):
+        """Send the pending events at the end of the window."""
+        try:
+            await asyncio.sleep(self.window)
+            await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending event batches: {e}")
+
+    async def _send(self, paper_id: Optional[str], events: List[Dict[str, Any]]):
+        """Broadcast the events of a paper as one message."""
+        message = events[0] if len(events) == 1 else create_event_batch(paper_id, events)
+        self.sent_messages += 1
+
+        if paper_id:
+            await self.manager.broadcast_to_paper(paper_id, message)
+        else:
+            await self.manager.broadcast(message)
@@ -3,19 +3,156 @@ WebSocket connection management for the Paper Processing Pipeline.
 
 This module handles WebSocket connections for real-time paper processing updates.
 It provides connection managers and event handling for the Paper Processing Pipeline.
+
+Each connection has a bounded outbound queue drained by its own writer task,
+so broadcasting serializes a message once and enqueues it without waiting for
+any client. A slow client only falls behind on its own queue: superseded
+progress events are coalesced, and when the queue is full messages are dropped
+or the client disconnected, as configured.
+
+Clients choose the encoding of their messages when connecting: compact JSON
+text frames, or msgpack binary frames if the msgpack package is installed.
+A message is serialized once per encoding in use, whatever the number of
+clients.
 """
 
 import logging
 import json
-from typing import Dict, List, Optional, Any, Set
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple, Union
 import asyncio
 from datetime import datetime
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Policies for a message sent to a client whose outbound queue is full
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT)
+
+# Close codes of connections closed by the server: try again later for clients
+# too slow to keep up, internal error for failed sends
+SLOW_CLIENT_CLOSE_CODE = 1013
+SEND_ERROR_CLOSE_CODE = 1011
+
+# Event types of which a client only needs the latest undelivered one per paper
+DEFAULT_COALESCED_EVENT_TYPES = frozenset({
+    "paper_progress",
+    "paper_entity_extracted",
+    "paper_relationship_extracted"
+})
+
+# Encodings of the messages sent to a client
+JSON = "json"
+MSGPACK = "msgpack"
+ENCODINGS = (JSON, MSGPACK)
+
+
+def encode_message(message: Dict[str, Any], encoding: str = JSON) -> Union[str, bytes]:
+    """
+    Serialize a message for sending.
+    
+    Args:
+        message: The message
+        encoding: json for a compact JSON string, msgpack for msgpack bytes
+        
+    Returns:
+        The serialized message
+    """
+    if encoding == MSGPACK:
+        return msgpack.packb(message, default=str)
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+
+class OutboundQueue:
+    """
+    Bounded queue of the serialized messages waiting to be sent to a client.
+
+    A message with a coalescing key replaces the queued message with the same
+    key, keeping its place in the queue.
+    """
+    
+    def __init__(self, websocket: WebSocket, max_size: int, overflow_policy: str, encoding: str = JSON):
+        """
+        Initialize the outbound queue.
+        
+        Args:
+            websocket: The WebSocket connection the messages are sent to
+            max_size: Maximum number of queued messages
+            overflow_policy: What to do with a message when the queue is full
+            encoding: Encoding of the messages sent to the client
+        """
+        self.websocket = websocket
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.encoding = encoding
+        self.writer: Optional[asyncio.Task] = None
+        
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        
+        self._messages: Deque[List[Any]] = deque()
+        self._keyed: Dict[Tuple[str, Optional[str]], List[Any]] = {}
+        self._ready = asyncio.Event()
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+    
+    def put(self, text: Union[str, bytes], key: Optional[Tuple[str, Optional[str]]] = None) -> bool:
+        """
+        Queue a message without waiting.
+        
+        Args:
+            text: The serialized message
+            key: Coalescing key, or None if the message must not be replaced
+            
+        Returns:
+            False if the queue is full and the client must be disconnected
+        """
+        if key is not None and key in self._keyed:
+            self._keyed[key][1] = text
+            self.coalesced += 1
+            return True
+        
+        if len(self._messages) >= self.max_size:
+            self.dropped += 1
+            if self.overflow_policy == DISCONNECT:
+                return False
+            if self.overflow_policy == DROP_NEWEST:
+                return True
+            oldest_key, _ = self._messages.popleft()
+            if oldest_key is not None:
+                del self._keyed[oldest_key]
+        
+        entry = [key, text]
+        self._messages.append(entry)
+        if key is not None:
+            self._keyed[key] = entry
+        self._ready.set()
+        return True
+    
+    async def get(self) -> Union[str, bytes]:
+        """Wait for and remove the next message."""
+        while not self._messages:
+            self._ready.clear()
+            await self._ready.wait()
+        
+        key, text = self._messages.popleft()
+        if key is not None:
+            del self._keyed[key]
+        return text
+
 
 class ConnectionManager:
     """
@@ -24,25 +161,61 @@ class ConnectionManager:
     Manages active WebSocket connections and handles broadcasting messages.
     """
     
-    def __init__(self):
-        """Initialize the connection manager."""
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        overflow_policy: str = DROP_OLDEST,
+        coalesced_event_types: Set[str] = DEFAULT_COALESCED_EVENT_TYPES
+    ):
+        """
+        Initialize the connection manager.
+        
+        Args:
+            max_queue_size: Maximum number of messages queued for a client
+            overflow_policy: What to do with a message for a client whose
+                queue is full: drop_oldest, drop_newest or disconnect
+            coalesced_event_types: Event types of which only the latest
+                queued event per paper is kept
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy. Must be one of {list(OVERFLOW_POLICIES)}")
+        
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.coalesced_event_types = frozenset(coalesced_event_types)
+        
         # Active connections for general broadcasts
         self.active_connections: List[WebSocket] = []
         
         # Connections by paper ID for targeted updates
         self.paper_connections: Dict[str, Set[WebSocket]] = {}
         
+        # Outbound queues by connection
+        self._queues: Dict[WebSocket, OutboundQueue] = {}
+        
+        # Counters of the queues of disconnected clients
+        self._closed_totals = {"sent": 0, "dropped": 0, "coalesced": 0}
+        self._slow_disconnects = 0
+        
         # Lock for thread-safe operations
         self._lock = asyncio.Lock()
     
-    async def connect(self, websocket: WebSocket, paper_id: Optional[str] = None):
+    async def connect(self, websocket: WebSocket, paper_id: Optional[str] = None, encoding: str = JSON):
         """
         Connect a WebSocket client.
         
         Args:
             websocket: The WebSocket connection
             paper_id: Optional paper ID to subscribe to specific updates
+            encoding: Encoding of the messages sent to the client, json or
+                msgpack. msgpack falls back to json if it is not installed.
         """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Invalid encoding. Must be one of {list(ENCODINGS)}")
+        if encoding == MSGPACK and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack is not installed, sending JSON to the client")
+            encoding = JSON
+        
         # Accept the connection
         await websocket.accept()
         
@@ -56,15 +229,19 @@ class ConnectionManager:
                 if paper_id not in self.paper_connections:
                     self.paper_connections[paper_id] = set()
                 self.paper_connections[paper_id].add(websocket)
+            
+            self._get_queue(websocket).encoding = encoding
         
         logger.info(f"Client connected. Active connections: {len(self.active_connections)}")
     
-    async def disconnect(self, websocket: WebSocket):
+    async def disconnect(self, websocket: WebSocket, code: Optional[int] = None):
         """
         Disconnect a WebSocket client.
         
         Args:
             websocket: The WebSocket connection to disconnect
+            code: Close code to close the connection with, or None if the
+                client has already disconnected
         """
         async with self._lock:
             # Remove from general connections
@@ -78,6 +255,22 @@ class ConnectionManager:
                     # Clean up empty sets
                     if not connections:
                         del self.paper_connections[paper_id]
+            
+            queue = self._queues.pop(websocket, None)
+        
+        if queue is not None:
+            self._closed_totals["sent"] += queue.sent
+            self._closed_totals["dropped"] += queue.dropped
+            self._closed_totals["coalesced"] += queue.coalesced
+            # A writer disconnecting its own client just returns
+            if queue.writer is not None and queue.writer is not asyncio.current_task():
+                queue.writer.cancel()
+        
+        if code is not None:
+            try:
+                await websocket.close(code=code)
+            except Exception as e:
+                logger.debug(f"Error closing client connection: {e}")
         
         logger.info(f"Client disconnected. Active connections: {len(self.active_connections)}")
     
@@ -117,6 +310,8 @@ class ConnectionManager:
         """
         Broadcast a message to all connected clients.
         
+        The message is queued for each client without waiting for it to be sent.
+        
         Args:
             message: The message to broadcast
         """
@@ -127,26 +322,14 @@ class ConnectionManager:
         if "timestamp" not in message:
             message["timestamp"] = datetime.utcnow().isoformat()
             
-        # Convert to JSON
-        message_json = json.dumps(message)
-        
-        # Send to all active connections
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error sending message to client: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected clients
-        for connection in disconnected:
-            await self.disconnect(connection)
+        await self._enqueue(list(self.active_connections), message)
     
     async def broadcast_to_paper(self, paper_id: str, message: Dict[str, Any]):
         """
         Broadcast a message to clients subscribed to a specific paper.
         
+        The message is queued for each client without waiting for it to be sent.
+        
         Args:
             paper_id: The paper ID
             message: The message to broadcast
@@ -160,26 +343,15 @@ class ConnectionManager:
         if "timestamp" not in message:
             message["timestamp"] = datetime.utcnow().isoformat()
             
-        # Convert to JSON
-        message_json = json.dumps(message)
-        
-        # Send to subscribed connections
-        disconnected = []
-        for connection in self.paper_connections.get(paper_id, set()):
-            try:
-                await connection.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error sending message to client: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected clients
-        for connection in disconnected:
-            await self.disconnect(connection)
+        await self._enqueue(list(self.paper_connections[paper_id]), message)
     
     async def send_personal_message(self, websocket: WebSocket, message: Dict[str, Any]):
         """
         Send a message to a specific WebSocket client.
         
+        The message goes through the client's queue, so it is delivered in
+        order with the broadcasts.
+        
         Args:
             websocket: The WebSocket connection to send the message to
             message: The message to send
@@ -188,16 +360,85 @@ class ConnectionManager:
         if "timestamp" not in message:
             message["timestamp"] = datetime.utcnow().isoformat()
             
-        # Convert to JSON
-        message_json = json.dumps(message)
+        await self._enqueue([websocket], message, coalesce=False)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the metrics of the outbound queues.
+        
+        Returns:
+            Dict with the number of connections, the queued messages in total
+            and for the fullest queue, and the messages sent, dropped and
+            coalesced since the manager was created
+        """
+        queues = list(self._queues.values())
+        return {
+            "connections": len(queues),
+            "queued_messages": sum(len(queue) for queue in queues),
+            "max_queue_depth": max((len(queue) for queue in queues), default=0),
+            "sent_messages": self._closed_totals["sent"] + sum(queue.sent for queue in queues),
+            "dropped_messages": self._closed_totals["dropped"] + sum(queue.dropped for queue in queues),
+            "coalesced_messages": self._closed_totals["coalesced"] + sum(queue.coalesced for queue in queues),
+            "slow_disconnects": self._slow_disconnects
+        }
+    
+    async def close(self):
+        """Disconnect all clients and stop their writer tasks."""
+        for websocket in list(self._queues):
+            await self.disconnect(websocket)
+    
+    def _get_queue(self, websocket: WebSocket) -> OutboundQueue:
+        """Return the outbound queue of a connecting client, starting its writer on first use."""
+        queue = self._queues.get(websocket)
+        if queue is None:
+            queue = OutboundQueue(websocket, self.max_queue_size, self.overflow_policy)
+            queue.writer = asyncio.create_task(self._write(queue))
+            self._queues[websocket] = queue
+        return queue
+    
+    async def _enqueue(self, connections: List[WebSocket], message: Dict[str, Any], coalesce: bool = True):
+        """Serialize a message once per encoding and queue it for each connection."""
+        encoded: Dict[str, Union[str, bytes]] = {}
+        
+        key = None
+        if coalesce and message.get("event_type") in self.coalesced_event_types:
+            key = (message["event_type"], message.get("paper_id"))
         
-        # Send to the specific client
+        overflowing = []
+        for connection in connections:
+            # Disconnected clients get no new queue
+            queue = self._queues.get(connection)
+            if queue is None:
+                continue
+            if queue.encoding not in encoded:
+                encoded[queue.encoding] = encode_message(message, queue.encoding)
+            if not queue.put(encoded[queue.encoding], key):
+                overflowing.append(connection)
+        
+        # Let the writers pick up the new messages
+        await asyncio.sleep(0)
+        
+        # Clean up clients too slow to keep up
+        for connection in overflowing:
+            logger.warning("Disconnecting client whose outbound queue is full")
+            self._slow_disconnects += 1
+            await self.disconnect(connection, SLOW_CLIENT_CLOSE_CODE)
+    
+    async def _write(self, queue: OutboundQueue):
+        """Send the messages of a queue to its client until it disconnects."""
         try:
-            await websocket.send_text(message_json)
+            while True:
+                message = await queue.get()
+                if isinstance(message, bytes):
+                    await queue.websocket.send_bytes(message)
+                else:
+                    await queue.websocket.send_text(message)
+                queue.sent += 1
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error sending personal message to client: {e}")
-            # Disconnect client if an error occurs
-            await self.disconnect(websocket)
+            logger.error(f"Error sending message to client: {e}")
+            await self.disconnect(queue.websocket, SEND_ERROR_CLOSE_CODE)
 
 
 # Global connection manager instance
@@ -0,0 +1,205 @@
+"""
+Event bus for the Paper Processing Pipeline.
+
+This module carries WebSocket events from the Celery workers, which have no
+WebSocket connections, to the API processes, which do. Workers publish events
+to a Redis pub/sub channel with a single non-blocking PUBLISH. Each API process
+runs one subscriber that forwards the events to its local connection manager,
+so every client receives the events of the papers it follows whichever API
+worker it is connected to.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Union
+
+from .events import PaperEvent
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Channel the events are published on
+DEFAULT_CHANNEL = "paper_processing:events"
+
+
+def serialize_event(event: Union[PaperEvent, Dict[str, Any]], paper_id: Optional[str] = None) -> str:
+    """
+    Serialize an event for the bus.
+
+    Args:
+        event: The event, as a PaperEvent or an event dict
+        paper_id: ID of the paper the event relates to, if not in the event
+
+    Returns:
+        JSON message with the paper ID and the event
+    """
+    if isinstance(event, PaperEvent):
+        event = event.model_dump(mode="json")
+    return json.dumps({"paper_id": paper_id or event.get("paper_id"), "event": event}, default=str)
+
+
+class EventPublisher:
+    """
+    Synchronous event publisher, used by the Celery tasks.
+
+    Publishing is best effort: an unavailable Redis server is logged and the
+    event dropped rather than failing the task.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, channel: str = DEFAULT_CHANNEL, client=None):
+        """
+        Initialize the event publisher.
+
+        Args:
+            redis_url: URL of the Redis server
+            channel: Channel to publish on
+            client: Existing Redis client to use instead of connecting to redis_url
+        """
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(redis_url)
+
+        self.client = client
+        self.channel = channel
+
+    def publish(self, event: Union[PaperEvent, Dict[str, Any]], paper_id: Optional[str] = None) -> int:
+        """
+        Publish an event.
+
+        Args:
+            event: The event, as a PaperEvent or an event dict
+            paper_id: ID of the paper the event relates to, or None for an
+                event for all clients
+
+        Returns:
+            Number of API processes that received the event
+        """
+        try:
+            return self.client.publish(self.channel, serialize_event(event, paper_id))
+        except Exception as e:
+            logger.warning(f"Could not publish event for paper {paper_id}: {e}")
+            return 0
+
+
+class EventSubscriber:
+    """
+    Asynchronous event subscriber, run once in each API process.
+
+    Received events are broadcast to the clients following their paper, or
+    to all clients if they relate to no paper. The subscription is restored
+    if the connection to Redis is lost.
+    """
+
+    def __init__(self, manager, redis_url: Optional[str] = None, channel: str = DEFAULT_CHANNEL,
+                 client=None, reconnect_delay: float = 1.0):
+        """
+        Initialize the event subscriber.
+
+        Args:
+            manager: Connection manager of this process
+            redis_url: URL of the Redis server
+            channel: Channel to subscribe to
+            client: Existing asyncio Redis client to use instead of connecting to redis_url
+            reconnect_delay: Seconds to wait before subscribing again after an error
+        """
+        if client is None:
+            import redis.asyncio
+
+            client = redis.asyncio.Redis.from_url(redis_url)
+
+        self.manager = manager
+        self.client = client
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.subscribed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start receiving events in a background task of the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop receiving events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.subscribed.clear()
+
+    async def _run(self) -> None:
+        """Receive events until stopped, subscribing again after errors."""
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self.subscribed.set()
+                logger.info(f"Subscribed to events on {self.channel}")
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self.dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event subscription to {self.channel} failed: {e}")
+            finally:
+                self.subscribed.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def dispatch(self, data: Union[bytes, str]) -> None:
+        """
+        Broadcast a received event to the local clients.
+
+        Args:
+            data: Message published by an EventPublisher
+        """
+        try:
+            message = json.loads(data)
+            event = message["event"]
+            paper_id = message.get("paper_id")
+
+            if paper_id:
+                await self.manager.broadcast_to_paper(paper_id, event)
+            else:
+                await self.manager.broadcast(event)
+        except Exception as e:
+            logger.error(f"Error dispatching event: {e}")
+
+
+# Publisher shared by the tasks of this process, created on first use
+_event_publisher: Optional[EventPublisher] = None
+_event_publisher_pid: Optional[int] = None
+
+
+def get_event_publisher() -> Optional[EventPublisher]:
+    """
+    Get the event publisher configured in the settings.
+
+    Returns:
+        The event publisher of this process, or None if the event bus is disabled
+    """
+    global _event_publisher, _event_publisher_pid
+
+    if _event_publisher_pid != os.getpid():
+        from ..config.settings import settings
+
+        event_bus_settings = settings.event_bus
+        _event_publisher = EventPublisher(
+            event_bus_settings.redis_url,
+            event_bus_settings.channel
+        ) if event_bus_settings.enabled else None
+        _event_publisher_pid = os.getpid()
+
+    return _event_publisher
@@ -45,6 +45,9 @@ class EventType(str, Enum):
     SYSTEM_STATUS = "system_status"
     SYSTEM_ERROR = "system_error"
     SYSTEM_METRICS = "system_metrics"
+    
+    # Events of a paper sent together
+    EVENT_BATCH = "event_batch"
 
 
 class PaperEvent(BaseModel):
@@ -370,6 +373,33 @@ def create_paper_status_event(
     }
 
 
+def create_event_batch(
+    paper_id: Optional[str],
+    events: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Create a batch of the events of a paper.
+    
+    The paper ID is left out of the batched events, as it is the batch's.
+    
+    Args:
+        paper_id: ID of the paper, or None for events for all clients
+        events: Event dicts, in the order they occurred
+        
+    Returns:
+        Event batch dict
+    """
+    return {
+        "event_type": EventType.EVENT_BATCH.value,
+        "paper_id": paper_id,
+        "timestamp": datetime.utcnow().isoformat(),
+        "events": [
+            {key: value for key, value in event.items() if key != "paper_id"}
+            for event in events
+        ]
+    }
+
+
 def create_error_event(
     message: str,
     error_type: str,
@@ -414,7 +414,7 @@ class KnowledgeGraphAdapter(BaseAdapter):
             return []
         
         try:
-            results = self.kg_manager.search_entities(search_text, limit)
+            results = self.kg_manager.search_entities(search_text, limit=limit)
             return results
         except Exception as e:
             logger.error(f"Error searching entities in knowledge graph: {e}")
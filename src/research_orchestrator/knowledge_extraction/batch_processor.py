@@ -0,0 +1,376 @@
+"""
+Batch Processor module for the Knowledge Extraction Pipeline.
+
+This module runs knowledge extraction over many documents on a pool of worker
+processes. Each worker builds its extraction components once, documents are
+submitted through a bounded in-flight queue, and every result is appended to an
+NDJSON file as soon as it completes. The output file doubles as a checkpoint:
+a resumed run skips documents whose content hash already has a result.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+import glob
+import hashlib
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+from research_orchestrator.knowledge_extraction.knowledge_extractor import KnowledgeExtractor
+
+logger = logging.getLogger(__name__)
+
+# Extractor used by the tasks of a worker process, created by _init_worker
+_worker_extractor: Optional[KnowledgeExtractor] = None
+
+
+class DocumentTimeoutError(Exception):
+    """Exception raised when a document takes longer than the per-document timeout."""
+    pass
+
+
+@dataclass
+class BatchProgress:
+    """Progress of a batch run, reported to the progress callback."""
+
+    total: int
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        """Number of documents accounted for, whatever the outcome."""
+        return self.processed + self.failed + self.skipped
+
+    @property
+    def documents_per_second(self) -> float:
+        """Throughput of extracted documents, successful or not."""
+        return (self.processed + self.failed) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the progress to a dictionary."""
+        return {
+            "total": self.total,
+            "processed": self.processed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed": self.elapsed,
+            "documents_per_second": self.documents_per_second
+        }
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hash of a file's content.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read at a time
+
+    Returns:
+        Hex digest of the content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _init_worker(document_processor, entity_recognizer, relationship_extractor):
+    """Create the extractor used by the tasks of a worker process."""
+    global _worker_extractor
+    _worker_extractor = KnowledgeExtractor(
+        document_processor=document_processor,
+        entity_recognizer=entity_recognizer,
+        relationship_extractor=relationship_extractor
+    )
+
+
+@contextmanager
+def _deadline(seconds: Optional[float]):
+    """
+    Raise DocumentTimeoutError in the block if it runs longer than ``seconds``.
+
+    Uses SIGALRM, so it only applies on platforms that have it and in the main
+    thread, which is where pool workers run their tasks.
+    """
+    if not seconds or not hasattr(signal, "setitimer") or \
+       threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise DocumentTimeoutError(f"Document processing exceeded {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _process_document(path: str, content_hash: str, timeout: Optional[float],
+                      options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract knowledge from one document with the worker's extractor.
+
+    Args:
+        path: Path to the document
+        content_hash: Hash of the document's content
+        timeout: Maximum processing time in seconds, or None
+        options: Keyword arguments for extract_document_record
+
+    Returns:
+        The document's NDJSON record; failures are recorded under "error"
+    """
+    start_time = time.time()
+    record = {"document_path": path, "content_hash": content_hash}
+
+    try:
+        with _deadline(timeout):
+            record.update(_worker_extractor.extract_document_record(path, **options))
+    except Exception as e:
+        record["error"] = str(e)
+        record["error_type"] = type(e).__name__
+
+    record["processing_time"] = time.time() - start_time
+    return record
+
+
+class BatchProcessor:
+    """
+    Parallel, streaming batch processor for knowledge extraction.
+
+    Documents are extracted on a process pool whose workers are initialised
+    once with the components of a KnowledgeExtractor. Results are written to
+    an NDJSON file, one record per document, in completion order.
+    """
+
+    def __init__(self,
+                 extractor: KnowledgeExtractor,
+                 workers: Optional[int] = None,
+                 max_in_flight: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 progress_callback: Optional[Callable[[BatchProgress], None]] = None):
+        """
+        Initialize the batch processor.
+
+        Args:
+            extractor: Knowledge extractor whose components the workers use;
+                they must be picklable unless ``workers`` is 1
+            workers: Number of worker processes (defaults to the CPU count);
+                1 processes documents in the calling process
+            max_in_flight: Maximum number of documents submitted but not yet
+                written (defaults to twice the number of workers)
+            timeout: Maximum processing time per document in seconds; a
+                document that runs over is recorded as failed. Enforced with
+                SIGALRM, so it is not applied where that is unavailable
+            progress_callback: Called with a BatchProgress after each document
+        """
+        self.extractor = extractor
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_in_flight = max(1, max_in_flight or 2 * self.workers)
+        self.timeout = timeout
+        self.progress_callback = progress_callback
+
+    def process_directory(self, input_dir: str, output_path: str,
+                          file_pattern: str = "*",
+                          resume: bool = True,
+                          **kwargs) -> Dict[str, Any]:
+        """
+        Process the documents in a directory.
+
+        Args:
+            input_dir: Input directory containing documents
+            output_path: Path of the NDJSON results file
+            file_pattern: File pattern to match documents
+            resume: Whether to skip documents already in the results file;
+                if False, the file is overwritten
+            **kwargs: Additional arguments to pass to the extractors
+
+        Returns:
+            Summary of the run
+        """
+        paths = sorted(
+            path for path in glob.glob(os.path.join(input_dir, file_pattern))
+            if os.path.isfile(path)
+        )
+        return self.process_files(paths, output_path, resume=resume, **kwargs)
+
+    def process_files(self, paths: List[str], output_path: str,
+                      resume: bool = True,
+                      **kwargs) -> Dict[str, Any]:
+        """
+        Process a list of documents.
+
+        Args:
+            paths: Paths of the documents
+            output_path: Path of the NDJSON results file
+            resume: Whether to skip documents already in the results file;
+                if False, the file is overwritten
+            **kwargs: Additional arguments to pass to the extractors
+
+        Returns:
+            Summary of the run
+        """
+        done_hashes = self._load_checkpoint(output_path) if resume else set()
+        progress = BatchProgress(total=len(paths))
+        start_time = time.time()
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        with open(output_path, 'a' if resume else 'w', encoding='utf-8') as output:
+            tasks = self._tasks(paths, done_hashes, progress, output, kwargs)
+            for record in self._run(tasks):
+                self._write_record(output, record)
+                if "error" in record:
+                    progress.failed += 1
+                    logger.error(f"Error processing document {record['document_path']}: {record['error']}")
+                else:
+                    progress.processed += 1
+
+                progress.elapsed = time.time() - start_time
+                if self.progress_callback:
+                    self.progress_callback(progress)
+
+        progress.elapsed = time.time() - start_time
+        logger.info(
+            f"Processed {progress.processed} documents ({progress.failed} failed, "
+            f"{progress.skipped} skipped) in {progress.elapsed:.1f}s, "
+            f"{progress.documents_per_second:.2f} documents/s"
+        )
+
+        summary = progress.to_dict()
+        summary["output_path"] = output_path
+        return summary
+
+    def _tasks(self, paths: List[str], done_hashes: Set[str], progress: BatchProgress,
+               output, options: Dict[str, Any]) -> Iterator[Tuple[str, str, Optional[float], Dict[str, Any]]]:
+        """
+        Generate the arguments of _process_document for the documents to extract.
+
+        Documents whose content was already processed, in an earlier run or
+        earlier in this one, are counted as skipped. Unreadable documents are
+        recorded as failed without being submitted.
+        """
+        for path in paths:
+            try:
+                content_hash = hash_file(path)
+            except OSError as e:
+                self._write_record(output, {
+                    "document_path": path,
+                    "content_hash": None,
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                })
+                progress.failed += 1
+                logger.error(f"Error reading document {path}: {e}")
+                continue
+
+            if content_hash in done_hashes:
+                progress.skipped += 1
+                continue
+            done_hashes.add(content_hash)
+
+            yield path, content_hash, self.timeout, options
+
+    def _run(self, tasks: Iterable[Tuple[str, str, Optional[float], Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Process tasks and yield their records as they complete.
+
+        At most ``max_in_flight`` tasks are submitted to the pool at a time,
+        so neither pending work nor finished results pile up in memory.
+        """
+        components = (
+            self.extractor.document_processor,
+            self.extractor.entity_recognizer,
+            self.extractor.relationship_extractor
+        )
+
+        if self.workers == 1:
+            _init_worker(*components)
+            for task in tasks:
+                yield _process_document(*task)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=components) as executor:
+            pending: Dict[Future, Tuple[str, str]] = {}
+
+            for task in tasks:
+                if len(pending) >= self.max_in_flight:
+                    yield from self._collect(pending)
+                pending[executor.submit(_process_document, *task)] = task[:2]
+
+            while pending:
+                yield from self._collect(pending)
+
+    def _collect(self, pending: Dict[Future, Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+        """Wait for at least one pending task and yield the records of those done."""
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            path, content_hash = pending.pop(future)
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker died or the task could not be sent to it
+                yield {
+                    "document_path": path,
+                    "content_hash": content_hash,
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                }
+
+    def _write_record(self, output, record: Dict[str, Any]):
+        """Append a record to the results file and flush it."""
+        output.write(json.dumps(record, default=str) + "\n")
+        output.flush()
+
+    def _load_checkpoint(self, output_path: str) -> Set[str]:
+        """
+        Read the content hashes of the documents processed by earlier runs.
+
+        A record cut short by an interrupted run is truncated from the file so
+        that new records start on a fresh line. Failed documents are retried.
+
+        Args:
+            output_path: Path of the NDJSON results file
+
+        Returns:
+            Content hashes of the successfully processed documents
+        """
+        hashes = set()
+        if not os.path.exists(output_path):
+            return hashes
+
+        complete_size = 0
+        with open(output_path, 'rb+') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                complete_size += len(line)
+
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping malformed record in {output_path}")
+                    continue
+                if "error" not in record and record.get("content_hash"):
+                    hashes.add(record["content_hash"])
+
+            f.truncate(complete_size)
+
+        logger.info(f"Resuming from {output_path}: {len(hashes)} documents already processed")
+        return hashes
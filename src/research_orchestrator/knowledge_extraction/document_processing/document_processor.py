@@ -6,9 +6,14 @@ processing of different document types and manages the pipeline for
 document segmentation and preparation.
 """
 
+import asyncio
+import json
 import logging
 import mimetypes
-from typing import Dict, List, Any, Optional, Union, BinaryIO, TextIO
+import mmap
+import queue
+import threading
+from typing import Dict, List, Any, Optional, Union, BinaryIO, TextIO, Iterator, Iterable
 import os
 import sys
 from datetime import datetime
@@ -17,6 +22,39 @@ import unittest.mock  # For detecting mocked methods in tests
 
 logger = logging.getLogger(__name__)
 
+# URL fetching runs on one event loop per process, in a background thread, and
+# processors with the same ``url`` configuration share a fetcher and its
+# connection pool
+_fetch_loop: Optional[asyncio.AbstractEventLoop] = None
+_fetch_pid: Optional[int] = None
+_url_fetchers: Dict[str, Any] = {}
+_fetch_lock = threading.Lock()
+
+
+def _get_fetch_loop() -> asyncio.AbstractEventLoop:
+    """Return the process's event loop running URL fetches, starting it if needed."""
+    global _fetch_loop, _fetch_pid
+    with _fetch_lock:
+        # A loop started before a fork does not run in the child process
+        if _fetch_loop is None or _fetch_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="document-url-fetcher", daemon=True).start()
+            _fetch_loop = loop
+            _fetch_pid = os.getpid()
+            _url_fetchers.clear()
+        return _fetch_loop
+
+
+def _get_url_fetcher(config: Dict[str, Any]):
+    """Return the process's URL fetcher for a ``url`` configuration, creating it on first use."""
+    _get_fetch_loop()
+    key = json.dumps(config, sort_keys=True, default=str)
+    with _fetch_lock:
+        if key not in _url_fetchers:
+            from .url_fetcher import AsyncURLFetcher
+            _url_fetchers[key] = AsyncURLFetcher(**config)
+        return _url_fetchers[key]
+
 
 class Document:
     """
@@ -131,6 +169,89 @@ class Document:
         )
 
 
+class LazyDocument(Document):
+    """
+    Processed document whose segments are produced on demand.
+    
+    Segments come from a generator, so consumers iterating over
+    ``iter_segments()`` can start on the first segments before the rest of the
+    document is processed. Segments are kept as they are produced, and
+    accessing ``content``, ``segments`` or ``to_dict()`` produces the remaining
+    ones.
+    """
+    
+    def __init__(
+        self,
+        segments: Iterator[Dict[str, Any]],
+        document_type: str = "text",
+        metadata: Optional[Dict[str, Any]] = None,
+        path: Optional[str] = None,
+        content: Optional[str] = None
+    ):
+        """
+        Initialize a LazyDocument object.
+        
+        Args:
+            segments: Iterator producing the document segments
+            document_type: Type of document (text, pdf, html, etc.)
+            metadata: Additional metadata about the document
+            path: Path to the source file, if applicable
+            content: The document's text content; if None, it is the content
+                of the segments joined by blank lines
+        """
+        self._segment_iterator = iter(segments)
+        self._produced_segments = []
+        super().__init__(content=content, document_type=document_type, metadata=metadata, path=path)
+    
+    @property
+    def content(self) -> str:
+        """The document's text content, producing every segment if needed."""
+        if self._content is None:
+            self._content = "\n\n".join(segment.get("content", "") for segment in self.segments)
+        return self._content
+    
+    @content.setter
+    def content(self, value: Optional[str]):
+        self._content = value
+    
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        """The document segments, producing the remaining ones if needed."""
+        for _ in self.iter_segments():
+            pass
+        return self._produced_segments
+    
+    @segments.setter
+    def segments(self, value: List[Dict[str, Any]]):
+        # Document.__init__ assigns an empty list; segments come from the iterator
+        self._produced_segments = list(value)
+    
+    @property
+    def is_complete(self) -> bool:
+        """Whether every segment has been produced."""
+        return self._segment_iterator is None
+    
+    def iter_segments(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the document segments, producing them as needed.
+        
+        Yields:
+            Document segments in order
+        """
+        i = 0
+        while True:
+            if i < len(self._produced_segments):
+                yield self._produced_segments[i]
+                i += 1
+            elif self._segment_iterator is None:
+                return
+            else:
+                try:
+                    self._produced_segments.append(next(self._segment_iterator))
+                except StopIteration:
+                    self._segment_iterator = None
+
+
 class DocumentProcessor:
     """
     Main document processing coordinator that handles different document types.
@@ -158,6 +279,7 @@ class DocumentProcessor:
         self._pdf_processor = None
         self._html_processor = None
         self._text_processor = None
+
     
     def process_document(self, document) -> Union[Dict[str, Any], 'Document']:
         """
@@ -224,20 +346,18 @@ class DocumentProcessor:
                 if content is None:
                     raise TypeError("Missing required 'content' field in document dictionary")
                 
-                # If content is bytes and not a string, try to decode it
-                if isinstance(content, bytes):
+                # If content is bytes of a text document, try to decode it
+                content_type = document.get('content_type')
+                if isinstance(content, bytes) and not (content_type and 'pdf' in content_type):
                     try:
                         content = content.decode('utf-8')
                     except UnicodeDecodeError:
                         content = content.decode('latin-1', errors='replace')
                 
-                # Ensure content is a string
-                if not isinstance(content, str) and not isinstance(content, bytes):
+                # Ensure content is a string, or a memory-mapped file from _read_file
+                if not isinstance(content, (str, bytes, mmap.mmap)):
                     raise TypeError(f"Document content must be string or bytes, got {type(content)}")
                 
-                # If content_type is provided, use it
-                content_type = document.get('content_type')
-                
                 # Create a result dictionary
                 result = {
                     'id': doc_id,
@@ -279,8 +399,9 @@ class DocumentProcessor:
                     result['processed'] = False
                     result['error'] = str(e)
                     # Return minimal content for failed processing to avoid downstream errors
+                    text = content if isinstance(content, str) else ''
                     processed = {
-                        'extracted_text': content[:100] + '...' if len(content) > 100 else content,
+                        'extracted_text': text[:100] + '...' if len(text) > 100 else text,
                         'segments': [],
                         'metadata': {'error': str(e)}
                     }
@@ -496,12 +617,20 @@ class DocumentProcessor:
         document_data = self._read_file(file_path)
         
         # Process the document
-        return self.process_document(document_data)
+        try:
+            return self.process_document(document_data)
+        finally:
+            if isinstance(document_data.get('content'), mmap.mmap):
+                document_data['content'].close()
     
     def process_url(self, url: str, timeout: int = 30, max_size: int = 10*1024*1024) -> Dict[str, Any]:
         """
         Process a document from a URL.
         
+        The document is fetched over the process's pooled HTTP connections,
+        revalidated against the response cache if one is configured, and
+        processed from memory.
+        
         Args:
             url: The URL of the document to process
             timeout: Timeout in seconds for the HTTP request (default: 30)
@@ -509,15 +638,66 @@ class DocumentProcessor:
             
         Returns:
             Processed document dictionary
-            
-        Raises:
-            requests.RequestException: For HTTP request errors
-            ValueError: For invalid URLs or content too large
-            IOError: For errors writing temporary files
         """
         logger.info(f"Processing document from URL: {url}")
         
-        # Create a basic result structure that we'll populate
+        fetch_result = self._run_fetch(self._get_url_fetcher().fetch(url, timeout, max_size))
+        return self.process_fetch_result(fetch_result)
+    
+    def process_urls(self, urls: Iterable[str], timeout: Optional[float] = None,
+                     max_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Process documents from many URLs, yielding results as they complete.
+        
+        URLs are fetched concurrently in the background, within the connection
+        limits of the ``url`` configuration, while the documents already
+        fetched are processed.
+        
+        Args:
+            urls: The URLs of the documents to process
+            timeout: Timeout in seconds for each HTTP request
+            max_size: Maximum content size in bytes to process
+            
+        Yields:
+            Processed document dictionaries, in completion order
+        """
+        urls = list(urls)
+        logger.info(f"Processing {len(urls)} documents from URLs")
+        
+        fetched = queue.Queue()
+        done = object()
+        fetcher = self._get_url_fetcher()
+        
+        async def fetch_all():
+            try:
+                async for fetch_result in fetcher.fetch_all(urls, timeout, max_size):
+                    fetched.put(fetch_result)
+            finally:
+                fetched.put(done)
+        
+        future = asyncio.run_coroutine_threadsafe(fetch_all(), self._get_fetch_loop())
+        try:
+            while True:
+                fetch_result = fetched.get()
+                if fetch_result is done:
+                    break
+                yield self.process_fetch_result(fetch_result)
+            future.result()
+        finally:
+            # Stop fetching if the caller stops consuming results
+            future.cancel()
+    
+    def process_fetch_result(self, fetch_result) -> Dict[str, Any]:
+        """
+        Process a document fetched by an AsyncURLFetcher.
+        
+        Args:
+            fetch_result: FetchResult of the document's URL
+            
+        Returns:
+            Processed document dictionary
+        """
+        url = fetch_result.url
         result = {
             'url': url,
             'processed': False,
@@ -525,162 +705,51 @@ class DocumentProcessor:
             'metadata': {'url': url}
         }
         
-        temp_path = None
-        
-        try:
-            # Validate URL format
-            if not url.startswith(('http://', 'https://')):
-                raise ValueError(f"Invalid URL format: {url}")
-            
-            # Import requests here to avoid dependency issues in testing
-            import requests
-            from requests.exceptions import RequestException, Timeout, ConnectionError
-            
-            try:
-                # Fetch the content with a timeout
-                response = requests.get(
-                    url, 
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    },
-                    timeout=timeout,
-                    stream=True  # Use streaming to check size before downloading entirely
-                )
-                
-                # Check response status
-                response.raise_for_status()
-                
-                # Check content size from headers to avoid downloading huge files
-                content_length = response.headers.get('Content-Length')
-                if content_length and int(content_length) > max_size:
-                    raise ValueError(f"Content too large: {int(content_length) // (1024*1024)}MB exceeds {max_size // (1024*1024)}MB limit")
-                
-                # Get small amount of content to determine type
-                chunk = next(response.iter_content(8192), b'')
-                
-                # Determine content type from headers or content inspection
-                content_type = response.headers.get('Content-Type', '').lower()
-                if not content_type:
-                    # Try to guess from content if header is missing
-                    if chunk.startswith(b'%PDF'):
-                        content_type = 'application/pdf'
-                    elif chunk.startswith(b'<!DOCTYPE html') or chunk.startswith(b'<html'):
-                        content_type = 'text/html'
-                    else:
-                        content_type = 'text/plain'
-                
-                # Create a temporary file
-                suffix = '.pdf' if 'pdf' in content_type else '.html' if 'html' in content_type else '.txt'
-                mode = 'wb' if 'pdf' in content_type or 'application/' in content_type else 'w'
-                
-                logger.info(f"Downloading {url} as {content_type}")
-                
-                # Download content to temporary file with size limit check
-                total_size = 0
-                with tempfile.NamedTemporaryFile(mode=mode, suffix=suffix, delete=False) as temp_file:
-                    temp_path = temp_file.name
-                    
-                    # Write the first chunk we already read
-                    if mode == 'wb':
-                        temp_file.write(chunk)
-                    else:
-                        # Try to decode to text
-                        try:
-                            text_chunk = chunk.decode('utf-8')
-                        except UnicodeDecodeError:
-                            text_chunk = chunk.decode('latin-1', errors='replace')
-                        temp_file.write(text_chunk)
-                    
-                    total_size += len(chunk)
-                    
-                    # Continue downloading the rest
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if not chunk:
-                            continue
-                        
-                        # Check size limit
-                        total_size += len(chunk)
-                        if total_size > max_size:
-                            raise ValueError(f"Content download exceeded size limit of {max_size // (1024*1024)}MB")
-                        
-                        # Write chunk to file
-                        if mode == 'wb':
-                            temp_file.write(chunk)
-                        else:
-                            # Try to decode to text
-                            try:
-                                text_chunk = chunk.decode('utf-8')
-                            except UnicodeDecodeError:
-                                text_chunk = chunk.decode('latin-1', errors='replace')
-                            temp_file.write(text_chunk)
-                
-                # Update metadata
-                result['metadata'].update({
-                    "content_type": content_type,
-                    "content_length": total_size,
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers)
-                })
-                
-                # Process the temporary file
-                processed_result = self.process_file(temp_path)
-                
-                # Merge results
-                result.update(processed_result)
-                result['processed'] = True
-                
-                return result
-                
-            except Timeout as e:
-                logger.error(f"Timeout error fetching {url}: {str(e)}")
-                result.update({
-                    'error': f"Request timed out after {timeout} seconds",
-                    'error_type': 'Timeout',
-                    'extracted_text': '',
-                    'segments': []
-                })
-                
-            except ConnectionError as e:
-                logger.error(f"Connection error fetching {url}: {str(e)}")
-                result.update({
-                    'error': f"Connection error: {str(e)}",
-                    'error_type': 'ConnectionError',
-                    'extracted_text': '',
-                    'segments': []
-                })
-                
-            except RequestException as e:
-                logger.error(f"Request error fetching {url}: {str(e)}")
-                result.update({
-                    'error': f"HTTP request error: {str(e)}",
-                    'error_type': 'RequestException',
-                    'extracted_text': '',
-                    'segments': [],
-                    'metadata': {
-                        'url': url,
-                        'status_code': getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
-                    }
-                })
-                
-        except Exception as e:
-            logger.error(f"Error processing URL {url}: {str(e)}", exc_info=True)
+        if not fetch_result.ok:
             result.update({
-                'error': str(e),
-                'error_type': type(e).__name__,
+                'error': fetch_result.error,
+                'error_type': fetch_result.error_type,
                 'extracted_text': '',
                 'segments': []
             })
-            
-        finally:
-            # Clean up the temporary file
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except Exception as e:
-                    logger.warning(f"Error removing temporary file {temp_path}: {str(e)}")
+            result['metadata']['status_code'] = fetch_result.status_code
+            return result
+        
+        logger.info(f"Processing {url} as {fetch_result.content_type}")
+        
+        # Process the content from memory
+        processed_result = self.process_document({
+            'id': url,
+            'content': fetch_result.content,
+            'content_type': fetch_result.content_type
+        })
+        
+        # Merge results
+        result.update(processed_result)
+        result['metadata'] = {
+            'url': url,
+            'content_type': fetch_result.content_type,
+            'content_length': len(fetch_result.content),
+            'status_code': fetch_result.status_code,
+            'headers': fetch_result.headers,
+            'from_cache': fetch_result.from_cache,
+            **(processed_result.get('metadata') or {})
+        }
         
         return result
     
+    def _get_url_fetcher(self):
+        """Return the URL fetcher of this processor's ``url`` configuration."""
+        return _get_url_fetcher(self.config.get('url', {}))
+    
+    def _get_fetch_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop running URL fetches."""
+        return _get_fetch_loop()
+    
+    def _run_fetch(self, coroutine):
+        """Run a fetch coroutine on the fetch loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_fetch_loop()).result()
+    
     def _process_pdf(self, file_path: str) -> Document:
         """
         Process a PDF document from a file path.
@@ -706,23 +775,62 @@ class DocumentProcessor:
                 logger.warning("PDF processor not available, falling back to text processor")
                 return self._process_text(file_path)
         
-        # Read the file content
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        # Process the PDF content using the helper method
-        result = self._process_pdf_content(content)
+        # Process the PDF file, which is memory-mapped rather than read
+        extracted_text, metadata = self._pdf_processor.process_file(file_path)
         
         # Create and return the document
         document = Document(
-            content=result.get("extracted_text", ""),
+            content=extracted_text,
             document_type="pdf",
-            metadata=result.get("metadata", {}),
+            metadata=metadata,
             path=file_path,
-            segments=result.get("segments", [])
+            segments=metadata.get("segments", [])
         )
         
         return document
+    
+    def process_document_lazily(self, file_path: str) -> LazyDocument:
+        """
+        Process a document file, producing its segments on demand.
+        
+        PDF pages are extracted one at a time as the document's segments are
+        iterated over, so downstream processing can start before the whole PDF
+        is parsed. Other document types are processed eagerly and wrapped.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Returns:
+            LazyDocument whose segments are produced on iteration
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        logger.info(f"Lazily processing document file: {file_path}")
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Document file not found: {file_path}")
+        
+        if 'pdf' in self._guess_content_type(file_path):
+            if self._pdf_processor is None:
+                from .pdf_processor import PDFProcessor
+                self._pdf_processor = PDFProcessor(self.config.get('pdf', {}))
+            
+            metadata, segments = self._pdf_processor.process_lazily(file_path)
+            return LazyDocument(segments, document_type="pdf", metadata=metadata, path=file_path)
+        
+        if 'html' in self._guess_content_type(file_path):
+            document = self._process_html(file_path)
+        else:
+            document = self._process_text(file_path)
+        
+        return LazyDocument(
+            document.segments,
+            document_type=document.document_type,
+            metadata=document.metadata,
+            path=file_path,
+            content=document.content
+        )
         
     def _process_pdf_content(self, content: bytes) -> Dict[str, Any]:
         """
@@ -942,10 +1050,13 @@ class DocumentProcessor:
         # Determine file type
         content_type = self._guess_content_type(file_path)
         
-        # Read content according to type
+        # Read content according to type; PDFs are memory-mapped instead of copied
         if 'pdf' in content_type:
             with open(file_path, 'rb') as f:
-                content = f.read()
+                if os.fstat(f.fileno()).st_size:
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    content = b""
         else:
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
@@ -2,16 +2,80 @@
 PDF Processor for the Knowledge Extraction Pipeline.
 
 This module provides the PDFProcessor class that handles PDF documents,
-extracting text content and metadata from them.
+extracting text content and metadata from them. Files are memory-mapped rather
+than read into memory, large documents can have their pages extracted on a
+process pool, and pages can be produced one at a time as a generator.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple, BinaryIO
+from typing import Dict, List, Any, Optional, Tuple, BinaryIO, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import mmap
+import os
 import re
 import io
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _clean_page_text(text: str) -> str:
+    """Collapse the whitespace of a page's text."""
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+@contextmanager
+def _open_pdf(file_path: str):
+    """
+    Open a PDF file as a stream without copying it into memory.
+    
+    The file is memory-mapped, so only the parts the parser touches are read.
+    Empty files, which cannot be mapped, are opened as an empty stream.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield io.BytesIO(b"")
+            return
+        
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def _extract_page_text(pdf_reader, page_index: int) -> str:
+    """Extract the cleaned text of a page, or "" if it cannot be extracted."""
+    try:
+        return _clean_page_text(pdf_reader.pages[page_index].extract_text())
+    except Exception as e:
+        logger.warning(f"Error extracting text from page {page_index}: {e}")
+        return ""
+
+
+def _extract_page_range(file_path: str, start_page: int, end_page: int) -> List[str]:
+    """
+    Extract the text of a range of pages in a worker process.
+    
+    Each worker maps and parses the file itself, so only page numbers and
+    extracted text cross the process boundary.
+    
+    Args:
+        file_path: Path to the PDF file
+        start_page: Index of the first page
+        end_page: Index after the last page
+        
+    Returns:
+        Cleaned text of each page in the range
+    """
+    import PyPDF2
+    
+    with _open_pdf(file_path) as stream:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        return [_extract_page_text(pdf_reader, i) for i in range(start_page, end_page)]
+
 
 class PDFProcessor:
     """
@@ -37,6 +101,12 @@ class PDFProcessor:
         self.ocr_enabled = self.config.get("ocr_enabled", False)
         self.tables_enabled = self.config.get("tables_enabled", False)
         self.page_range = self.config.get("page_range", None)  # (start, end) or None for all
+        
+        # Page-parallel extraction of files
+        self.parallel_pages = self.config.get("parallel_pages", False)
+        self.max_workers = self.config.get("max_workers", None)  # None for the CPU count
+        self.pages_per_task = self.config.get("pages_per_task", 16)
+        self.min_parallel_pages = self.config.get("min_parallel_pages", 32)
     
     def process(self, content: bytes) -> Tuple[str, Dict[str, Any]]:
         """
@@ -54,37 +124,140 @@ class PDFProcessor:
             logger.error("PyPDF2 library not found. Please install it to process PDF documents.")
             return "", {"error": "PyPDF2 library not found"}
         
-        # Open the PDF from binary content
-        pdf_file = io.BytesIO(content)
+        # Open the PDF from binary content; streams such as memory maps are used as they are
+        pdf_file = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
         
         try:
             # Parse the PDF
-            with PyPDF2.PdfReader(pdf_file) as pdf_reader:
-                # Extract metadata if configured
-                metadata = self._extract_metadata(pdf_reader) if self.extract_metadata else {}
-                
-                # Extract text from pages
-                text, page_texts = self._extract_text(pdf_reader)
-                
-                # Add page segments if configured
-                if self.segment_by_pages:
-                    metadata["segments"] = self._create_page_segments(page_texts)
-                
-                # Add basic statistics
-                char_count = len(text)
-                word_count = len(text.split())
-                metadata.update({
-                    "char_count": char_count,
-                    "word_count": word_count,
-                    "page_count": len(pdf_reader.pages)
-                })
-                
-                return text, metadata
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            return self._process_reader(pdf_reader)
                 
         except Exception as e:
             logger.error(f"Error processing PDF: {e}")
             return "", {"error": str(e)}
     
+    def process_file(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Process a PDF file.
+        
+        The file is memory-mapped instead of being read into memory. If
+        ``parallel_pages`` is enabled and the document has at least
+        ``min_parallel_pages`` pages, its pages are extracted on a process pool.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Tuple of (extracted_text, metadata)
+        """
+        try:
+            import PyPDF2
+        except ImportError:
+            logger.error("PyPDF2 library not found. Please install it to process PDF documents.")
+            return "", {"error": "PyPDF2 library not found"}
+        
+        try:
+            with _open_pdf(file_path) as stream:
+                pdf_reader = PyPDF2.PdfReader(stream)
+                return self._process_reader(pdf_reader, file_path)
+                
+        except Exception as e:
+            logger.error(f"Error processing PDF {file_path}: {e}")
+            return "", {"error": str(e)}
+    
+    def process_lazily(self, file_path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """
+        Process a PDF file one page at a time.
+        
+        The metadata is read straight away; page segments are extracted as the
+        returned generator is consumed, so processing of the first pages can
+        start before the whole document is parsed. The file stays mapped until
+        the generator is exhausted or closed.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Tuple of (metadata, generator of page segments)
+        """
+        import PyPDF2
+        
+        with _open_pdf(file_path) as stream:
+            pdf_reader = PyPDF2.PdfReader(stream)
+            metadata = self._extract_metadata(pdf_reader) if self.extract_metadata else {}
+            metadata["page_count"] = len(pdf_reader.pages)
+        
+        return metadata, self._iter_page_segments(file_path)
+    
+    def _iter_page_segments(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Generate the segments of a PDF file's non-empty pages in order."""
+        for i, page_text in self.iter_pages(file_path):
+            if page_text.strip():
+                yield self._create_page_segment(i, page_text)
+    
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """
+        Generate the cleaned text of a PDF file's pages in order.
+        
+        With ``parallel_pages`` enabled, large documents are extracted on a
+        process pool and pages are yielded as soon as their range is done.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Yields:
+            Tuples of (page_index, page_text)
+        """
+        import PyPDF2
+        
+        with _open_pdf(file_path) as stream:
+            pdf_reader = PyPDF2.PdfReader(stream)
+            start_page, end_page = self._page_bounds(len(pdf_reader.pages))
+            
+            if not self._use_parallel(end_page - start_page):
+                for i in range(start_page, end_page):
+                    yield i, _extract_page_text(pdf_reader, i)
+                return
+        
+        # Workers parse the file themselves, so the parent's mapping is released first
+        i = start_page
+        for page_texts in self._map_page_ranges(file_path, start_page, end_page):
+            for page_text in page_texts:
+                yield i, page_text
+                i += 1
+    
+    def _process_reader(self, pdf_reader, file_path: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract the text and metadata of an opened PDF.
+        
+        Args:
+            pdf_reader: PyPDF2 PdfReader object
+            file_path: Path to the PDF file, needed for page-parallel extraction
+            
+        Returns:
+            Tuple of (extracted_text, metadata)
+        """
+        # Extract metadata if configured
+        metadata = self._extract_metadata(pdf_reader) if self.extract_metadata else {}
+        
+        # Extract text from pages
+        text, page_texts = self._extract_text(pdf_reader, file_path)
+        
+        # Add page segments if configured
+        if self.segment_by_pages:
+            metadata["segments"] = self._create_page_segments(page_texts)
+        
+        # Add basic statistics
+        char_count = len(text)
+        word_count = len(text.split())
+        metadata.update({
+            "char_count": char_count,
+            "word_count": word_count,
+            "page_count": len(pdf_reader.pages)
+        })
+        
+        return text, metadata
+    
     def _extract_metadata(self, pdf_reader) -> Dict[str, Any]:
         """
         Extract metadata from PDF.
@@ -112,43 +285,71 @@ class PDFProcessor:
         
         return metadata
     
-    def _extract_text(self, pdf_reader) -> Tuple[str, List[str]]:
+    def _extract_text(self, pdf_reader, file_path: Optional[str] = None) -> Tuple[str, List[str]]:
         """
         Extract text content from PDF pages.
         
         Args:
             pdf_reader: PyPDF2 PdfReader object
+            file_path: Path to the PDF file; if given and page-parallel
+                extraction applies, pages are extracted on a process pool
             
         Returns:
             Tuple of (full_text, list_of_page_texts)
         """
-        page_texts = []
-        
         # Determine page range
-        start_page, end_page = 0, len(pdf_reader.pages)
-        if self.page_range:
-            start_page = max(0, self.page_range[0])
-            end_page = min(len(pdf_reader.pages), self.page_range[1])
+        start_page, end_page = self._page_bounds(len(pdf_reader.pages))
         
-        # Extract text from each page
-        for i in range(start_page, end_page):
-            try:
-                page = pdf_reader.pages[i]
-                page_text = page.extract_text()
-                
-                # Clean up the text
-                page_text = self._clean_text(page_text)
-                
-                page_texts.append(page_text)
-            except Exception as e:
-                logger.warning(f"Error extracting text from page {i}: {e}")
-                page_texts.append("")
+        if file_path and self._use_parallel(end_page - start_page):
+            page_texts = [
+                page_text
+                for page_texts in self._map_page_ranges(file_path, start_page, end_page)
+                for page_text in page_texts
+            ]
+        else:
+            # Extract text from each page
+            page_texts = [_extract_page_text(pdf_reader, i) for i in range(start_page, end_page)]
         
         # Combine all pages
         full_text = "\n\n".join(page_texts)
         
         return full_text, page_texts
     
+    def _page_bounds(self, page_count: int) -> Tuple[int, int]:
+        """Return the indices of the first page and after the last page to extract."""
+        start_page, end_page = 0, page_count
+        if self.page_range:
+            start_page = max(0, self.page_range[0])
+            end_page = min(page_count, self.page_range[1])
+        return start_page, end_page
+    
+    def _use_parallel(self, page_count: int) -> bool:
+        """Whether a document with this many pages to extract is extracted in parallel."""
+        return bool(self.parallel_pages) and page_count >= max(self.min_parallel_pages, 2)
+    
+    def _map_page_ranges(self, file_path: str, start_page: int, end_page: int) -> Iterator[List[str]]:
+        """
+        Extract ranges of ``pages_per_task`` pages on a process pool.
+        
+        Args:
+            file_path: Path to the PDF file
+            start_page: Index of the first page
+            end_page: Index after the last page
+            
+        Yields:
+            Page texts of each range, in page order
+        """
+        pages_per_task = max(1, self.pages_per_task)
+        starts = list(range(start_page, end_page, pages_per_task))
+        ends = [min(start + pages_per_task, end_page) for start in starts]
+        workers = min(self.max_workers or os.cpu_count() or 1, len(starts))
+        
+        logger.debug(f"Extracting {end_page - start_page} pages of {file_path} in "
+                     f"{len(starts)} ranges on {workers} workers")
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_extract_page_range, [file_path] * len(starts), starts, ends)
+    
     def _clean_text(self, text: str) -> str:
         """
         Clean and normalize text content from PDF.
@@ -160,7 +361,7 @@ class PDFProcessor:
             Cleaned text
         """
         # Remove excessive whitespace
-        cleaned = re.sub(r'\s+', ' ', text).strip()
+        cleaned = _clean_page_text(text)
         
         # Fix common OCR issues if needed
         # ...
@@ -181,17 +382,29 @@ class PDFProcessor:
         
         for i, page_text in enumerate(page_texts):
             if page_text.strip():  # Skip empty pages
-                segment = {
-                    "id": f"page{i+1}",
-                    "type": "page",
-                    "page_number": i + 1,
-                    "content": page_text,
-                    "word_count": len(page_text.split())
-                }
-                segments.append(segment)
+                segments.append(self._create_page_segment(i, page_text))
         
         return segments
     
+    def _create_page_segment(self, page_index: int, page_text: str) -> Dict[str, Any]:
+        """
+        Create the segment of a PDF page.
+        
+        Args:
+            page_index: Index of the page
+            page_text: Text content of the page
+            
+        Returns:
+            Segment dictionary
+        """
+        return {
+            "id": f"page{page_index+1}",
+            "type": "page",
+            "page_number": page_index + 1,
+            "content": page_text,
+            "word_count": len(page_text.split())
+        }
+    
     def _detect_headers(self, text: str) -> List[Dict[str, Any]]:
         """
         Detect potential headers in text based on formatting.
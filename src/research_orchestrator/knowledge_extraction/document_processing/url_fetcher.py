@@ -0,0 +1,361 @@
+"""
+URL Fetcher for the Knowledge Extraction Pipeline.
+
+This module provides the AsyncURLFetcher class, which downloads documents over
+a shared pool of HTTP connections with a concurrency limit per host. Responses
+carrying an ETag or Last-Modified header are kept in an on-disk cache and
+revalidated with conditional requests, so unchanged documents are not
+downloaded again. Content is returned in memory, ready to be handed to the
+document processors.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/91.0.4472.124 Safari/537.36'
+)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a URL."""
+
+    url: str
+    content: bytes = b""
+    content_type: str = ""
+    status_code: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the content was fetched successfully."""
+        return self.error is None
+
+
+def guess_content_type(content_type: str, content: bytes) -> str:
+    """
+    Determine the content type of a response.
+
+    Args:
+        content_type: Content-Type header of the response, possibly empty
+        content: Start of the response body
+
+    Returns:
+        Lowercase MIME type, sniffed from the content if the header is missing
+    """
+    if content_type:
+        return content_type.lower()
+    if content.startswith(b'%PDF'):
+        return 'application/pdf'
+    if content.startswith(b'<!DOCTYPE html') or content.startswith(b'<html'):
+        return 'text/html'
+    return 'text/plain'
+
+
+class ResponseCache:
+    """
+    On-disk cache of HTTP responses used for conditional requests.
+
+    Each URL is stored as a JSON file with its validators and headers next to
+    a file with the body, both named after the SHA-256 of the URL.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory of the cache files, created if needed
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        """Return the paths of the metadata and body files of a URL."""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached response of a URL.
+
+        Args:
+            url: The URL
+
+        Returns:
+            Dictionary with the response's etag, last_modified, content_type,
+            headers and content, or None if it is not cached
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry["content"] = f.read()
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """
+        Get the conditional request headers for a URL.
+
+        Args:
+            url: The URL
+
+        Returns:
+            If-None-Match and If-Modified-Since headers, empty if not cached
+        """
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, result: FetchResult) -> None:
+        """
+        Store a response if it carries an ETag or Last-Modified validator.
+
+        Args:
+            result: Successful fetch result
+        """
+        etag = result.headers.get("etag")
+        last_modified = result.headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(result.url)
+        entry = {
+            "url": result.url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": result.content_type,
+            "status_code": result.status_code,
+            "headers": result.headers
+        }
+
+        # Write the body before the metadata, each atomically, so a reader
+        # never pairs new validators with an old body
+        self._write_atomic(body_path, result.content)
+        self._write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """Write a file through a temporary file renamed into place."""
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+class AsyncURLFetcher:
+    """
+    Asynchronous document fetcher with connection pooling.
+
+    All requests share one HTTP client and its connection pool. At most
+    ``max_connections_per_host`` requests run against a host at a time, and
+    response bodies are streamed into memory up to ``max_size`` bytes.
+
+    The fetcher is bound to the event loop it is first used in.
+    """
+
+    def __init__(self,
+                 max_connections: int = 20,
+                 max_connections_per_host: int = 4,
+                 timeout: float = 30.0,
+                 max_size: int = 10 * 1024 * 1024,
+                 cache_dir: Optional[str] = None,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        """
+        Initialize the URL fetcher.
+
+        Args:
+            max_connections: Maximum number of open connections
+            max_connections_per_host: Maximum number of concurrent requests per host
+            timeout: Default timeout in seconds of each request
+            max_size: Default maximum content size in bytes
+            cache_dir: Directory of the response cache, or None to disable it
+            user_agent: User-Agent header sent with requests
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.max_size = max_size
+        self.user_agent = user_agent
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+
+        self._client = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> 'AsyncURLFetcher':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self):
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={'User-Agent': self.user_agent}
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent requests to a URL's host."""
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_limits[host]
+
+    async def fetch(self, url: str, timeout: Optional[float] = None,
+                    max_size: Optional[int] = None) -> FetchResult:
+        """
+        Fetch a URL.
+
+        Errors are reported in the result rather than raised.
+
+        Args:
+            url: The URL to fetch
+            timeout: Timeout in seconds, overriding the default
+            max_size: Maximum content size in bytes, overriding the default
+
+        Returns:
+            The fetch result
+        """
+        import httpx
+
+        timeout = timeout if timeout is not None else self.timeout
+        max_size = max_size if max_size is not None else self.max_size
+
+        try:
+            if not url.startswith(('http://', 'https://')):
+                raise ValueError(f"Invalid URL format: {url}")
+
+            async with self._host_limit(url):
+                return await self._fetch(url, timeout, max_size)
+
+        except httpx.TimeoutException as e:
+            logger.error(f"Timeout error fetching {url}: {str(e)}")
+            return FetchResult(url, error=f"Request timed out after {timeout} seconds", error_type='Timeout')
+        except httpx.ConnectError as e:
+            logger.error(f"Connection error fetching {url}: {str(e)}")
+            return FetchResult(url, error=f"Connection error: {str(e)}", error_type='ConnectionError')
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Request error fetching {url}: {str(e)}")
+            return FetchResult(url, status_code=e.response.status_code,
+                               error=f"HTTP request error: {str(e)}", error_type='RequestException')
+        except httpx.HTTPError as e:
+            logger.error(f"Request error fetching {url}: {str(e)}")
+            return FetchResult(url, error=f"HTTP request error: {str(e)}", error_type='RequestException')
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return FetchResult(url, error=str(e), error_type=type(e).__name__)
+
+    async def _fetch(self, url: str, timeout: float, max_size: int) -> FetchResult:
+        """Fetch a URL, revalidating its cached response if there is one."""
+        headers = self.cache.validators(url) if self.cache else {}
+
+        async with self._get_client().stream('GET', url, headers=headers, timeout=timeout) as response:
+            if response.status_code == 304 and self.cache:
+                cached = self.cache.get(url)
+                if cached is not None:
+                    logger.debug(f"Using cached response for {url}")
+                    return FetchResult(
+                        url,
+                        content=cached["content"],
+                        content_type=cached["content_type"],
+                        status_code=cached["status_code"],
+                        headers=cached["headers"],
+                        from_cache=True
+                    )
+
+            response.raise_for_status()
+
+            # Check content size from headers to avoid downloading huge files
+            content_length = response.headers.get('Content-Length')
+            if content_length and int(content_length) > max_size:
+                raise ValueError(f"Content too large: {int(content_length) // (1024*1024)}MB exceeds {max_size // (1024*1024)}MB limit")
+
+            content = bytearray()
+            async for chunk in response.aiter_bytes():
+                content.extend(chunk)
+                if len(content) > max_size:
+                    raise ValueError(f"Content download exceeded size limit of {max_size // (1024*1024)}MB")
+
+            result = FetchResult(
+                url,
+                content=bytes(content),
+                content_type=guess_content_type(response.headers.get('Content-Type', ''), bytes(content[:8192])),
+                status_code=response.status_code,
+                headers={key.lower(): value for key, value in response.headers.items()}
+            )
+
+        if self.cache:
+            try:
+                self.cache.put(result)
+            except OSError as e:
+                logger.warning(f"Could not cache response for {url}: {str(e)}")
+
+        return result
+
+    async def fetch_all(self, urls: Iterable[str], timeout: Optional[float] = None,
+                        max_size: Optional[int] = None) -> AsyncIterator[FetchResult]:
+        """
+        Fetch URLs concurrently, yielding results as they complete.
+
+        Args:
+            urls: The URLs to fetch
+            timeout: Timeout in seconds, overriding the default
+            max_size: Maximum content size in bytes, overriding the default
+
+        Yields:
+            Fetch results in completion order
+        """
+        tasks = [asyncio.ensure_future(self.fetch(url, timeout, max_size)) for url in urls]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
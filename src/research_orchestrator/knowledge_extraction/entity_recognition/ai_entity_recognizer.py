@@ -13,6 +13,7 @@ import logging
 from pathlib import Path
 
 from src.research_orchestrator.knowledge_extraction.entity_recognition.entity_recognizer import EntityRecognizer, Entity
+from src.research_orchestrator.knowledge_extraction.entity_recognition.pattern_matcher import PatternScanner
 from src.research_orchestrator.adapters.karma_adapter.karma_adapter import KARMAAdapter
 
 # Configure logging
@@ -113,8 +114,9 @@ class AIEntityRecognizer(EntityRecognizer):
         self.patterns = {entity_type: [] for entity_type in self.entity_types}
         self._load_patterns()
         
-        # Compile regex patterns
+        # Compile regex patterns, and combine them into a single-pass scanner
         self.compiled_patterns = self._compile_patterns()
+        self.scanner = self._build_scanner()
         
         # Initialize KARMA adapter if needed
         self.karma_adapter = None
@@ -150,6 +152,14 @@ class AIEntityRecognizer(EntityRecognizer):
             compiled[entity_type] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
         return compiled
     
+    def _build_scanner(self) -> PatternScanner:
+        """Combine the compiled patterns into one scanner keyed by (entity type, pattern)."""
+        return PatternScanner(
+            [((entity_type, pattern.pattern), pattern.pattern)
+             for entity_type, patterns in self.compiled_patterns.items() for pattern in patterns],
+            re.IGNORECASE
+        )
+    
     def recognize_entities(self, text: str) -> List[Entity]:
         """
         Recognize AI-specific entities in the given text.
@@ -180,28 +190,28 @@ class AIEntityRecognizer(EntityRecognizer):
         entities = []
         entity_id = 0
         
-        for entity_type, patterns in self.compiled_patterns.items():
-            for pattern in patterns:
-                for match in pattern.finditer(text):
-                    start_pos, end_pos = match.span()
-                    entity_text = match.group(0)
-                    
-                    # Simple confidence calculation based on length of entity
-                    # In a real system, this would be more sophisticated
-                    confidence = min(0.7 + len(entity_text) / 30, 0.95)
-                    
-                    entity = Entity(
-                        id=f"entity_{entity_id}",
-                        text=entity_text,
-                        type=entity_type,
-                        confidence=confidence,
-                        start_pos=start_pos,
-                        end_pos=end_pos,
-                        metadata={"source": "pattern", "pattern": pattern.pattern}
-                    )
-                    
-                    entities.append(entity)
-                    entity_id += 1
+        # All patterns are matched in one pass over the text
+        for match in self.scanner.scan(text):
+            entity_type, pattern = match.key
+            start_pos, end_pos = match.span()
+            entity_text = match.group(0)
+            
+            # Simple confidence calculation based on length of entity
+            # In a real system, this would be more sophisticated
+            confidence = min(0.7 + len(entity_text) / 30, 0.95)
+            
+            entity = Entity(
+                id=f"entity_{entity_id}",
+                text=entity_text,
+                type=entity_type,
+                confidence=confidence,
+                start_pos=start_pos,
+                end_pos=end_pos,
+                metadata={"source": "pattern", "pattern": pattern}
+            )
+            
+            entities.append(entity)
+            entity_id += 1
         
         return entities
     
@@ -275,6 +285,7 @@ class AIEntityRecognizer(EntityRecognizer):
         if entity_type not in self.compiled_patterns:
             self.compiled_patterns[entity_type] = []
         self.compiled_patterns[entity_type].append(re.compile(pattern, re.IGNORECASE))
+        self.scanner = self._build_scanner()
         
         logger.info(f"Added custom pattern for entity type '{entity_type}': {pattern}")
         
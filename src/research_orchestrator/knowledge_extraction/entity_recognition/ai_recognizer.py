@@ -13,6 +13,7 @@ import json
 
 from .base_recognizer import EntityRecognizer
 from .entity import Entity, EntityType
+from .pattern_matcher import AhoCorasick, PatternScanner, lowercase_preserving_offsets
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +76,9 @@ class AIEntityRecognizer(EntityRecognizer):
         self.patterns: Dict[EntityType, List[Pattern]] = {}
         # Dictionary of known entities with their types
         self.known_entities: Dict[str, Tuple[EntityType, float]] = {}
+        # Single-pass matchers over all patterns and all known entities
+        self.scanner: Optional[PatternScanner] = None
+        self.dictionary_matcher = AhoCorasick()
         
         # Now call the parent constructor which will call _initialize_from_config
         super().__init__(config)
@@ -92,6 +96,12 @@ class AIEntityRecognizer(EntityRecognizer):
                 patterns = self.DEFAULT_PATTERNS.get(entity_type, []) + custom_patterns.get(type_str, [])
                 self.patterns[entity_type] = [re.compile(p, re.IGNORECASE) for p in patterns]
         
+        self.scanner = PatternScanner(
+            [(entity_type, pattern.pattern)
+             for entity_type, patterns in self.patterns.items() for pattern in patterns],
+            re.IGNORECASE
+        )
+        
         # Load known entities from a dictionary file if specified
         dict_path = self.config.get("dictionary_path")
         if dict_path and os.path.exists(dict_path):
@@ -117,6 +127,7 @@ class AIEntityRecognizer(EntityRecognizer):
                 entity_type = EntityType.from_string(info["type"])
                 confidence = info.get("confidence", 1.0)
                 self.known_entities[entity_text.lower()] = (entity_type, confidence)
+                self.dictionary_matcher.add(entity_text, (entity_type, confidence))
             
             logger.info(f"Loaded {len(self.known_entities)} known entities from {filepath}")
         except Exception as e:
@@ -133,47 +144,37 @@ class AIEntityRecognizer(EntityRecognizer):
         """
         all_entities = []
         
-        # Pattern-based recognition
-        for entity_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                for match in pattern.finditer(text):
-                    entity_text = match.group(0)
-                    start_pos = match.start()
-                    end_pos = match.end()
-                    
-                    # Compute confidence based on heuristics
-                    confidence = self._compute_confidence(entity_text, entity_type, start_pos, end_pos, text)
-                    
-                    # Create and add the entity
-                    entity = Entity(
-                        text=entity_text,
-                        type=entity_type,
-                        confidence=confidence,
-                        start_pos=start_pos,
-                        end_pos=end_pos
-                    )
-                    all_entities.append(entity)
+        # Pattern-based recognition, all patterns in one pass
+        for match in self.scanner.scan(text):
+            entity_text = match.group(0)
+            start_pos = match.start()
+            end_pos = match.end()
+            
+            # Compute confidence based on heuristics
+            confidence = self._compute_confidence(entity_text, match.key, start_pos, end_pos, text)
+            
+            # Create and add the entity
+            entity = Entity(
+                text=entity_text,
+                type=match.key,
+                confidence=confidence,
+                start_pos=start_pos,
+                end_pos=end_pos
+            )
+            all_entities.append(entity)
         
-        # Dictionary-based recognition
-        for i, word in enumerate(text.split()):
-            # Clean up the word for matching
-            clean_word = word.lower().strip('.,;:()[]{}"\'-')
-            if clean_word in self.known_entities:
-                entity_type, confidence = self.known_entities[clean_word]
-                
-                # Find the position in the original text
-                start_pos = text.lower().find(clean_word)
-                if start_pos >= 0:
-                    end_pos = start_pos + len(clean_word)
-                    
-                    entity = Entity(
-                        text=word,
-                        type=entity_type,
-                        confidence=confidence,
-                        start_pos=start_pos,
-                        end_pos=end_pos
-                    )
-                    all_entities.append(entity)
+        # Dictionary-based recognition of every occurrence of each known entity
+        if len(self.dictionary_matcher):
+            lowered = lowercase_preserving_offsets(text)
+            for start_pos, end_pos, (entity_type, confidence) in self.dictionary_matcher.find_all(text, lowered=lowered):
+                entity = Entity(
+                    text=text[start_pos:end_pos],
+                    type=entity_type,
+                    confidence=confidence,
+                    start_pos=start_pos,
+                    end_pos=end_pos
+                )
+                all_entities.append(entity)
         
         # Apply additional recognition logic for AI-specific contexts
         self._recognize_model_related_entities(text, all_entities)
@@ -9,6 +9,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Set, Tuple
 import json
 import os
+import heapq
 import logging
 from collections import defaultdict
 
@@ -101,11 +102,29 @@ class EntityRecognizer(ABC):
                           -(e.end_pos - e.start_pos if e.start_pos is not None and e.end_pos is not None else 0))
         )
         
+        # Sweep the entities in start order. Every kept entity starts at or
+        # before the current one, so only those ending at or after its start
+        # can overlap it; those are the active entities, held as indices into
+        # the result in result order, with a heap of their ends to retire them
         result = []
+        active: List[int] = []
+        active_ends: List[Tuple[int, int]] = []
+        
         for entity in sorted_entities:
-            # Check if this entity overlaps with any entity already in the result
+            if entity.start_pos is None or entity.end_pos is None:
+                # Entities without a position never overlap anything
+                result.append(entity)
+                continue
+            
+            while active_ends and active_ends[0][0] < entity.start_pos:
+                end_pos, index = heapq.heappop(active_ends)
+                if result[index].end_pos == end_pos:
+                    active.remove(index)
+            
+            # Resolve against the first overlapping entity in the result
             overlap = False
-            for i, existing in enumerate(result):
+            for index in active:
+                existing = result[index]
                 if entity.overlaps_with(existing):
                     # If current entity is contained within existing entity, skip it
                     if existing.contains(entity):
@@ -115,13 +134,13 @@ class EntityRecognizer(ABC):
                     # If existing entity is contained within current entity, replace it
                     elif entity.contains(existing):
                         if entity.confidence >= existing.confidence:
-                            result[i] = entity
+                            self._replace_active(result, active_ends, index, entity)
                         overlap = True
                         break
                     
                     # Partial overlap - keep the one with higher confidence
                     elif entity.confidence > existing.confidence:
-                        result[i] = entity
+                        self._replace_active(result, active_ends, index, entity)
                         overlap = True
                         break
                     else:
@@ -129,10 +148,34 @@ class EntityRecognizer(ABC):
                         break
             
             if not overlap:
+                active.append(len(result))
+                heapq.heappush(active_ends, (entity.end_pos, len(result)))
                 result.append(entity)
         
         return result
     
+    @staticmethod
+    def _replace_active(
+        result: List[Entity],
+        active_ends: List[Tuple[int, int]],
+        index: int,
+        entity: Entity
+    ) -> None:
+        """Replace an active entity of the overlap sweep.
+        
+        A replacement never ends before the entity it replaces, so it stays
+        active; its end is only pushed when it differs.
+        
+        Args:
+            result: Entities kept so far
+            active_ends: Heap of (end, index) of the active entities
+            index: Index of the entity to replace
+            entity: The replacement entity
+        """
+        if entity.end_pos != result[index].end_pos:
+            heapq.heappush(active_ends, (entity.end_pos, index))
+        result[index] = entity
+    
     def group_entities_by_type(self, entities: List[Entity]) -> Dict[EntityType, List[Entity]]:
         """Group entities by their type.
         
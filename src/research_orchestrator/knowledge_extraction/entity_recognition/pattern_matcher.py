@@ -0,0 +1,385 @@
+"""
+Shared matching engine for the entity recognizers.
+
+This module provides two matchers that scan a document once, however many
+patterns or terms a recognizer has:
+
+- PatternScanner combines regex patterns into one scanner. Every pattern
+  reports exactly the matches its own ``finditer`` would, but the text is
+  walked in a single pass.
+- AhoCorasick finds dictionary and keyword terms with an Aho-Corasick automaton
+  over a lowercased copy of the text, in time linear in the text length.
+
+literal_alternation builds a regex matching any of a set of literal terms, for
+embedding term lists in larger patterns.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+
+def lowercase_preserving_offsets(text: str) -> str:
+    """Lowercase text without changing the offset of any character.
+
+    A few characters lowercase to more than one character (e.g. "İ"); those
+    are left unchanged so offsets in the result are offsets in ``text``.
+
+    Args:
+        text: Text to lowercase
+
+    Returns:
+        Lowercased text of the same length
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+def _is_word_char(ch: str) -> bool:
+    """Check whether a character is a regex word character."""
+    return ch.isalnum() or ch == "_"
+
+
+def is_word_boundary(text: str, position: int) -> bool:
+    """Check whether ``\\b`` would match at a position in the text.
+
+    Args:
+        text: The text
+        position: Offset between two characters
+
+    Returns:
+        True if exactly one side of the position is a word character
+    """
+    before = position > 0 and _is_word_char(text[position - 1])
+    after = position < len(text) and _is_word_char(text[position])
+    return before != after
+
+
+def literal_alternation(terms: Iterable[str]) -> str:
+    """Build a regex that matches any of a set of literal terms.
+
+    The terms are merged into a trie, so the regex inspects each character
+    once however many terms share a prefix, and the longest term matching at a
+    position is tried first.
+
+    Args:
+        terms: Literal terms; empty terms are ignored
+
+    Returns:
+        Regex source, or a pattern that never matches if there are no terms
+    """
+    trie: Dict[str, Dict] = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    if not trie:
+        return "(?!)"
+    return _trie_pattern(trie)
+
+
+def _trie_pattern(node: Dict[str, Dict]) -> str:
+    """Return the regex source for a trie node built by literal_alternation."""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in node.items() if ch]
+    if not branches:
+        return ""
+
+    if "" in node:
+        # A term ends here: the longer terms are optional, and tried first
+        return "(?:" + "|".join(branches) + ")?"
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+class ScanMatch:
+    """A match of one pattern of a PatternScanner.
+
+    Supports the subset of the ``re.Match`` API used by the recognizers, with
+    group numbers relative to the matched pattern.
+    """
+
+    __slots__ = ("key", "string", "_regs")
+
+    def __init__(self, key: Any, string: str, regs: Tuple[Tuple[int, int], ...]):
+        """Initialize the match.
+
+        Args:
+            key: Key of the matched pattern
+            string: The scanned text
+            regs: Spans of the whole match followed by the pattern's groups
+        """
+        self.key = key
+        self.string = string
+        self._regs = regs
+
+    def span(self, group: int = 0) -> Tuple[int, int]:
+        """Return the (start, end) span of a group."""
+        return self._regs[group]
+
+    def start(self, group: int = 0) -> int:
+        """Return the start offset of a group."""
+        return self._regs[group][0]
+
+    def end(self, group: int = 0) -> int:
+        """Return the end offset of a group."""
+        return self._regs[group][1]
+
+    def group(self, group: int = 0) -> Optional[str]:
+        """Return the text of a group, or None if it did not participate."""
+        start, end = self._regs[group]
+        return self.string[start:end] if start >= 0 else None
+
+    @property
+    def lastindex(self) -> Optional[int]:
+        """Return the highest group that participated in the match, if any."""
+        for group in range(len(self._regs) - 1, 0, -1):
+            if self._regs[group][0] >= 0:
+                return group
+        return None
+
+
+class PatternScanner:
+    """Single-pass scanner over many regex patterns.
+
+    All patterns are compiled into one regex that tries every pattern at a
+    position and records the span of each pattern that matches there, plus an
+    alternation used to jump to the next position where any pattern matches.
+    A pattern's match at a position is reported unless it starts inside that
+    pattern's previous match, which reproduces ``finditer`` for every pattern.
+    Patterns that cannot share a regex (back-references, named groups, inline
+    global flags) are scanned on their own and merged in.
+    """
+
+    _UNCOMBINABLE = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?[aiLmsux]+\)")
+
+    def __init__(self, patterns: Iterable[Tuple[Any, str]], flags: int = 0):
+        """Compile the patterns.
+
+        Args:
+            patterns: (key, pattern) pairs; the key identifies the pattern in
+                the matches, e.g. an entity type
+            flags: Regex flags applied to every pattern
+
+        Raises:
+            re.error: If a pattern is not a valid regex
+        """
+        self.patterns: List[Tuple[Any, Pattern]] = [
+            (key, re.compile(pattern, flags)) for key, pattern in patterns
+        ]
+
+        combined = [
+            index for index, (_, compiled) in enumerate(self.patterns)
+            if not self._UNCOMBINABLE.search(compiled.pattern)
+        ]
+        self._separate = [index for index in range(len(self.patterns)) if index not in set(combined)]
+
+        # Group of each combined pattern's whole match in the probe regex
+        self._combined: List[Tuple[int, int, int]] = []
+        probe_parts = []
+        group = 1
+        for index in combined:
+            compiled = self.patterns[index][1]
+            self._combined.append((index, group, compiled.groups))
+            probe_parts.append(f"(?=({compiled.pattern})?)")
+            group += compiled.groups + 1
+
+        self._search: Optional[Pattern] = None
+        self._probe: Optional[Pattern] = None
+        if combined:
+            self._search = re.compile(
+                "|".join(f"(?:{self.patterns[index][1].pattern})" for index in combined), flags
+            )
+            self._probe = re.compile("".join(probe_parts), flags)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def scan(self, text: str) -> List[ScanMatch]:
+        """Find the matches of every pattern in the text.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            Matches ordered by start offset, then by pattern order
+        """
+        matches: List[Tuple[int, int, ScanMatch]] = []
+
+        if self._search is not None:
+            # End of the previous reported match of each pattern
+            last_end = [0] * len(self.patterns)
+            search, probe = self._search.search, self._probe.match
+            keys = [key for key, _ in self.patterns]
+            combined = self._combined
+            position = 0
+            length = len(text)
+
+            while position <= length:
+                found = search(text, position)
+                if found is None:
+                    break
+
+                start = found.start()
+                regs = probe(text, start).regs
+                for index, group, group_count in combined:
+                    end = regs[group][1]
+                    if end <= start or start < last_end[index]:
+                        continue
+                    last_end[index] = end
+                    matches.append((start, index, ScanMatch(
+                        keys[index], text, regs[group:group + group_count + 1]
+                    )))
+
+                position = start + 1
+
+        for index in self._separate:
+            key, compiled = self.patterns[index]
+            for found in compiled.finditer(text):
+                if found.end() > found.start():
+                    matches.append((found.start(), index, ScanMatch(key, text, found.regs)))
+
+        if self._separate:
+            matches.sort(key=lambda item: (item[0], item[1]))
+
+        return [match for _, _, match in matches]
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for case-insensitive dictionary lookups.
+
+    Terms are stored lowercased; texts are scanned once, through a lowercased
+    buffer, reporting every term occurrence with offsets into the original text.
+    """
+
+    def __init__(self, terms: Optional[Iterable[Tuple[str, Any]]] = None):
+        """Initialize the automaton.
+
+        Args:
+            terms: Optional (term, value) pairs to add
+        """
+        # Trie transitions, and the term ending at each node, if any
+        self._goto: List[Dict[str, int]] = [{}]
+        self._terminal: List[Optional[int]] = [None]
+        # Failure links and the terms ending at each node, filled in by build()
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self.terms: List[str] = []
+        self.values: List[Any] = []
+        self._built = True
+
+        for term, value in terms or ():
+            self.add(term, value)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, term: str, value: Any = None):
+        """Add a term, replacing the value of a term that was already added.
+
+        Args:
+            term: Term to match; matching ignores case
+            value: Value reported with the term's matches
+        """
+        term = lowercase_preserving_offsets(term)
+        if not term:
+            return
+
+        node = 0
+        for ch in term:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._terminal.append(None)
+            node = next_node
+
+        if self._terminal[node] is not None:
+            self.values[self._terminal[node]] = value
+            return
+
+        self._terminal[node] = len(self.terms)
+        self.terms.append(term)
+        self.values.append(value)
+        self._built = False
+
+    def build(self):
+        """Compute the failure links; called automatically before a search."""
+        node_count = len(self._goto)
+        self._fail = [0] * node_count
+        self._outputs = [()] * node_count
+
+        # Breadth-first, so a node's failure target is complete before the node
+        queue = list(self._goto[0].values())
+        for node in queue:
+            self._outputs[node] = self._own_output(node)
+
+        for node in queue:
+            for ch, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(ch, 0)
+                self._outputs[next_node] = self._own_output(next_node) + self._outputs[self._fail[next_node]]
+
+        self._built = True
+
+    def _own_output(self, node: int) -> Tuple[int, ...]:
+        """Return the term ending exactly at a node, as an output tuple."""
+        terminal = self._terminal[node]
+        return () if terminal is None else (terminal,)
+
+    def find_all(self, text: str, whole_words: bool = True, overlapping: bool = False,
+                 lowered: Optional[str] = None) -> List[Tuple[int, int, Any]]:
+        """Find the occurrences of every term in a text.
+
+        Args:
+            text: The text to search
+            whole_words: Whether a match must start and end at word boundaries,
+                as if each term were wrapped in ``\\b``
+            overlapping: Whether a term may match again inside its own previous
+                match; when False, each term's matches follow ``re.finditer``
+            lowered: Lowercased text from lowercase_preserving_offsets, to reuse
+                a buffer shared with other matchers
+
+        Returns:
+            (start, end, value) tuples ordered by end offset, then by term length
+            (longest first)
+        """
+        if not self._built:
+            self.build()
+        if lowered is None:
+            lowered = lowercase_preserving_offsets(text)
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        terms, values = self.terms, self.values
+        last_end = [0] * len(terms) if not overlapping else None
+        matches = []
+
+        node = 0
+        for position, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not outputs[node]:
+                continue
+
+            end = position + 1
+            for index in outputs[node]:
+                start = end - len(terms[index])
+                if whole_words and not (is_word_boundary(text, start) and is_word_boundary(text, end)):
+                    continue
+                if last_end is not None:
+                    if start < last_end[index]:
+                        continue
+                    last_end[index] = end
+                matches.append((start, end, values[index]))
+
+        return matches
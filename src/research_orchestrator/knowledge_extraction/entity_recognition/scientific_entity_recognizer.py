@@ -13,6 +13,9 @@ import logging
 from pathlib import Path
 
 from src.research_orchestrator.knowledge_extraction.entity_recognition.entity_recognizer import EntityRecognizer, Entity
+from src.research_orchestrator.knowledge_extraction.entity_recognition.pattern_matcher import (
+    AhoCorasick, PatternScanner, lowercase_preserving_offsets
+)
 from src.research_orchestrator.adapters.karma_adapter.karma_adapter import KARMAAdapter
 
 # Configure logging
@@ -63,6 +66,10 @@ DEFAULT_PATTERNS = {
 }
 
 
+# Phrase following a keyword that names the recognized entity
+KEYWORD_PHRASE_PATTERN = re.compile(r'\s+([A-Za-z][\w\s,\-\']{2,50})', re.IGNORECASE)
+
+
 class ScientificEntityRecognizer(EntityRecognizer):
     """
     Specialized entity recognizer for scientific research documents that identifies
@@ -96,8 +103,9 @@ class ScientificEntityRecognizer(EntityRecognizer):
         self.patterns = {entity_type: [] for entity_type in self.entity_types}
         self._load_patterns()
         
-        # Compile regex patterns
+        # Compile regex patterns, and combine them into a single-pass scanner
         self.compiled_patterns = self._compile_patterns()
+        self.scanner = self._build_scanner()
         
         # Initialize KARMA adapter if needed
         self.karma_adapter = None
@@ -111,6 +119,7 @@ class ScientificEntityRecognizer(EntityRecognizer):
         # Initialize keyword dictionaries for entity types that are 
         # difficult to capture with regex patterns
         self.keywords = self._initialize_keywords()
+        self.keyword_matcher = self._build_keyword_matcher()
     
     def _load_patterns(self):
         """Load patterns from configuration and custom patterns."""
@@ -137,6 +146,14 @@ class ScientificEntityRecognizer(EntityRecognizer):
             compiled[entity_type] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
         return compiled
     
+    def _build_scanner(self) -> PatternScanner:
+        """Combine the compiled patterns into one scanner keyed by (entity type, pattern)."""
+        return PatternScanner(
+            [((entity_type, pattern.pattern), pattern.pattern)
+             for entity_type, patterns in self.compiled_patterns.items() for pattern in patterns],
+            re.IGNORECASE
+        )
+    
     def _initialize_keywords(self) -> Dict[str, Set[str]]:
         """Initialize keyword dictionaries for entity types."""
         keywords = {}
@@ -167,6 +184,15 @@ class ScientificEntityRecognizer(EntityRecognizer):
         
         return keywords
     
+    def _build_keyword_matcher(self) -> AhoCorasick:
+        """Build one automaton over the keywords of every entity type."""
+        types_by_keyword: Dict[str, List[str]] = {}
+        for entity_type, keyword_set in self.keywords.items():
+            for keyword in keyword_set:
+                types_by_keyword.setdefault(keyword.lower(), []).append(entity_type)
+        
+        return AhoCorasick((keyword, (keyword, types)) for keyword, types in types_by_keyword.items())
+    
     def recognize_entities(self, text: str) -> List[Entity]:
         """
         Recognize scientific entities in the given text.
@@ -203,28 +229,28 @@ class ScientificEntityRecognizer(EntityRecognizer):
         entities = []
         entity_id = 0
         
-        for entity_type, patterns in self.compiled_patterns.items():
-            for pattern in patterns:
-                for match in pattern.finditer(text):
-                    start_pos, end_pos = match.span()
-                    entity_text = match.group(0)
-                    
-                    # Simple confidence calculation based on heuristics
-                    # In a real system, this would be more sophisticated
-                    confidence = self._calculate_confidence(entity_text, entity_type)
-                    
-                    entity = Entity(
-                        id=f"scientific_entity_{entity_id}",
-                        text=entity_text,
-                        type=entity_type,
-                        confidence=confidence,
-                        start_pos=start_pos,
-                        end_pos=end_pos,
-                        metadata={"source": "pattern", "pattern": pattern.pattern}
-                    )
-                    
-                    entities.append(entity)
-                    entity_id += 1
+        # All patterns are matched in one pass over the text
+        for match in self.scanner.scan(text):
+            entity_type, pattern = match.key
+            start_pos, end_pos = match.span()
+            entity_text = match.group(0)
+            
+            # Simple confidence calculation based on heuristics
+            # In a real system, this would be more sophisticated
+            confidence = self._calculate_confidence(entity_text, entity_type)
+            
+            entity = Entity(
+                id=f"scientific_entity_{entity_id}",
+                text=entity_text,
+                type=entity_type,
+                confidence=confidence,
+                start_pos=start_pos,
+                end_pos=end_pos,
+                metadata={"source": "pattern", "pattern": pattern}
+            )
+            
+            entities.append(entity)
+            entity_id += 1
         
         return entities
     
@@ -233,28 +259,38 @@ class ScientificEntityRecognizer(EntityRecognizer):
         entities = []
         entity_id = 0
         
-        for entity_type, keyword_set in self.keywords.items():
-            for keyword in keyword_set:
-                # Search for the keyword in the text
-                for match in re.finditer(r'\b' + re.escape(keyword) + r'\b\s+([A-Za-z][\w\s,\-\']{2,50})', text, re.IGNORECASE):
-                    start_pos, end_pos = match.span()
-                    entity_text = match.group(1).strip()
-                    
-                    # Calculate confidence
-                    confidence = 0.7  # Default confidence for keyword matches
-                    
-                    entity = Entity(
-                        id=f"keyword_entity_{entity_id}",
-                        text=entity_text,
-                        type=entity_type,
-                        confidence=confidence,
-                        start_pos=start_pos,
-                        end_pos=end_pos,
-                        metadata={"source": "keyword", "keyword": keyword}
-                    )
-                    
-                    entities.append(entity)
-                    entity_id += 1
+        # Find every keyword in one pass, then read the phrase that follows it;
+        # a keyword is not matched again inside its own previous match
+        last_end: Dict[str, int] = {}
+        lowered = lowercase_preserving_offsets(text)
+        for start_pos, keyword_end, (keyword, entity_types) in self.keyword_matcher.find_all(
+                text, overlapping=True, lowered=lowered):
+            if start_pos < last_end.get(keyword, 0):
+                continue
+            match = KEYWORD_PHRASE_PATTERN.match(text, keyword_end)
+            if not match:
+                continue
+            
+            end_pos = match.end()
+            last_end[keyword] = end_pos
+            entity_text = match.group(1).strip()
+            
+            for entity_type in entity_types:
+                # Calculate confidence
+                confidence = 0.7  # Default confidence for keyword matches
+                
+                entity = Entity(
+                    id=f"keyword_entity_{entity_id}",
+                    text=entity_text,
+                    type=entity_type,
+                    confidence=confidence,
+                    start_pos=start_pos,
+                    end_pos=end_pos,
+                    metadata={"source": "keyword", "keyword": keyword}
+                )
+                
+                entities.append(entity)
+                entity_id += 1
         
         return entities
     
@@ -413,6 +449,7 @@ class ScientificEntityRecognizer(EntityRecognizer):
         if entity_type not in self.compiled_patterns:
             self.compiled_patterns[entity_type] = []
         self.compiled_patterns[entity_type].append(re.compile(pattern, re.IGNORECASE))
+        self.scanner = self._build_scanner()
         
         logger.info(f"Added custom pattern for entity type '{entity_type}': {pattern}")
     
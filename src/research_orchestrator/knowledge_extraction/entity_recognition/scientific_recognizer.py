@@ -14,6 +14,7 @@ import json
 
 from .base_recognizer import EntityRecognizer
 from .entity import Entity, EntityType
+from .pattern_matcher import AhoCorasick, PatternScanner, lowercase_preserving_offsets
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +74,9 @@ class ScientificEntityRecognizer(EntityRecognizer):
         self.patterns: Dict[EntityType, List[Pattern]] = {}
         # Dictionary of known scientific terms with their types
         self.known_terms: Dict[str, Tuple[EntityType, float]] = {}
+        # Single-pass matchers over all patterns and all known terms
+        self.scanner: Optional[PatternScanner] = None
+        self.terminology_matcher = AhoCorasick()
         
         # Now call the parent constructor which will call _initialize_from_config
         super().__init__(config)
@@ -90,6 +94,12 @@ class ScientificEntityRecognizer(EntityRecognizer):
                 patterns = self.DEFAULT_PATTERNS.get(entity_type, []) + custom_patterns.get(type_str, [])
                 self.patterns[entity_type] = [re.compile(p, re.IGNORECASE) for p in patterns]
         
+        self.scanner = PatternScanner(
+            [(entity_type, pattern.pattern)
+             for entity_type, patterns in self.patterns.items() for pattern in patterns],
+            re.IGNORECASE
+        )
+        
         # Load known scientific terms from a dictionary file if specified
         dict_path = self.config.get("terminology_path")
         if dict_path and os.path.exists(dict_path):
@@ -115,6 +125,7 @@ class ScientificEntityRecognizer(EntityRecognizer):
                 entity_type = EntityType.from_string(info["type"])
                 confidence = info.get("confidence", 1.0)
                 self.known_terms[term_text.lower()] = (entity_type, confidence)
+                self.terminology_matcher.add(term_text, (entity_type, confidence))
             
             logger.info(f"Loaded {len(self.known_terms)} scientific terms from {filepath}")
         except Exception as e:
@@ -131,42 +142,37 @@ class ScientificEntityRecognizer(EntityRecognizer):
         """
         all_entities = []
         
-        # Pattern-based recognition
-        for entity_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                for match in pattern.finditer(text):
-                    # For patterns with capture groups, use the first group
-                    # Otherwise use the whole match
-                    if match.lastindex and match.lastindex >= 1:
-                        entity_text = match.group(1)
-                        # Adjust positions for capture group
-                        start_pos = match.start(1)
-                        end_pos = match.end(1)
-                    else:
-                        entity_text = match.group(0)
-                        start_pos = match.start()
-                        end_pos = match.end()
-                    
-                    # Compute confidence based on heuristics
-                    confidence = self._compute_confidence(entity_text, entity_type, start_pos, end_pos, text)
-                    
-                    # Create and add the entity
-                    entity = Entity(
-                        text=entity_text,
-                        type=entity_type,
-                        confidence=confidence,
-                        start_pos=start_pos,
-                        end_pos=end_pos
-                    )
-                    all_entities.append(entity)
-        
-        # Terminology dictionary-based recognition
-        for term, (term_type, base_confidence) in self.known_terms.items():
-            # Find all occurrences of the term in the text
-            for match in re.finditer(rf"\b{re.escape(term)}\b", text, re.IGNORECASE):
+        # Pattern-based recognition, all patterns in one pass
+        for match in self.scanner.scan(text):
+            # For patterns with capture groups, use the first group
+            # Otherwise use the whole match
+            if match.lastindex and match.lastindex >= 1:
+                entity_text = match.group(1)
+                # Adjust positions for capture group
+                start_pos = match.start(1)
+                end_pos = match.end(1)
+            else:
+                entity_text = match.group(0)
                 start_pos = match.start()
                 end_pos = match.end()
-                
+            
+            # Compute confidence based on heuristics
+            confidence = self._compute_confidence(entity_text, match.key, start_pos, end_pos, text)
+            
+            # Create and add the entity
+            entity = Entity(
+                text=entity_text,
+                type=match.key,
+                confidence=confidence,
+                start_pos=start_pos,
+                end_pos=end_pos
+            )
+            all_entities.append(entity)
+        
+        # Terminology dictionary-based recognition of every occurrence of each term
+        if len(self.terminology_matcher):
+            lowered = lowercase_preserving_offsets(text)
+            for start_pos, end_pos, (term_type, base_confidence) in self.terminology_matcher.find_all(text, lowered=lowered):
                 # Get the actual matched text from the original text
                 matched_text = text[start_pos:end_pos]
                 
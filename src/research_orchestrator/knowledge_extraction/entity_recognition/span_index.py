@@ -0,0 +1,161 @@
+"""
+Position index over entity spans.
+
+SpanIndex answers "which entities lie at this part of the text" in logarithmic
+time, so recognizers and relationship extractors can look entities up by
+position instead of comparing every pair.
+"""
+
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+def _entity_span(item: Any) -> Tuple[Optional[int], Optional[int]]:
+    """Return the (start, end) span of an entity."""
+    return item.start_pos, item.end_pos
+
+
+class SpanIndex:
+    """Static interval tree over items with character spans.
+
+    Spans are half-open ``[start, end)`` ranges. The index is an implicit
+    augmented interval tree: items are sorted by start and stored in an array
+    laid out as a binary search tree, each node recording the largest end in
+    its subtree. A query visits O(log n) nodes plus one per item it returns.
+    Items without a start or end position are not indexed.
+    """
+
+    # Subtrees of at most 2 ** (_SCAN_LEVEL + 1) items are scanned linearly
+    _SCAN_LEVEL = 3
+
+    def __init__(self, items: Iterable[Any],
+                 span: Callable[[Any], Tuple[Optional[int], Optional[int]]] = _entity_span):
+        """Build the index.
+
+        Args:
+            items: Items to index, e.g. entities
+            span: Function returning the (start, end) span of an item;
+                defaults to the ``start_pos`` and ``end_pos`` attributes
+        """
+        positioned = []
+        for order, item in enumerate(items):
+            start, end = span(item)
+            if start is not None and end is not None:
+                positioned.append((start, end, order, item))
+        positioned.sort(key=lambda entry: (entry[0], entry[1], entry[2]))
+
+        self._starts = [entry[0] for entry in positioned]
+        self._ends = [entry[1] for entry in positioned]
+        self._order = [entry[2] for entry in positioned]
+        self._items = [entry[3] for entry in positioned]
+        self._max_ends = list(self._ends)
+        self._max_level = self._build()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self) -> int:
+        """Compute the largest end in every subtree.
+
+        Returns:
+            Level of the root node
+        """
+        count = len(self._items)
+        if not count:
+            return -1
+
+        ends, max_ends = self._ends, self._max_ends
+        # Largest end under the rightmost node of the current level, which
+        # stands in for right subtrees that lie past the end of the array
+        last_index = (count - 1) & ~1
+        last = max_ends[last_index]
+
+        level = 1
+        while (1 << level) <= count:
+            half = 1 << (level - 1)
+            for index in range((half << 1) - 1, count, half << 2):
+                right = max_ends[index + half] if index + half < count else last
+                max_ends[index] = max(ends[index], max_ends[index - half], right)
+
+            last_index = last_index - half if (last_index >> level) & 1 else last_index + half
+            if last_index < count and max_ends[last_index] > last:
+                last = max_ends[last_index]
+            level += 1
+
+        return level - 1
+
+    def _overlapping_positions(self, start: int, end: int) -> List[int]:
+        """Return array positions of the items overlapping ``[start, end)``."""
+        count = len(self._items)
+        if not count:
+            return []
+
+        starts, ends, max_ends = self._starts, self._ends, self._max_ends
+        found = []
+        # (node, level, whether the left subtree has been visited)
+        stack = [((1 << self._max_level) - 1, self._max_level, False)]
+
+        while stack:
+            node, level, left_done = stack.pop()
+
+            if level <= self._SCAN_LEVEL:
+                first = node >> level << level
+                last = min(first + (1 << (level + 1)) - 1, count)
+                for index in range(first, last):
+                    if starts[index] >= end:
+                        break
+                    if ends[index] > start:
+                        found.append(index)
+            elif not left_done:
+                stack.append((node, level, True))
+                left = node - (1 << (level - 1))
+                if left >= count or max_ends[left] > start:
+                    stack.append((left, level - 1, False))
+            elif node < count and starts[node] < end:
+                if ends[node] > start:
+                    found.append(node)
+                stack.append((node + (1 << (level - 1)), level - 1, False))
+
+        return found
+
+    def overlapping(self, start: int, end: int) -> List[Any]:
+        """Find the items whose span overlaps a range of the text.
+
+        Args:
+            start: Start of the range
+            end: End of the range (exclusive)
+
+        Returns:
+            Overlapping items, in the order they were given to the index
+        """
+        positions = self._overlapping_positions(start, end)
+        positions.sort(key=self._order.__getitem__)
+        return [self._items[position] for position in positions]
+
+    def within(self, start: int, end: int) -> List[Any]:
+        """Find the items whose span lies entirely inside a range of the text.
+
+        Args:
+            start: Start of the range
+            end: End of the range (exclusive)
+
+        Returns:
+            Contained items, in the order they were given to the index
+        """
+        positions = [
+            position for position in self._overlapping_positions(start, end)
+            if self._starts[position] >= start and self._ends[position] <= end
+        ]
+        positions.sort(key=self._order.__getitem__)
+        return [self._items[position] for position in positions]
+
+    def at(self, position: int) -> List[Any]:
+        """Find the items covering a character position.
+
+        Args:
+            position: Offset of a character in the text
+
+        Returns:
+            Items whose span includes the position, in the order they were
+            given to the index
+        """
+        return self.overlapping(position, position + 1)
@@ -5,7 +5,7 @@ This module provides a coordinator that manages the entire knowledge extraction
 including document processing, entity recognition, and relationship extraction.
 """
 
-from typing import Dict, List, Optional, Set, Any, Tuple, Union
+from typing import Callable, Dict, List, Optional, Set, Any, Tuple, Union
 import logging
 import os
 import json
@@ -547,50 +547,103 @@ class KnowledgeExtractor:
         
         return analysis
     
-    def batch_process(self, input_dir: str, output_dir: str,
-                     file_pattern: str = "*",
-                     **kwargs) -> List[Dict[str, Any]]:
+    def extract_document_record(self, doc_path: str, **kwargs) -> Dict[str, Any]:
         """
-        Process a batch of documents.
+        Extract entities and relationships from a document without storing them.
+        
+        Used by batch processing, where results are streamed to disk rather than
+        kept on the extractor.
         
         Args:
-            input_dir: Input directory containing documents
-            output_dir: Output directory to save results
-            file_pattern: File pattern to match documents
+            doc_path: Path to the document file
             **kwargs: Additional arguments to pass to the extractors
             
         Returns:
-            List of dictionaries containing results for each document
+            Dictionary containing the document's entities and relationships
         """
-        import glob
+        document = self.document_processor.process_document(doc_path)
         
-        # Get all files matching the pattern
-        files = glob.glob(os.path.join(input_dir, file_pattern))
+        # Handle both Document objects and dictionary returns
+        if hasattr(document, 'content'):
+            document_content = document.content
+            document_type = document.document_type
+        elif isinstance(document, dict) and 'content' in document:
+            document_content = document['content']
+            document_type = document.get('document_type')
+        else:
+            raise ValueError(f"Document does not have content attribute or key: {type(document)}")
+        
+        entities = self.entity_recognizer.recognize(document_content)
+        min_entity_confidence = kwargs.get("min_entity_confidence", 0.0)
+        entity_types = kwargs.get("entity_types")
+        if min_entity_confidence > 0 or entity_types:
+            entities = self.entity_recognizer.filter_entities(
+                entities, min_entity_confidence, entity_types
+            )
         
-        results = []
+        relationships = self.relationship_extractor.extract_relationships(document_content, entities)
+        min_relationship_confidence = kwargs.get("min_relationship_confidence", 0.0)
+        relation_types = kwargs.get("relation_types")
+        if min_relationship_confidence > 0 or relation_types:
+            relationships = self.relationship_extractor.filter_relationships(
+                relationships, min_relationship_confidence, relation_types
+            )
         
-        for file_path in files:
-            try:
-                # Extract knowledge from the document
-                result = self.extract_knowledge(file_path, output_dir, **kwargs)
-                
-                # Add document path to the result
-                result["document_path"] = file_path
-                
-                results.append(result)
-                
-                logger.info(f"Processed document {file_path}")
-                
-            except Exception as e:
-                logger.error(f"Error processing document {file_path}: {e}")
-                results.append({
-                    "document_path": file_path,
-                    "error": str(e)
-                })
+        return {
+            "document_type": document_type,
+            "entity_count": len(entities),
+            "relationship_count": len(relationships),
+            "entities": [e.to_dict() for e in entities],
+            "relationships": [r.to_dict() for r in relationships]
+        }
+    
+    def batch_process(self, input_dir: str, output_dir: str,
+                     file_pattern: str = "*",
+                     workers: Optional[int] = None,
+                     max_in_flight: Optional[int] = None,
+                     timeout: Optional[float] = None,
+                     resume: bool = True,
+                     progress_callback: Optional[Callable[[Any], None]] = None,
+                     **kwargs) -> Dict[str, Any]:
+        """
+        Process a batch of documents in parallel.
         
-        logger.info(f"Processed {len(results)} documents")
+        Documents are extracted on a pool of worker processes and each result
+        is appended to ``results.ndjson`` in the output directory as soon as it
+        completes. Documents whose content already has a result there are
+        skipped, so an interrupted run can be resumed by running it again.
         
-        return results
+        Args:
+            input_dir: Input directory containing documents
+            output_dir: Output directory to save results
+            file_pattern: File pattern to match documents
+            workers: Number of worker processes (defaults to the CPU count)
+            max_in_flight: Maximum number of documents queued at once
+            timeout: Maximum processing time per document in seconds
+            resume: Whether to skip documents processed by an earlier run
+            progress_callback: Called with a BatchProgress after each document
+            **kwargs: Additional arguments to pass to the extractors
+            
+        Returns:
+            Summary of the run, including the path of the results file
+        """
+        from research_orchestrator.knowledge_extraction.batch_processor import BatchProcessor
+        
+        processor = BatchProcessor(
+            self,
+            workers=workers,
+            max_in_flight=max_in_flight,
+            timeout=timeout,
+            progress_callback=progress_callback
+        )
+        
+        return processor.process_directory(
+            input_dir,
+            os.path.join(output_dir, "results.ndjson"),
+            file_pattern=file_pattern,
+            resume=resume,
+            **kwargs
+        )
         
     def save_extraction_results(self, temp_dir, doc_id):
         """
@@ -11,6 +11,7 @@ import logging
 from collections import defaultdict
 
 from ..entity_recognition.entity import Entity, EntityType
+from ..entity_recognition.span_index import SpanIndex
 from .base_extractor import RelationshipExtractor
 from .relationship import Relationship, RelationType
 
@@ -253,14 +254,16 @@ class AIRelationshipExtractor(RelationshipExtractor):
                         )
                         relationships.append(rel)
         
-        # Also look for train/evaluation keywords near model-dataset pairs
+        # Also look for train/evaluation keywords near model-dataset pairs;
+        # only datasets within 100 characters of a model can qualify, so they
+        # are looked up by position rather than compared with every model
+        dataset_index = SpanIndex(dataset_entities)
         for model in model_entities:
-            for dataset in dataset_entities:
-                # Skip entities without position information
-                if model.start_pos is None or model.end_pos is None or \
-                   dataset.start_pos is None or dataset.end_pos is None:
-                    continue
-                
+            # Skip entities without position information
+            if model.start_pos is None or model.end_pos is None:
+                continue
+            
+            for dataset in dataset_index.overlapping(model.start_pos - 101, model.end_pos + 101):
                 # Check for proximity
                 if abs(model.start_pos - dataset.end_pos) <= 100 or \
                    abs(dataset.start_pos - model.end_pos) <= 100:
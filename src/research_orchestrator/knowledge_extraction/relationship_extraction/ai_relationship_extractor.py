@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Set, Tuple, Any, Pattern
 import logging
 
 from src.research_orchestrator.knowledge_extraction.entity_recognition.entity_recognizer import Entity
+from src.research_orchestrator.knowledge_extraction.entity_recognition.span_index import SpanIndex
 from src.research_orchestrator.knowledge_extraction.relationship_extraction.relationship_extractor import RelationshipExtractor, Relationship
 from src.research_orchestrator.knowledge_extraction.relationship_extraction.pattern_relationship_extractor import PatternRelationshipExtractor
 from src.research_orchestrator.adapters.karma_adapter.karma_adapter import KARMAAdapter
@@ -213,13 +214,23 @@ class AIRelationshipExtractor(RelationshipExtractor):
                 entities_by_type[entity.type] = []
             entities_by_type[entity.type].append(entity)
         
+        # Index the start of each entity, so the targets near a source are
+        # looked up by position instead of compared with every source
+        starts_by_type = {
+            entity_type: SpanIndex(type_entities, span=self._start_span)
+            for entity_type, type_entities in entities_by_type.items()
+        }
+        
         # Find entity pairs based on common type pairs
         for source_type, target_type, relation_type in self.entity_type_pairs:
             if source_type not in entities_by_type or target_type not in entities_by_type:
                 continue
             
             for source_entity in entities_by_type[source_type]:
-                for target_entity in entities_by_type[target_type]:
+                nearby_targets = starts_by_type[target_type].overlapping(
+                    source_entity.start_pos - 500, source_entity.start_pos + 501
+                )
+                for target_entity in nearby_targets:
                     # Skip self-relationships
                     if source_entity.id == target_entity.id:
                         continue
@@ -251,6 +262,13 @@ class AIRelationshipExtractor(RelationshipExtractor):
         
         return relationships
     
+    @staticmethod
+    def _start_span(entity: Entity) -> Tuple[Optional[int], Optional[int]]:
+        """Return the one-character span at the start of an entity."""
+        if entity.start_pos is None:
+            return None, None
+        return entity.start_pos, entity.start_pos + 1
+    
     def _extract_relationships_with_karma(self, text: str, entities: List[Entity]) -> List[Relationship]:
         """
         Extract relationships using the KARMA adapter.
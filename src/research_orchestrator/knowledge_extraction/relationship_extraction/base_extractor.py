@@ -113,6 +113,27 @@ class RelationshipExtractor(ABC):
         Returns:
             List of entity pairs (source, target)
         """
+        return list(self.iter_entity_pairs(entities, max_distance))
+    
+    def iter_entity_pairs(
+        self, 
+        entities: List[Entity], 
+        max_distance: Optional[int] = None
+    ) -> Iterator[Tuple[Entity, Entity]]:
+        """Generate potential entity pairs with a sliding window.
+        
+        Entities are visited in position order, and each one is paired with the
+        entities that follow it until one starts more than ``max_distance``
+        characters after it ends; every later entity starts further away still.
+        Each pair is generated in both directions.
+        
+        Args:
+            entities: List of entities to pair
+            max_distance: Maximum distance between entities (optional)
+            
+        Yields:
+            Entity pairs (source, target)
+        """
         # Remove entities without position information
         positioned_entities = [
             e for e in entities 
@@ -125,24 +146,17 @@ class RelationshipExtractor(ABC):
             key=lambda e: e.start_pos
         )
         
-        pairs = []
-        
-        # Create pairs of entities
         for i, entity1 in enumerate(sorted_entities):
             for j in range(i + 1, len(sorted_entities)):
                 entity2 = sorted_entities[j]
                 
-                # Skip if too far apart
-                if max_distance is not None:
-                    distance = entity2.start_pos - entity1.end_pos
-                    if distance > max_distance:
-                        continue
+                # Stop once the window has moved past max_distance
+                if max_distance is not None and entity2.start_pos - entity1.end_pos > max_distance:
+                    break
                 
                 # Create pairs in both directions
-                pairs.append((entity1, entity2))
-                pairs.append((entity2, entity1))
-        
-        return pairs
+                yield entity1, entity2
+                yield entity2, entity1
     
     def get_entity_pair_context(
         self, 
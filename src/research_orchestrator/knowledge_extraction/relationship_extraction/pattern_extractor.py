@@ -6,12 +6,15 @@ relationships between entities in research documents.
 """
 
 import re
-from typing import List, Dict, Any, Optional, Pattern as RegexPattern, Tuple, Set
+from typing import List, Dict, Any, Optional, Pattern as RegexPattern, Tuple, Set, Iterator
 import logging
 import os
 import json
+from collections import defaultdict
 
 from ..entity_recognition.entity import Entity, EntityType
+from ..entity_recognition.pattern_matcher import literal_alternation
+from ..entity_recognition.span_index import SpanIndex
 from .base_extractor import RelationshipExtractor
 from .relationship import Relationship, RelationType
 
@@ -214,6 +217,12 @@ class PatternRelationshipExtractor(RelationshipExtractor):
     def extract_relationships(self, text: str, entities: List[Entity]) -> List[Relationship]:
         """Extract relationships between entities in the provided text.
         
+        Each pattern is matched once over the whole text, with its ``{source}``
+        and ``{target}`` placeholders matching any entity mention, and then
+        inside each of its matches for the overlapping matches the scan skips.
+        A match relates a pair of nearby entities when its placeholders fall on
+        the pair's mentions and it lies inside the pair's context window.
+        
         Args:
             text: The text to analyze for relationships
             entities: List of entities to find relationships between
@@ -221,38 +230,227 @@ class PatternRelationshipExtractor(RelationshipExtractor):
         Returns:
             A list of detected relationships
         """
-        # Find potential entity pairs based on proximity
-        entity_pairs = self.find_entity_pairs(entities, self.max_entity_distance)
+        # Find potential entity pairs based on proximity, indexed by the spans
+        # of their mentions
+        pairs = list(self.iter_entity_pairs(entities, self.max_entity_distance))
+        if not pairs:
+            self.relationships = []
+            return []
+        
+        pairs_by_source: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        pairs_by_target: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        # Span of the context windows of each target mention's pairs
+        target_regions: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for pair_index, (source, target) in enumerate(pairs):
+            target_span = (target.start_pos, target.end_pos)
+            pairs_by_source[(source.start_pos, source.end_pos)].append(pair_index)
+            pairs_by_target[target_span].append(pair_index)
+            window_start, window_end = self._get_context_window(text, source, target)
+            region_start, region_end = target_regions.get(target_span, (window_start, window_end))
+            target_regions[target_span] = (min(region_start, window_start), max(region_end, window_end))
+        
+        # Placeholders match the text of any entity mention
+        mention_pattern = literal_alternation(
+            text[start:end].lower() for start, end in pairs_by_source
+        )
+        
+        # Pairs by context window, for patterns without placeholders
+        windows: Optional[SpanIndex] = None
+        # Possible relationship types for each entity type pair
+        possible_relations: Dict[Tuple[EntityType, EntityType], List[RelationType]] = {}
+        
+        # Extract relationships, ordered as if each pair were matched in turn
+        found: List[Tuple[Tuple[int, int, int, int], Relationship]] = []
+        
+        for rel_type, patterns in self.patterns.items():
+            for pattern_index, pattern in enumerate(patterns):
+                compiled = self._compile_document_pattern(pattern, mention_pattern)
+                if compiled is None:
+                    continue
+                document_pattern, value_group = compiled
+                groups = document_pattern.groupindex
+                
+                if "target" in groups:
+                    matches = self._iter_target_matches(
+                        text, document_pattern, pattern, mention_pattern, target_regions
+                    )
+                else:
+                    matches = document_pattern.finditer(text)
+                
+                for match in matches:
+                    if "target" in groups:
+                        candidates = pairs_by_target.get(match.span("target"), [])
+                    elif "source" in groups:
+                        candidates = pairs_by_source.get(match.span("source"), [])
+                    else:
+                        if windows is None:
+                            windows = SpanIndex(
+                                range(len(pairs)),
+                                span=lambda pair_index: self._get_context_window(text, *pairs[pair_index])
+                            )
+                        candidates = windows.overlapping(match.start(), match.end())
+                    
+                    for pair_index in candidates:
+                        source, target = pairs[pair_index]
+                        
+                        # The match must name the pair's source if the pattern
+                        # includes it, and lie inside the pair's context window
+                        if "source" in groups and match.span("source") != (source.start_pos, source.end_pos):
+                            continue
+                        window_start, window_end = self._get_context_window(text, source, target)
+                        if match.start() < window_start or match.end() > window_end:
+                            continue
+                        
+                        type_pair = (source.type, target.type)
+                        if type_pair not in possible_relations:
+                            possible_relations[type_pair] = self._get_possible_relation_types(source, target)
+                        if rel_type not in possible_relations[type_pair]:
+                            continue
+                        
+                        # Calculate confidence based on match quality
+                        confidence = self._calculate_confidence(
+                            match, text[window_start:window_end], source, target, rel_type
+                        )
+                        
+                        # Extract any numeric values for certain relationship types
+                        metadata = {}
+                        if rel_type == RelationType.ACHIEVES and value_group and match.group(value_group) is not None:
+                            metadata["value"] = match.group(value_group)
+                        
+                        relationship = Relationship(
+                            source=source,
+                            target=target,
+                            relation_type=rel_type,
+                            confidence=confidence,
+                            context=match.group(0),
+                            metadata=metadata
+                        )
+                        
+                        order = (
+                            pair_index,
+                            possible_relations[type_pair].index(rel_type),
+                            pattern_index,
+                            match.start()
+                        )
+                        found.append((order, relationship))
+        
+        found.sort(key=lambda item: item[0])
+        
+        # Remove duplicate relationships
+        unique_relationships = self._remove_duplicates([relationship for _, relationship in found])
         
-        # Extract relationships from the pairs
-        all_relationships = []
+        # Save the relationships for later use
+        self.relationships = unique_relationships
+        
+        return unique_relationships
+    
+    def _get_context_window(self, text: str, source: Entity, target: Entity) -> Tuple[int, int]:
+        """Get the bounds of the context window around an entity pair.
         
-        for source, target in entity_pairs:
-            # Get context window for this entity pair
-            context = self.get_entity_pair_context(
-                text, source, target, self.context_window_size
-            )
+        Args:
+            text: The full text
+            source: Source entity
+            target: Target entity
             
-            if not context:
-                continue
+        Returns:
+            (start, end) offsets of the window, as used by get_entity_pair_context
+        """
+        first, second = (source, target) if source.start_pos < target.start_pos else (target, source)
+        start = max(0, first.start_pos - self.context_window_size)
+        end = min(len(text), second.end_pos + self.context_window_size)
+        return start, end
+    
+    def _iter_target_matches(
+        self,
+        text: str,
+        document_pattern: RegexPattern,
+        pattern: RegexPattern,
+        mention_pattern: str,
+        target_regions: Dict[Tuple[int, int], Tuple[int, int]]
+    ) -> Iterator[re.Match]:
+        """Match a pattern with a ``{target}`` placeholder, including overlapping matches.
+        
+        Matches found in one scan cannot overlap, so a match for one target,
+        such as "achieves 76.1% top one accuracy", would hide a longer match
+        for a later target, such as "... accuracy and precision". A hidden
+        match starts inside a match of the scan where the scanned pattern also
+        matches, so each match of the scan is followed by the matches starting
+        at those positions with the placeholder bound to the text of each later
+        target mention in reach.
+        
+        Args:
+            text: The full text
+            document_pattern: The pattern compiled for the whole document
+            pattern: Relationship pattern with placeholders
+            mention_pattern: Regex matching the text of any entity mention
+            target_regions: Span to search for each target mention's span
             
-            # Get potential relationship types based on entity types
-            possible_relations = self._get_possible_relation_types(source, target)
+        Yields:
+            Matches of the pattern, ordered by the match of the scan they start in
+        """
+        regions = SpanIndex(list(target_regions), span=target_regions.get)
+        compiled_by_text: Dict[str, Optional[RegexPattern]] = {}
+        
+        for match in document_pattern.finditer(text):
+            yield match
             
-            # Try to match patterns for the possible relationship types
-            relationships = self._match_patterns(
-                context, source, target, possible_relations
-            )
+            # Positions inside the match where another match could start
+            starts = [
+                position for position in range(match.start(), match.end())
+                if position == match.start() or document_pattern.match(text, position)
+            ]
             
-            all_relationships.extend(relationships)
+            for target_span in regions.at(match.start()):
+                if target_span[0] < match.start():
+                    continue
+                target_text = text[target_span[0]:target_span[1]].lower()
+                if target_text not in compiled_by_text:
+                    compiled = self._compile_document_pattern(pattern, mention_pattern, re.escape(target_text))
+                    compiled_by_text[target_text] = compiled[0] if compiled else None
+                target_pattern = compiled_by_text[target_text]
+                if target_pattern is None:
+                    continue
+                
+                for position in starts:
+                    if position > target_span[0]:
+                        break
+                    hidden = target_pattern.match(text, position, target_regions[target_span][1])
+                    if hidden is not None and hidden.span("target") == target_span and \
+                            (hidden.span(), hidden.span("target")) != (match.span(), match.span("target")):
+                        yield hidden
+    
+    def _compile_document_pattern(
+        self, pattern: RegexPattern, mention_pattern: str, target_pattern: Optional[str] = None
+    ) -> Optional[Tuple[RegexPattern, Optional[int]]]:
+        """Compile a relationship pattern for matching a whole document.
         
-        # Remove duplicate relationships
-        unique_relationships = self._remove_duplicates(all_relationships)
+        The ``{source}`` and ``{target}`` placeholders become named groups that
+        match any entity mention; a repeated placeholder must repeat the text.
         
-        # Save the relationships for later use
-        self.relationships = unique_relationships
+        Args:
+            pattern: Relationship pattern with placeholders
+            mention_pattern: Regex matching the text of any entity mention
+            target_pattern: Regex for the ``{target}`` placeholder instead of
+                mention_pattern
+            
+        Returns:
+            The compiled pattern and the number of the pattern's own first
+            group, if it has one, or None if the pattern is invalid
+        """
+        pattern_str = pattern.pattern
+        for name, name_pattern in (("source", mention_pattern), ("target", target_pattern or mention_pattern)):
+            placeholder = r"\{" + name + r"\}"
+            pattern_str = pattern_str.replace(placeholder, f"(?P<{name}>{name_pattern})", 1)
+            pattern_str = pattern_str.replace(placeholder, f"(?P={name})")
         
-        return unique_relationships
+        try:
+            compiled = re.compile(pattern_str, re.IGNORECASE)
+        except re.error as e:
+            logger.warning(f"Invalid pattern after substitution: {e}")
+            return None
+        
+        own_groups = set(range(1, compiled.groups + 1)) - set(compiled.groupindex.values())
+        return compiled, min(own_groups) if own_groups else None
     
     def _get_possible_relation_types(
         self, source: Entity, target: Entity
@@ -276,81 +474,6 @@ class PatternRelationshipExtractor(RelationshipExtractor):
         # If no specific mapping, return all relationship types
         return list(self.patterns.keys())
     
-    def _match_patterns(
-        self,
-        context: str,
-        source: Entity,
-        target: Entity,
-        relation_types: List[RelationType]
-    ) -> List[Relationship]:
-        """Try to match relationship patterns in the context.
-        
-        Args:
-            context: Text context between and around the entities
-            source: Source entity
-            target: Target entity
-            relation_types: List of relationship types to check
-            
-        Returns:
-            List of detected relationships
-        """
-        results = []
-        
-        # Prepare entity texts for substitution
-        source_text = re.escape(source.text)
-        target_text = re.escape(target.text)
-        
-        for rel_type in relation_types:
-            # Skip if we don't have patterns for this relationship type
-            if rel_type not in self.patterns:
-                continue
-            
-            for pattern in self.patterns[rel_type]:
-                # Substitute the entity placeholders with the actual entity texts
-                entity_pattern_str = pattern.pattern
-                entity_pattern_str = entity_pattern_str.replace(r'\{source\}', source_text)
-                entity_pattern_str = entity_pattern_str.replace(r'\{target\}', target_text)
-                
-                try:
-                    entity_pattern = re.compile(entity_pattern_str, re.IGNORECASE)
-                    
-                    # Look for the pattern in the context
-                    matches = list(entity_pattern.finditer(context))
-                    
-                    if matches:
-                        # Create a relationship for each match
-                        for match in matches:
-                            # Calculate confidence based on match quality
-                            confidence = self._calculate_confidence(
-                                match, context, source, target, rel_type
-                            )
-                            
-                            # Extract any numeric values for certain relationship types
-                            metadata = {}
-                            if rel_type == RelationType.ACHIEVES and match.lastindex and match.lastindex >= 1:
-                                metadata["value"] = match.group(1)
-                            
-                            # Get the matched context
-                            match_context = match.group(0)
-                            
-                            # Create the relationship
-                            relationship = Relationship(
-                                source=source,
-                                target=target,
-                                relation_type=rel_type,
-                                confidence=confidence,
-                                context=match_context,
-                                metadata=metadata
-                            )
-                            
-                            results.append(relationship)
-                
-                except re.error as e:
-                    logger.warning(f"Invalid pattern after substitution: {e}")
-                    continue
-        
-        return results
-    
     def _calculate_confidence(
         self,
         match: re.Match,
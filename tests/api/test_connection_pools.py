@@ -0,0 +1,151 @@
+"""
+Tests for the process-wide connection pool registry.
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.api.dependencies import database
+from src.api.dependencies.pools import ConnectionPoolRegistry, MongoPoolMonitor, PoolStats
+
+
+class TestPoolStats(unittest.TestCase):
+    """Tests for the PoolStats class."""
+
+    def test_record_wait(self):
+        """Test that waits update the counters and average."""
+        stats = PoolStats()
+        stats.record_wait(2.0)
+        stats.record_wait(4.0)
+
+        data = stats.to_dict()
+        self.assertEqual(data["acquisitions"], 2)
+        self.assertEqual(data["max_wait_ms"], 4.0)
+        self.assertEqual(data["avg_wait_ms"], 3.0)
+
+
+class TestMongoPoolMonitor(unittest.TestCase):
+    """Tests for the MongoPoolMonitor listener."""
+
+    def test_checkout_and_checkin(self):
+        """Test that pool events maintain in-use and idle counts."""
+        monitor = MongoPoolMonitor()
+        event = SimpleNamespace(address=("localhost", 27017), connection_id=1)
+
+        monitor.connection_created(event)
+        monitor.connection_check_out_started(event)
+        monitor.connection_checked_out(event)
+
+        stats = monitor.snapshot()
+        self.assertEqual(stats["in_use"], 1)
+        self.assertEqual(stats["idle"], 0)
+        self.assertEqual(stats["acquisitions"], 1)
+
+        monitor.connection_checked_in(event)
+
+        stats = monitor.snapshot()
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["idle"], 1)
+
+
+class TestConnectionPoolRegistry(unittest.TestCase):
+    """Tests for the ConnectionPoolRegistry class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.neo4j = MagicMock()
+        self.mongo_client = MagicMock()
+        self.neo4j_factory = MagicMock(return_value=self.neo4j)
+        self.mongo_factory = MagicMock(return_value=self.mongo_client)
+        self.registry = ConnectionPoolRegistry(self.neo4j_factory, self.mongo_factory)
+
+    def test_clients_are_created_once(self):
+        """Test that repeated lookups reuse the same clients."""
+        self.registry.startup()
+
+        for _ in range(3):
+            self.assertIs(self.registry.get_neo4j(), self.neo4j)
+            self.assertIs(self.registry.get_mongo_client(), self.mongo_client)
+
+        self.neo4j_factory.assert_called_once()
+        self.mongo_factory.assert_called_once_with(self.registry.mongo_monitor)
+
+    def test_lazy_creation_without_startup(self):
+        """Test that clients are created on first use."""
+        self.assertFalse(self.registry.started)
+        self.assertIs(self.registry.get_neo4j(), self.neo4j)
+        self.assertTrue(self.registry.started)
+
+    def test_startup_tolerates_unavailable_database(self):
+        """Test that a failing factory does not prevent startup."""
+        self.neo4j_factory.side_effect = [ConnectionError("down"), self.neo4j]
+
+        self.registry.startup()
+
+        # The client is retried on first use
+        self.assertIs(self.registry.get_neo4j(), self.neo4j)
+
+    def test_neo4j_session_tracking(self):
+        """Test that borrowed sessions are counted and closed."""
+        session = MagicMock()
+        self.neo4j.get_session.return_value = session
+
+        with self.registry.neo4j_session() as borrowed:
+            self.assertIs(borrowed, session)
+            self.assertEqual(self.registry.stats()["neo4j"]["sessions_open"], 1)
+
+        session.close.assert_called_once()
+        stats = self.registry.stats()["neo4j"]
+        self.assertEqual(stats["sessions_open"], 0)
+        self.assertEqual(stats["sessions_opened"], 1)
+
+    def test_shutdown_closes_clients(self):
+        """Test that shutdown closes both clients and resets the registry."""
+        self.registry.startup()
+        self.registry.shutdown()
+
+        self.neo4j.close.assert_called_once()
+        self.mongo_client.close.assert_called_once()
+        self.assertFalse(self.registry.started)
+
+
+class TestDatabaseDependencies(unittest.TestCase):
+    """Tests for the database dependency providers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mongo_factory = MagicMock()
+        self.registry = ConnectionPoolRegistry(database._create_neo4j_manager, self.mongo_factory)
+        self.original_registry = database.pool_registry
+        database.pool_registry = self.registry
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        database.pool_registry = self.original_registry
+
+    def test_get_neo4j_session(self):
+        """Test that the session dependency borrows and releases a session."""
+        dependency = database.get_neo4j_session()
+
+        session = next(dependency)
+        self.assertEqual(session.run("RETURN 1"), [])
+        self.assertEqual(self.registry.stats()["neo4j"]["sessions_open"], 1)
+
+        with self.assertRaises(StopIteration):
+            next(dependency)
+
+        self.assertEqual(self.registry.stats()["neo4j"]["sessions_open"], 0)
+
+    def test_get_neo4j_is_shared(self):
+        """Test that requests share one Neo4j manager."""
+        first = next(database.get_neo4j())
+        second = next(database.get_neo4j())
+
+        self.assertIs(first, second)
+        with first.transaction() as tx:
+            self.assertEqual(tx.execute_write_query("RETURN 1"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Fixtures for knowledge graph benchmark tests.
+
+This module provides an in-memory stand-in for the Neo4j manager that charges
+a fixed cost per transaction, so benchmarks can compare round-trip behaviour
+without a running database.
+"""
+
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+
+# Simulated network and commit cost of one write transaction; kept small so the
+# per-row work, not sleeping, dominates the larger benchmark sizes
+ROUND_TRIP_SECONDS = 0.0001
+
+
+class InMemoryNeo4jManager:
+    """Neo4jManager stand-in that records transactions and stores rows in dictionaries."""
+
+    def __init__(self, round_trip_seconds: float = ROUND_TRIP_SECONDS):
+        self.round_trip_seconds = round_trip_seconds
+        self.transactions = 0
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.relationships: Dict[str, Dict[str, Any]] = {}
+
+    def create_constraints(self, constraints: List[Dict[str, str]]):
+        pass
+
+    def create_indexes(self, indexes: List[Dict[str, str]]):
+        pass
+
+    def add_label(self, label: str, excluded_labels: Optional[List[str]] = None, batch_size: int = 10000) -> int:
+        return 0
+
+    def create_fulltext_index(self, name: str, labels: List[str], properties: List[str]) -> bool:
+        # No full-text support, so search uses the in-process index
+        return False
+
+    def execute_read_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        self.transactions += 1
+        time.sleep(self.round_trip_seconds)
+        return [{"e": node, "labels": ["Entity"]} for node in self.nodes.values()]
+
+    def execute_write_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        self.transactions += 1
+        time.sleep(self.round_trip_seconds)
+        return self._apply(query, parameters or {})
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        time.sleep(self.round_trip_seconds)
+        yield SimpleNamespace(execute_write_query=lambda query, parameters=None: self._apply(query, parameters or {}))
+
+    def _apply(self, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+
+        if "UNWIND $rows" in query:
+            rows = parameters["rows"]
+            if "MERGE (source)" in query:
+                created = []
+                for row in rows:
+                    if row["source_id"] in self.nodes and row["target_id"] in self.nodes:
+                        self.relationships[row["id"]] = row["properties"]
+                        if "reverse_id" in row:
+                            self.relationships[row["reverse_id"]] = row["reverse_properties"]
+                        created.append({"id": row["id"]})
+                return created
+
+            for row in rows:
+                self.nodes.setdefault(row["id"], {}).update(row["properties"])
+            return [{"id": row["id"]} for row in rows]
+
+        if "source_id" in parameters:
+            if parameters["source_id"] in self.nodes and parameters["target_id"] in self.nodes:
+                self.relationships[parameters["id"]] = dict(parameters)
+                return [{"r": dict(parameters)}]
+            return []
+
+        self.nodes[parameters["id"]] = dict(parameters)
+        return [{"e": dict(parameters)}]
+
+    def close(self):
+        pass
+
+
+class Timer:
+    """Utility class for timing operations."""
+
+    def __init__(self, name):
+        self.name = name
+        self.start_time = None
+        self.end_time = None
+
+    def __enter__(self):
+        self.start_time = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end_time = time.time()
+        print(f"{self.name}: {self.duration:.4f} seconds")
+
+    @property
+    def duration(self):
+        """Return the duration in seconds."""
+        if self.start_time is None or self.end_time is None:
+            return 0
+        return self.end_time - self.start_time
+
+
+@pytest.fixture
+def in_memory_neo4j():
+    """Return an in-memory Neo4j manager stand-in."""
+    return InMemoryNeo4jManager()
+
+
+@pytest.fixture
+def timer():
+    """Return a Timer class for benchmarking."""
+    return Timer
@@ -0,0 +1,123 @@
+"""
+Benchmark tests for bulk ingest into the knowledge graph.
+
+These tests compare the per-entity write path with the chunked UNWIND path of
+KnowledgeGraphManager using an in-memory Neo4j stand-in that charges a fixed
+cost per transaction.
+"""
+
+import logging
+import os
+
+import pytest
+
+# Mark all tests in this module as benchmark tests
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow
+]
+
+from src.knowledge_graph_system.core.knowledge_graph_manager import KnowledgeGraphManager
+from src.knowledge_graph_system.core.models.base_models import GraphEntity, GraphRelationship
+
+
+# The 100k case takes tens of seconds on the per-row path; opt in explicitly
+ROW_COUNTS = [
+    1000,
+    10000,
+    pytest.param(100000, marks=pytest.mark.skipif(
+        not os.environ.get("RUN_LARGE_BENCHMARKS"),
+        reason="set RUN_LARGE_BENCHMARKS=1 to run the 100k row benchmark"
+    )),
+]
+
+
+def _generate_graph(row_count):
+    """Generate row_count entities and a chain of relationships between them."""
+    labels = ["AIModel", "Dataset", "Algorithm", "Metric"]
+    entities = [
+        GraphEntity(
+            id=f"entity-{i}",
+            label=labels[i % len(labels)],
+            properties={"name": f"Entity {i}"}
+        )
+        for i in range(row_count)
+    ]
+    relationships = [
+        GraphRelationship(
+            id=f"rel-{i}",
+            type="EVALUATED_ON" if i % 2 else "USES",
+            source_id=f"entity-{i}",
+            target_id=f"entity-{i + 1}"
+        )
+        for i in range(row_count - 1)
+    ]
+    return entities, relationships
+
+
+@pytest.fixture(autouse=True)
+def quiet_manager_logging():
+    """Silence per-entity INFO logging so it does not dominate the timings."""
+    manager_logger = logging.getLogger("src.knowledge_graph_system.core.knowledge_graph_manager")
+    plain_logger = logging.getLogger("knowledge_graph_system.core.knowledge_graph_manager")
+    previous = (manager_logger.level, plain_logger.level)
+    manager_logger.setLevel(logging.WARNING)
+    plain_logger.setLevel(logging.WARNING)
+    yield
+    manager_logger.setLevel(previous[0])
+    plain_logger.setLevel(previous[1])
+
+
+@pytest.mark.parametrize('row_count', ROW_COUNTS)
+def test_bulk_vs_individual_entity_ingest(row_count, in_memory_neo4j, timer):
+    """Compare per-entity and UNWIND ingest of entities."""
+    entities, _ = _generate_graph(row_count)
+    manager = KnowledgeGraphManager(in_memory_neo4j)
+
+    with timer(f"batch_add_entities(bulk=False, {row_count} rows)") as individual:
+        individual_result = manager.batch_add_entities(entities, bulk=False)
+    individual_transactions = in_memory_neo4j.transactions
+
+    in_memory_neo4j.transactions = 0
+    in_memory_neo4j.nodes.clear()
+
+    with timer(f"batch_add_entities(bulk=True, {row_count} rows)") as bulk:
+        bulk_result = manager.batch_add_entities(entities)
+    bulk_transactions = in_memory_neo4j.transactions
+
+    print(f"Transactions: individual={individual_transactions}, bulk={bulk_transactions}, "
+          f"speedup={individual.duration / max(bulk.duration, 1e-9):.1f}x")
+
+    assert individual_result["success_count"] == row_count
+    assert bulk_result["success_count"] == row_count
+    assert len(in_memory_neo4j.nodes) == row_count
+    assert bulk_transactions < individual_transactions
+    assert bulk.duration < individual.duration
+
+
+@pytest.mark.parametrize('row_count', ROW_COUNTS)
+def test_bulk_vs_individual_relationship_ingest(row_count, in_memory_neo4j, timer):
+    """Compare per-relationship and UNWIND ingest of relationships."""
+    entities, relationships = _generate_graph(row_count)
+    manager = KnowledgeGraphManager(in_memory_neo4j)
+    manager.batch_add_entities(entities)
+
+    in_memory_neo4j.transactions = 0
+    with timer(f"batch_add_relationships(bulk=False, {row_count} rows)") as individual:
+        individual_result = manager.batch_add_relationships(relationships, bulk=False)
+    individual_transactions = in_memory_neo4j.transactions
+
+    in_memory_neo4j.transactions = 0
+    in_memory_neo4j.relationships.clear()
+
+    with timer(f"batch_add_relationships(bulk=True, {row_count} rows)") as bulk:
+        bulk_result = manager.batch_add_relationships(relationships)
+    bulk_transactions = in_memory_neo4j.transactions
+
+    print(f"Transactions: individual={individual_transactions}, bulk={bulk_transactions}, "
+          f"speedup={individual.duration / max(bulk.duration, 1e-9):.1f}x")
+
+    assert individual_result["success_count"] == len(relationships)
+    assert bulk_result["success_count"] == len(relationships)
+    assert bulk_transactions < individual_transactions
+    assert bulk.duration < individual.duration
@@ -0,0 +1,105 @@
+"""
+Benchmark tests for embedding similarity.
+
+These tests compare the previous per-pair cosine similarity loop of the
+connection discovery engine with the batched matrix products of the
+embedding index, and measure approximate search over a large collection.
+"""
+
+import itertools
+import math
+import os
+
+import numpy as np
+import pytest
+
+# Mark all tests in this module as benchmark tests
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow
+]
+
+from src.knowledge_graph_system.embeddings.embedding_index import EmbeddingIndex
+
+
+DIMENSION = 64
+
+# Building and hashing 1M vectors takes tens of seconds; opt in explicitly
+SEARCH_COUNTS = [
+    100000,
+    pytest.param(1000000, marks=pytest.mark.skipif(
+        not os.environ.get("RUN_LARGE_BENCHMARKS"),
+        reason="set RUN_LARGE_BENCHMARKS=1 to run the 1M vector benchmark"
+    )),
+]
+
+
+def _cosine(vector1, vector2):
+    """Emulate a per-pair similarity call on Python lists."""
+    dot = sum(a * b for a, b in zip(vector1, vector2))
+    norm1 = math.sqrt(sum(a * a for a in vector1))
+    norm2 = math.sqrt(sum(b * b for b in vector2))
+    return dot / (norm1 * norm2)
+
+
+@pytest.mark.parametrize('entity_count', [500, 2000])
+def test_all_pairs_vs_per_pair_loop(entity_count, timer):
+    """Compare thresholded all-pairs search with a per-pair Python loop."""
+    rng = np.random.default_rng(42)
+    embeddings = rng.standard_normal((entity_count, DIMENSION)).astype(np.float32)
+    ids = [f"entity-{i}" for i in range(entity_count)]
+    threshold = 0.35
+
+    index = EmbeddingIndex(DIMENSION, capacity=entity_count)
+    index.add_many(ids, embeddings)
+
+    # The loop is quadratic in Python; time a fixed sample of pairs and extrapolate
+    lists = embeddings.tolist()
+    sample = list(itertools.islice(itertools.combinations(range(entity_count), 2), 100000))
+    with timer(f"Per-pair loop ({len(sample)} of {entity_count} entities' pairs)") as loop:
+        for i, j in sample:
+            _cosine(lists[i], lists[j])
+    pair_count = entity_count * (entity_count - 1) // 2
+    estimated = loop.duration * pair_count / len(sample)
+
+    with timer(f"EmbeddingIndex.similar_pairs ({entity_count} entities)") as batched:
+        pairs = index.similar_pairs(threshold)
+
+    print(f"Estimated per-pair loop: {estimated:.2f}s, speedup: {estimated / max(batched.duration, 1e-9):.1f}x")
+
+    assert all(score >= threshold for _, _, score in pairs)
+    assert batched.duration < estimated
+
+
+@pytest.mark.parametrize('vector_count', SEARCH_COUNTS)
+def test_exact_vs_approximate_top_k(vector_count, timer):
+    """Measure exact and LSH top-k latency and the recall of LSH."""
+    rng = np.random.default_rng(7)
+    centers = rng.standard_normal((vector_count // 10, DIMENSION)).astype(np.float32)
+    embeddings = np.repeat(centers, 10, axis=0) + 0.05 * rng.standard_normal(
+        (vector_count, DIMENSION)
+    ).astype(np.float32)
+    ids = [f"entity-{i}" for i in range(vector_count)]
+
+    with timer(f"EmbeddingIndex build ({vector_count} vectors)"):
+        index = EmbeddingIndex(DIMENSION, capacity=vector_count)
+        index.add_many(ids, embeddings)
+
+    queries = ids[::vector_count // 20]
+    with timer(f"Exact top-10 ({vector_count} vectors, {len(queries)} queries)"):
+        exact = [index.top_k_similar(query, k=9) for query in queries]
+
+    with timer(f"LSH tables ({vector_count} vectors)"):
+        index.enable_approximate(n_bits=12, n_tables=8)
+
+    with timer(f"Approximate top-10 ({vector_count} vectors, {len(queries)} queries)"):
+        approximate = [index.top_k_similar(query, k=9) for query in queries]
+
+    hits = sum(
+        len({match for match, _ in exact_matches} & {match for match, _ in approximate_matches})
+        for exact_matches, approximate_matches in zip(exact, approximate)
+    )
+    recall = hits / sum(len(matches) for matches in exact)
+    print(f"LSH recall@9: {recall:.3f}")
+
+    assert recall > 0.8
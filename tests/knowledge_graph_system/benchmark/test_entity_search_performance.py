@@ -0,0 +1,109 @@
+"""
+Benchmark tests for entity search.
+
+These tests compare the previous regex full scan over every node with the
+in-process inverted index that backs search_entities when the database has no
+full-text index support.
+"""
+
+import os
+import random
+import re
+
+import pytest
+
+# Mark all tests in this module as benchmark tests
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow
+]
+
+from src.knowledge_graph_system.core.utils.search_index import EntitySearchIndex
+
+
+# Building the 1M entity index takes tens of seconds; opt in explicitly
+ENTITY_COUNTS = [
+    100000,
+    pytest.param(1000000, marks=pytest.mark.skipif(
+        not os.environ.get("RUN_LARGE_BENCHMARKS"),
+        reason="set RUN_LARGE_BENCHMARKS=1 to run the 1M entity benchmark"
+    )),
+]
+
+WORDS = [
+    "neural", "graph", "transformer", "vision", "language", "diffusion", "sparse",
+    "attention", "recurrent", "contrastive", "generative", "retrieval", "quantized",
+    "federated", "causal", "bayesian", "adaptive", "efficient", "robust", "latent"
+]
+
+
+def _generate_entities(entity_count, seed=42):
+    """Generate entities with multi-word names and aliases."""
+    rng = random.Random(seed)
+    entities = []
+    for i in range(entity_count):
+        name = " ".join(rng.sample(WORDS, 2)) + f" model{i}"
+        entities.append({
+            "id": f"entity-{i}",
+            "name": name,
+            "aliases": [f"{rng.choice(WORDS)} net {i}"],
+            "confidence": 1.0
+        })
+    return entities
+
+
+def _regex_scan(entities, search_text, limit):
+    """Emulate the previous search_entities query: a regex test against every node."""
+    pattern = re.compile(f"(?i).*{search_text}.*")
+    results = []
+    for entity in entities:
+        if (pattern.match(entity["name"]) or pattern.match(entity["id"])
+                or any(pattern.match(alias) for alias in entity["aliases"])):
+            results.append(entity)
+            if len(results) >= limit:
+                break
+    return results
+
+
+@pytest.mark.parametrize('entity_count', ENTITY_COUNTS)
+def test_index_vs_regex_scan(entity_count, timer):
+    """Compare search latency of the inverted index with a regex full scan."""
+    entities = _generate_entities(entity_count)
+
+    with timer(f"EntitySearchIndex build ({entity_count} entities)"):
+        index = EntitySearchIndex()
+        for entity in entities:
+            index.add(entity, ["Entity"])
+
+    # A selective query: the scan must visit every node to find the single match
+    target = entity_count - 1
+    queries = [f"model{target}", f"model{entity_count // 2}"]
+
+    with timer(f"Regex scan ({entity_count} entities, {len(queries)} queries)") as scan:
+        scan_results = [_regex_scan(entities, query, 10) for query in queries]
+
+    with timer(f"Index search ({entity_count} entities, {len(queries)} queries)") as indexed:
+        index_results = [index.search(query, limit=10) for query in queries]
+
+    print(f"Speedup: {scan.duration / max(indexed.duration, 1e-9):.1f}x")
+
+    assert [entity["id"] for entity, _ in index_results[0]] == [f"entity-{target}"]
+    assert scan_results[0][0]["id"] == f"entity-{target}"
+    assert indexed.duration < scan.duration
+
+
+@pytest.mark.parametrize('entity_count', ENTITY_COUNTS)
+def test_index_search_modes(entity_count, timer):
+    """Measure ranked search latency for each search mode."""
+    index = EntitySearchIndex()
+    for entity in _generate_entities(entity_count):
+        index.add(entity, ["Entity"])
+
+    for mode, query in [("exact", "sparse attention"), ("prefix", "contrast gener"),
+                        ("fuzzy", "transfromer")]:
+        with timer(f"Index search mode={mode} ({entity_count} entities)"):
+            results = index.search(query, mode=mode, limit=20)
+
+        assert results
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,72 @@
+"""
+Benchmark tests for structural entity similarity.
+
+These tests measure build and query latency of the MinHash LSH index that
+backs KnowledgeGraphManager.find_similar_entities, and its recall against
+exact Jaccard scoring.
+"""
+
+import random
+
+import pytest
+
+# Mark all tests in this module as benchmark tests
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow
+]
+
+from src.knowledge_graph_system.core.utils.similarity_index import (
+    PROPERTY_WEIGHT, EntitySimilarityIndex, property_tokens
+)
+
+
+ARCHITECTURES = ["transformer", "cnn", "rnn", "mlp", "gnn", "diffusion"]
+FRAMEWORKS = ["pytorch", "jax", "tensorflow"]
+
+
+def _generate_entities(entity_count, seed=11):
+    """Generate model entities with overlapping properties."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"model-{i}",
+            "architecture": rng.choice(ARCHITECTURES),
+            "framework": rng.choice(FRAMEWORKS),
+            "layers": rng.choice([12, 24, 48]),
+            "family": f"family-{rng.randrange(entity_count // 20)}",
+            "license": rng.choice(["mit", "apache-2.0"])
+        }
+        for i in range(entity_count)
+    ]
+
+
+@pytest.mark.parametrize('entity_count', [20000])
+def test_query_latency_and_recall(entity_count, timer):
+    """Measure per-query latency and recall of the similarity index."""
+    entities = _generate_entities(entity_count)
+
+    with timer(f"EntitySimilarityIndex build ({entity_count} entities)"):
+        index = EntitySimilarityIndex()
+        for entity in entities:
+            index.add_entity(entity["id"], entity, ["Entity", "AIModel"])
+
+    queries = entities[:50]
+    with timer(f"EntitySimilarityIndex query ({len(queries)} queries)") as queried:
+        results = [index.query(query["id"], threshold=0.5, limit=10) for query in queries]
+
+    print(f"Mean query latency: {1000 * queried.duration / len(queries):.2f}ms")
+
+    # Exact scores of every same-label entity for the first query
+    tokens = {entity["id"]: property_tokens(entity) for entity in entities}
+    query_tokens = tokens[queries[0]["id"]]
+    exact = {
+        entity_id for entity_id, entity_tokens in tokens.items()
+        if entity_id != queries[0]["id"]
+        and PROPERTY_WEIGHT * len(query_tokens & entity_tokens) / len(query_tokens | entity_tokens) >= 0.55
+    }
+    found = {entity_id for entity_id, _ in index.query(queries[0]["id"], threshold=0.4, limit=entity_count)}
+
+    assert exact <= found
+    assert queried.duration / len(queries) < 0.1
+    assert all(len(matches) <= 10 for matches in results)
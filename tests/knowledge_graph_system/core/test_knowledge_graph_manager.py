@@ -0,0 +1,759 @@
+"""
+Tests for the Knowledge Graph Manager module.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.knowledge_graph_system.core.knowledge_graph_manager import KnowledgeGraphManager
+from src.knowledge_graph_system.core.models.base_models import GraphEntity, GraphRelationship
+from src.knowledge_graph_system.core.utils.ndjson_stream import iter_records
+from src.knowledge_graph_system.embeddings.embedding_index import EmbeddingIndex
+
+
+def echo_ids(query, params):
+    """Simulate a write that stores every row and returns its ID."""
+    return [{"id": row["id"]} for row in params["rows"]]
+
+
+class TestKnowledgeGraphManagerBatching(unittest.TestCase):
+    """Tests for the bulk ingest path of KnowledgeGraphManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.mock_db.execute_write_query.side_effect = echo_ids
+        self.manager = KnowledgeGraphManager(self.mock_db, batch_size=2)
+
+    def test_schema_labels_existing_entities(self):
+        """Test that nodes written before the Entity label get it when the schema is initialized."""
+        self.mock_db.add_label.assert_called_once_with(
+            "Entity", excluded_labels=["TemporalChange", "TemporalCheckpoint"]
+        )
+
+    def test_invalid_batch_size(self):
+        """Test that a non-positive batch size is rejected."""
+        with self.assertRaises(ValueError):
+            KnowledgeGraphManager(self.mock_db, batch_size=0)
+
+    def test_invalid_batch_size_override(self):
+        """Test that a non-positive per-call batch size is rejected."""
+        entity = GraphEntity(id="e1", label="Model")
+        relationship = GraphRelationship(id="r1", type="USES", source_id="a", target_id="b")
+
+        with self.assertRaises(ValueError):
+            self.manager.batch_add_entities([entity], batch_size=-1)
+        with self.assertRaises(ValueError):
+            self.manager.batch_add_relationships([relationship], batch_size=0)
+
+        self.mock_db.execute_write_query.assert_not_called()
+
+    def test_batch_add_entities_chunks_by_label(self):
+        """Test that entities are grouped by label and chunked."""
+        entities = [GraphEntity(id=f"m{i}", label="Model") for i in range(3)]
+        entities.append(GraphEntity(id="d0", label="Dataset"))
+
+        result = self.manager.batch_add_entities(entities)
+
+        self.assertEqual(result["success_count"], 4)
+        self.assertEqual(result["failure_count"], 0)
+
+        # Two chunks for Model (2 + 1) and one for Dataset
+        calls = self.mock_db.execute_write_query.call_args_list
+        self.assertEqual(len(calls), 3)
+        self.assertIn("UNWIND $rows AS row", calls[0].args[0])
+        self.assertIn("MERGE (e:Entity {id: row.id})", calls[0].args[0])
+        self.assertIn("e:`Model`", calls[0].args[0])
+        self.assertEqual([row["id"] for row in calls[0].args[1]["rows"]], ["m0", "m1"])
+        self.assertEqual([row["id"] for row in calls[1].args[1]["rows"]], ["m2"])
+        self.assertIn("e:`Dataset`", calls[2].args[0])
+
+    def test_batch_add_entities_sets_extra_labels(self):
+        """Test that secondary labels are added to merged nodes."""
+        entity = GraphEntity(id="e1", label="Model", labels={"Model", "Paper"})
+
+        self.manager.batch_add_entities([entity])
+
+        query = self.mock_db.execute_write_query.call_args.args[0]
+        self.assertIn("MERGE (e:Entity {id: row.id})", query)
+        self.assertIn("e:`Model`:`Paper`", query)
+
+    def test_batch_add_entities_counts_written_rows(self):
+        """Test that rows missing from the result are reported as failures."""
+        entities = [GraphEntity(id=f"e{i}", label="Model") for i in range(2)]
+        self.mock_db.execute_write_query.side_effect = None
+        self.mock_db.execute_write_query.return_value = [{"id": "e0"}]
+
+        result = self.manager.batch_add_entities(entities)
+
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(result["failure_count"], 1)
+        self.assertEqual(result["failures"][0]["entity_id"], "e1")
+
+    def test_batch_add_entities_isolates_failed_chunks(self):
+        """Test that a failing chunk does not affect the other chunks."""
+        entities = [GraphEntity(id=f"e{i}", label="Model") for i in range(4)]
+        self.mock_db.execute_write_query.side_effect = [
+            [{"id": "e0"}, {"id": "e1"}], Exception("boom")
+        ]
+
+        result = self.manager.batch_add_entities(entities)
+
+        self.assertEqual(result["success_count"], 2)
+        self.assertEqual(result["failure_count"], 2)
+        self.assertEqual(
+            result["failures"],
+            [{"entity_id": "e2", "error": "boom"}, {"entity_id": "e3", "error": "boom"}]
+        )
+
+    def test_batch_add_entities_custom_batch_size(self):
+        """Test that the batch size can be overridden per call."""
+        entities = [GraphEntity(id=f"e{i}", label="Model") for i in range(5)]
+
+        result = self.manager.batch_add_entities(entities, batch_size=10)
+
+        self.assertEqual(self.mock_db.execute_write_query.call_count, 1)
+        self.assertEqual(result["success_count"], 5)
+
+    def test_batch_add_entities_individual_path(self):
+        """Test that bulk=False adds entities one at a time."""
+        entities = [GraphEntity(id=f"e{i}", label="Model") for i in range(3)]
+        self.mock_db.execute_write_query.side_effect = None
+
+        result = self.manager.batch_add_entities(entities, bulk=False)
+
+        self.assertEqual(result["success_count"], 3)
+        self.assertEqual(self.mock_db.execute_write_query.call_count, 3)
+        query = self.mock_db.execute_write_query.call_args.args[0]
+        self.assertIn("CREATE (e:Model:Entity", query)
+
+    def test_batch_add_relationships_reports_missing_endpoints(self):
+        """Test that relationships without matching endpoints are reported as failures."""
+        relationships = [
+            GraphRelationship(id="r1", type="USES", source_id="a", target_id="b"),
+            GraphRelationship(id="r2", type="USES", source_id="a", target_id="missing"),
+        ]
+        self.mock_db.execute_write_query.side_effect = None
+        self.mock_db.execute_write_query.return_value = [{"id": "r1"}]
+
+        result = self.manager.batch_add_relationships(relationships)
+
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(result["failure_count"], 1)
+        self.assertEqual(result["failures"][0]["relationship_id"], "r2")
+
+        query, params = self.mock_db.execute_write_query.call_args.args
+        self.assertIn("MATCH (source:Entity {id: row.source_id})", query)
+        self.assertIn("MATCH (target:Entity {id: row.target_id})", query)
+        self.assertIn("MERGE (source)-[r:`USES` {id: row.id}]->(target)", query)
+        row = params["rows"][0]
+        self.assertEqual(row["source_id"], "a")
+        self.assertNotIn("source_id", row["properties"])
+        self.assertNotIn("bidirectional", row["properties"])
+
+    def test_batch_add_relationships_bidirectional(self):
+        """Test that the reverse edge is written by the same statement as the forward edge."""
+        relationships = [
+            GraphRelationship(id="r1", type="RELATED_TO", source_id="a", target_id="b", bidirectional=True),
+            GraphRelationship(id="r2", type="RELATED_TO", source_id="b", target_id="c"),
+        ]
+
+        result = self.manager.batch_add_relationships(relationships)
+
+        self.assertEqual(result["success_count"], 2)
+        self.assertEqual(result["failure_count"], 0)
+
+        # One statement per (type, direction) group
+        calls = self.mock_db.execute_write_query.call_args_list
+        self.assertEqual(len(calls), 2)
+        query, params = calls[0].args
+        self.assertIn("MERGE (target)-[reverse:`REVERSE_RELATED_TO` {id: row.reverse_id}]->(source)", query)
+        row = params["rows"][0]
+        self.assertEqual(row["reverse_properties"]["id"], row["reverse_id"])
+        self.assertNotIn("REVERSE_", calls[1].args[0])
+
+        # Writing the batch again merges the same reverse edge
+        self.manager.batch_add_relationships(relationships)
+        self.assertEqual(self.mock_db.execute_write_query.call_args_list[2].args[1]["rows"][0]["reverse_id"],
+                         row["reverse_id"])
+
+    def test_batch_add_relationships_bidirectional_failure(self):
+        """Test that a failed bidirectional write reports the relationship once."""
+        relationship = GraphRelationship(
+            id="r1", type="RELATED_TO", source_id="a", target_id="b", bidirectional=True
+        )
+        self.mock_db.execute_write_query.side_effect = Exception("deadlock")
+
+        result = self.manager.batch_add_relationships([relationship])
+
+        self.assertEqual(result["success_count"], 0)
+        self.assertEqual(result["failures"], [{"relationship_id": "r1", "error": "deadlock"}])
+
+    def test_batch_add_relationships_isolates_failed_chunks(self):
+        """Test that a failing relationship chunk is reported per relationship."""
+        relationships = [
+            GraphRelationship(id=f"r{i}", type="USES", source_id="a", target_id="b")
+            for i in range(3)
+        ]
+        self.mock_db.execute_write_query.side_effect = [
+            Exception("deadlock"), [{"id": "r2"}]
+        ]
+
+        result = self.manager.batch_add_relationships(relationships)
+
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(result["failure_count"], 2)
+        self.assertEqual(
+            [failure["relationship_id"] for failure in result["failures"]],
+            ["r0", "r1"]
+        )
+
+
+class TestKnowledgeGraphManagerRelationshipWrites(unittest.TestCase):
+    """Tests for the single relationship write path of KnowledgeGraphManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.manager = KnowledgeGraphManager(self.mock_db)
+        self.mock_db.reset_mock()
+
+    def test_add_relationship_writes_both_directions_in_one_statement(self):
+        """Test that a bidirectional relationship is written with one statement."""
+        relationship = GraphRelationship(
+            id="r1", type="RELATED_TO", source_id="a", target_id="b", bidirectional=True
+        )
+        self.mock_db.execute_write_query.return_value = [{"id": "r1"}]
+
+        result = self.manager.add_relationship(relationship)
+
+        self.assertTrue(result["success"])
+        self.mock_db.execute_write_query.assert_called_once()
+        self.mock_db.transaction.assert_not_called()
+        query, params = self.mock_db.execute_write_query.call_args.args
+        self.assertIn("UNWIND $rows AS row", query)
+        self.assertIn("`REVERSE_RELATED_TO`", query)
+        row, = params["rows"]
+        self.assertEqual((row["id"], row["source_id"], row["target_id"]), ("r1", "a", "b"))
+        self.assertEqual(row["reverse_id"], "r1:reverse")
+        self.assertEqual(row["reverse_properties"]["id"], "r1:reverse")
+
+    def test_add_relationship_failure(self):
+        """Test that a failed bidirectional write reports the error."""
+        relationship = GraphRelationship(
+            id="r1", type="RELATED_TO", source_id="a", target_id="b", bidirectional=True
+        )
+        self.mock_db.execute_write_query.side_effect = Exception("constraint")
+
+        result = self.manager.add_relationship(relationship)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "constraint")
+
+
+class TestKnowledgeGraphManagerSearch(unittest.TestCase):
+    """Tests for full-text entity search."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.mock_db.create_fulltext_index.return_value = True
+        self.manager = KnowledgeGraphManager(self.mock_db)
+
+    def test_schema_creates_fulltext_index(self):
+        """Test that the schema provisions the full-text index."""
+        self.mock_db.create_fulltext_index.assert_called_once_with(
+            "entity_fulltext_index", ["Entity"], ["name", "aliases"]
+        )
+        self.assertTrue(self.manager.fulltext_enabled)
+
+    def test_search_uses_fulltext_index(self):
+        """Test that search queries the full-text index with ranked results."""
+        self.mock_db.execute_read_query.return_value = [
+            {"e": {"id": "m1", "name": "BERT"}, "score": 2.5}
+        ]
+
+        results = self.manager.search_entities("BERT large", labels=["AIModel"], limit=5, mode="prefix")
+
+        self.assertEqual(results, [{"id": "m1", "name": "BERT", "score": 2.5}])
+        query, params = self.mock_db.execute_read_query.call_args.args
+        self.assertIn("db.index.fulltext.queryNodes", query)
+        self.assertNotIn("=~", query)
+        self.assertEqual(params["search_query"], "bert* AND large*")
+        self.assertEqual(params["labels"], ["AIModel"])
+        self.assertEqual(params["limit"], 5)
+
+    def test_fulltext_query_modes(self):
+        """Test the Lucene query built for each mode."""
+        self.assertEqual(self.manager._build_fulltext_query("GPT-4", "exact"), "gpt AND 4")
+        self.assertEqual(self.manager._build_fulltext_query("resnet", "fuzzy"), "resnet~")
+
+    def test_search_falls_back_to_in_process_index(self):
+        """Test that search uses an in-process index when full-text search fails."""
+        def read_query(query, params=None):
+            if "fulltext" in query:
+                raise Exception("There is no procedure with the name `db.index.fulltext.queryNodes`")
+            return [
+                {"e": {"id": "m1", "name": "BERT", "confidence": 1.0}, "labels": ["Entity", "AIModel"]},
+                {"e": {"id": "d1", "name": "SQuAD", "confidence": 1.0}, "labels": ["Entity", "Dataset"]},
+            ]
+
+        self.mock_db.execute_read_query.side_effect = read_query
+
+        results = self.manager.search_entities("bert")
+
+        self.assertEqual([result["id"] for result in results], ["m1"])
+        self.assertFalse(self.manager.fulltext_enabled)
+
+        # The index is loaded once and kept up to date by writes
+        self.manager.add_entity(GraphEntity(id="m2", label="AIModel", properties={"name": "BERT base"}))
+        self.manager.delete_entity("m1")
+        results = self.manager.search_entities("bert")
+
+        self.assertEqual([result["id"] for result in results], ["m2"])
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 2)
+
+    def test_search_without_fulltext_support(self):
+        """Test that the in-process index is used when the index cannot be created."""
+        mock_db = MagicMock()
+        mock_db.create_fulltext_index.return_value = False
+        mock_db.execute_read_query.return_value = []
+        manager = KnowledgeGraphManager(mock_db)
+
+        self.assertEqual(manager.search_entities("bert"), [])
+        query = mock_db.execute_read_query.call_args.args[0]
+        self.assertIn("MATCH (e:Entity)", query)
+
+    def test_search_index_is_shared_by_managers_of_a_database(self):
+        """Test that managers built per request on one database share the fallback index."""
+        def read_query(query, params=None):
+            if "fulltext" in query:
+                raise Exception("There is no procedure with the name `db.index.fulltext.queryNodes`")
+            return [{"e": {"id": "m1", "name": "BERT", "confidence": 1.0}, "labels": ["Entity", "AIModel"]}]
+
+        self.mock_db.execute_read_query.side_effect = read_query
+        self.assertEqual([result["id"] for result in self.manager.search_entities("bert")], ["m1"])
+
+        # A new manager neither retries full-text search nor rebuilds the index,
+        # and sees the writes of the others
+        manager = KnowledgeGraphManager(self.mock_db)
+        self.assertFalse(manager.fulltext_enabled)
+        self.manager.add_entity(GraphEntity(id="m2", label="AIModel", properties={"name": "BERT base"}))
+        results = manager.search_entities("bert")
+
+        self.assertEqual([result["id"] for result in results], ["m1", "m2"])
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 2)
+        self.assertIs(manager._search_index, self.manager._search_index)
+        self.assertIsNone(KnowledgeGraphManager(MagicMock())._search_index)
+
+    def test_search_invalid_mode(self):
+        """Test that an unknown search mode is rejected."""
+        with self.assertRaises(ValueError):
+            self.manager.search_entities("bert", mode="regex")
+
+
+class TestKnowledgeGraphManagerEdgeList(unittest.TestCase):
+    """Tests for the bulk edge list fetch."""
+
+    def test_get_edge_list_single_query(self):
+        """Test that the edge list is fetched with one read query."""
+        mock_db = MagicMock()
+        mock_db.execute_read_query.return_value = [
+            {"source_id": "m1", "target_id": "d1", "type": "TRAINED_ON"}
+        ]
+        manager = KnowledgeGraphManager(mock_db)
+
+        edges = manager.get_edge_list()
+
+        self.assertEqual(edges, [{"source_id": "m1", "target_id": "d1", "type": "TRAINED_ON"}])
+        mock_db.execute_read_query.assert_called_once()
+        self.assertIn("(source:Entity)-[r]->(target:Entity)", mock_db.execute_read_query.call_args.args[0])
+
+
+class TestKnowledgeGraphManagerEmbeddings(unittest.TestCase):
+    """Tests for embedding index maintenance and similarity search."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.index = EmbeddingIndex(2)
+        self.manager = KnowledgeGraphManager(self.mock_db, embedding_index=self.index)
+
+    def test_writes_maintain_index(self):
+        """Test that entity writes add, update and remove embeddings."""
+        self.manager.add_entity(GraphEntity(id="m1", label="AIModel", properties={"embedding": [1.0, 0.0]}))
+        self.manager.add_entity(GraphEntity(id="m2", label="AIModel"))
+        self.assertIn("m1", self.index)
+        self.assertNotIn("m2", self.index)
+
+        self.mock_db.execute_write_query.return_value = [{"e": {"id": "m2"}, "labels": ["Entity"]}]
+        self.manager.update_entity("m2", {"embedding": [0.0, 1.0]})
+        self.assertIn("m2", self.index)
+
+        self.mock_db.execute_write_query.return_value = [{"labels": ["Entity"], "types": []}]
+        self.manager.delete_entity("m1")
+        self.assertNotIn("m1", self.index)
+
+    def test_index_error_does_not_fail_write(self):
+        """Test that an embedding the index rejects is logged, not reported as a failed write."""
+        self.manager.add_entity(GraphEntity(id="m1", label="AIModel", properties={"embedding": [1.0, 0.0]}))
+
+        result = self.manager.add_entity(GraphEntity(id="m1", label="AIModel", properties={"embedding": [1.0]}))
+
+        self.assertTrue(result["success"])
+        self.assertNotIn("m1", self.index)
+
+    def test_find_similar_entities_uses_index(self):
+        """Test that similar entities come from the index in similarity order."""
+        self.index.add_many(["m1", "m2", "m3"], [[1.0, 0.0], [0.6, 0.8], [0.9, 0.1]])
+        self.mock_db.execute_read_query.return_value = [{"e": {"id": "m2"}}, {"e": {"id": "m3"}}]
+
+        results = self.manager.find_similar_entities("m1", threshold=0.5, limit=5)
+
+        self.assertEqual([result["entity"]["id"] for result in results], ["m3", "m2"])
+        self.assertGreater(results[0]["similarity"], results[1]["similarity"])
+        query, params = self.mock_db.execute_read_query.call_args.args
+        self.assertIn("e.id IN $ids", query)
+        self.assertEqual(params["ids"], ["m3", "m2"])
+
+
+class TestKnowledgeGraphManagerSimilarity(unittest.TestCase):
+    """Tests for find_similar_entities backed by the similarity index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.manager = KnowledgeGraphManager(self.mock_db)
+        nodes = [
+            {"e": {"id": "m1", "architecture": "transformer", "framework": "jax"}, "labels": ["Entity", "AIModel"]},
+            {"e": {"id": "m2", "architecture": "transformer", "framework": "jax"}, "labels": ["Entity", "AIModel"]},
+            {"e": {"id": "d1", "architecture": "transformer", "framework": "jax"}, "labels": ["Entity", "Dataset"]}
+        ]
+        edges = [{"id": "r1", "source_id": "m1", "target_id": "d1", "type": "TRAINED_ON"}]
+
+        def read(query, params=None):
+            if "e.id IN $ids" in query:
+                return [node for node in nodes if node["e"]["id"] in params["ids"]]
+            if "(source:Entity)-[r]->(target:Entity)" in query:
+                return edges
+            return nodes
+
+        self.mock_db.execute_read_query.side_effect = read
+
+    def test_index_loaded_once(self):
+        """Test that the loaded index serves the threshold and limit for every manager."""
+        self.manager._load_similarity_index()
+        results = self.manager.find_similar_entities("m1", threshold=0.5, limit=5)
+        KnowledgeGraphManager(self.mock_db).find_similar_entities("m1", threshold=0.5, limit=5)
+
+        self.assertEqual([(result["entity"]["id"], result["similarity"]) for result in results], [("m2", 0.7)])
+        # Two loading queries, then one entity lookup per call
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 4)
+        self.assertEqual(self.manager.find_similar_entities("m1", threshold=0.8), [])
+
+    def test_writes_maintain_index(self):
+        """Test that relationship and entity writes of any manager update the loaded index."""
+        self.manager._load_similarity_index()
+        other_manager = KnowledgeGraphManager(self.mock_db)
+        self.mock_db.execute_write_query.return_value = [{"id": "r2"}]
+
+        other_manager.add_relationship(GraphRelationship(id="r2", type="TRAINED_ON", source_id="m2", target_id="d1"))
+        self.assertAlmostEqual(self.manager.find_similar_entities("m1")[0]["similarity"], 1.0)
+
+        self.mock_db.execute_write_query.return_value = [{"type": "TRAINED_ON"}]
+        other_manager.delete_relationship("r2")
+        self.assertAlmostEqual(self.manager.find_similar_entities("m1")[0]["similarity"], 0.7)
+
+        self.mock_db.execute_write_query.return_value = [{"labels": ["Entity", "AIModel"], "types": []}]
+        self.manager.delete_entity("m2")
+        self.assertEqual(self.manager.find_similar_entities("m1"), [])
+
+    @patch("src.knowledge_graph_system.core.knowledge_graph_manager.threading.Thread")
+    def test_database_scores_until_index_is_loaded(self, thread):
+        """Test that the database scores entities while the index loads in the background."""
+        read = self.mock_db.execute_read_query.side_effect
+
+        def read_with_scores(query, params=None):
+            if "labels(other)" in query:
+                return [{"other": {"id": "m2"}, "similarity": 0.7}]
+            return read(query, params)
+
+        self.mock_db.execute_read_query.side_effect = read_with_scores
+
+        results = self.manager.find_similar_entities("m1")
+        KnowledgeGraphManager(self.mock_db).find_similar_entities("m1")
+
+        self.assertEqual(results, [{"entity": {"id": "m2"}, "similarity": 0.7}])
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+        thread.call_args.kwargs["target"]()
+        self.mock_db.execute_read_query.reset_mock()
+
+        self.assertEqual(self.manager.find_similar_entities("m1")[0]["similarity"], 0.7)
+        queries = [call[0][0] for call in self.mock_db.execute_read_query.call_args_list]
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("labels(other)", queries[0])
+
+    @patch("src.knowledge_graph_system.core.knowledge_graph_manager.threading.Thread")
+    def test_expired_index_is_reloaded(self, thread):
+        """Test that an index older than its time to live is reloaded."""
+        self.manager._load_similarity_index()
+        self.manager.SIMILARITY_INDEX_TTL = 0
+
+        self.manager.find_similar_entities("m1")
+
+        thread.return_value.start.assert_called_once()
+
+
+class TestKnowledgeGraphManagerPagination(unittest.TestCase):
+    """Tests for keyset pagination and cached counts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.manager = KnowledgeGraphManager(self.mock_db)
+
+    def test_entities_page_chains_cursor(self):
+        """Test that a full page returns a cursor that resumes after its last ID."""
+        self.mock_db.execute_read_query.return_value = [
+            {"e": {"id": f"m{i}"}, "labels": ["Entity", "AIModel"]} for i in range(3)
+        ]
+
+        page = self.manager.get_entities_page("AIModel", limit=2)
+
+        self.assertEqual([record["entity"]["id"] for record in page["entities"]], ["m0", "m1"])
+        self.assertIsNotNone(page["next_cursor"])
+        query, params = self.mock_db.execute_read_query.call_args[0]
+        self.assertIn("MATCH (e:Entity:`AIModel`)", query)
+        self.assertEqual(params, {"after_id": None, "limit": 3})
+
+        self.mock_db.execute_read_query.return_value = [{"e": {"id": "m2"}, "labels": ["Entity", "AIModel"]}]
+        last = self.manager.get_entities_page("AIModel", limit=2, cursor=page["next_cursor"])
+
+        self.assertEqual(self.mock_db.execute_read_query.call_args[0][1]["after_id"], "m1")
+        self.assertIsNone(last["next_cursor"])
+
+    def test_cursor_bound_to_filters(self):
+        """Test that cursors are rejected for other filters or listings."""
+        self.mock_db.execute_read_query.return_value = [{"e": {"id": "m0"}, "labels": []}] * 2
+        cursor = self.manager.get_entities_page("AIModel", limit=1)["next_cursor"]
+
+        with self.assertRaises(ValueError):
+            self.manager.get_entities_page("Dataset", cursor=cursor)
+        with self.assertRaises(ValueError):
+            self.manager.get_relationships_page(cursor=cursor)
+        with self.assertRaises(ValueError):
+            self.manager.get_entities_page(cursor="not-a-cursor")
+
+    def test_relationships_page_orders_by_type_and_id(self):
+        """Test that relationship pages resume after the last (type, id) key."""
+        self.mock_db.execute_read_query.return_value = [
+            {"r": {"id": f"r{i}"}, "type": "USES", "source": {"id": "m1"}, "target": {"id": "d1"}}
+            for i in range(2)
+        ]
+
+        page = self.manager.get_relationships_page(entity_id="m1", direction="outgoing", limit=1)
+        self.manager.get_relationships_page(entity_id="m1", direction="outgoing", limit=1,
+                                            cursor=page["next_cursor"])
+
+        query, params = self.mock_db.execute_read_query.call_args[0]
+        self.assertIn("(:Entity {id: $entity_id})-[r]->()", query)
+        self.assertIn("ORDER BY type, r.id", query)
+        self.assertEqual((params["after_type"], params["after_id"]), ("USES", "r0"))
+
+    def test_counts_are_cached(self):
+        """Test that counts are read once and reused."""
+        self.mock_db.execute_read_query.return_value = [{"count": 42}]
+
+        self.assertEqual(self.manager.count_entities("AIModel"), 42)
+        self.assertEqual(self.manager.count_entities("AIModel"), 42)
+        self.assertEqual(self.manager.count_relationships("USES"), 42)
+
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 2)
+
+    def test_counts_are_shared_by_managers_of_a_database(self):
+        """Test that managers built per request on one database reuse cached counts."""
+        self.mock_db.execute_read_query.return_value = [{"count": 42}]
+
+        self.assertEqual(self.manager.count_relationships(), 42)
+        self.assertEqual(KnowledgeGraphManager(self.mock_db).count_relationships(), 42)
+        other_db = MagicMock()
+        other_db.execute_read_query.return_value = [{"count": 7}]
+        self.assertEqual(KnowledgeGraphManager(other_db).count_relationships(), 7)
+
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 1)
+
+    def test_relationships_page_reads_each_type_through_id_index(self):
+        """Test that listing all relationships seeks each type's id index in turn."""
+        relationships = {
+            "CITES": [f"c{i}" for i in range(2)],
+            "USES": [f"u{i}" for i in range(3)]
+        }
+
+        def read(query, params):
+            if "db.relationshipTypes()" in query:
+                return [{"type": "USES"}, {"type": "CITES"}]
+            relationship_type = query.split("[r:`")[1].split("`]")[0]
+            ids = [i for i in relationships[relationship_type] if params["after_id"] is None or i > params["after_id"]]
+            return [
+                {"r": {"id": i}, "type": relationship_type, "source": {}, "target": {}}
+                for i in ids[:params["limit"]]
+            ]
+
+        self.mock_db.execute_read_query.side_effect = read
+
+        page = self.manager.get_relationships_page(limit=3)
+        last = KnowledgeGraphManager(self.mock_db).get_relationships_page(limit=3, cursor=page["next_cursor"])
+
+        self.assertEqual([r["relationship"]["id"] for r in page["relationships"]], ["c0", "c1", "u0"])
+        self.assertEqual([r["relationship"]["id"] for r in last["relationships"]], ["u1", "u2"])
+        self.assertIsNone(last["next_cursor"])
+        for call in self.mock_db.execute_read_query.call_args_list:
+            self.assertNotIn("ORDER BY type", call[0][0])
+
+        # Each type's index is created once, whichever manager lists it first
+        indexed = [call[0][0][0]["type"] for call in self.mock_db.create_relationship_indexes.call_args_list]
+        self.assertEqual(indexed, ["CITES", "USES"])
+
+
+
+class FakeGraphDatabase:
+    """In-memory stand-in answering the export queries and storing imported rows."""
+
+    def __init__(self, node_count=0, fail_after=None):
+        self.nodes = {
+            f"e{i:03d}": {"id": f"e{i:03d}", "name": f"Entity {i}", "labels": ["AIModel", "Entity"]}
+            for i in range(node_count)
+        }
+        self.edges = [(f"e{i:03d}", f"e{i + 1:03d}", f"r{i:03d}") for i in range(node_count - 1)]
+        self.reads = 0
+        self.fail_after = fail_after
+        self.written_nodes = []
+        self.written_edges = []
+
+    def execute_read_query(self, query, params):
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            raise RuntimeError("connection lost")
+
+        ids = sorted(i for i in self.nodes if params["after_id"] is None or i > params["after_id"])
+        ids = ids[:params["limit"]]
+        if "OPTIONAL MATCH" not in query:
+            return [
+                {"e": {k: v for k, v in self.nodes[i].items() if k != "labels"}, "labels": self.nodes[i]["labels"]}
+                for i in ids
+            ]
+
+        records = []
+        for i in ids:
+            edges = [edge for edge in self.edges if edge[0] == i]
+            records.extend(
+                {"source_id": i, "r": {"id": rel_id}, "type": "EXTENDS", "target_id": target}
+                for _, target, rel_id in edges
+            )
+            if not edges:
+                records.append({"source_id": i, "r": None, "type": None, "target_id": None})
+        return records
+
+    def execute_write_query(self, query, params):
+        if "MERGE (source)" in query:
+            self.written_edges.extend(params["rows"])
+        else:
+            self.written_nodes.extend(params["rows"])
+        return [{"id": row["id"]} for row in params["rows"]]
+
+
+class TestKnowledgeGraphManagerTransfer(unittest.TestCase):
+    """Tests for streaming NDJSON export and import."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "graph.ndjson.gz")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def _manager(self, db):
+        manager = KnowledgeGraphManager(MagicMock(), batch_size=3)
+        manager.db_manager = db
+        return manager
+
+    def test_export_writes_nodes_then_relationships(self):
+        """Test that the export holds every node followed by every relationship."""
+        result = self._manager(FakeGraphDatabase(7)).export_stream(self.path)
+
+        records = list(iter_records(self.path))
+        self.assertEqual((result["nodes"], result["relationships"]), (7, 6))
+        self.assertEqual([record["type"] for record in records], ["node"] * 7 + ["relationship"] * 6)
+        self.assertEqual(records[0]["labels"], ["AIModel", "Entity"])
+        self.assertFalse(os.path.exists(self.path + ".checkpoint"))
+
+    def test_export_resumes_from_checkpoint(self):
+        """Test that an interrupted export continues without duplicating records."""
+        result = self._manager(FakeGraphDatabase(7, fail_after=4)).export_stream(self.path)
+        self.assertFalse(result["success"])
+        self.assertTrue(os.path.exists(self.path + ".checkpoint"))
+
+        result = self._manager(FakeGraphDatabase(7)).export_stream(self.path)
+
+        records = list(iter_records(self.path))
+        self.assertTrue(result["success"])
+        self.assertEqual(len(records), 13)
+        self.assertEqual(len({record["properties"]["id"] for record in records}), 13)
+
+    def test_import_round_trip(self):
+        """Test that an exported graph imports through the bulk MERGE statements."""
+        self._manager(FakeGraphDatabase(7)).export_stream(self.path)
+        target = FakeGraphDatabase()
+
+        result = self._manager(target).import_stream(self.path)
+
+        self.assertEqual((result["nodes"], result["relationships"]), (7, 6))
+        self.assertEqual(sorted(row["id"] for row in target.written_nodes), sorted(FakeGraphDatabase(7).nodes))
+        self.assertEqual(target.written_edges[0]["source_id"], "e000")
+
+    def test_import_skips_checkpointed_records(self):
+        """Test that an import resumes after the records already written."""
+        self._manager(FakeGraphDatabase(7)).export_stream(self.path)
+        with open(self.path + ".checkpoint", "w") as f:
+            f.write('{"operation": "import", "records": 9, "nodes": 7, "relationships": 2, "failure_count": 0}')
+        target = FakeGraphDatabase()
+
+        result = self._manager(target).import_stream(self.path)
+
+        self.assertEqual(len(target.written_nodes), 0)
+        self.assertEqual(len(target.written_edges), 4)
+        self.assertEqual(result["relationships"], 6)
+
+    def test_import_rows_without_ids(self):
+        """Test that rows without an id do not fail the batch they are in."""
+        path = os.path.join(self.temp_dir.name, "graph.ndjson")
+        records = [
+            {"type": "node", "labels": ["Entity"], "properties": {"id": "a"}},
+            {"type": "node", "labels": ["Entity"], "properties": {"name": "anonymous"}},
+            {"type": "relationship", "relationship_type": "EXTENDS", "source_id": "a", "target_id": "b",
+             "properties": {"id": None, "confidence": 0.5}},
+            {"type": "relationship", "relationship_type": "EXTENDS", "source_id": "b", "target_id": "a",
+             "properties": {}},
+        ]
+        with open(path, "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        target = FakeGraphDatabase()
+
+        result = self._manager(target).import_stream(path)
+
+        self.assertTrue(result["success"])
+        self.assertEqual((result["nodes"], result["relationships"], result["failure_count"]), (1, 2, 1))
+        self.assertEqual([row["id"] for row in target.written_nodes], ["a"])
+        self.assertEqual([row["id"] for row in target.written_edges], ["a-EXTENDS-b", "b-EXTENDS-a"])
+        self.assertEqual(target.written_edges[0]["properties"], {"id": "a-EXTENDS-b", "confidence": 0.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
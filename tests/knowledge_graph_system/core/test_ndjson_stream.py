@@ -0,0 +1,70 @@
+"""
+Tests for the NDJSON streaming helpers.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.knowledge_graph_system.core.utils.ndjson_stream import (
+    ChunkWriter, clear_checkpoint, iter_records, load_checkpoint, resolve_compression, save_checkpoint
+)
+
+
+class TestNDJSONStream(unittest.TestCase):
+    """Tests for chunked NDJSON files and checkpoints."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_resolve_compression(self):
+        """Test that the format is inferred from the suffix and validated."""
+        self.assertEqual(resolve_compression("graph.ndjson.gz"), "gzip")
+        self.assertEqual(resolve_compression("graph.ndjson"), "none")
+        self.assertEqual(resolve_compression("graph.gz", "none"), "none")
+        with self.assertRaises(ValueError):
+            resolve_compression("graph.ndjson", "bz2")
+
+    def test_chunks_read_back_as_one_stream(self):
+        """Test that separately compressed chunks read back in order."""
+        for compression in ("none", "gzip"):
+            path = os.path.join(self.temp_dir.name, f"graph.{compression}")
+            with ChunkWriter(path, compression) as writer:
+                writer.write([{"n": 0}, {"n": 1}])
+                writer.write([{"n": 2}])
+
+            self.assertEqual([record["n"] for record in iter_records(path, compression)], [0, 1, 2])
+
+    def test_reopen_truncates_after_offset(self):
+        """Test that resuming at an offset discards a partly written chunk."""
+        path = os.path.join(self.temp_dir.name, "graph.ndjson.gz")
+        with ChunkWriter(path, "gzip") as writer:
+            offset = writer.write([{"n": 0}])
+            writer.write([{"n": 1}])
+        with open(path, "ab") as f:
+            f.write(b"partial")
+
+        with ChunkWriter(path, "gzip", offset) as writer:
+            writer.write([{"n": 2}])
+
+        self.assertEqual([record["n"] for record in iter_records(path)], [0, 2])
+
+    def test_checkpoint_round_trip(self):
+        """Test saving, loading and clearing a checkpoint."""
+        path = os.path.join(self.temp_dir.name, "graph.checkpoint")
+        self.assertIsNone(load_checkpoint(path))
+
+        save_checkpoint(path, {"offset": 10})
+        self.assertEqual(load_checkpoint(path), {"offset": 10})
+
+        clear_checkpoint(path)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
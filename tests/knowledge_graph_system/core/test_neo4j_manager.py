@@ -6,7 +6,9 @@ import unittest
 import os
 from unittest.mock import MagicMock, patch
 
-from knowledge_graph_system.core.db.neo4j_manager import Neo4jManager
+from knowledge_graph_system.core.db.neo4j_manager import (
+    Neo4jManager, BufferedResult, Neo4jTransaction, StatementBatch
+)
 
 
 class TestNeo4jManager(unittest.TestCase):
@@ -94,7 +96,10 @@ class TestNeo4jManager(unittest.TestCase):
     def test_run_query(self):
         """Test running a query."""
         # Configure mock
+        mock_record = MagicMock()
+        mock_record.data.return_value = {"n": 1}
         mock_result = MagicMock()
+        mock_result.__iter__.return_value = [mock_record]
         self.mock_session.run.return_value = mock_result
         
         # Create Neo4jManager instance
@@ -111,7 +116,12 @@ class TestNeo4jManager(unittest.TestCase):
         
         # Check if query was run correctly
         self.mock_session.run.assert_called_once_with(query, parameters)
-        self.assertEqual(result, mock_result)
+        
+        # Records are buffered so they survive the session being closed
+        self.assertIsInstance(result, BufferedResult)
+        self.assertEqual(list(result), [mock_record])
+        self.assertEqual(result.data(), [{"n": 1}])
+        self.assertEqual(result.summary(), mock_result.consume.return_value)
     
     def test_execute_read_query(self):
         """Test executing a read query."""
@@ -167,6 +177,132 @@ class TestNeo4jManager(unittest.TestCase):
         self.mock_transaction.run.assert_called_once_with(query, parameters)
         self.assertEqual(result, [{"key": "value"}])
     
+    def test_transaction_commits(self):
+        """Test that a unit of work runs all queries in one transaction and commits."""
+        mock_tx = MagicMock()
+        self.mock_session.begin_transaction.return_value = mock_tx
+        
+        mock_record = MagicMock()
+        mock_record.data.return_value = {"key": "value"}
+        mock_result = MagicMock()
+        mock_result.__iter__.return_value = [mock_record]
+        mock_tx.run.return_value = mock_result
+        
+        manager = Neo4jManager(
+            uri="bolt://localhost:7687",
+            username="neo4j",
+            password="password"
+        )
+        
+        with manager.transaction() as tx:
+            self.assertIsInstance(tx, Neo4jTransaction)
+            first = tx.execute_read_query("MATCH (n) RETURN n")
+            tx.execute_write_query("CREATE (n)", {"param": "value"})
+        
+        self.assertEqual(first, [{"key": "value"}])
+        self.assertEqual(tx.query_count, 2)
+        self.mock_driver.session.assert_called_once()
+        self.mock_session.begin_transaction.assert_called_once()
+        mock_tx.commit.assert_called_once()
+        mock_tx.rollback.assert_not_called()
+    
+    def test_transaction_rolls_back_on_error(self):
+        """Test that a unit of work is rolled back when the block raises."""
+        mock_tx = MagicMock()
+        self.mock_session.begin_transaction.return_value = mock_tx
+        
+        manager = Neo4jManager(
+            uri="bolt://localhost:7687",
+            username="neo4j",
+            password="password"
+        )
+        
+        with self.assertRaises(RuntimeError):
+            with manager.transaction():
+                raise RuntimeError("failed")
+        
+        mock_tx.rollback.assert_called_once()
+        mock_tx.commit.assert_not_called()
+    
+    def test_batch_flushes_in_one_transaction(self):
+        """Test that queued statements are sent together on exit."""
+        mock_tx = MagicMock()
+        mock_tx.run.return_value = []
+        self.mock_session.begin_transaction.return_value = mock_tx
+        
+        manager = Neo4jManager(
+            uri="bolt://localhost:7687",
+            username="neo4j",
+            password="password"
+        )
+        
+        with manager.batch() as batch:
+            self.assertIsInstance(batch, StatementBatch)
+            for i in range(3):
+                self.assertEqual(batch.add("CREATE (n {id: $id})", {"id": i}), i)
+            batch.add("MATCH (n) RETURN count(n) AS count")
+            mock_tx.run.assert_not_called()
+        
+        # The same-shaped statements are unwound into one statement
+        self.assertEqual(mock_tx.run.call_count, 2)
+        query, parameters = mock_tx.run.call_args_list[0].args
+        self.assertIn("UNWIND $rows AS _row", query)
+        self.assertIn("CREATE (n {id: _row.id})", query)
+        self.assertNotIn("RETURN", query)
+        self.assertEqual(parameters["rows"], [{"id": i, "_statement": i} for i in range(3)])
+        self.assertEqual(mock_tx.run.call_args_list[1].args[0], "MATCH (n) RETURN count(n) AS count")
+        self.assertEqual(len(batch.results), 4)
+        self.mock_session.begin_transaction.assert_called_once()
+        mock_tx.commit.assert_called_once()
+    
+    def test_batch_splits_unwound_results(self):
+        """Test that the records of an unwound statement are returned per statement."""
+        def record(statement, node_id):
+            return MagicMock(data=MagicMock(return_value={"_row": {"id": node_id, "_statement": statement},
+                                                          "id": node_id}))
+        
+        mock_tx = MagicMock()
+        mock_tx.run.return_value = [record(0, "a"), record(2, "c")]
+        self.mock_session.begin_transaction.return_value = mock_tx
+        
+        manager = Neo4jManager(
+            uri="bolt://localhost:7687",
+            username="neo4j",
+            password="password"
+        )
+        
+        with manager.batch() as batch:
+            for node_id in "abc":
+                batch.add("MATCH (n {id: $id}) RETURN n.id AS id", {"id": node_id})
+        
+        query = mock_tx.run.call_args.args[0]
+        self.assertTrue(query.endswith("RETURN *"))
+        self.assertIn("MATCH (n {id: _row.id}) RETURN n.id AS id", query)
+        self.assertEqual(batch.results, [[{"id": "a"}], [], [{"id": "c"}]])
+    
+    def test_batch_auto_flush_and_discard(self):
+        """Test automatic flushing at max_statements and discarding on error."""
+        mock_tx = MagicMock()
+        mock_tx.run.return_value = []
+        self.mock_session.begin_transaction.return_value = mock_tx
+        
+        manager = Neo4jManager(
+            uri="bolt://localhost:7687",
+            username="neo4j",
+            password="password"
+        )
+        
+        with self.assertRaises(RuntimeError):
+            with manager.batch(max_statements=2) as batch:
+                for i in range(3):
+                    batch.add("CREATE (n {id: $id})", {"id": i})
+                raise RuntimeError("failed")
+        
+        # The first two statements were flushed together, the third was discarded
+        self.assertEqual(mock_tx.run.call_count, 1)
+        self.assertEqual(len(mock_tx.run.call_args.args[1]["rows"]), 2)
+        self.assertEqual(batch.pending, [])
+    
     def test_create_constraints(self):
         """Test creating constraints."""
         # Create Neo4jManager instance
@@ -210,7 +346,30 @@ class TestNeo4jManager(unittest.TestCase):
             "FOR (n:Test) ON (n.prop1, n.prop2)"
         )
         self.mock_session.run.assert_called_once_with(expected_query, {})
-    
+
+    def test_create_fulltext_index(self):
+        """Test creating a full-text index."""
+        # Create Neo4jManager instance
+        manager = Neo4jManager(
+            uri="bolt://localhost:7687",
+            username="neo4j",
+            password="password"
+        )
+
+        # Create full-text index
+        self.assertTrue(manager.create_fulltext_index("test_fulltext", ["Test"], ["name", "aliases"]))
+
+        # Check if query was run correctly
+        expected_query = (
+            "CREATE FULLTEXT INDEX test_fulltext IF NOT EXISTS "
+            "FOR (n:Test) ON EACH [n.name, n.aliases]"
+        )
+        self.mock_session.run.assert_called_once_with(expected_query, {})
+
+        # Backends without full-text support report failure
+        self.mock_session.run.side_effect = Exception("Invalid input 'FULLTEXT'")
+        self.assertFalse(manager.create_fulltext_index("test_fulltext", ["Test"], ["name"]))
+
     def test_clear_database(self):
         """Test clearing the database."""
         # Create Neo4jManager instance
@@ -0,0 +1,87 @@
+"""
+Tests for the in-process entity search index.
+"""
+
+import unittest
+
+from src.knowledge_graph_system.core.utils.search_index import (
+    EntitySearchIndex, bounded_edit_distance, tokenize
+)
+
+
+class TestSearchHelpers(unittest.TestCase):
+    """Tests for the tokenizer and edit distance helpers."""
+
+    def test_tokenize(self):
+        """Test that text is split into lowercase words."""
+        self.assertEqual(tokenize("GPT-4 Turbo (2024)"), ["gpt", "4", "turbo", "2024"])
+        self.assertEqual(tokenize(""), [])
+
+    def test_bounded_edit_distance(self):
+        """Test that distances above the limit are rejected."""
+        self.assertEqual(bounded_edit_distance("bert", "bert", 1), 0)
+        self.assertEqual(bounded_edit_distance("bert", "berts", 1), 1)
+        self.assertIsNone(bounded_edit_distance("bert", "roberta", 2))
+
+
+class TestEntitySearchIndex(unittest.TestCase):
+    """Tests for the EntitySearchIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = EntitySearchIndex()
+        self.index.add({"id": "m1", "name": "Transformer", "confidence": 0.9}, ["Entity", "AIModel"])
+        self.index.add({"id": "m2", "name": "BERT", "aliases": ["Bidirectional Transformer"],
+                        "confidence": 0.8}, ["Entity", "AIModel"])
+        self.index.add({"id": "d1", "name": "ImageNet", "confidence": 0.4}, ["Entity", "Dataset"])
+
+    def test_exact_search_ranks_name_matches_first(self):
+        """Test that name matches outrank alias matches."""
+        results = self.index.search("transformer")
+
+        self.assertEqual([entity["id"] for entity, _ in results], ["m1", "m2"])
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_all_terms_must_match(self):
+        """Test that every word of the query must match."""
+        results = self.index.search("bidirectional transformer")
+
+        self.assertEqual([entity["id"] for entity, _ in results], ["m2"])
+
+    def test_prefix_search(self):
+        """Test that prefix mode matches word prefixes."""
+        results = self.index.search("imag", mode="prefix")
+
+        self.assertEqual([entity["id"] for entity, _ in results], ["d1"])
+        self.assertEqual(self.index.search("imag"), [])
+
+    def test_fuzzy_search(self):
+        """Test that fuzzy mode tolerates small spelling differences."""
+        results = self.index.search("transfromer", mode="fuzzy")
+
+        self.assertEqual({entity["id"] for entity, _ in results}, {"m1", "m2"})
+
+    def test_filters(self):
+        """Test label and confidence filters."""
+        self.assertEqual(self.index.search("imagenet", labels=["AIModel"]), [])
+        self.assertEqual(self.index.search("imagenet", min_confidence=0.5), [])
+        self.assertEqual(len(self.index.search("imagenet", labels=["Dataset"])), 1)
+
+    def test_update_and_remove(self):
+        """Test that updates re-index and removals drop postings."""
+        self.index.update("d1", {"name": "CIFAR"})
+        self.assertEqual(self.index.search("imagenet"), [])
+        self.assertEqual(len(self.index.search("cifar")), 1)
+
+        self.index.remove("d1")
+        self.assertNotIn("d1", self.index)
+        self.assertNotIn("cifar", self.index.postings)
+
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected."""
+        with self.assertRaises(ValueError):
+            self.index.search("bert", mode="regex")
+
+
+if __name__ == '__main__':
+    unittest.main()
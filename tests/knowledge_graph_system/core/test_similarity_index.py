@@ -0,0 +1,122 @@
+"""
+Tests for the in-process structural similarity index.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.knowledge_graph_system.core.utils.similarity_index import (
+    EntitySimilarityIndex, MinHasher, property_tokens
+)
+
+
+def _jaccard(set1, set2):
+    """Compute the exact Jaccard similarity of two sets."""
+    return len(set1 & set2) / len(set1 | set2)
+
+
+class TestMinHasher(unittest.TestCase):
+    """Tests for MinHash signatures."""
+
+    def test_estimate_tracks_jaccard(self):
+        """Test that signature agreement estimates Jaccard similarity."""
+        hasher = MinHasher(num_perm=256)
+        set1 = {f"t{i}" for i in range(100)}
+        set2 = {f"t{i}" for i in range(50, 150)}
+
+        estimate = np.mean(hasher.signature(set1) == hasher.signature(set2))
+
+        self.assertAlmostEqual(estimate, _jaccard(set1, set2), delta=0.1)
+
+    def test_update_matches_full_signature(self):
+        """Test that adding a token incrementally gives the full signature."""
+        hasher = MinHasher()
+
+        incremental = hasher.update(hasher.signature(["a", "b"]), "c")
+
+        np.testing.assert_array_equal(incremental, hasher.signature(["a", "b", "c"]))
+
+    def test_property_tokens_skip_identity(self):
+        """Test that identifying and timestamp properties are not tokens."""
+        tokens = property_tokens({"id": "m1", "updated_at": "now", "tasks": ["qa", "nli"], "size": None})
+
+        self.assertEqual(tokens, {'tasks=["qa", "nli"]'})
+
+
+class TestEntitySimilarityIndex(unittest.TestCase):
+    """Tests for the EntitySimilarityIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = EntitySimilarityIndex()
+        shared = {f"attr{i}": i for i in range(8)}
+        self.index.add_entity("m1", dict(shared, id="m1", architecture="transformer"), ["Entity", "AIModel"])
+        self.index.add_entity("m2", dict(shared, id="m2", architecture="transformer"), ["Entity", "AIModel"])
+        self.index.add_entity("m3", dict(shared, id="m3", architecture="cnn", extra=1), ["Entity", "AIModel"])
+        self.index.add_entity("d1", dict(shared, id="d1", architecture="transformer"), ["Entity", "Dataset"])
+        self.index.add_entity("x1", {"id": "x1", "unrelated": True}, ["Entity", "AIModel"])
+
+    def test_query_ranks_same_label_entities(self):
+        """Test that results are ranked, labelled alike and above the threshold."""
+        results = self.index.query("m1", threshold=0.3, limit=10)
+
+        self.assertEqual([entity_id for entity_id, _ in results], ["m2", "m3"])
+        self.assertAlmostEqual(results[0][1], 0.7)
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_limit_and_unknown_entity(self):
+        """Test the limit and queries for entities that are not indexed."""
+        self.assertEqual(len(self.index.query("m1", threshold=0.0, limit=1)), 1)
+        self.assertEqual(self.index.query("missing"), [])
+
+    def test_neighbors_contribute(self):
+        """Test that shared neighbours raise similarity and removed edges lower it."""
+        self.index.add_edge("r1", "m1", "d1")
+        self.index.add_edge("r2", "m2", "d1")
+
+        self.assertAlmostEqual(self.index.query("m1", limit=1)[0][1], 1.0)
+
+        self.index.remove_edge("r2")
+
+        self.assertAlmostEqual(self.index.query("m1", limit=1)[0][1], 0.7)
+
+    def test_parallel_edges_keep_neighbor(self):
+        """Test that a neighbour stays until its last relationship is removed."""
+        self.index.add_edge("r1", "m1", "d1")
+        self.index.add_edge("r2", "m2", "d1")
+        self.index.add_edge("r3", "d1", "m2")
+        self.index.remove_edge("r3")
+
+        self.assertAlmostEqual(self.index.query("m1", limit=1)[0][1], 1.0)
+
+    def test_update_and_remove_entity(self):
+        """Test that updates re-hash properties and removals drop entities and edges."""
+        self.index.add_entity("m2", {"id": "m2", "architecture": "rnn"}, ["Entity", "AIModel"])
+        self.assertEqual(self.index.query("m1", threshold=0.3)[0][0], "m3")
+
+        self.index.add_edge("r1", "m3", "d1")
+        self.index.remove_entity("m3")
+
+        self.assertNotIn("m3", self.index)
+        self.assertEqual(self.index.query("m1", threshold=0.3), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_entities_without_properties(self):
+        """Test that entities without property tokens are not similar by their properties."""
+        self.index.add_entity("e1", {"id": "e1", "created_at": "2024-01-01"}, ["Entity", "AIModel"])
+        self.index.add_entity("e2", {"id": "e2", "name": None}, ["Entity", "AIModel"])
+
+        # The empty property sets share no band and score 0, as in the Cypher fallback
+        self.assertEqual(self.index.query("e1", threshold=0.0), [])
+
+        # Shared neighbours still make them similar
+        self.index.add_edge("r1", "e1", "d1")
+        self.index.add_edge("r2", "e2", "d1")
+        results = self.index.query("e1", threshold=0.0)
+        self.assertEqual([entity_id for entity_id, _ in results], ["e2"])
+        self.assertAlmostEqual(results[0][1], 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Tests for the embedding index.
+"""
+
+import itertools
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.knowledge_graph_system.embeddings.embedding_index import EmbeddingIndex
+
+
+def _cosine(vector1, vector2):
+    """Compute cosine similarity directly."""
+    return float(np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2)))
+
+
+class TestEmbeddingIndex(unittest.TestCase):
+    """Tests for the EmbeddingIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(3)
+        self.ids = [f"e{i}" for i in range(50)]
+        self.embeddings = rng.standard_normal((50, 8)).astype(np.float32)
+
+        # A small block size exercises the blocked scans
+        self.index = EmbeddingIndex(8, capacity=4, block_size=7)
+        self.index.add_many(self.ids, self.embeddings)
+
+    def test_top_k_matches_brute_force(self):
+        """Test that top-k search matches a direct cosine computation."""
+        expected = sorted(
+            ((other, _cosine(self.embeddings[0], self.embeddings[i])) for i, other in enumerate(self.ids) if i),
+            key=lambda match: -match[1]
+        )[:5]
+
+        results = self.index.top_k_similar("e0", k=5)
+
+        self.assertEqual([entity_id for entity_id, _ in results], [entity_id for entity_id, _ in expected])
+        for (_, score), (_, expected_score) in zip(results, expected):
+            self.assertAlmostEqual(score, expected_score, places=5)
+
+    def test_threshold_and_missing_entity(self):
+        """Test that results below the threshold and unknown entities are left out."""
+        results = self.index.top_k_similar("e0", k=50, threshold=0.5)
+
+        self.assertTrue(all(score >= 0.5 for _, score in results))
+        self.assertEqual(self.index.top_k_similar("missing"), [])
+
+    def test_similar_pairs_matches_brute_force(self):
+        """Test that thresholded all-pairs search matches every pair."""
+        expected = {
+            (self.ids[i], self.ids[j])
+            for i, j in itertools.combinations(range(50), 2)
+            if _cosine(self.embeddings[i], self.embeddings[j]) >= 0.4
+        }
+
+        pairs = self.index.similar_pairs(0.4)
+
+        self.assertEqual({(source, target) for source, target, _ in pairs}, expected)
+
+    def test_similar_pairs_in_column_tiles(self):
+        """Test that pairs found in narrow column tiles match those of whole blocks."""
+        pairs = self.index.similar_pairs(0.4)
+
+        # Tiles of three columns for blocks of seven rows
+        with patch("src.knowledge_graph_system.embeddings.embedding_index.PAIR_TILE_BYTES", 7 * 5 * 3):
+            tiled_pairs = self.index.similar_pairs(0.4)
+
+        self.assertTrue(pairs)
+        self.assertEqual([(source, target) for source, target, _ in tiled_pairs],
+                         [(source, target) for source, target, _ in pairs])
+
+    def test_similar_pairs_subset_keeps_order(self):
+        """Test that pairs are restricted to, and ordered by, the requested IDs."""
+        subset = list(reversed(self.ids[:10]))
+
+        pairs = self.index.similar_pairs(-1.0, entity_ids=subset + ["missing"])
+
+        self.assertEqual(len(pairs), 45)
+        for source, target, _ in pairs:
+            self.assertLess(subset.index(source), subset.index(target))
+
+    def test_replace_and_remove(self):
+        """Test that replacing and removing embeddings keeps the matrix contiguous."""
+        self.index.add("e1", self.embeddings[0] * 3)
+        self.assertAlmostEqual(self.index.top_k_similar("e0", k=1)[0][1], 1.0, places=5)
+        self.assertEqual(self.index.top_k_similar("e0", k=1)[0][0], "e1")
+
+        self.assertTrue(self.index.remove("e1"))
+        self.assertFalse(self.index.remove("e1"))
+        self.assertEqual(len(self.index), 49)
+        self.assertNotIn("e1", self.index)
+        np.testing.assert_allclose(
+            self.index.get("e49"), self.embeddings[49] / np.linalg.norm(self.embeddings[49]), rtol=1e-5
+        )
+
+    def test_dimension_mismatch(self):
+        """Test that embeddings of the wrong dimension are rejected."""
+        with self.assertRaises(ValueError):
+            self.index.add("bad", [1.0, 2.0])
+
+    def test_save_and_memory_mapped_load(self):
+        """Test that a saved index is loaded memory-mapped and copied on write."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.index.save(directory)
+            loaded = EmbeddingIndex.load(directory)
+
+            self.assertIsInstance(loaded.vectors, np.memmap)
+            self.assertEqual(loaded.top_k_similar("e0", k=3), self.index.top_k_similar("e0", k=3))
+
+            loaded.add("new", self.embeddings[0])
+            self.assertEqual(loaded.top_k_similar("e0", k=1)[0][0], "new")
+            self.assertEqual(len(EmbeddingIndex.load(directory)), 50)
+
+    def test_approximate_search(self):
+        """Test that LSH search finds near duplicates and is maintained on writes."""
+        self.index.enable_approximate(n_bits=4, n_tables=8)
+        self.index.add("near", self.embeddings[5] + 0.01)
+
+        results = self.index.top_k_similar("near", k=1)
+        pairs = {(source, target) for source, target, _ in self.index.similar_pairs(0.99)}
+
+        self.assertEqual(results[0][0], "e5")
+        self.assertIn(("e5", "near"), pairs)
+
+        self.index.remove("e5")
+        self.assertNotIn("e5", [entity_id for entity_id, _ in self.index.top_k_similar("near", k=5)])
+
+    def test_approximate_requires_tables(self):
+        """Test that approximate search must be enabled first."""
+        with self.assertRaises(ValueError):
+            self.index.top_k_similar("e0", approximate=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
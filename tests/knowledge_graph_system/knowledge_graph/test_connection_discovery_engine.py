@@ -0,0 +1,264 @@
+"""
+Tests for the adjacency index and the index-driven connection discovery engine.
+"""
+
+import itertools
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from src.knowledge_graph_system.embeddings.embedding_index import EmbeddingIndex
+from src.knowledge_graph_system.knowledge_graph.adjacency_index import AdjacencyIndex
+from src.knowledge_graph_system.knowledge_graph.connection_discovery_engine import ConnectionDiscoveryEngine
+
+
+def _random_graph(entity_count=40, edge_count=90, seed=7):
+    """Generate entities and an edge list for a random graph."""
+    rng = random.Random(seed)
+    entities = [{"id": f"e{i}", "name": f"Entity {i}", "type": "Concept"} for i in range(entity_count)]
+    edges = []
+    for _ in range(edge_count):
+        source, target = rng.sample(range(entity_count), 2)
+        edges.append({"source_id": f"e{source}", "target_id": f"e{target}", "type": "USES"})
+    return entities, edges
+
+
+def _neighbor_sets(edges):
+    """Build undirected neighbour sets from an edge list."""
+    neighbors = {}
+    for edge in edges:
+        neighbors.setdefault(edge["source_id"], set()).add(edge["target_id"])
+        neighbors.setdefault(edge["target_id"], set()).add(edge["source_id"])
+    return neighbors
+
+
+def _count_simple_paths(neighbors, source, target, max_length):
+    """Count simple paths between two entities by enumeration."""
+    counts = {}
+    stack = [(source, [source])]
+    while stack:
+        node, path = stack.pop()
+        for neighbor in neighbors.get(node, ()):
+            if neighbor in path:
+                continue
+            if neighbor == target:
+                length = len(path)
+                counts[length] = counts.get(length, 0) + 1
+            elif len(path) < max_length:
+                stack.append((neighbor, path + [neighbor]))
+    return counts
+
+
+class TestAdjacencyIndex(unittest.TestCase):
+    """Tests for the AdjacencyIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = AdjacencyIndex.from_edges([
+            ("a", "b", "USES"), ("b", "c", "USES"), ("c", "a", "CITES"),
+            ("c", "d", None), ("a", "b", "USES"), ("d", "d", None)
+        ])
+
+    def test_build_is_undirected_and_deduplicated(self):
+        """Test that edges are stored in both directions without duplicates or self loops."""
+        a, b, c, d = (self.index.row(entity_id) for entity_id in "abcd")
+
+        self.assertEqual(self.index.neighbors(a).tolist(), sorted([b, c]))
+        self.assertEqual(self.index.degree(c), 3)
+        self.assertEqual(self.index.degree(d), 1)
+        self.assertTrue(self.index.has_edge(b, a))
+        self.assertFalse(self.index.has_edge(a, d))
+        self.assertEqual(self.index.edge_type(a, c), "CITES")
+        self.assertIsNone(self.index.row("missing"))
+
+    def test_walk_counts(self):
+        """Test that walk counts match powers of the adjacency matrix."""
+        a, d = self.index.row("a"), self.index.row("d")
+
+        _, (columns, counts) = self.index.walk_counts(a, 2)
+        two_step = dict(zip(columns.tolist(), counts.tolist()))
+
+        # a-c-d is the only two-step walk from a to d; a returns to itself twice
+        self.assertEqual(two_step[d], 1)
+        self.assertEqual(two_step[a], 2)
+
+    def test_add_edges_and_compact(self):
+        """Test that added edges are visible before and after compaction."""
+        touched = self.index.add_edges([("a", "d", "USES"), ("d", "e", None), ("a", "b", None)])
+        a, d, e = (self.index.row(entity_id) for entity_id in "ade")
+
+        self.assertEqual(touched, {a, d, e})
+        self.assertTrue(self.index.has_edge(d, a))
+        self.assertEqual(self.index.within_hops([e], 2), {e, d, a, self.index.row("c")})
+
+        self.index.compact()
+
+        self.assertEqual(self.index.degree(a), 3)
+        self.assertEqual(self.index.neighbors(e).tolist(), [d])
+
+
+class TestConnectionDiscoveryEngine(unittest.TestCase):
+    """Tests for index-driven connection discovery."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.entities, self.edges = _random_graph()
+        self.graph_manager = MagicMock(embedding_index=None)
+        self.graph_manager.get_entities.return_value = self.entities
+        self.graph_manager.get_edge_list.side_effect = lambda: list(self.edges)
+        self.engine = ConnectionDiscoveryEngine(self.graph_manager)
+
+    def _discover(self, **kwargs):
+        """Run the graph strategies and key the results by strategy and pair."""
+        connections = self.engine.discover_connections(
+            strategies=["common_neighbors", "path_based"], limit=100000, **kwargs
+        )
+        return {
+            (conn["discovery_method"], conn["source_id"], conn["target_id"]): conn
+            for conn in connections
+        }
+
+    def test_single_bulk_fetch(self):
+        """Test that discovery fetches the adjacency once and issues no per-pair queries."""
+        self._discover()
+
+        self.graph_manager.get_edge_list.assert_called_once()
+        self.graph_manager.check_direct_connection.assert_not_called()
+        self.graph_manager.get_neighbors.assert_not_called()
+        self.graph_manager.find_paths.assert_not_called()
+
+    def test_common_neighbors_match_brute_force(self):
+        """Test that common neighbor connections match an all-pairs scan."""
+        neighbors = _neighbor_sets(self.edges)
+        expected = {}
+        for entity1, entity2 in itertools.combinations(self.entities, 2):
+            neighbors1 = neighbors.get(entity1["id"], set())
+            neighbors2 = neighbors.get(entity2["id"], set())
+            common = neighbors1 & neighbors2
+            if entity2["id"] not in neighbors1 and len(common) >= 2:
+                expected[(entity1["id"], entity2["id"])] = len(common) / len(neighbors1 | neighbors2)
+
+        results = self._discover()
+        actual = {
+            (source, target): conn["confidence"]
+            for (method, source, target), conn in results.items() if method == "common_neighbors"
+        }
+
+        self.assertTrue(expected)
+        self.assertEqual(actual.keys(), expected.keys())
+        for pair, confidence in expected.items():
+            self.assertAlmostEqual(actual[pair], confidence)
+
+    def test_path_counts_match_simple_paths(self):
+        """Test that path counts match enumerated simple paths up to length three."""
+        neighbors = _neighbor_sets(self.edges)
+        results = self._discover()
+        path_results = {
+            (source, target): conn
+            for (method, source, target), conn in results.items() if method == "path_based"
+        }
+
+        self.assertTrue(path_results)
+        for entity1, entity2 in itertools.combinations(self.entities, 2):
+            if entity2["id"] in neighbors.get(entity1["id"], set()):
+                continue
+            counts = _count_simple_paths(neighbors, entity1["id"], entity2["id"], 3)
+            conn = path_results.get((entity1["id"], entity2["id"]))
+            if not counts:
+                self.assertIsNone(conn)
+                continue
+            self.assertEqual(conn["path_count"], sum(counts.values()))
+            self.assertEqual(conn["shortest_path_length"], min(counts))
+
+    def test_incremental_matches_full_recompute(self):
+        """Test that re-scoring after new edges matches a full recompute."""
+        self._discover()
+        new_edges = [
+            {"source_id": "e1", "target_id": "e2", "type": "USES"},
+            {"source_id": "e3", "target_id": "e39", "type": "CITES"}
+        ]
+
+        rescored = self.engine.add_edges(new_edges)
+        incremental = self._discover(incremental=True)
+
+        self.assertTrue(rescored)
+        self.graph_manager.get_edge_list.assert_called_once()
+
+        self.edges.extend(new_edges)
+        full = self._discover()
+
+        self.assertEqual(incremental.keys(), full.keys())
+        for key, conn in full.items():
+            self.assertAlmostEqual(incremental[key]["confidence"], conn["confidence"])
+
+    def test_incremental_with_other_filters_runs_in_full(self):
+        """Test that an incremental run for other entities does not reuse cached results."""
+        entities = {entity["id"]: entity for entity in self.entities}
+        self.graph_manager.get_entity.side_effect = entities.get
+        subset = self._discover(entity_ids=["e1", "e2", "e3"])
+
+        incremental = self._discover(incremental=True)
+        full = self._discover()
+
+        self.assertEqual(self.graph_manager.get_edge_list.call_count, 3)
+        self.assertNotEqual(incremental.keys(), subset.keys())
+        self.assertEqual(incremental.keys(), full.keys())
+
+    def test_new_direct_connection_drops_suggestions(self):
+        """Test that a suggested pair is dropped once it becomes directly connected."""
+        suggestion = self.engine.discover_connections(strategies=["common_neighbors"], limit=1)[0]
+
+        self.engine.add_edges([{"source_id": suggestion["source_id"], "target_id": suggestion["target_id"]}])
+        connections = self.engine.discover_connections(
+            strategies=["common_neighbors"], limit=100000, incremental=True
+        )
+
+        pairs = {(conn["source_id"], conn["target_id"]) for conn in connections}
+        self.assertNotIn((suggestion["source_id"], suggestion["target_id"]), pairs)
+
+
+class TestEmbeddingSimilarityDiscovery(unittest.TestCase):
+    """Tests for embedding similarity discovery with the embedding index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.entities = [
+            {"id": "m1", "type": "AIModel", "embedding": [1.0, 0.0, 0.0]},
+            {"id": "m2", "type": "AIModel", "embedding": [0.9, 0.1, 0.0]},
+            {"id": "m3", "type": "AIModel", "embedding": [0.0, 1.0, 0.0]},
+            {"id": "m4", "type": "AIModel", "embedding": [0.95, 0.0, 0.05]},
+            {"id": "m5", "type": "AIModel"}
+        ]
+        self.graph_manager = MagicMock(embedding_index=None)
+        self.graph_manager.get_entities.return_value = self.entities
+        self.graph_manager.get_edge_list.return_value = [
+            {"source_id": "m1", "target_id": "m4", "type": "DERIVED_FROM"}
+        ]
+
+    def test_similar_pairs_without_per_pair_calls(self):
+        """Test that similar, unconnected pairs are found with batched products."""
+        engine = ConnectionDiscoveryEngine(self.graph_manager)
+
+        connections = engine.discover_connections(strategies=["embedding_similarity"])
+
+        pairs = {(conn["source_id"], conn["target_id"]) for conn in connections}
+        self.assertEqual(pairs, {("m1", "m2"), ("m2", "m4")})
+        self.graph_manager.calculate_embedding_similarity.assert_not_called()
+
+    def test_uses_shared_index(self):
+        """Test that the graph manager's embedding index is used when it holds the entities."""
+        index = EmbeddingIndex(3)
+        index.add_many(["m1", "m2", "m3"], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.99, 0.01, 0.0]])
+        self.graph_manager.embedding_index = index
+        for entity in self.entities:
+            entity.pop("embedding", None)
+
+        connections = ConnectionDiscoveryEngine(self.graph_manager).discover_connections(
+            strategies=["embedding_similarity"]
+        )
+
+        self.assertEqual([(conn["source_id"], conn["target_id"]) for conn in connections], [("m1", "m3")])
+
+
+if __name__ == '__main__':
+    unittest.main()
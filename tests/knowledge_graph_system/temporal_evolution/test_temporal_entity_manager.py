@@ -0,0 +1,135 @@
+"""
+Tests for the Temporal Entity Manager module.
+"""
+
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+from src.knowledge_graph_system.temporal_evolution.core.temporal_entity_manager import TemporalEntityManager
+from src.knowledge_graph_system.temporal_evolution.models.temporal_ai_models import TemporalAIModel
+from src.knowledge_graph_system.temporal_evolution.query_engine.snapshot_engine import TemporalSnapshotEngine
+
+
+class TestTemporalEntityManagerVersioning(unittest.TestCase):
+    """Tests for create_new_version."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.previous = TemporalAIModel(
+            id="model-1",
+            name="GPT",
+            entity_id="gpt",
+            version_id="gpt_v1.0",
+            version_number=1.0
+        )
+
+        self.events = []
+        self.tx = MagicMock()
+        self.tx.execute_query.side_effect = self._execute_query
+
+        self.graph_manager = MagicMock()
+        self.graph_manager.transaction.side_effect = self._transaction
+
+        self.manager = TemporalEntityManager(self.graph_manager)
+
+    @contextmanager
+    def _transaction(self):
+        self.events.append("begin")
+        try:
+            yield self.tx
+        except BaseException:
+            self.events.append("rollback")
+            raise
+        else:
+            self.events.append("commit")
+
+    def _execute_query(self, query, parameters=None):
+        if "CREATE (c:TemporalChange)" in query:
+            return [{"invalidated": 0, "pending": 1}]
+        if "RETURN e" in query and "CREATE" not in query:
+            return [{"e": self.previous.to_dict()}]
+        return [{"e": parameters["entity_properties"]}]
+
+    def test_create_new_version_single_transaction(self):
+        """Test that the lookup and the version write share one transaction."""
+        new_version = self.manager.create_new_version("gpt_v1.0", {"name": "GPT-2"})
+
+        self.assertIsNotNone(new_version)
+        self.assertEqual(new_version.version_id, "gpt_v2.0")
+        self.assertEqual(new_version.predecessor_version_id, "gpt_v1.0")
+        self.assertEqual(self.events, ["begin", "commit"])
+
+        # One read and one combined write, all inside the transaction
+        self.assertEqual(self.tx.execute_query.call_count, 2)
+        query, params = self.tx.execute_query.call_args.args
+        self.assertIn("SET previous.valid_to = $valid_to", query)
+        self.assertIn("CREATE (previous)-[r:EVOLVED_INTO]->(e)", query)
+        self.assertEqual(params["previous_version_id"], "gpt_v1.0")
+        self.assertEqual(params["new_version_id"], "gpt_v2.0")
+        self.assertEqual(params["entity_properties"]["name"], "GPT-2")
+        self.assertNotIn("source_id", params["relationship_properties"])
+
+    def test_create_new_version_rolls_back_on_failure(self):
+        """Test that a failing write rolls back the transaction."""
+        def fail_on_write(query, parameters=None):
+            if "CREATE" in query:
+                raise Exception("write failed")
+            return self._execute_query(query, parameters)
+
+        self.tx.execute_query.side_effect = fail_on_write
+
+        with self.assertRaises(Exception):
+            self.manager.create_new_version("gpt_v1.0", {"name": "GPT-2"})
+
+        self.assertEqual(self.events, ["begin", "rollback"])
+
+    def test_create_new_version_missing_previous(self):
+        """Test that a missing previous version returns None without writing."""
+        self.tx.execute_query.side_effect = None
+        self.tx.execute_query.return_value = []
+
+        self.assertIsNone(self.manager.create_new_version("missing", {}))
+        self.assertEqual(self.tx.execute_query.call_count, 1)
+        self.assertEqual(self.events, ["begin", "commit"])
+
+    def test_scoped_manager_leaves_original_untouched(self):
+        """Test that the transaction-scoped copy does not replace the graph manager."""
+        self.manager.create_new_version("gpt_v1.0", {"name": "GPT-2"})
+
+        self.assertIs(self.manager.graph_manager, self.graph_manager)
+
+    def test_changes_are_logged_in_the_version_transaction(self):
+        """Test that the change log is written through the transaction of the version write."""
+        snapshot_engine = TemporalSnapshotEngine(self.graph_manager)
+        manager = TemporalEntityManager(self.graph_manager, snapshot_engine)
+
+        manager.create_new_version("gpt_v1.0", {"name": "GPT-2"})
+
+        queries = [call.args[0] for call in self.tx.execute_query.call_args_list]
+        self.assertIn("CREATE (c:TemporalChange)", queries[-1])
+        self.assertEqual(len(self.tx.execute_query.call_args.args[1]["changes"]), 2)
+        self.assertFalse(any(
+            "CREATE (c:TemporalChange)" in call.args[0]
+            for call in self.graph_manager.execute_query.call_args_list
+        ))
+        self.assertEqual(self.events, ["begin", "commit"])
+
+    def test_failed_change_log_rolls_back_version(self):
+        """Test that a failure to log the changes rolls back the version write."""
+        def fail_on_log(query, parameters=None):
+            if "CREATE (c:TemporalChange)" in query:
+                raise Exception("log failed")
+            return self._execute_query(query, parameters)
+
+        self.tx.execute_query.side_effect = fail_on_log
+        manager = TemporalEntityManager(self.graph_manager, TemporalSnapshotEngine(self.graph_manager))
+
+        with self.assertRaises(Exception):
+            manager.create_new_version("gpt_v1.0", {"name": "GPT-2"})
+
+        self.assertEqual(self.events, ["begin", "rollback"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Tests for the query result cache.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.knowledge_graph_system.core.knowledge_graph_manager import KnowledgeGraphManager
+from src.knowledge_graph_system.core.models.base_models import GraphEntity
+from src.knowledge_graph_system.utils.query_cache import (
+    QueryResultCache, make_cache_key, tags_for_query
+)
+from src.knowledge_graph_system.utils.query_optimizer import QueryOptimizer
+
+
+class TestTagsForQuery(unittest.TestCase):
+    """Tests for tag extraction from Cypher patterns."""
+
+    def test_labels_and_types(self):
+        """Test that labels and relationship types become tags."""
+        tags = tags_for_query("MATCH (m:AIModel)-[r:TRAINED_ON|EVALUATED_ON]->(d:`Dataset`) RETURN count(m)")
+
+        self.assertEqual(tags, {"label:AIModel", "label:Dataset", "type:TRAINED_ON", "type:EVALUATED_ON"})
+
+    def test_unlabeled_patterns(self):
+        """Test that patterns without labels or types depend on every label or type."""
+        tags = tags_for_query("MATCH (e)-[r]-() WHERE e.id = $id RETURN r, [1, 2]")
+
+        self.assertEqual(tags, {"label:*", "type:*"})
+
+    def test_cache_key_keeps_literals(self):
+        """Test that queries differing only in a literal get different keys."""
+        self.assertNotEqual(
+            make_cache_key("MATCH (e {name: 'a'}) RETURN e"),
+            make_cache_key("MATCH (e {name: 'b'}) RETURN e")
+        )
+        self.assertEqual(
+            make_cache_key("MATCH (e)\n   RETURN e", {"x": 1}),
+            make_cache_key("MATCH (e) RETURN e", {"x": 1})
+        )
+
+
+class TestQueryResultCache(unittest.TestCase):
+    """Tests for the QueryResultCache class."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = QueryResultCache(max_entries=2)
+        cache.put("a", [{"n": 1}])
+        cache.put("b", [{"n": 2}])
+        cache.get("a")
+        cache.put("c", [{"n": 3}])
+
+        self.assertEqual(cache.get("a"), [{"n": 1}])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_size_bound(self):
+        """Test that the total size bound evicts entries and rejects oversized results."""
+        cache = QueryResultCache(max_bytes=40)
+
+        self.assertFalse(cache.put("big", [{"value": "x" * 100}]))
+        cache.put("a", [{"value": "x" * 10}])
+        cache.put("b", [{"value": "y" * 10}])
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+        self.assertLessEqual(cache.stats()["bytes"], 40)
+
+    @patch('src.knowledge_graph_system.utils.query_cache.time.monotonic')
+    def test_ttl_expiry(self, mock_monotonic):
+        """Test that entries expire after their time-to-live."""
+        mock_monotonic.return_value = 100.0
+        cache = QueryResultCache(default_ttl=10)
+        cache.put("a", [])
+        cache.put("b", [], ttl=60)
+
+        mock_monotonic.return_value = 120.0
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), [])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+    def test_invalidate_by_tag(self):
+        """Test that invalidation evicts dependent entries only."""
+        cache = QueryResultCache()
+        cache.put("models", [], tags={"label:AIModel"})
+        cache.put("datasets", [], tags={"label:Dataset"})
+        cache.put("any_node", [], tags={"label:*"})
+        cache.put("uses", [], tags={"type:USES"})
+
+        self.assertEqual(cache.invalidate(labels=["AIModel"]), 2)
+        self.assertIsNone(cache.get("models"))
+        self.assertIsNone(cache.get("any_node"))
+        self.assertIsNotNone(cache.get("datasets"))
+        self.assertIsNotNone(cache.get("uses"))
+
+        self.assertEqual(cache.invalidate(relationship_types=["USES"]), 1)
+        self.assertEqual(cache.stats()["invalidations"], 3)
+
+
+class TestQueryOptimizerCaching(unittest.TestCase):
+    """Tests for QueryOptimizer.execute_with_cache."""
+
+    def test_cache_hit_returns_records(self):
+        """Test that repeated executions return the materialised records."""
+        neo4j = MagicMock()
+        neo4j.run_query.return_value.data.return_value = [{"name": "BERT"}]
+        optimizer = QueryOptimizer(neo4j)
+        optimizer.enable_query_caching()
+
+        first = optimizer.execute_with_cache("MATCH (m:AIModel) RETURN m.name AS name")
+        second = optimizer.execute_with_cache("MATCH (m:AIModel) RETURN m.name AS name")
+
+        self.assertEqual(first, [{"name": "BERT"}])
+        self.assertEqual(second, [{"name": "BERT"}])
+        neo4j.run_query.assert_called_once()
+        self.assertEqual(optimizer.get_cache_statistics()["hits"], 1)
+
+
+class TestKnowledgeGraphManagerCacheInvalidation(unittest.TestCase):
+    """Tests for cache invalidation by KnowledgeGraphManager writes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_db = MagicMock()
+        self.cache = QueryResultCache()
+        self.manager = KnowledgeGraphManager(self.mock_db, query_cache=self.cache)
+        self.mock_db.execute_read_query.return_value = [{"e": {"id": "m1", "name": "BERT"}}]
+
+    def test_reads_are_cached(self):
+        """Test that repeated reads are served from the cache."""
+        self.manager.get_entity_by_id("m1")
+        entity = self.manager.get_entity_by_id("m1")
+
+        self.assertEqual(entity, {"id": "m1", "name": "BERT"})
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 1)
+
+    def test_update_entity_invalidates(self):
+        """Test that updating an entity evicts reads that depend on its labels."""
+        self.manager.get_entity_by_id("m1")
+        self.manager.get_entities_by_label("Dataset")
+        self.mock_db.execute_write_query.return_value = [
+            {"e": {"id": "m1"}, "labels": ["Entity", "AIModel"]}
+        ]
+
+        self.manager.update_entity("m1", {"name": "BERT-large"})
+
+        # The unlabeled lookup by ID is evicted; label-free reads depend on every label
+        self.assertEqual(len(self.cache), 0)
+        self.manager.get_entity_by_id("m1")
+        self.assertEqual(self.mock_db.execute_read_query.call_count, 3)
+
+    def test_delete_entity_invalidates_relationship_types(self):
+        """Test that deleting an entity evicts reads of its relationship types."""
+        self.cache.put("uses", [], tags={"type:USES"})
+        self.cache.put("cites", [], tags={"type:CITES"})
+        self.mock_db.execute_write_query.return_value = [
+            {"labels": ["Entity", "AIModel"], "types": ["USES"]}
+        ]
+
+        self.manager.delete_entity("m1")
+
+        self.assertIsNone(self.cache.get("uses"))
+        self.assertIsNotNone(self.cache.get("cites"))
+
+    def test_add_entity_invalidates_label(self):
+        """Test that adding an entity evicts reads of its label."""
+        self.cache.put("models", [], tags={"label:AIModel"})
+        self.cache.put("papers", [], tags={"label:Paper"})
+
+        self.manager.add_entity(GraphEntity(id="m2", label="AIModel"))
+
+        self.assertIsNone(self.cache.get("models"))
+        self.assertIsNotNone(self.cache.get("papers"))
+
+
+if __name__ == '__main__':
+    unittest.main()
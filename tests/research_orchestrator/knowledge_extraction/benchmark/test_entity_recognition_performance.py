@@ -101,6 +101,41 @@ def test_entity_overlap_merging_performance(entity_count, generate_entities, tim
     assert len(merged_entities) < entity_count
 
 
+@pytest.mark.parametrize('entity_count', [1000, 10000, 50000])
+def test_merge_overlapping_entities_on_large_documents(entity_count, timer):
+    """Test overlap merging with entities spread over a large document."""
+    rng = np.random.default_rng(42)
+    starts = rng.integers(0, entity_count * 8, size=entity_count)
+    lengths = rng.integers(1, 40, size=entity_count)
+    
+    entities = [
+        Entity(
+            id=f"e{i}",
+            text="entity",
+            type=EntityType.MODEL,
+            confidence=float(rng.uniform(0.5, 1.0)),
+            start_pos=int(start),
+            end_pos=int(start + length),
+        )
+        for i, (start, length) in enumerate(zip(starts, lengths))
+    ]
+    
+    recognizer = EntityRecognizerFactory.create_recognizer("ai")
+    
+    start_time = time.time()
+    with timer(f"merge_overlapping_entities({entity_count} spread entities)"):
+        merged_entities = recognizer.merge_overlapping_entities(entities)
+    elapsed = time.time() - start_time
+    
+    print(f"  {entity_count / max(elapsed, 1e-9):.0f} entities/sec, {len(merged_entities)} kept")
+    
+    # Kept entities are only ever replaced by entities they overlap, so some
+    # overlaps must have been resolved
+    assert len(merged_entities) < entity_count
+    # The sweep should handle tens of thousands of raw hits in well under a second
+    assert elapsed < 5.0
+
+
 def test_entity_recognition_scalability():
     """Test how entity recognition time scales with document size."""
     sizes = [10, 50, 100, 500, 1000]  # KB
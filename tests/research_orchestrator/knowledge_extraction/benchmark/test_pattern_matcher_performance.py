@@ -0,0 +1,104 @@
+"""
+Benchmark tests for the single-pass pattern matchers.
+
+This module compares the PatternScanner and AhoCorasick matchers used by the
+entity recognizers with the per-pattern and per-term scans they replace, on
+paper-sized documents.
+"""
+
+import pytest
+import random
+import re
+import time
+
+# Mark all tests in this module as benchmark tests and entity related tests
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.entity,
+    pytest.mark.slow
+]
+
+from research_orchestrator.knowledge_extraction.entity_recognition.ai_recognizer import AIEntityRecognizer
+from research_orchestrator.knowledge_extraction.entity_recognition.pattern_matcher import AhoCorasick
+
+
+# Sentences typical of an AI paper, repeated to the size of a paper
+PAPER_SENTENCES = [
+    "We fine-tune BERT-large and GPT-3 on the SQuAD dataset using PyTorch.",
+    "Our model reaches 92.4% accuracy on ImageNet, outperforming ResNet-50.",
+    "The Transformer architecture was introduced by researchers at Google.",
+    "Results on the GLUE benchmark show a 3.1 point improvement in F1 score.",
+    "We use the Adam optimizer with a learning rate of 0.0001 and batch size 32.",
+    "Related work on reinforcement learning from DeepMind informs this approach.",
+    "Experiments were run with TensorFlow on eight GPUs for three days.",
+    "Table 2 reports BLEU scores on WMT for each ablation of the attention layers.",
+]
+
+
+def generate_paper(pages):
+    """Generate the text of a paper with roughly 3KB per page."""
+    rng = random.Random(42)
+    sentences = []
+    size = 0
+    while size < pages * 3 * 1024:
+        sentence = rng.choice(PAPER_SENTENCES)
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)
+
+
+@pytest.mark.parametrize('pages', [5, 50])
+def test_pattern_scanner_performance(pages, timer):
+    """Compare one PatternScanner pass with a finditer pass per pattern."""
+    text = generate_paper(pages)
+    recognizer = AIEntityRecognizer()
+    patterns = [pattern for patterns in recognizer.patterns.values() for pattern in patterns]
+
+    with timer(f"per-pattern finditer ({len(patterns)} patterns, {pages} pages)"):
+        expected = sum(1 for pattern in patterns for _ in pattern.finditer(text))
+
+    with timer(f"PatternScanner.scan ({len(patterns)} patterns, {pages} pages)"):
+        matches = recognizer.scanner.scan(text)
+
+    assert len(matches) == expected
+
+
+@pytest.mark.parametrize('term_count', [100, 2000])
+def test_dictionary_matcher_performance(term_count, timer):
+    """Compare an AhoCorasick pass with a regex scan per dictionary term."""
+    text = generate_paper(50)
+    terms = [f"term{i} model" for i in range(term_count)] + ["bert", "imagenet", "pytorch"]
+    matcher = AhoCorasick((term, term) for term in terms)
+
+    start_time = time.time()
+    expected = sum(
+        1 for term in terms for _ in re.finditer(rf"\b{re.escape(term)}\b", text, re.IGNORECASE)
+    )
+    regex_time = time.time() - start_time
+
+    start_time = time.time()
+    matches = matcher.find_all(text)
+    matcher_time = time.time() - start_time
+
+    print(f"\nDictionary of {term_count} terms: regex {regex_time:.4f}s, Aho-Corasick {matcher_time:.4f}s")
+
+    assert len(matches) == expected
+    if term_count >= 2000:
+        assert matcher_time < regex_time, "Aho-Corasick should beat per-term regex scans on large dictionaries"
+
+
+def test_pattern_scanner_scalability():
+    """Test that scanning time grows linearly with the document size."""
+    scanner = AIEntityRecognizer().scanner
+    times = []
+
+    for pages in [10, 40]:
+        text = generate_paper(pages)
+        start_time = time.time()
+        scanner.scan(text)
+        times.append(time.time() - start_time)
+
+    print(f"\nPatternScanner 10 pages: {times[0]:.4f}s, 40 pages: {times[1]:.4f}s")
+
+    # Four times the text should take well under sixteen times as long
+    assert times[1] < times[0] * 8
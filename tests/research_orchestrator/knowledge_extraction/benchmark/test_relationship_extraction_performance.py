@@ -6,6 +6,7 @@ extraction components with different document sizes and entity counts.
 """
 
 import pytest
+import random
 import time
 import numpy as np
 
@@ -227,4 +228,38 @@ def test_relationship_extraction_scalability():
     print(f"\nScaling factor: O(n^{slope:.2f})")
     
     # Relationship extraction can be quadratic in worst case, but should be sub-quadratic in practice
-    assert slope < 2.5, f"Relationship extraction scales very poorly: O(n^{slope:.2f})"
\ No newline at end of file
+    assert slope < 2.5, f"Relationship extraction scales very poorly: O(n^{slope:.2f})"
+
+# Sentences typical of an AI paper, dense with related entities
+PAPER_SENTENCES = [
+    "We fine-tuned BERT on the SQuAD dataset using PyTorch.",
+    "GPT-4 outperforms GPT-3 on MMLU and achieves 86.4% accuracy.",
+    "ResNet is based on the VGG architecture and was trained on ImageNet.",
+    "The Transformer model was developed by Google and implemented in TensorFlow.",
+    "LLaMA was evaluated on the GLUE benchmark and uses the Transformer architecture.",
+    "BERT-large was pre-trained on BookCorpus and Wikipedia.",
+]
+
+
+@pytest.mark.parametrize('sentence_count', [100, 1000])
+def test_pattern_extraction_throughput(sentence_count):
+    """Measure pattern extraction throughput in entities per second on large papers."""
+    rng = random.Random(42)
+    content = " ".join(rng.choice(PAPER_SENTENCES) for _ in range(sentence_count))
+    
+    entities = EntityRecognizerFactory.create_recognizer("ai").recognize(content)
+    extractor = RelationshipExtractorFactory.create_extractor("pattern")
+    
+    start_time = time.time()
+    relationships = extractor.extract_relationships(content, entities)
+    elapsed = time.time() - start_time
+    
+    print(f"\nPattern extraction over {len(content) // 1024}KB: {len(entities)} entities, "
+          f"{len(relationships)} relationships in {elapsed:.3f}s "
+          f"({len(entities) / elapsed:.0f} entities/sec)")
+    
+    assert relationships
+    # Candidate pairs are generated within max_entity_distance and every
+    # pattern is matched once per document, so throughput stays in the
+    # thousands of entities per second even on paper-sized inputs
+    assert len(entities) / elapsed > 500
@@ -0,0 +1,166 @@
+"""
+Unit tests for the batch processor component.
+
+This module contains tests for the BatchProcessor class, focusing on streaming
+results to NDJSON, parallel processing, resuming from a checkpoint, timeouts,
+and progress reporting.
+"""
+
+import pytest
+
+# Mark all tests in this module as unit tests
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.medium
+]
+import json
+import time
+from unittest.mock import MagicMock
+
+from research_orchestrator.knowledge_extraction.knowledge_extractor import KnowledgeExtractor
+from research_orchestrator.knowledge_extraction.batch_processor import BatchProcessor, BatchProgress, hash_file
+from research_orchestrator.knowledge_extraction.document_processing.document_processor import DocumentProcessor
+from research_orchestrator.knowledge_extraction.entity_recognition.factory import EntityRecognizerFactory
+from research_orchestrator.knowledge_extraction.relationship_extraction.factory import RelationshipExtractorFactory
+
+
+DOCUMENTS = {
+    "bert.txt": "BERT was trained on SQuAD using PyTorch.",
+    "gpt.txt": "GPT-4 outperforms GPT-3 on MMLU and achieves 86.4% accuracy.",
+    "resnet.txt": "ResNet was evaluated on ImageNet.",
+}
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    """Create a directory of small documents."""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for name, content in DOCUMENTS.items():
+        (corpus / name).write_text(content)
+    return corpus
+
+
+@pytest.fixture
+def extractor():
+    """Create a knowledge extractor with real, picklable components."""
+    return KnowledgeExtractor(
+        document_processor=DocumentProcessor(),
+        entity_recognizer=EntityRecognizerFactory.create_recognizer("ai"),
+        relationship_extractor=RelationshipExtractorFactory.create_extractor("pattern")
+    )
+
+
+def read_records(path):
+    """Read the records of an NDJSON results file."""
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBatchProcessor:
+    """Tests for the BatchProcessor class."""
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_batch_process_streams_results(self, extractor, corpus_dir, tmp_path, workers):
+        """Test that every document's results are written to the NDJSON file."""
+        summary = extractor.batch_process(str(corpus_dir), str(tmp_path / "out"), file_pattern="*.txt", workers=workers)
+
+        assert summary["processed"] == 3
+        assert summary["failed"] == 0
+        assert summary["output_path"] == str(tmp_path / "out" / "results.ndjson")
+
+        records = read_records(summary["output_path"])
+        assert sorted(r["document_path"] for r in records) == sorted(str(corpus_dir / name) for name in DOCUMENTS)
+        for record in records:
+            assert record["content_hash"] == hash_file(record["document_path"])
+            assert record["entity_count"] == len(record["entities"]) > 0
+            assert record["relationship_count"] == len(record["relationships"])
+
+    def test_resume_skips_processed_documents(self, extractor, corpus_dir, tmp_path):
+        """Test that a rerun only processes new or changed documents."""
+        output_path = tmp_path / "results.ndjson"
+        processor = BatchProcessor(extractor, workers=1)
+        processor.process_directory(str(corpus_dir), str(output_path))
+
+        # Simulate a run interrupted in the middle of writing a record
+        with open(output_path, "a") as f:
+            f.write('{"document_path": "partial')
+        (corpus_dir / "new.txt").write_text("LLaMA uses the Transformer architecture.")
+        # Same content as an existing document under a different name
+        (corpus_dir / "copy.txt").write_text(DOCUMENTS["bert.txt"])
+
+        summary = processor.process_directory(str(corpus_dir), str(output_path))
+
+        assert summary["processed"] == 1
+        assert summary["skipped"] == 4
+        records = read_records(output_path)
+        assert len(records) == 4
+        assert records[-1]["document_path"] == str(corpus_dir / "new.txt")
+
+        # Without resume, the file is rewritten
+        summary = processor.process_directory(str(corpus_dir), str(output_path), resume=False)
+        assert summary["processed"] == 4
+        assert len(read_records(output_path)) == 4
+
+    def test_failed_documents_are_recorded_and_retried(self, corpus_dir, tmp_path):
+        """Test that a failing document is recorded with its error and retried on resume."""
+        entity_recognizer = MagicMock()
+        entity_recognizer.recognize.side_effect = ValueError("recognizer failed")
+        extractor = KnowledgeExtractor(
+            document_processor=DocumentProcessor(),
+            entity_recognizer=entity_recognizer,
+            relationship_extractor=MagicMock()
+        )
+        output_path = tmp_path / "results.ndjson"
+        processor = BatchProcessor(extractor, workers=1)
+
+        summary = processor.process_directory(str(corpus_dir), str(output_path))
+        assert summary["failed"] == 3
+        assert all(r["error"] == "recognizer failed" and r["error_type"] == "ValueError"
+                   for r in read_records(output_path))
+
+        summary = processor.process_directory(str(corpus_dir), str(output_path))
+        assert summary["failed"] == 3
+        assert summary["skipped"] == 0
+
+    def test_document_timeout(self, corpus_dir, tmp_path):
+        """Test that a document running over the timeout is recorded as failed."""
+        entity_recognizer = MagicMock()
+        entity_recognizer.recognize.side_effect = lambda text: time.sleep(5)
+        extractor = KnowledgeExtractor(
+            document_processor=DocumentProcessor(),
+            entity_recognizer=entity_recognizer,
+            relationship_extractor=MagicMock()
+        )
+        processor = BatchProcessor(extractor, workers=1, timeout=0.1)
+
+        start_time = time.time()
+        summary = processor.process_files([str(corpus_dir / "bert.txt")], str(tmp_path / "results.ndjson"))
+
+        assert time.time() - start_time < 5
+        assert summary["failed"] == 1
+        assert read_records(tmp_path / "results.ndjson")[0]["error_type"] == "DocumentTimeoutError"
+
+    def test_progress_callback(self, extractor, corpus_dir, tmp_path):
+        """Test that progress is reported after each document."""
+        reports = []
+        processor = BatchProcessor(
+            extractor,
+            workers=2,
+            max_in_flight=1,
+            progress_callback=lambda progress: reports.append(progress.to_dict())
+        )
+
+        processor.process_directory(str(corpus_dir), str(tmp_path / "results.ndjson"))
+
+        assert [r["processed"] for r in reports] == [1, 2, 3]
+        assert all(r["total"] == 3 for r in reports)
+        assert reports[-1]["documents_per_second"] > 0
+
+    def test_batch_progress(self):
+        """Test progress counters and throughput."""
+        progress = BatchProgress(total=10, processed=4, failed=1, skipped=2, elapsed=2.0)
+
+        assert progress.completed == 7
+        assert progress.documents_per_second == 2.5
+        assert BatchProgress(total=1).documents_per_second == 0.0
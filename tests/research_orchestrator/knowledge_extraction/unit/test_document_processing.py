@@ -18,11 +18,41 @@ import tempfile
 from unittest.mock import MagicMock, patch
 
 from research_orchestrator.knowledge_extraction.document_processing.document_processor import (
-    DocumentProcessor, Document
+    DocumentProcessor, Document, LazyDocument
 )
+from research_orchestrator.knowledge_extraction.document_processing.pdf_processor import PDFProcessor
 from research_orchestrator.knowledge_extraction.document_processing.text_processor import TextProcessor
 
 
+def write_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    page_count = len(page_texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count)), page_count)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                        "/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)).encode())
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    
+    with open(path, "wb") as f:
+        f.write(data)
+
+
 class TestDocument:
     """Tests for the Document class."""
     
@@ -316,4 +346,84 @@ class TestTextProcessor:
             assert result.document_type == "text"
         finally:
             # Clean up the temporary file
-            os.unlink(file_path)
\ No newline at end of file
+            os.unlink(file_path)
+
+
+class TestPDFProcessor:
+    """Tests for the PDFProcessor class."""
+    
+    PAGES = [f"Page {i + 1} mentions BERT and   ImageNet." for i in range(6)]
+    
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        """Create a six-page PDF file."""
+        path = tmp_path / "paper.pdf"
+        write_pdf(str(path), self.PAGES)
+        return str(path)
+    
+    def test_process_file(self, pdf_path):
+        """Test that a memory-mapped file gives the same result as its bytes."""
+        processor = PDFProcessor()
+        
+        text, metadata = processor.process_file(pdf_path)
+        with open(pdf_path, "rb") as f:
+            expected = processor.process(f.read())
+        
+        assert (text, metadata) == expected
+        assert metadata["page_count"] == 6
+        assert text.split("\n\n")[0] == "Page 1 mentions BERT and ImageNet."
+        assert [s["page_number"] for s in metadata["segments"]] == [1, 2, 3, 4, 5, 6]
+    
+    def test_page_parallel_extraction(self, pdf_path):
+        """Test that page-parallel extraction keeps the pages in order."""
+        serial = PDFProcessor().process_file(pdf_path)
+        parallel = PDFProcessor({
+            "parallel_pages": True,
+            "max_workers": 2,
+            "pages_per_task": 2,
+            "min_parallel_pages": 4
+        }).process_file(pdf_path)
+        
+        assert parallel == serial
+    
+    @pytest.mark.parametrize("parallel_pages", [False, True])
+    def test_iter_pages_with_page_range(self, pdf_path, parallel_pages):
+        """Test iterating over a range of pages."""
+        processor = PDFProcessor({
+            "page_range": (1, 5),
+            "parallel_pages": parallel_pages,
+            "pages_per_task": 3,
+            "min_parallel_pages": 2
+        })
+        
+        pages = list(processor.iter_pages(pdf_path))
+        
+        assert [i for i, _ in pages] == [1, 2, 3, 4]
+        assert pages[0][1] == "Page 2 mentions BERT and ImageNet."
+    
+    def test_lazy_document(self, pdf_path):
+        """Test that a lazy document produces its pages as they are consumed."""
+        processor = DocumentProcessor()
+        
+        document = processor.process_document_lazily(pdf_path)
+        
+        assert isinstance(document, LazyDocument)
+        assert document.metadata["page_count"] == 6
+        first = next(document.iter_segments())
+        assert first["page_number"] == 1
+        assert not document.is_complete
+        
+        # Accessing the content produces the remaining pages
+        eager = processor._process_pdf(pdf_path)
+        assert document.content == eager.content
+        assert document.segments == eager.segments
+        assert document.is_complete
+    
+    def test_process_file_maps_pdf(self, pdf_path):
+        """Test that DocumentProcessor.process_file processes a memory-mapped PDF."""
+        processor = DocumentProcessor()
+        
+        result = processor.process_file(pdf_path)
+        
+        assert result["processed"] is True
+        assert result["extracted_text"].startswith("Page 1 mentions BERT")
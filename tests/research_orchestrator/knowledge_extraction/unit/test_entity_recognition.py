@@ -21,6 +21,8 @@ from src.research_orchestrator.knowledge_extraction.entity_recognition.base_reco
 from src.research_orchestrator.knowledge_extraction.entity_recognition.ai_recognizer import AIEntityRecognizer
 from src.research_orchestrator.knowledge_extraction.entity_recognition.scientific_recognizer import ScientificEntityRecognizer
 from src.research_orchestrator.knowledge_extraction.entity_recognition.factory import EntityRecognizerFactory
+from src.research_orchestrator.knowledge_extraction.entity_recognition.pattern_matcher import PatternScanner, AhoCorasick, literal_alternation
+from src.research_orchestrator.knowledge_extraction.entity_recognition.span_index import SpanIndex
 
 
 class TestEntity:
@@ -348,4 +350,157 @@ class TestEntityRecognizerFactory:
     def test_create_invalid_recognizer(self):
         """Test creating an invalid entity recognizer."""
         with pytest.raises(ValueError):
-            EntityRecognizerFactory.create_recognizer("invalid_type")
\ No newline at end of file
+            EntityRecognizerFactory.create_recognizer("invalid_type")
+
+
+class TestPatternScanner:
+    """Tests for the PatternScanner class."""
+    
+    def test_scan_matches_finditer(self):
+        """Test that each pattern reports exactly the matches of its own finditer."""
+        import re
+        patterns = [r"GPT-\d+", r"\bBERT(?:-\w+)?", r"(\w+) dataset", r"\d+\.\d+%", r"\w+"]
+        text = "GPT-4 and BERT-large beat 12.5% on the SQuAD dataset; GPT-3 lags, bert-base too."
+        
+        scanner = PatternScanner([(i, p) for i, p in enumerate(patterns)], re.IGNORECASE)
+        matches = scanner.scan(text)
+        
+        for i, pattern in enumerate(patterns):
+            groups = re.compile(pattern).groups
+            expected = [m.regs for m in re.finditer(pattern, text, re.IGNORECASE)]
+            actual = [tuple(m.span(g) for g in range(groups + 1)) for m in matches if m.key == i]
+            assert actual == expected
+        
+        # Matches come back ordered by start offset
+        starts = [m.start() for m in matches]
+        assert starts == sorted(starts)
+    
+    def test_scan_groups(self):
+        """Test that group numbers are relative to the matched pattern."""
+        scanner = PatternScanner([("a", r"x(\d)"), ("b", r"(\w+) (dataset)")])
+        matches = scanner.scan("x1 COCO dataset")
+        
+        by_key = {m.key: m for m in matches}
+        assert by_key["a"].group(1) == "1"
+        assert by_key["a"].lastindex == 1
+        assert by_key["b"].group(1) == "COCO"
+        assert by_key["b"].group(2) == "dataset"
+        assert by_key["b"].start(2) == 8
+    
+    def test_scan_uncombinable_pattern(self):
+        """Test that patterns with back-references are scanned on their own."""
+        scanner = PatternScanner([("repeat", r"(\w+) \1"), ("word", r"deep")])
+        matches = scanner.scan("deep deep learning")
+        
+        assert [(m.key, m.group(0)) for m in matches] == [
+            ("repeat", "deep deep"), ("word", "deep"), ("word", "deep")
+        ]
+
+
+class TestAhoCorasick:
+    """Tests for the AhoCorasick class."""
+    
+    def test_find_all_whole_words(self):
+        """Test case-insensitive whole-word matching of single and multi-word terms."""
+        matcher = AhoCorasick([("BERT", "model"), ("machine learning", "field"), ("learning", "concept")])
+        text = "Machine learning with BERT, not RoBERTa; learning again."
+        
+        matches = matcher.find_all(text)
+        assert [(text[s:e], v) for s, e, v in matches] == [
+            ("Machine learning", "field"),
+            ("learning", "concept"),
+            ("BERT", "model"),
+            ("learning", "concept"),
+        ]
+    
+    def test_find_all_substrings(self):
+        """Test matching without word boundaries."""
+        matcher = AhoCorasick([("bert", None)])
+        assert [(s, e) for s, e, _ in matcher.find_all("RoBERTa BERT", whole_words=False)] == [(2, 6), (8, 12)]
+    
+    def test_find_all_overlapping(self):
+        """Test that a term is not matched inside its own previous match unless overlapping."""
+        matcher = AhoCorasick([("aa", None)])
+        assert len(matcher.find_all("aaaa", whole_words=False)) == 2
+        assert len(matcher.find_all("aaaa", whole_words=False, overlapping=True)) == 3
+    
+    def test_ai_recognizer_dictionary(self, tmp_path):
+        """Test that dictionary entities are found at every occurrence, including multi-word terms."""
+        import json
+        dictionary_path = tmp_path / "entities.json"
+        dictionary_path.write_text(json.dumps({
+            "Stable Diffusion": {"type": "MODEL", "confidence": 0.9},
+        }))
+        
+        recognizer = AIEntityRecognizer(config={"dictionary_path": str(dictionary_path)})
+        text = "We fine-tune stable diffusion. Stable Diffusion then generates images."
+        matches = recognizer.dictionary_matcher.find_all(text)
+        
+        assert [(s, e) for s, e, _ in matches] == [(13, 29), (31, 47)]
+        assert all(value == (EntityType.MODEL, 0.9) for _, _, value in matches)
+    
+    def test_literal_alternation(self):
+        """Test that a literal alternation matches any term, longest first."""
+        import re
+        pattern = re.compile(literal_alternation(["bert", "bert-large", "gpt-3", "a.b"]))
+        
+        assert pattern.fullmatch("bert")
+        assert pattern.fullmatch("a.b")
+        assert not pattern.fullmatch("axb")
+        assert pattern.match("bert-large model").group(0) == "bert-large"
+        assert [m.group(0) for m in pattern.finditer("gpt-3 and bert")] == ["gpt-3", "bert"]
+        assert re.search(literal_alternation([]), "anything") is None
+
+
+class TestSpanIndex:
+    """Tests for the SpanIndex class."""
+    
+    def test_overlapping(self):
+        """Test finding the entities that overlap a range, in insertion order."""
+        entities = [
+            Entity(text="GPT-4", type=EntityType.MODEL, confidence=0.9, start_pos=40, end_pos=45, id="e1"),
+            Entity(text="BERT", type=EntityType.MODEL, confidence=0.9, start_pos=0, end_pos=4, id="e2"),
+            Entity(text="BERT-large", type=EntityType.MODEL, confidence=0.9, start_pos=0, end_pos=10, id="e3"),
+            Entity(text="MMLU", type=EntityType.BENCHMARK, confidence=0.9, start_pos=None, end_pos=None, id="e4"),
+        ]
+        index = SpanIndex(entities)
+        
+        assert len(index) == 3
+        assert [e.id for e in index.overlapping(3, 42)] == ["e1", "e2", "e3"]
+        assert [e.id for e in index.overlapping(4, 40)] == ["e3"]
+        assert [e.id for e in index.within(0, 5)] == ["e2"]
+        assert [e.id for e in index.at(44)] == ["e1"]
+        assert index.at(45) == []
+    
+    def test_overlapping_matches_brute_force(self):
+        """Test the interval tree against a linear scan over many spans."""
+        import random
+        rng = random.Random(7)
+        spans = []
+        for _ in range(500):
+            start = rng.randint(0, 2000)
+            spans.append((start, start + rng.choice([1, 3, 10, 50, 400])))
+        index = SpanIndex(spans, span=lambda span: span)
+        
+        for _ in range(200):
+            start = rng.randint(0, 2100)
+            end = start + rng.randint(1, 100)
+            expected = [span for span in spans if span[0] < end and span[1] > start]
+            assert index.overlapping(start, end) == expected
+    
+    def test_merge_overlapping_entities_nested(self):
+        """Test the overlap sweep with nested, partial and separate entities."""
+        recognizer = AIEntityRecognizer()
+        entities = [
+            Entity(text="language model", type=EntityType.MODEL, confidence=0.7, start_pos=10, end_pos=24, id="outer"),
+            Entity(text="model", type=EntityType.MODEL, confidence=0.9, start_pos=19, end_pos=24, id="inner"),
+            Entity(text="model training", type=EntityType.TASK, confidence=0.8, start_pos=19, end_pos=33, id="partial"),
+            Entity(text="large language model", type=EntityType.MODEL, confidence=0.7, start_pos=4, end_pos=24, id="wider"),
+            Entity(text="ImageNet", type=EntityType.DATASET, confidence=0.6, start_pos=50, end_pos=58, id="separate"),
+        ]
+        
+        merged = recognizer.merge_overlapping_entities(entities)
+        
+        # "wider" is kept first and contains "outer" and "inner"; "partial"
+        # overlaps it with higher confidence and replaces it
+        assert [e.id for e in merged] == ["partial", "separate"]
@@ -215,6 +215,31 @@ class TestRelationshipExtractor:
         # Should find both BERT-Google and GPT-3-OpenAI pairs (4 pairs total with both directions)
         assert len(pairs) >= 4
     
+    def test_iter_entity_pairs_sliding_window(self):
+        """Test that pairs are generated in position order within max_distance."""
+        class TestExtractor(RelationshipExtractor):
+            def extract_relationships(self, text, entities):
+                return []
+        
+        extractor = TestExtractor()
+        
+        # Given out of order, with a long entity that reaches past a shorter one
+        entities = [
+            Entity(text="C", type=EntityType.MODEL, confidence=0.9, start_pos=40, end_pos=41, id="e3"),
+            Entity(text="A", type=EntityType.MODEL, confidence=0.9, start_pos=0, end_pos=30, id="e1"),
+            Entity(text="B", type=EntityType.MODEL, confidence=0.9, start_pos=5, end_pos=6, id="e2"),
+            Entity(text="D", type=EntityType.MODEL, confidence=0.9, start_pos=100, end_pos=101, id="e4"),
+        ]
+        
+        pairs = [(s.id, t.id) for s, t in extractor.iter_entity_pairs(entities, max_distance=10)]
+        assert pairs == [
+            ("e1", "e2"), ("e2", "e1"),
+            ("e1", "e3"), ("e3", "e1"),
+        ]
+        
+        # Without a maximum distance, every pair is generated
+        assert len(list(extractor.iter_entity_pairs(entities))) == 12
+    
     def test_filter_relationships(self):
         """Test filtering relationships by confidence and type."""
         class TestExtractor(RelationshipExtractor):
@@ -334,6 +359,75 @@ class TestPatternRelationshipExtractor:
         assert relationships[0].source.text == "BERT"
         assert relationships[0].target.text == "Transformer"
         assert relationships[0].relation_type == RelationType.BASED_ON
+    
+    def test_extract_relationships_from_mentions(self):
+        """Test that pattern matches are mapped to the entity pairs they mention."""
+        extractor = PatternRelationshipExtractor()
+        text = "BERT was trained on SQuAD. GPT-3 was evaluated on GLUE."
+        entities = [
+            Entity(text="BERT", type=EntityType.MODEL, confidence=1.0, start_pos=0, end_pos=4, id="e1"),
+            Entity(text="SQuAD", type=EntityType.DATASET, confidence=1.0, start_pos=20, end_pos=25, id="e2"),
+            Entity(text="GPT-3", type=EntityType.MODEL, confidence=1.0, start_pos=27, end_pos=32, id="e3"),
+            Entity(text="GLUE", type=EntityType.DATASET, confidence=1.0, start_pos=50, end_pos=54, id="e4"),
+        ]
+        
+        relationships = extractor.extract_relationships(text, entities)
+        found = {
+            (r.source.id, r.relation_type, r.target.id) for r in relationships
+            if r.source.type == EntityType.MODEL
+        }
+        
+        assert found == {
+            ("e1", RelationType.TRAINED_ON, "e2"),
+            ("e3", RelationType.TRAINED_ON, "e2"),
+            ("e1", RelationType.EVALUATED_ON, "e4"),
+            ("e3", RelationType.EVALUATED_ON, "e4"),
+        }
+    
+    def test_extract_relationships_requires_mention_position(self):
+        """Test that a placeholder only matches at the position of the entity's mention."""
+        extractor = PatternRelationshipExtractor()
+        # The second "ImageNet" is not a recognized mention
+        text = "ResNet uses ImageNet features; it was trained on ImageNet."
+        entities = [
+            Entity(text="ResNet", type=EntityType.MODEL, confidence=1.0, start_pos=0, end_pos=6, id="e1"),
+            Entity(text="ImageNet", type=EntityType.DATASET, confidence=1.0, start_pos=12, end_pos=20, id="e2"),
+        ]
+        
+        relationships = extractor.extract_relationships(text, entities)
+        
+        assert relationships == []
+    
+    def test_extract_relationships_value_metadata(self):
+        """Test that achieved values are captured from the pattern's own group."""
+        extractor = PatternRelationshipExtractor()
+        text = "GPT-4 achieves 86.4% accuracy"
+        entities = [
+            Entity(text="GPT-4", type=EntityType.MODEL, confidence=1.0, start_pos=0, end_pos=5, id="e1"),
+            Entity(text="accuracy", type=EntityType.METRIC, confidence=1.0, start_pos=21, end_pos=29, id="e2"),
+        ]
+        
+        relationships = extractor.extract_relationships(text, entities)
+        
+        assert len(relationships) == 1
+        assert relationships[0].relation_type == RelationType.ACHIEVES
+        assert relationships[0].metadata["value"] == "86.4%"
+
+    def test_extract_relationships_overlapping_matches(self):
+        """Test that a match for one target does not hide an overlapping match for another."""
+        extractor = PatternRelationshipExtractor()
+        text = "ResNet achieves 76.1% top one accuracy and precision"
+        entities = [
+            Entity(text="ResNet", type=EntityType.MODEL, confidence=1.0, start_pos=0, end_pos=6, id="e1"),
+            Entity(text="accuracy", type=EntityType.METRIC, confidence=1.0, start_pos=30, end_pos=38, id="e2"),
+            Entity(text="precision", type=EntityType.METRIC, confidence=1.0, start_pos=43, end_pos=52, id="e3"),
+        ]
+
+        relationships = extractor.extract_relationships(text, entities)
+        found = {(r.source.id, r.relation_type, r.target.id) for r in relationships}
+
+        assert ("e1", RelationType.ACHIEVES, "e2") in found
+        assert ("e1", RelationType.ACHIEVES, "e3") in found
 
 
 class TestAIRelationshipExtractor:
@@ -0,0 +1,199 @@
+"""
+Unit tests for URL fetching.
+
+This module contains tests for the AsyncURLFetcher class and the URL processing
+methods of DocumentProcessor, run against a local HTTP stub server. It covers
+conditional requests, per-host concurrency limits, size limits and batch
+processing.
+"""
+
+import pytest
+
+# Mark all tests in this module as unit tests and document related tests
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.document,
+    pytest.mark.medium
+]
+import asyncio
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from research_orchestrator.knowledge_extraction.document_processing.document_processor import DocumentProcessor
+from research_orchestrator.knowledge_extraction.document_processing.url_fetcher import AsyncURLFetcher
+
+PAPER_TEXT = b"BERT was trained on SQuAD using PyTorch."
+PAPER_ETAG = '"paper-v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler serving a few fixed documents."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path == "/paper.txt":
+                if self.headers.get("If-None-Match") == PAPER_ETAG:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self._send(PAPER_TEXT, "text/plain", ETag=PAPER_ETAG)
+            elif self.path.startswith("/slow"):
+                time.sleep(0.2)
+                self._send(b"GPT-4 outperforms GPT-3 on MMLU.", "text/plain")
+            elif self.path == "/page.html":
+                self._send(b"<html><body><p>ResNet was evaluated on ImageNet.</p></body></html>", "text/html")
+            elif self.path == "/large.txt":
+                self._send(b"x" * 4096, "text/plain")
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send(self, body, content_type, **headers):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run a local HTTP server and return it with its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = Counter()
+    server.active = server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestAsyncURLFetcher:
+    """Tests for the AsyncURLFetcher class."""
+
+    def test_conditional_request_uses_cache(self, stub_server, tmp_path):
+        """Test that a cached response is revalidated instead of downloaded."""
+        server, base_url = stub_server
+
+        async def fetch_twice():
+            async with AsyncURLFetcher(cache_dir=str(tmp_path / "responses")) as fetcher:
+                return await fetcher.fetch(f"{base_url}/paper.txt"), await fetcher.fetch(f"{base_url}/paper.txt")
+
+        first, second = asyncio.run(fetch_twice())
+
+        assert first.ok and not first.from_cache
+        assert second.ok and second.from_cache
+        assert first.content == second.content == PAPER_TEXT
+        assert second.content_type == "text/plain"
+        assert server.requests["/paper.txt"] == 2
+
+    def test_per_host_limit(self, stub_server):
+        """Test that concurrent requests to a host are limited."""
+        server, base_url = stub_server
+
+        async def fetch_all():
+            async with AsyncURLFetcher(max_connections_per_host=2) as fetcher:
+                return [r async for r in fetcher.fetch_all(f"{base_url}/slow{i}" for i in range(6))]
+
+        results = asyncio.run(fetch_all())
+
+        assert len(results) == 6
+        assert all(r.ok for r in results)
+        assert server.max_active == 2
+
+    def test_errors_are_reported(self, stub_server):
+        """Test that failures are reported in the results."""
+        server, base_url = stub_server
+
+        async def fetch():
+            async with AsyncURLFetcher(max_size=1024) as fetcher:
+                return (
+                    await fetcher.fetch(f"{base_url}/missing.txt"),
+                    await fetcher.fetch(f"{base_url}/large.txt"),
+                    await fetcher.fetch("ftp://example.com/paper.txt")
+                )
+
+        missing, large, invalid = asyncio.run(fetch())
+
+        assert missing.error_type == "RequestException"
+        assert missing.status_code == 404
+        assert large.error_type == "ValueError"
+        assert invalid.error_type == "ValueError"
+
+
+class TestDocumentProcessorURLs:
+    """Tests for processing documents from URLs."""
+
+    def test_process_url(self, stub_server, tmp_path):
+        """Test processing a document from a URL without a temporary file."""
+        server, base_url = stub_server
+        processor = DocumentProcessor({"url": {"cache_dir": str(tmp_path / "responses")}})
+
+        result = processor.process_url(f"{base_url}/paper.txt")
+        cached = processor.process_url(f"{base_url}/paper.txt")
+
+        assert result["processed"] is True
+        assert result["extracted_text"] == PAPER_TEXT.decode()
+        assert result["metadata"]["status_code"] == 200
+        assert result["metadata"]["from_cache"] is False
+        assert cached["extracted_text"] == result["extracted_text"]
+        assert cached["metadata"]["from_cache"] is True
+
+    def test_process_urls(self, stub_server):
+        """Test that a batch of URLs yields a result per URL."""
+        server, base_url = stub_server
+        processor = DocumentProcessor()
+        urls = [f"{base_url}/paper.txt", f"{base_url}/page.html", f"{base_url}/missing.txt"]
+
+        results = {r["url"]: r for r in processor.process_urls(urls)}
+
+        assert set(results) == set(urls)
+        assert results[urls[0]]["processed"] is True
+        assert "ResNet" in results[urls[1]]["extracted_text"]
+        assert results[urls[2]]["processed"] is False
+        assert results[urls[2]]["metadata"]["status_code"] == 404
+
+    def test_processor_remains_picklable(self, stub_server):
+        """Test that a processor that fetched URLs can still be sent to worker processes."""
+        import pickle
+
+        server, base_url = stub_server
+        processor = DocumentProcessor()
+        processor.process_url(f"{base_url}/paper.txt")
+
+        copy = pickle.loads(pickle.dumps(processor))
+
+        assert copy.process_url(f"{base_url}/paper.txt")["processed"] is True
+
+    def test_processors_share_fetch_thread_and_fetcher(self, stub_server):
+        """Test that processors built per task share one fetch thread and connection pool."""
+        server, base_url = stub_server
+        processors = [DocumentProcessor() for _ in range(5)]
+        for processor in processors:
+            processor.process_url(f"{base_url}/paper.txt")
+
+        threads = [thread for thread in threading.enumerate() if thread.name == "document-url-fetcher"]
+        assert len(threads) == 1
+        assert len({id(processor._get_url_fetcher()) for processor in processors}) == 1
+        assert DocumentProcessor({"url": {"max_connections": 2}})._get_url_fetcher() is not processors[0]._get_url_fetcher()